@@ -0,0 +1,82 @@
+"""Create stock price history tables
+
+Revision ID: 158_create_stock_price_history_tables
+Revises: 157_create_watchlist_table
+Create Date: 2025-01-20
+
+This migration creates the local OHLCV store used to serve historical prices
+without re-downloading the full period from the upstream provider.
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "158_create_stock_price_history_tables"
+down_revision = "157_create_watchlist_table"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create stock price bar and coverage tables"""
+
+    op.execute(
+        """
+        DO $$ BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.tables
+                WHERE table_schema='migration'
+                AND table_name='stock_price_bars'
+            ) THEN
+                CREATE TABLE migration.stock_price_bars (
+                    symbol VARCHAR(30) NOT NULL,
+                    interval VARCHAR(10) NOT NULL,
+                    bar_timestamp BIGINT NOT NULL,
+                    trade_date DATE NOT NULL,
+                    open DOUBLE PRECISION,
+                    high DOUBLE PRECISION,
+                    low DOUBLE PRECISION,
+                    close DOUBLE PRECISION,
+                    volume DOUBLE PRECISION,
+                    CONSTRAINT pk_stock_price_bars
+                        PRIMARY KEY (symbol, interval, bar_timestamp)
+                );
+
+                CREATE INDEX IF NOT EXISTS ix_stock_price_bars_symbol_interval_date
+                    ON migration.stock_price_bars(symbol, interval, trade_date);
+            END IF;
+        END $$;
+    """
+    )
+
+    op.execute(
+        """
+        DO $$ BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.tables
+                WHERE table_schema='migration'
+                AND table_name='stock_price_coverage'
+            ) THEN
+                CREATE TABLE migration.stock_price_coverage (
+                    symbol VARCHAR(30) NOT NULL,
+                    interval VARCHAR(10) NOT NULL,
+                    first_trade_date DATE NOT NULL,
+                    last_trade_date DATE NOT NULL,
+                    starts_at_inception BOOLEAN NOT NULL DEFAULT FALSE,
+                    last_refreshed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+                    CONSTRAINT pk_stock_price_coverage PRIMARY KEY (symbol, interval)
+                );
+            END IF;
+        END $$;
+    """
+    )
+
+
+def downgrade() -> None:
+    """Drop stock price history tables"""
+    op.execute(
+        """
+        DROP TABLE IF EXISTS migration.stock_price_coverage CASCADE;
+        DROP TABLE IF EXISTS migration.stock_price_bars CASCADE;
+    """
+    )
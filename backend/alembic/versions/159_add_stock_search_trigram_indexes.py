@@ -0,0 +1,43 @@
+"""Add trigram indexes for stock search
+
+Revision ID: 159_add_stock_search_trigram_indexes
+Revises: 158_create_stock_price_history_tables
+Create Date: 2025-01-22
+
+Stock search matches ILIKE '%query%' on symbol and company name, which the
+btree symbol index cannot serve. GIN trigram indexes let Postgres answer
+those filters and the similarity ranking from the index.
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "159_add_stock_search_trigram_indexes"
+down_revision = "158_create_stock_price_history_tables"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Enable pg_trgm and index stock symbol and company name"""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_stocks_symbol_trgm
+            ON migration.stocks USING gin (symbol gin_trgm_ops);
+
+        CREATE INDEX IF NOT EXISTS ix_stocks_company_name_trgm
+            ON migration.stocks USING gin (company_name gin_trgm_ops);
+    """
+    )
+
+
+def downgrade() -> None:
+    """Drop stock search trigram indexes (pg_trgm is left installed)"""
+    op.execute(
+        """
+        DROP INDEX IF EXISTS migration.ix_stocks_company_name_trgm;
+        DROP INDEX IF EXISTS migration.ix_stocks_symbol_trgm;
+    """
+    )
@@ -0,0 +1,100 @@
+"""Add indexes for set-wise application deduplication
+
+Revision ID: 160_add_bulk_deduplication_indexes
+Revises: 159_add_stock_search_trigram_indexes
+Create Date: 2025-01-24
+
+Bulk deduplication resolves a whole application list at once:
+- nearest-neighbour lookups on canonical_applications.name_embedding use an
+  HNSW index, replacing the ivfflat index built with lists=100 when the table
+  was empty (ivfflat centroids are fixed at build time)
+- collection flow links are written with INSERT ... ON CONFLICT, which needs
+  a unique index on (collection_flow_id, canonical_application_id)
+
+Duplicate links left by earlier data migrations are not deleted here: the
+upgrade stops with an error naming how many there are, so an operator can
+review and merge them before re-running it.
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "160_add_bulk_deduplication_indexes"
+down_revision = "159_add_stock_search_trigram_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create the HNSW embedding index and the unique link index"""
+    op.execute(
+        """
+            DO $$
+            BEGIN
+                IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'vector') THEN
+                    DROP INDEX IF EXISTS migration.idx_canonical_apps_vector_similarity;
+                    CREATE INDEX IF NOT EXISTS idx_canonical_apps_name_embedding_hnsw
+                        ON migration.canonical_applications
+                        USING hnsw (name_embedding vector_cosine_ops)
+                        WHERE name_embedding IS NOT NULL;
+                END IF;
+            END $$;
+        """
+    )
+
+    op.execute(
+        """
+            DO $$
+            DECLARE
+                duplicate_pairs INTEGER;
+            BEGIN
+                SELECT count(*) INTO duplicate_pairs
+                FROM (
+                    SELECT 1
+                    FROM migration.collection_flow_applications
+                    WHERE canonical_application_id IS NOT NULL
+                    GROUP BY collection_flow_id, canonical_application_id
+                    HAVING count(*) > 1
+                ) AS duplicates;
+
+                IF duplicate_pairs > 0 THEN
+                    RAISE EXCEPTION
+                        'collection_flow_applications has % (collection_flow_id, '
+                        'canonical_application_id) pairs linked more than once; '
+                        'merge them before creating '
+                        'uq_collection_flow_apps_flow_canonical',
+                        duplicate_pairs
+                    USING HINT = 'SELECT collection_flow_id, canonical_application_id, '
+                        'array_agg(id ORDER BY created_at) FROM '
+                        'migration.collection_flow_applications WHERE '
+                        'canonical_application_id IS NOT NULL GROUP BY 1, 2 '
+                        'HAVING count(*) > 1';
+                END IF;
+            END $$;
+
+            CREATE UNIQUE INDEX IF NOT EXISTS uq_collection_flow_apps_flow_canonical
+                ON migration.collection_flow_applications
+                (collection_flow_id, canonical_application_id);
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drop the new indexes and restore the ivfflat embedding index"""
+    op.execute("DROP INDEX IF EXISTS migration.uq_collection_flow_apps_flow_canonical;")
+
+    op.execute(
+        """
+            DO $$
+            BEGIN
+                IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'vector') THEN
+                    DROP INDEX IF EXISTS migration.idx_canonical_apps_name_embedding_hnsw;
+                    CREATE INDEX IF NOT EXISTS idx_canonical_apps_vector_similarity
+                        ON migration.canonical_applications
+                        USING ivfflat (name_embedding vector_cosine_ops)
+                        WITH (lists = 100)
+                        WHERE name_embedding IS NOT NULL;
+                END IF;
+            END $$;
+        """
+    )
@@ -0,0 +1,57 @@
+"""Create materialized dependency graph tables
+
+Revision ID: 161_create_dependency_graph_tables
+Revises: 160_add_bulk_deduplication_indexes
+Create Date: 2025-01-27
+
+Stores one compact application dependency graph per engagement plus a
+versioned change log, so graph views read a single row and clients can fetch
+deltas since the version they already hold.
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "161_create_dependency_graph_tables"
+down_revision = "160_add_bulk_deduplication_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create dependency graph snapshot and change tables"""
+    op.execute(
+        """
+            CREATE TABLE IF NOT EXISTS migration.dependency_graph_snapshots (
+                client_account_id UUID NOT NULL,
+                engagement_id UUID NOT NULL,
+                version BIGINT NOT NULL DEFAULT 0,
+                base_version BIGINT NOT NULL DEFAULT 0,
+                nodes JSONB,
+                edges JSONB,
+                updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+                CONSTRAINT pk_dependency_graph_snapshots
+                    PRIMARY KEY (client_account_id, engagement_id)
+            );
+
+            CREATE TABLE IF NOT EXISTS migration.dependency_graph_changes (
+                client_account_id UUID NOT NULL,
+                engagement_id UUID NOT NULL,
+                version BIGINT NOT NULL,
+                change JSONB NOT NULL,
+                created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+                CONSTRAINT pk_dependency_graph_changes
+                    PRIMARY KEY (client_account_id, engagement_id, version)
+            );
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drop dependency graph tables"""
+    op.execute(
+        """
+            DROP TABLE IF EXISTS migration.dependency_graph_changes;
+            DROP TABLE IF EXISTS migration.dependency_graph_snapshots;
+        """
+    )
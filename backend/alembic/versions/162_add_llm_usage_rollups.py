@@ -0,0 +1,158 @@
+"""Add hourly and daily LLM usage rollups
+
+Revision ID: 162_add_llm_usage_rollups
+Revises: 161_create_dependency_graph_tables
+Create Date: 2025-01-28
+
+Turns llm_usage_summary into an incrementally maintained rollup of
+llm_usage_logs, so usage reports read a bounded number of summary rows
+instead of scanning every raw log:
+
+- Response time sum/count and first/last request columns, so rollup rows can
+  be re-aggregated into exact averages and report periods.
+- The period/context unique constraint becomes NULLS NOT DISTINCT; contexts
+  are often NULL and upserts must still conflict on them.
+- llm_usage_rollup_state records how far each period type has been rolled
+  up, so reports know which range still has to come from raw logs.
+
+Existing summary rows are kept. Rows from before the earliest surviving raw
+log are the only record of that usage, so the rollup state starts at that
+log's hour and day; rows at or after it are rebuilt by the rollup job. Kept
+rows get response time sum/count derived from their average and are merged
+where NULL contexts let duplicates through the old constraint.
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "162_add_llm_usage_rollups"
+down_revision = "161_create_dependency_graph_tables"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add rollup columns, NULL-safe unique key and rollup state table"""
+    op.execute(
+        """
+            ALTER TABLE migration.llm_usage_summary
+                ADD COLUMN IF NOT EXISTS total_response_time_ms BIGINT
+                    DEFAULT 0 NOT NULL,
+                ADD COLUMN IF NOT EXISTS timed_requests INTEGER DEFAULT 0 NOT NULL,
+                ADD COLUMN IF NOT EXISTS first_request_at TIMESTAMP WITH TIME ZONE,
+                ADD COLUMN IF NOT EXISTS last_request_at TIMESTAMP WITH TIME ZONE;
+
+            -- Averages were stored per row; every request is taken as timed
+            UPDATE migration.llm_usage_summary
+            SET total_response_time_ms =
+                    avg_response_time_ms::BIGINT * total_requests,
+                timed_requests = total_requests
+            WHERE avg_response_time_ms IS NOT NULL;
+
+            CREATE TABLE IF NOT EXISTS migration.llm_usage_rollup_state (
+                period_type VARCHAR(20) PRIMARY KEY,
+                rolled_until TIMESTAMP WITH TIME ZONE NOT NULL,
+                updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
+            );
+
+            -- Roll up from the earliest log still on hand; older usage only
+            -- survives in the existing summary rows
+            INSERT INTO migration.llm_usage_rollup_state (period_type, rolled_until)
+            SELECT period_type, date_trunc(unit, first_log, 'UTC')
+            FROM (
+                SELECT COALESCE(MIN(created_at), NOW()) AS first_log
+                FROM migration.llm_usage_logs
+            ) logs
+            CROSS JOIN (VALUES ('hourly', 'hour'), ('daily', 'day'))
+                AS periods (period_type, unit)
+            ON CONFLICT (period_type) DO NOTHING;
+
+            -- The rollup job rebuilds everything from there on
+            DELETE FROM migration.llm_usage_summary summary
+            USING migration.llm_usage_rollup_state state
+            WHERE summary.period_type = state.period_type
+                AND summary.period_start >= state.rolled_until;
+
+            -- Merge rows the old constraint let through because of NULL
+            -- contexts, so the NULLS NOT DISTINCT constraint can be added
+            WITH duplicates AS (
+                SELECT
+                    (array_agg(id ORDER BY id))[1] AS keep_id,
+                    array_agg(id) AS ids,
+                    SUM(total_requests) AS total_requests,
+                    SUM(successful_requests) AS successful_requests,
+                    SUM(failed_requests) AS failed_requests,
+                    SUM(total_input_tokens) AS total_input_tokens,
+                    SUM(total_output_tokens) AS total_output_tokens,
+                    SUM(total_tokens) AS total_tokens,
+                    SUM(total_cost) AS total_cost,
+                    MIN(min_response_time_ms) AS min_response_time_ms,
+                    MAX(max_response_time_ms) AS max_response_time_ms,
+                    SUM(total_response_time_ms) AS total_response_time_ms,
+                    SUM(timed_requests) AS timed_requests
+                FROM migration.llm_usage_summary
+                GROUP BY
+                    period_type, period_start, client_account_id, engagement_id,
+                    user_id, llm_provider, model_name, page_context,
+                    feature_context
+                HAVING COUNT(*) > 1
+            ), merged AS (
+                UPDATE migration.llm_usage_summary summary
+                SET total_requests = dup.total_requests,
+                    successful_requests = dup.successful_requests,
+                    failed_requests = dup.failed_requests,
+                    total_input_tokens = dup.total_input_tokens,
+                    total_output_tokens = dup.total_output_tokens,
+                    total_tokens = dup.total_tokens,
+                    total_cost = dup.total_cost,
+                    avg_response_time_ms = ROUND(
+                        dup.total_response_time_ms
+                        / NULLIF(dup.timed_requests, 0)
+                    ),
+                    min_response_time_ms = dup.min_response_time_ms,
+                    max_response_time_ms = dup.max_response_time_ms,
+                    total_response_time_ms = dup.total_response_time_ms,
+                    timed_requests = dup.timed_requests
+                FROM duplicates dup
+                WHERE summary.id = dup.keep_id
+            )
+            DELETE FROM migration.llm_usage_summary summary
+            USING duplicates dup
+            WHERE summary.id = ANY(dup.ids) AND summary.id <> dup.keep_id;
+
+            ALTER TABLE migration.llm_usage_summary
+                DROP CONSTRAINT IF EXISTS uq_usage_summary_period_context;
+            ALTER TABLE migration.llm_usage_summary
+                ADD CONSTRAINT uq_usage_summary_period_context
+                UNIQUE NULLS NOT DISTINCT (
+                    period_type, period_start, client_account_id, engagement_id,
+                    user_id, llm_provider, model_name, page_context,
+                    feature_context
+                );
+        """
+    )
+
+
+def downgrade() -> None:
+    """Restore the original summary table shape"""
+    op.execute(
+        """
+            DROP TABLE IF EXISTS migration.llm_usage_rollup_state;
+
+            ALTER TABLE migration.llm_usage_summary
+                DROP CONSTRAINT IF EXISTS uq_usage_summary_period_context;
+            ALTER TABLE migration.llm_usage_summary
+                ADD CONSTRAINT uq_usage_summary_period_context
+                UNIQUE (
+                    period_type, period_start, client_account_id, engagement_id,
+                    user_id, llm_provider, model_name, page_context,
+                    feature_context
+                );
+
+            ALTER TABLE migration.llm_usage_summary
+                DROP COLUMN IF EXISTS last_request_at,
+                DROP COLUMN IF EXISTS first_request_at,
+                DROP COLUMN IF EXISTS timed_requests,
+                DROP COLUMN IF EXISTS total_response_time_ms;
+        """
+    )
@@ -0,0 +1,55 @@
+"""Add indexes for agent task history analytics
+
+Revision ID: 163_add_agent_task_history_analytics_indexes
+Revises: 162_add_llm_usage_rollups
+Create Date: 2025-01-29
+
+Agent performance and analytics queries aggregate one agent's tasks within a
+tenant over a time window, and task history pages list them newest first.
+The existing single-column indexes force a scan of every task for the agent
+or tenant; these composite indexes turn each query into one index range:
+- (client_account_id, engagement_id, agent_name, started_at DESC) for
+  per-agent aggregates and history pages
+- (client_account_id, engagement_id, started_at DESC) for the all-agents
+  activity feed
+- (client_account_id, engagement_id, discovered_by_agent, created_at) for
+  per-agent pattern discovery stats
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "163_add_agent_task_history_analytics_indexes"
+down_revision = "162_add_llm_usage_rollups"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create tenant/agent/time composite indexes"""
+    op.execute(
+        """
+            CREATE INDEX IF NOT EXISTS idx_agent_task_history_agent_started
+                ON migration.agent_task_history
+                (client_account_id, engagement_id, agent_name, started_at DESC);
+
+            CREATE INDEX IF NOT EXISTS idx_agent_task_history_engagement_started
+                ON migration.agent_task_history
+                (client_account_id, engagement_id, started_at DESC);
+
+            CREATE INDEX IF NOT EXISTS idx_agent_discovered_patterns_agent_created
+                ON migration.agent_discovered_patterns
+                (client_account_id, engagement_id, discovered_by_agent, created_at);
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drop the analytics indexes"""
+    op.execute(
+        """
+            DROP INDEX IF EXISTS migration.idx_agent_discovered_patterns_agent_created;
+            DROP INDEX IF EXISTS migration.idx_agent_task_history_engagement_started;
+            DROP INDEX IF EXISTS migration.idx_agent_task_history_agent_started;
+        """
+    )
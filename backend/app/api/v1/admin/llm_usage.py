@@ -423,4 +423,6 @@ async def health_check():
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat(),
         "pricing_cache_size": len(llm_tracker.pricing_cache),
+        "log_writer": llm_tracker.writer.get_stats(),
+        "rollups": llm_tracker.rollups.get_stats(),
     }
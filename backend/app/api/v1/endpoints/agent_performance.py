@@ -41,14 +41,10 @@ async def get_agent_performance(
     - Performance trends over time
     """
     try:
-        # Get sync session for service compatibility
-        from app.core.database import get_db as get_sync_db
-
-        sync_db = next(get_sync_db())
-        service = AgentTaskHistoryService(sync_db)
+        service = AgentTaskHistoryService(db)
 
         # Get comprehensive performance summary
-        performance_summary = service.get_agent_performance_summary(
+        performance_summary = await service.get_agent_performance_summary(
             agent_name=agent_name,
             client_account_id=context.client_account_id,
             engagement_id=context.engagement_id,
@@ -87,9 +83,6 @@ async def get_agent_performance(
             },
         )
 
-        # Close sync db session
-        sync_db.close()
-
         return {
             "success": True,
             "timestamp": datetime.utcnow().isoformat(),
@@ -136,14 +129,10 @@ async def get_agent_task_history(
     - Error messages for failed tasks
     """
     try:
-        # Get sync session for service compatibility
-        from app.core.database import get_db as get_sync_db
-
-        sync_db = next(get_sync_db())
-        service = AgentTaskHistoryService(sync_db)
+        service = AgentTaskHistoryService(db)
 
         # Get paginated task history
-        task_history = service.get_agent_task_history(
+        task_history = await service.get_agent_task_history(
             agent_name=agent_name,
             client_account_id=context.client_account_id,
             engagement_id=context.engagement_id,
@@ -169,9 +158,6 @@ async def get_agent_task_history(
             },
         )
 
-        # Close sync db session
-        sync_db.close()
-
         return {
             "success": True,
             "timestamp": datetime.utcnow().isoformat(),
@@ -208,14 +194,10 @@ async def get_agent_analytics(
     - Task complexity analysis
     """
     try:
-        # Get sync session for service compatibility
-        from app.core.database import get_db as get_sync_db
-
-        sync_db = next(get_sync_db())
-        service = AgentTaskHistoryService(sync_db)
+        service = AgentTaskHistoryService(db)
 
         # Get comprehensive analytics
-        analytics = service.get_agent_analytics(
+        analytics = await service.get_agent_analytics(
             agent_name=agent_name,
             client_account_id=context.client_account_id,
             engagement_id=context.engagement_id,
@@ -229,7 +211,7 @@ async def get_agent_analytics(
 
         # Get aggregated performance trends
         performance_trends = (
-            agent_performance_aggregation_service.get_agent_performance_trends(
+            await agent_performance_aggregation_service.get_agent_performance_trends(
                 agent_name=agent_name,
                 client_account_id=context.client_account_id,
                 engagement_id=context.engagement_id,
@@ -245,9 +227,6 @@ async def get_agent_analytics(
             extra={"agent_name": agent_name, "period_days": period_days},
         )
 
-        # Close sync db session
-        sync_db.close()
-
         return {
             "success": True,
             "timestamp": datetime.utcnow().isoformat(),
@@ -316,14 +295,10 @@ async def get_agents_activity_feed(
 
         # Add completed tasks if requested
         if include_completed:
-            # Get sync session for service compatibility
-            from app.core.database import get_db as get_sync_db
-
-            sync_db = next(get_sync_db())
-            service = AgentTaskHistoryService(sync_db)
+            service = AgentTaskHistoryService(db)
 
             # Get recent completed tasks
-            recent_tasks = service.get_agent_task_history(
+            recent_tasks = await service.get_agent_task_history(
                 agent_name=agent_filter or "",  # Empty string gets all agents
                 client_account_id=context.client_account_id,
                 engagement_id=context.engagement_id,
@@ -361,10 +336,6 @@ async def get_agents_activity_feed(
         # Limit results
         activities = activities[:limit]
 
-        # Close sync db session if it was opened
-        if include_completed and "sync_db" in locals():
-            sync_db.close()
-
         logger.info(
             "Retrieved activity feed",
             extra={
@@ -419,24 +390,18 @@ async def get_discovered_patterns(
     - Agent attribution
     """
     try:
-        # Get sync session for service compatibility
-        from app.core.database import get_db as get_sync_db
-
-        sync_db = next(get_sync_db())
-        service = AgentTaskHistoryService(sync_db)
+        service = AgentTaskHistoryService(db)
 
         # Get discovered patterns
-        patterns = service.get_discovered_patterns(
+        patterns = await service.get_discovered_patterns(
             agent_name=agent_name,
             client_account_id=context.client_account_id,
             engagement_id=context.engagement_id,
             pattern_type=pattern_type,
             min_confidence=min_confidence,
+            limit=limit,
         )
 
-        # Limit results
-        patterns = patterns[:limit]
-
         logger.info(
             "Retrieved discovered patterns",
             extra={
@@ -447,9 +412,6 @@ async def get_discovered_patterns(
             },
         )
 
-        # Close sync db session
-        sync_db.close()
-
         return {
             "success": True,
             "timestamp": datetime.utcnow().isoformat(),
@@ -488,7 +450,7 @@ async def get_all_agents_summary(
     """
     try:
         # Get summary for all agents
-        summaries = agent_performance_aggregation_service.get_all_agents_summary(
+        summaries = await agent_performance_aggregation_service.get_all_agents_summary(
             client_account_id=context.client_account_id,
             engagement_id=context.engagement_id,
             days=days,
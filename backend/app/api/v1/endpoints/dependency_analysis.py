@@ -16,6 +16,7 @@ from app.core.context import RequestContext, get_current_context
 from app.core.database import get_db
 from app.core.security.secure_logging import safe_log_format
 from app.models.discovery_flow import DiscoveryFlow
+from app.services.dependency_graph_store import DependencyGraphStore
 from app.services.master_flow_orchestrator import MasterFlowOrchestrator
 
 logger = logging.getLogger(__name__)
@@ -79,6 +80,27 @@ async def get_dependency_analysis(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/graph")
+async def get_dependency_graph(
+    since_version: Optional[int] = Query(
+        None, description="Return only the changes after this graph version"
+    ),
+    db: AsyncSession = Depends(get_db),
+    context: RequestContext = Depends(get_current_context),
+):
+    """Get the engagement's application dependency graph, or changes since a version."""
+    try:
+        store = DependencyGraphStore(
+            db, context.client_account_id, context.engagement_id
+        )
+        graph = await store.get_graph(since_version)
+        return {"success": True, "data": {"dependency_graph": graph}}
+
+    except Exception as e:
+        logger.error(safe_log_format("Failed to get dependency graph: {e}", e=e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/")
 async def create_dependencies(
     request: DependencyAnalysisRequest,
@@ -297,22 +297,22 @@ async def get_task_history(
         # Add performance data if requested and context available
         if include_performance_data and context:
             try:
-                from app.core.database import get_db
+                from app.core.database import AsyncSessionLocal
                 from app.services.agent_task_history_service import (
                     AgentTaskHistoryService,
                 )
 
-                db = next(get_db())
-                service = AgentTaskHistoryService(db)
-
                 # Get task history from database for more detailed metrics
                 if agent_id:
-                    db_history = service.get_agent_task_history(
-                        agent_name=agent_id,
-                        client_account_id=context.client_account_id,
-                        engagement_id=context.engagement_id,
-                        limit=limit,
-                    )
+                    async with AsyncSessionLocal() as db:
+                        db_history = await AgentTaskHistoryService(
+                            db
+                        ).get_agent_task_history(
+                            agent_name=agent_id,
+                            client_account_id=context.client_account_id,
+                            engagement_id=context.engagement_id,
+                            limit=limit,
+                        )
 
                     if "tasks" in db_history:
                         response["detailed_tasks"] = db_history["tasks"]
@@ -320,8 +320,6 @@ async def get_task_history(
                             "total_in_database": db_history.get("total_tasks", 0),
                             "data_source": "agent_task_history",
                         }
-
-                db.close()
             except Exception as perf_error:
                 logger.warning(
                     f"Could not fetch detailed performance data: {perf_error}"
@@ -6,16 +6,22 @@ import logging
 import json
 import re
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.context import RequestContext, get_current_context
 from app.core.database import get_db
+from app.services.stock_analysis_snapshot import (
+    StockAnalysisSnapshot,
+    build_stock_analysis_snapshot,
+)
 from app.services.stock_service import StockService
+from app.services.stock_data_api import StockDataAPIService
 from app.services.stock_analysis_agent import StockAnalysisAgent
 from app.services.stock_financials_agent import StockFinancialsAgent
 from app.services.stock_statistics_agent import StockStatisticsAgent
@@ -343,17 +349,18 @@ async def get_watchlist(
         result = await db.execute(stmt)
         watchlist_items = result.scalars().all()
 
-        # Get stock data for each watchlist item
+        # Get stock data for all watchlist items in one batch
         stock_service = StockService(db, context)
-        watchlist_with_data = []
-        for item in watchlist_items:
-            stock_data = await stock_service.get_stock_by_symbol(item.stock_symbol)
-            watchlist_with_data.append(
-                {
-                    **item.to_dict(),
-                    "stock_data": stock_data,
-                }
-            )
+        batch = await stock_service.get_stocks_by_symbols(
+            [item.stock_symbol for item in watchlist_items]
+        )
+        watchlist_with_data = [
+            {
+                **item.to_dict(),
+                "stock_data": batch["stocks"].get(item.stock_symbol.upper()),
+            }
+            for item in watchlist_items
+        ]
 
         return {"success": True, "watchlist": watchlist_with_data}
 
@@ -495,13 +502,14 @@ async def compare_stocks(
                 status_code=400, detail="Maximum 10 stocks allowed for comparison"
             )
 
+        # Resolve all symbols in one batch instead of one upstream call each
         stock_service = StockService(db, context)
-        comparison_data = []
-
-        for symbol in symbol_list:
-            stock_data = await stock_service.get_stock_by_symbol(symbol)
-            if stock_data:
-                comparison_data.append(stock_data)
+        batch = await stock_service.get_stocks_by_symbols(symbol_list)
+        comparison_data = [
+            batch["stocks"][symbol]
+            for symbol in symbol_list
+            if symbol in batch["stocks"]
+        ]
 
         if not comparison_data:
             raise HTTPException(
@@ -513,6 +521,7 @@ async def compare_stocks(
             "symbols": symbol_list,
             "stocks": comparison_data,
             "count": len(comparison_data),
+            "errors": batch["errors"],
         }
 
     except HTTPException:
@@ -524,6 +533,17 @@ async def compare_stocks(
         )
 
 
+# Market data metrics endpoint (must come before /{symbol} route)
+@router.get("/market-data/stats", response_model=dict)
+async def get_market_data_stats(
+    context: RequestContext = Depends(get_current_context),
+):
+    """
+    Get market data cache and request-coalescing metrics for this worker.
+    """
+    return {"success": True, **StockDataAPIService().get_market_data_stats()}
+
+
 # Parameterized routes (must come AFTER specific routes)
 @router.get("/{symbol}", response_model=StockDetailResponse)
 async def get_stock(
@@ -565,6 +585,11 @@ async def get_historical_prices(
         "1d",
         description="Interval: 1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo",
     ),
+    format: str = Query(
+        "records",
+        pattern="^(records|columns)$",
+        description="Response layout: 'records' (one object per bar) or 'columns' (arrays per field)",
+    ),
     db: AsyncSession = Depends(get_db),
     context: RequestContext = Depends(get_current_context),
 ):
@@ -573,20 +598,25 @@ async def get_historical_prices(
     """
     try:
         stock_service = StockService(db, context)
-        prices = await stock_service.get_historical_prices(symbol, period, interval)
+        series = await stock_service.get_price_series(symbol, period, interval)
 
-        if not prices:
+        if series is None or series.is_empty:
             raise HTTPException(
                 status_code=404, detail=f"No historical data found for {symbol}"
             )
 
-        return {
+        response = {
             "success": True,
             "symbol": symbol,
             "period": period,
             "interval": interval,
-            "prices": prices,
+            "format": format,
         }
+        if format == "columns":
+            response["columns"] = series.to_columns()
+        else:
+            response["prices"] = series.to_records()
+        return response
 
     except HTTPException:
         raise
@@ -914,22 +944,21 @@ async def analyze_stock_news(
 
 # Helper functions for analyze_stock_all_agents
 async def _run_agent(
-    agent_class,
-    agent_name: str,
+    agent_type: str,
     symbol: str,
-    model: Optional[str],
-    db: AsyncSession,
-    context: RequestContext,
+    run: Callable[[], Awaitable[Dict[str, Any]]],
 ) -> tuple:
-    """Run a single agent and return its result."""
+    """Run a single agent and return (agent_type, analysis dict or None)."""
+    agent_name = agent_type.capitalize()
     try:
         logger.info(f"🚀 [ANALYZE ALL] Starting {agent_name} Agent for {symbol}")
-        agent = agent_class(db, context)
-        result = await agent.analyze(symbol, model=model)
+        result = await run()
         logger.info(f"🚀 [ANALYZE ALL] ✅ {agent_name} Agent completed for {symbol}")
 
-        if "analysis" in result and result["analysis"] is not None:
+        if isinstance(result, dict) and result.get("analysis") is not None:
             analysis = result["analysis"]
+            if not isinstance(analysis, dict) and hasattr(analysis, "to_dict"):
+                analysis = analysis.to_dict()
             analysis_keys = (
                 list(analysis.keys()) if isinstance(analysis, dict) else "N/A"
             )
@@ -937,7 +966,7 @@ async def _run_agent(
                 f"🚀 [ANALYZE ALL] {agent_name} Agent returned analysis "
                 f"with keys: {analysis_keys}"
             )
-            return (agent_name.lower(), analysis)
+            return (agent_type, analysis)
         else:
             logger.error(
                 f"🚀 [ANALYZE ALL] {agent_name} Agent result missing 'analysis' key or is None"
@@ -946,12 +975,60 @@ async def _run_agent(
             logger.error(
                 f"🚀 [ANALYZE ALL] {agent_name} Agent result keys: {result_keys}"
             )
-            return (agent_name.lower(), None)
+            return (agent_type, None)
     except Exception as e:
         logger.error(
             f"🚀 [ANALYZE ALL] ❌ {agent_name} Agent failed: {e}", exc_info=True
         )
-        return (agent_name.lower(), None)
+        return (agent_type, None)
+
+
+def _create_agent_tasks(
+    snapshot: StockAnalysisSnapshot,
+    model: Optional[str],
+    db: AsyncSession,
+    context: RequestContext,
+) -> List[asyncio.Task]:
+    """Start all four agents on a shared snapshot."""
+    symbol = snapshot.symbol
+
+    async def run_news() -> Dict[str, Any]:
+        # Fetch news from past 6 months from Indian news sources
+        news_data = await StockDataAPIService().get_stock_news(
+            symbol,
+            50,
+            company_name=snapshot.stock_data.get("company_name"),
+            months_back=6,
+        )
+        logger.info(
+            f"🚀 [ANALYZE ALL] Retrieved {len(news_data) if news_data else 0} "
+            f"news articles from Indian news sources"
+        )
+        return await StockNewsAgent(db, context).analyze_news(
+            symbol, news_data or [], model=model, snapshot=snapshot
+        )
+
+    runners = {
+        "financials": lambda: StockFinancialsAgent(db, context).analyze_financials(
+            symbol, model=model, snapshot=snapshot
+        ),
+        "statistics": lambda: StockStatisticsAgent(db, context).analyze_statistics(
+            symbol, model=model, snapshot=snapshot
+        ),
+        "history": lambda: StockHistoryAgent(db, context).analyze_history(
+            symbol, model=model, snapshot=snapshot
+        ),
+        "news": run_news,
+    }
+    return [
+        asyncio.ensure_future(_run_agent(agent_type, symbol, run))
+        for agent_type, run in runners.items()
+    ]
+
+
+def _sse_event(event: str, data: Any) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
 
 
 def _process_agent_result(result: tuple, results: dict) -> None:
@@ -1186,7 +1263,7 @@ def _build_comprehensive_analysis(results: dict) -> Optional[dict]:
 
 
 @router.post("/analyze/all", response_model=dict)
-async def analyze_stock_all_agents(  # noqa: C901
+async def analyze_stock_all_agents(
     request: StockAnalysisRequest,
     db: AsyncSession = Depends(get_db),
     context: RequestContext = Depends(get_current_context),
@@ -1210,183 +1287,18 @@ async def analyze_stock_all_agents(  # noqa: C901
     }
 
     try:
-        stock_service = StockService(db, context)
-        stock_data = await stock_service.get_stock_by_symbol(request.symbol)
-        if not stock_data:
+        snapshot = await build_stock_analysis_snapshot(db, context, request.symbol)
+        if snapshot is None:
             raise HTTPException(
                 status_code=404, detail=f"Stock {request.symbol} not found"
             )
+        results["stock"] = snapshot.stock.to_dict()
 
-        stock = await stock_service.save_stock(stock_data)
-        results["stock"] = stock.to_dict()
-
-        async def run_financials():
-            try:
-                logger.info(
-                    f"🚀 [ANALYZE ALL] Starting Financials Agent for {request.symbol}"
-                )
-                agent = StockFinancialsAgent(db, context)
-                result = await agent.analyze_financials(
-                    request.symbol, model=request.model
-                )
-                logger.info(
-                    f"🚀 [ANALYZE ALL] ✅ Financials Agent completed for {request.symbol}"
-                )
-                if "analysis" in result and result["analysis"] is not None:
-                    analysis = result["analysis"]
-                    analysis_keys = (
-                        list(analysis.keys()) if isinstance(analysis, dict) else "N/A"
-                    )
-                    logger.info(
-                        f"🚀 [ANALYZE ALL] Financials Agent returned analysis "
-                        f"with keys: {analysis_keys}"
-                    )
-                    return ("financials", analysis)
-                else:
-                    logger.error(
-                        "🚀 [ANALYZE ALL] Financials Agent result missing 'analysis' key or is None"
-                    )
-                    result_keys = (
-                        list(result.keys()) if isinstance(result, dict) else "N/A"
-                    )
-                    logger.error(
-                        f"🚀 [ANALYZE ALL] Financials Agent result keys: {result_keys}"
-                    )
-                    return ("financials", None)
-            except Exception as e:
-                logger.error(
-                    f"🚀 [ANALYZE ALL] ❌ Financials Agent failed: {e}", exc_info=True
-                )
-                return ("financials", None)
-
-        async def run_statistics():
-            try:
-                logger.info(
-                    f"🚀 [ANALYZE ALL] Starting Statistics Agent for {request.symbol}"
-                )
-                agent = StockStatisticsAgent(db, context)
-                result = await agent.analyze_statistics(
-                    request.symbol, model=request.model
-                )
-                logger.info(
-                    f"🚀 [ANALYZE ALL] ✅ Statistics Agent completed for {request.symbol}"
-                )
-                if "analysis" in result and result["analysis"] is not None:
-                    analysis = result["analysis"]
-                    analysis_keys = (
-                        list(analysis.keys()) if isinstance(analysis, dict) else "N/A"
-                    )
-                    logger.info(
-                        f"🚀 [ANALYZE ALL] Statistics Agent returned analysis "
-                        f"with keys: {analysis_keys}"
-                    )
-                    return ("statistics", analysis)
-                else:
-                    logger.error(
-                        "🚀 [ANALYZE ALL] Statistics Agent result missing 'analysis' key or is None"
-                    )
-                    result_keys = (
-                        list(result.keys()) if isinstance(result, dict) else "N/A"
-                    )
-                    logger.error(
-                        f"🚀 [ANALYZE ALL] Statistics Agent result keys: {result_keys}"
-                    )
-                    return ("statistics", None)
-            except Exception as e:
-                logger.error(
-                    f"🚀 [ANALYZE ALL] ❌ Statistics Agent failed: {e}", exc_info=True
-                )
-                return ("statistics", None)
-
-        async def run_history():
-            try:
-                logger.info(
-                    f"🚀 [ANALYZE ALL] Starting History Agent for {request.symbol}"
-                )
-                agent = StockHistoryAgent(db, context)
-                result = await agent.analyze_history(
-                    request.symbol, model=request.model
-                )
-                logger.info(
-                    f"🚀 [ANALYZE ALL] ✅ History Agent completed for {request.symbol}"
-                )
-                if "analysis" in result and result["analysis"] is not None:
-                    analysis = result["analysis"]
-                    analysis_keys = (
-                        list(analysis.keys()) if isinstance(analysis, dict) else "N/A"
-                    )
-                    logger.info(
-                        f"🚀 [ANALYZE ALL] History Agent returned analysis "
-                        f"with keys: {analysis_keys}"
-                    )
-                    return ("history", analysis)
-                else:
-                    logger.error(
-                        "🚀 [ANALYZE ALL] History Agent result missing 'analysis' key or is None"
-                    )
-                    result_keys = (
-                        list(result.keys()) if isinstance(result, dict) else "N/A"
-                    )
-                    logger.error(
-                        f"🚀 [ANALYZE ALL] History Agent result keys: {result_keys}"
-                    )
-                    return ("history", None)
-            except Exception as e:
-                logger.error(
-                    f"🚀 [ANALYZE ALL] ❌ History Agent failed: {e}", exc_info=True
-                )
-                return ("history", None)
-
-        async def run_news():
-            try:
-                logger.info(
-                    f"🚀 [ANALYZE ALL] Starting News Agent for {request.symbol}"
-                )
-                # Fetch news from past 6 months from Indian news sources
-                news_data = await stock_service.get_stock_news(
-                    request.symbol, limit=50, months_back=6
-                )
-                logger.info(
-                    f"🚀 [ANALYZE ALL] Retrieved "
-                    f"{len(news_data) if news_data else 0} news articles "
-                    f"from Indian news sources"
-                )
-                agent = StockNewsAgent(db, context)
-                result = await agent.analyze_news(
-                    request.symbol, news_data or [], model=request.model
-                )
-                logger.info(
-                    f"🚀 [ANALYZE ALL] ✅ News Agent completed for {request.symbol}"
-                )
-                if "analysis" in result:
-                    analysis_data = result["analysis"]
-                    if isinstance(analysis_data, dict):
-                        return ("news", analysis_data)
-                    else:
-                        return (
-                            "news",
-                            (
-                                analysis_data.to_dict()
-                                if hasattr(analysis_data, "to_dict")
-                                else analysis_data
-                            ),
-                        )
-                else:
-                    logger.error(
-                        "🚀 [ANALYZE ALL] News Agent result missing 'analysis' key"
-                    )
-                    return ("news", None)
-            except Exception as e:
-                logger.error(
-                    f"🚀 [ANALYZE ALL] ❌ News Agent failed: {e}", exc_info=True
-                )
-                return ("news", None)
-
-        # Run all agents concurrently
+        # Run all agents concurrently on the shared snapshot
         logger.info(
             f"🚀 [ANALYZE ALL] Running all agents concurrently for {request.symbol}"
         )
-        tasks = [run_financials(), run_statistics(), run_history(), run_news()]
+        tasks = _create_agent_tasks(snapshot, request.model, db, context)
         agent_results = await asyncio.gather(*tasks, return_exceptions=True)
 
         # Process results
@@ -1436,3 +1348,92 @@ async def analyze_stock_all_agents(  # noqa: C901
         results["success"] = False
         results["errors"].append(str(e))
         return results
+
+
+@router.post("/analyze/all/stream")
+async def analyze_stock_all_agents_stream(
+    request: StockAnalysisRequest,
+    db: AsyncSession = Depends(get_db),
+    context: RequestContext = Depends(get_current_context),
+):
+    """
+    Run all specialized agents concurrently and stream results as server-sent events.
+
+    Events, in order:
+    - ``stock``: the saved stock snapshot shared by all agents
+    - ``agent``: one per agent as it finishes, ``{"agent", "analysis", "error"}``
+    - ``complete``: the merged comprehensive analysis and any errors
+    - ``error``: sent instead of the above if the stock cannot be loaded
+    """
+    logger.info(
+        f"🚀 [ANALYZE ALL] Starting streamed analysis for {request.symbol} "
+        f"with model: {request.model or 'auto'}"
+    )
+
+    async def event_stream():
+        results = {
+            "financials": None,
+            "statistics": None,
+            "history": None,
+            "news": None,
+            "errors": [],
+        }
+        tasks: List[asyncio.Task] = []
+        try:
+            snapshot = await build_stock_analysis_snapshot(db, context, request.symbol)
+            if snapshot is None:
+                yield _sse_event(
+                    "error", {"detail": f"Stock {request.symbol} not found"}
+                )
+                return
+            await db.commit()
+            yield _sse_event("stock", snapshot.stock.to_dict())
+
+            tasks = _create_agent_tasks(snapshot, request.model, db, context)
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                # Persist each analysis as it is streamed, not only at the end
+                async with snapshot.db_lock:
+                    await db.commit()
+                errors_before = len(results["errors"])
+                _process_agent_result(result, results)
+                agent_type = result[0]
+                yield _sse_event(
+                    "agent",
+                    {
+                        "agent": agent_type,
+                        "analysis": results.get(agent_type),
+                        "error": (
+                            results["errors"][-1]
+                            if len(results["errors"]) > errors_before
+                            else None
+                        ),
+                    },
+                )
+
+            yield _sse_event(
+                "complete",
+                {
+                    "success": True,
+                    "symbol": request.symbol,
+                    "analysis": _build_comprehensive_analysis(results),
+                    "errors": results["errors"],
+                },
+            )
+        except Exception as e:
+            logger.error(
+                f"🚀 [ANALYZE ALL] ❌ Error in streamed analyze_all for {request.symbol}: {e}",
+                exc_info=True,
+            )
+            yield _sse_event("error", {"detail": str(e)})
+        finally:
+            # Client disconnected or stream failed: stop remaining agents
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -205,6 +205,54 @@ def get_lifespan():  # noqa: C901
         except Exception as e:  # pragma: no cover
             logging.getLogger(__name__).warning("LiteLLM tracking setup warning: %s", e)
 
+        # Batch LLM usage logs into bulk inserts from one background task
+        try:
+            from app.services.llm_usage_tracker import llm_tracker
+
+            await llm_tracker.writer.start()
+        except Exception as e:  # pragma: no cover
+            logging.getLogger(__name__).warning(
+                "LLM usage log writer startup warning: %s", e
+            )
+
+        # Roll closed hours of LLM usage logs into report summaries
+        try:
+            from app.services.llm_usage_tracker import llm_tracker
+
+            await llm_tracker.rollups.start()
+        except Exception as e:  # pragma: no cover
+            logging.getLogger(__name__).warning(
+                "LLM usage rollup job startup warning: %s", e
+            )
+
+        # Build the stock symbol search index before the first typeahead request
+        try:
+            from app.services.market_data import get_symbol_index
+
+            get_symbol_index()
+        except Exception as e:  # pragma: no cover
+            logging.getLogger(__name__).warning("Symbol index warm-up warning: %s", e)
+
+        # Keep materialized dependency graphs current on asset/dependency writes
+        try:
+            from app.services.dependency_graph_changes import (
+                register_dependency_graph_listeners,
+            )
+
+            register_dependency_graph_listeners()
+        except Exception as e:  # pragma: no cover
+            logging.getLogger(__name__).warning(
+                "Dependency graph listener setup warning: %s", e
+            )
+
+        # Subscribe the Redis near cache to invalidations (no-op when disabled)
+        try:
+            from app.services.caching.redis_cache import redis_cache
+
+            await redis_cache.start_near_cache()
+        except Exception as e:  # pragma: no cover
+            logging.getLogger(__name__).warning("Near cache startup warning: %s", e)
+
         # Start flow health monitor
         try:
             logging.getLogger(__name__).info("🔄 Starting flow health monitor...")
@@ -247,6 +295,42 @@ def get_lifespan():  # noqa: C901
                 "Error stopping flow health monitor: %s", e
             )
 
+        # Stop rolling up LLM usage logs
+        try:
+            from app.services.llm_usage_tracker import llm_tracker
+
+            await llm_tracker.rollups.stop()
+        except Exception as e:  # pragma: no cover
+            logging.getLogger(__name__).warning(
+                "Error stopping LLM usage rollup job: %s", e
+            )
+
+        # Write LLM usage logs still queued
+        try:
+            from app.services.llm_usage_tracker import llm_tracker
+
+            await llm_tracker.writer.stop()
+        except Exception as e:  # pragma: no cover
+            logging.getLogger(__name__).warning("Error flushing LLM usage logs: %s", e)
+
+        # Release the cache's Redis connection pool
+        try:
+            from app.services.caching.redis_cache import redis_cache
+
+            await redis_cache.close()
+        except Exception as e:  # pragma: no cover
+            logging.getLogger(__name__).warning("Error closing Redis cache: %s", e)
+
+        # Release the embedding API connection pool
+        try:
+            from app.services.embeddings import close_http_client
+
+            await close_http_client()
+        except Exception as e:  # pragma: no cover
+            logging.getLogger(__name__).warning(
+                "Error closing embedding HTTP client: %s", e
+            )
+
         logging.getLogger(__name__).info("✅ Shutdown logic completed.")
 
     return lifespan
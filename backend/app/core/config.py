@@ -174,6 +174,30 @@ class Settings(BaseSettings):
         env="REDIS_URL",
     )
     REDIS_DEFAULT_TTL: int = Field(default=3600, env="REDIS_DEFAULT_TTL")  # 1 hour
+    # Value codec: json, orjson or msgpack. This release reads entries from any
+    # codec, but earlier releases only read plain JSON: keep json (and no
+    # compression) until every worker runs this release, then opt in
+    REDIS_CACHE_CODEC: str = Field(default="json", env="REDIS_CACHE_CODEC")
+    # zstd or none; only bodies at or above the threshold (bytes) are compressed
+    REDIS_CACHE_COMPRESSION: str = Field(default="none", env="REDIS_CACHE_COMPRESSION")
+    REDIS_CACHE_COMPRESS_THRESHOLD: int = Field(
+        default=4096, env="REDIS_CACHE_COMPRESS_THRESHOLD"
+    )
+    # Also SCAN for prefix patterns the tag index resolves; enable only until
+    # keys written before their writers were tagged have expired
+    REDIS_CACHE_TAG_SCAN_FALLBACK: bool = Field(
+        default=False, env="REDIS_CACHE_TAG_SCAN_FALLBACK"
+    )
+    # Process-local near cache in front of Redis, kept coherent over pub/sub
+    REDIS_NEAR_CACHE_ENABLED: bool = Field(
+        default=False, env="REDIS_NEAR_CACHE_ENABLED"
+    )
+    REDIS_NEAR_CACHE_MAX_ENTRIES: int = Field(
+        default=10000, env="REDIS_NEAR_CACHE_MAX_ENTRIES"
+    )
+    REDIS_NEAR_CACHE_MAX_BYTES: int = Field(
+        default=64 * 1024 * 1024, env="REDIS_NEAR_CACHE_MAX_BYTES"
+    )
 
     # Upstash Redis (for production) - unified configuration
 
@@ -201,6 +225,22 @@ class Settings(BaseSettings):
     )
     CHAT_LLM_MODEL: str = Field(default="google/gemma-3-4b-it", env="CHAT_LLM_MODEL")
 
+    # LLM usage logs are queued and bulk-inserted by a background writer
+    LLM_USAGE_LOG_BATCH_SIZE: int = Field(default=200, env="LLM_USAGE_LOG_BATCH_SIZE")
+    LLM_USAGE_LOG_FLUSH_INTERVAL_SECONDS: float = Field(
+        default=1.0, env="LLM_USAGE_LOG_FLUSH_INTERVAL_SECONDS"
+    )
+    # Rows beyond this many waiting to be written are dropped and counted
+    LLM_USAGE_LOG_MAX_QUEUE: int = Field(default=10000, env="LLM_USAGE_LOG_MAX_QUEUE")
+    # Closed hours of usage logs are rolled up into hourly and daily summaries
+    LLM_USAGE_ROLLUP_INTERVAL_SECONDS: int = Field(
+        default=300, env="LLM_USAGE_ROLLUP_INTERVAL_SECONDS"
+    )
+    # How long after an hour ends before it is rolled up; covers queued writes
+    LLM_USAGE_ROLLUP_GRACE_SECONDS: int = Field(
+        default=300, env="LLM_USAGE_ROLLUP_GRACE_SECONDS"
+    )
+
     # Migration specific settings
     MAX_ASSETS_PER_SCAN: int = Field(default=1000, env="MAX_ASSETS_PER_SCAN")
     DEFAULT_MIGRATION_TIMELINE_DAYS: int = Field(
@@ -354,6 +394,72 @@ class Settings(BaseSettings):
         ),
     )
 
+    # Market Data Cache Configuration (stock quotes and price history)
+    MARKET_DATA_CACHE_MAX_ENTRIES: int = Field(
+        default=2048,
+        ge=16,
+        env="MARKET_DATA_CACHE_MAX_ENTRIES",
+        description="Maximum entries held in the in-process market data LRU",
+    )
+    MARKET_DATA_QUOTE_TTL: int = Field(
+        default=30,
+        ge=1,
+        env="MARKET_DATA_QUOTE_TTL",
+        description="Seconds a cached quote is considered fresh",
+    )
+    MARKET_DATA_QUOTE_STALE_TTL: int = Field(
+        default=300,
+        ge=0,
+        env="MARKET_DATA_QUOTE_STALE_TTL",
+        description="Extra seconds a stale quote may be served while it is refreshed",
+    )
+    MARKET_DATA_PROFILE_TTL: int = Field(
+        default=21600,
+        ge=1,
+        env="MARKET_DATA_PROFILE_TTL",
+        description="Seconds a cached company profile (yfinance info) is reused by batch quotes",
+    )
+    MARKET_DATA_INTRADAY_TTL: int = Field(
+        default=60,
+        ge=1,
+        env="MARKET_DATA_INTRADAY_TTL",
+        description="Seconds intraday (minute/hour) price history is considered fresh",
+    )
+    MARKET_DATA_HISTORY_TTL: int = Field(
+        default=900,
+        ge=1,
+        env="MARKET_DATA_HISTORY_TTL",
+        description="Seconds daily-or-longer price history is considered fresh",
+    )
+    MARKET_DATA_HISTORY_STALE_TTL: int = Field(
+        default=86400,
+        ge=0,
+        env="MARKET_DATA_HISTORY_STALE_TTL",
+        description="Extra seconds stale price history may be served while it is refreshed",
+    )
+    MARKET_DATA_BATCH_CONCURRENCY: int = Field(
+        default=8,
+        ge=1,
+        env="MARKET_DATA_BATCH_CONCURRENCY",
+        description="Maximum concurrent per-symbol upstream calls in a batch quote request",
+    )
+    MARKET_DATA_OHLCV_STORE_ENABLED: bool = Field(
+        default=True,
+        env="MARKET_DATA_OHLCV_STORE_ENABLED",
+        description="Serve daily/weekly/monthly history from the local Postgres OHLCV store",
+    )
+    MARKET_DATA_OHLCV_REFRESH_SECONDS: int = Field(
+        default=900,
+        ge=0,
+        env="MARKET_DATA_OHLCV_REFRESH_SECONDS",
+        description="Minimum seconds between upstream tail refreshes of a stored series",
+    )
+    MARKET_DATA_SYMBOL_UNIVERSE_PATH: str = Field(
+        default="",
+        env="MARKET_DATA_SYMBOL_UNIVERSE_PATH",
+        description="symbol,name,exchange CSV for typeahead search; defaults to the bundled universe",
+    )
+
     model_config = ConfigDict(
         env_file=".env" if os.getenv("RAILWAY_ENVIRONMENT") is None else None,
         env_file_encoding="utf-8",
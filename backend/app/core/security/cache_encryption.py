@@ -8,7 +8,7 @@ Ensures PII, tokens, and other sensitive information is never stored in plaintex
 import base64
 import hashlib
 import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
@@ -179,6 +179,7 @@ class SecureCache:
         value: Any,
         ttl: Optional[int] = None,
         force_encrypt: bool = False,
+        tags: Optional[List[str]] = None,
     ) -> bool:
         """Set cache value with automatic encryption for sensitive data"""
         try:
@@ -204,6 +205,8 @@ class SecureCache:
 
             # Use underlying cache client
             if hasattr(self.cache_client, "set"):
+                if tags is not None:
+                    return await self.cache_client.set(key, cache_data, ttl, tags=tags)
                 return await self.cache_client.set(key, cache_data, ttl)
             else:
                 # Fallback for sync clients
@@ -224,29 +227,33 @@ class SecureCache:
                 if cached_data:
                     cached_data = json.loads(cached_data)
 
-            if not cached_data:
-                return None
-
-            # Handle legacy unstructured cache data
-            if not isinstance(cached_data, dict) or "encrypted" not in cached_data:
-                return cached_data
-
-            # Handle structured cache data with encryption info
-            if cached_data.get("encrypted", False):
-                decrypted_value = self.encryption.decrypt_sensitive_data(
-                    cached_data["data"]
-                )
-                if decrypted_value is None:
-                    logger.warning(f"Failed to decrypt cache data for key {key}")
-                    return None
-                return decrypted_value
-            else:
-                return cached_data["data"]
+            return self.unwrap(key, cached_data)
 
         except Exception as e:
             logger.error(f"Failed to get cache for key {key}: {e}")
             return None
 
+    def unwrap(self, key: str, cached_data: Any) -> Optional[Any]:
+        """Extract the stored value from a fetched cache entry, decrypting if needed"""
+        if not cached_data:
+            return None
+
+        # Handle legacy unstructured cache data
+        if not isinstance(cached_data, dict) or "encrypted" not in cached_data:
+            return cached_data
+
+        # Handle structured cache data with encryption info
+        if cached_data.get("encrypted", False):
+            decrypted_value = self.encryption.decrypt_sensitive_data(
+                cached_data["data"]
+            )
+            if decrypted_value is None:
+                logger.warning(f"Failed to decrypt cache data for key {key}")
+                return None
+            return decrypted_value
+        else:
+            return cached_data["data"]
+
     def _contains_sensitive_data(self, data: Any) -> bool:
         """Check if data contains sensitive information"""
         if isinstance(data, dict):
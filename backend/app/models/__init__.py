@@ -78,7 +78,7 @@ from app.models.feedback import Feedback
 from app.models.flow_deletion_audit import FlowDeletionAudit
 
 # LLM Usage Models
-from app.models.llm_usage import LLMUsageLog, LLMUsageSummary
+from app.models.llm_usage import LLMUsageLog, LLMUsageRollupState, LLMUsageSummary
 
 # Migration Models
 from app.models.migration import Migration
@@ -106,8 +106,12 @@ from app.models.security_audit import RoleChangeApproval, SecurityAuditLog
 # Tags Models
 from app.models.tags import AssetTag, Tag
 
+# Dependency Graph Models
+from app.models.dependency_graph import DependencyGraphChange, DependencyGraphSnapshot
+
 # Stock Analysis Models
 from app.models.stock import Stock, StockAnalysis
+from app.models.stock_price_history import StockPriceBar, StockPriceCoverage
 from app.models.watchlist import Watchlist
 
 # User Flow Management Models
@@ -159,9 +163,13 @@ __all__ = [
     # Tags Models
     "Tag",
     "AssetTag",
+    # Dependency Graph Models
+    "DependencyGraphSnapshot",
+    "DependencyGraphChange",
     # LLM Usage Models
     "LLMUsageLog",
     "LLMUsageSummary",
+    "LLMUsageRollupState",
     # SixR Analysis Models REMOVED - Replaced by Assessment Flow (Phase 4, Issue #840)
     # "SixRAnalysis",
     # Canonical Applications Models
@@ -185,5 +193,7 @@ __all__ = [
     # Stock Analysis Models
     "Stock",
     "StockAnalysis",
+    "StockPriceBar",
+    "StockPriceCoverage",
     "Watchlist",
 ]
@@ -19,6 +19,7 @@ from sqlalchemy import (
     DateTime,
     Enum as SQLEnum,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -204,6 +205,13 @@ class AgentDiscoveredPatterns(Base):
             "engagement_id",
             name="uq_agent_discovered_patterns_pattern_client_engagement",
         ),
+        Index(
+            "idx_agent_discovered_patterns_agent_created",
+            "client_account_id",
+            "engagement_id",
+            "discovered_by_agent",
+            "created_at",
+        ),
         CheckConstraint(
             "confidence_score >= 0 AND confidence_score <= 1",
             name="chk_agent_discovered_patterns_confidence_score",
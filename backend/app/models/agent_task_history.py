@@ -14,6 +14,7 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -196,6 +197,20 @@ class AgentTaskHistory(Base):
             "agent_type IN ('individual', 'crew_member')",
             name="chk_agent_task_history_agent_type",
         ),
+        # Per-agent analytics and history pages within a tenant and time window
+        Index(
+            "idx_agent_task_history_agent_started",
+            "client_account_id",
+            "engagement_id",
+            "agent_name",
+            started_at.desc(),
+        ),
+        Index(
+            "idx_agent_task_history_engagement_started",
+            "client_account_id",
+            "engagement_id",
+            started_at.desc(),
+        ),
     )
 
     def __repr__(self):
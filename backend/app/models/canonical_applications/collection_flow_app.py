@@ -11,6 +11,7 @@ from .base import (
     String,
     Float,
     ForeignKey,
+    Index,
     UUID,
     JSONB,
     relationship,
@@ -28,7 +29,16 @@ class CollectionFlowApplication(Base, TimestampMixin):
     """
 
     __tablename__ = "collection_flow_applications"
-    __table_args__ = {"schema": "migration"}
+    __table_args__ = (
+        # One link per canonical application in a flow; target of bulk upserts
+        Index(
+            "uq_collection_flow_apps_flow_canonical",
+            "collection_flow_id",
+            "canonical_application_id",
+            unique=True,
+        ),
+        {"schema": "migration"},
+    )
 
     # Existing fields (preserved for backward compatibility)
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
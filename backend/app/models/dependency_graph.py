@@ -0,0 +1,71 @@
+"""
+Dependency Graph Models - Materialized per-engagement dependency graph
+"""
+
+from sqlalchemy import BigInteger, Column, DateTime
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PostgresUUID
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class DependencyGraphSnapshot(Base):
+    """
+    Current application dependency graph of one engagement, kept in a compact
+    form so graph views read a single row instead of re-joining dependencies.
+
+    nodes maps asset id -> name; edges maps dependency id ->
+    [source asset id, target asset id, dependency type, description].
+    NULL nodes/edges mean the graph must be rebuilt from asset_dependencies.
+    """
+
+    __tablename__ = "dependency_graph_snapshots"
+    __table_args__ = {"schema": "migration"}
+
+    client_account_id = Column(PostgresUUID(as_uuid=True), primary_key=True)
+    engagement_id = Column(PostgresUUID(as_uuid=True), primary_key=True)
+
+    # Bumped by every change; base_version is the version of the last rebuild
+    version = Column(BigInteger, nullable=False, default=0)
+    base_version = Column(BigInteger, nullable=False, default=0)
+
+    nodes = Column(JSONB, nullable=True)
+    edges = Column(JSONB, nullable=True)
+
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self):
+        return (
+            f"<DependencyGraphSnapshot(engagement_id={self.engagement_id}, "
+            f"version={self.version})>"
+        )
+
+
+class DependencyGraphChange(Base):
+    """
+    Delta applied to a snapshot at one version, so clients holding an older
+    version can catch up without reloading the whole graph.
+    """
+
+    __tablename__ = "dependency_graph_changes"
+    __table_args__ = {"schema": "migration"}
+
+    client_account_id = Column(PostgresUUID(as_uuid=True), primary_key=True)
+    engagement_id = Column(PostgresUUID(as_uuid=True), primary_key=True)
+    version = Column(BigInteger, primary_key=True)
+
+    # {"edges": {id: [...]}, "removed_edges": [...], "labels": {...},
+    #  "removed_nodes": [...]}
+    change = Column(JSONB, nullable=False)
+
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self):
+        return (
+            f"<DependencyGraphChange(engagement_id={self.engagement_id}, "
+            f"version={self.version})>"
+        )
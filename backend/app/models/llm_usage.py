@@ -205,7 +205,7 @@ class LLMUsageSummary(Base):
     )
 
     # Aggregation period
-    period_type = Column(String(20), nullable=False)  # 'daily', 'weekly', 'monthly'
+    period_type = Column(String(20), nullable=False)  # 'hourly', 'daily'
     period_start = Column(DateTime(timezone=True), nullable=False)
     period_end = Column(DateTime(timezone=True), nullable=False)
 
@@ -233,6 +233,11 @@ class LLMUsageSummary(Base):
     avg_response_time_ms = Column(Integer, nullable=True)
     min_response_time_ms = Column(Integer, nullable=True)
     max_response_time_ms = Column(Integer, nullable=True)
+    # Sum and count of non-null response times, so averages can be re-aggregated
+    total_response_time_ms = Column(BigInteger, default=0, nullable=False)
+    timed_requests = Column(Integer, default=0, nullable=False)
+    first_request_at = Column(DateTime(timezone=True), nullable=True)
+    last_request_at = Column(DateTime(timezone=True), nullable=True)
 
     # Relationships
     client_account = relationship("ClientAccount", back_populates="llm_usage_summaries")
@@ -254,8 +259,29 @@ class LLMUsageSummary(Base):
             "page_context",
             "feature_context",
             name="uq_usage_summary_period_context",
+            # Rollup upserts rely on NULL contexts conflicting with each other
+            postgresql_nulls_not_distinct=True,
         ),
     )
 
     def __repr__(self):
         return f"<LLMUsageSummary(period={self.period_type}, requests={self.total_requests}, cost={self.total_cost})>"
+
+
+class LLMUsageRollupState(Base):
+    """How far raw usage logs have been rolled up for each period type."""
+
+    __tablename__ = "llm_usage_rollup_state"
+
+    period_type = Column(String(20), primary_key=True)  # 'hourly', 'daily'
+    # Every bucket starting before this has been rolled up
+    rolled_until = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self):
+        return f"<LLMUsageRollupState(period={self.period_type}, rolled_until={self.rolled_until})>"
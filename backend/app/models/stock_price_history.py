@@ -0,0 +1,86 @@
+"""
+Stock Price History Models - Local OHLCV store for historical prices
+"""
+
+from typing import Any, Dict
+
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Float,
+    String,
+)
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class StockPriceBar(Base):
+    """
+    One OHLCV bar for a symbol at a given interval.
+
+    Market data is public, so bars are shared across tenants and keyed only by
+    (symbol, interval, timestamp).
+    """
+
+    __tablename__ = "stock_price_bars"
+    __table_args__ = {"schema": "migration"}
+
+    symbol = Column(String(30), primary_key=True)
+    interval = Column(String(10), primary_key=True)  # e.g., "1d", "1wk", "1mo"
+    bar_timestamp = Column(BigInteger, primary_key=True)  # epoch seconds, UTC
+    trade_date = Column(Date, nullable=False)  # exchange-local trading date
+
+    open = Column(Float, nullable=True)
+    high = Column(Float, nullable=True)
+    low = Column(Float, nullable=True)
+    close = Column(Float, nullable=True)
+    volume = Column(Float, nullable=True)
+
+    def __repr__(self):
+        return (
+            f"<StockPriceBar(symbol={self.symbol}, interval={self.interval}, "
+            f"date={self.trade_date})>"
+        )
+
+
+class StockPriceCoverage(Base):
+    """
+    Range of bars already stored for a (symbol, interval) pair.
+
+    Used to decide which head/tail gaps still have to be fetched upstream.
+    """
+
+    __tablename__ = "stock_price_coverage"
+    __table_args__ = {"schema": "migration"}
+
+    symbol = Column(String(30), primary_key=True)
+    interval = Column(String(10), primary_key=True)
+
+    first_trade_date = Column(Date, nullable=False)
+    last_trade_date = Column(Date, nullable=False)
+    # True once the full upstream history (period=max) has been stored
+    starts_at_inception = Column(Boolean, nullable=False, default=False)
+
+    last_refreshed_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self):
+        return f"<StockPriceCoverage(symbol={self.symbol}, interval={self.interval})>"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for API responses"""
+        return {
+            "symbol": self.symbol,
+            "interval": self.interval,
+            "first_trade_date": self.first_trade_date.isoformat(),
+            "last_trade_date": self.last_trade_date.isoformat(),
+            "starts_at_inception": self.starts_at_inception,
+            "last_refreshed_at": (
+                self.last_refreshed_at.isoformat() if self.last_refreshed_at else None
+            ),
+        }
@@ -81,6 +81,7 @@ class AppAppQueryMixin:
                 "source_app_name": row.source_app_name,
                 "target_app_info": row.target_app_info,
                 "dependency_type": row.AssetDependency.dependency_type,
+                "description": row.AssetDependency.description,
                 "created_at": (
                     row.AssetDependency.created_at.isoformat()
                     if row.AssetDependency.created_at
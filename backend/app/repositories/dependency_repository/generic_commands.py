@@ -318,16 +318,26 @@ class GenericCommandMixin:
 
         # Delete all dependencies where this application is the source
         # WITH multi-tenant isolation to prevent cross-tenant deletion
-        stmt = delete(AssetDependency).where(
-            and_(
-                AssetDependency.asset_id == app_uuid,
-                AssetDependency.client_account_id == client_uuid,
-                AssetDependency.engagement_id == engagement_uuid,
+        stmt = (
+            delete(AssetDependency)
+            .where(
+                and_(
+                    AssetDependency.asset_id == app_uuid,
+                    AssetDependency.client_account_id == client_uuid,
+                    AssetDependency.engagement_id == engagement_uuid,
+                )
             )
+            .returning(AssetDependency.id)
         )
 
         result = await self.db.execute(stmt)
-        deleted_count = result.rowcount
+        deleted_ids = result.scalars().all()
+        deleted_count = len(deleted_ids)
+
+        # Bulk DELETE skips the ORM flush that maintains the dependency graph
+        from app.services.dependency_graph_store import remove_graph_edges
+
+        await remove_graph_edges(self.db, client_uuid, engagement_uuid, deleted_ids)
 
         logger.info(
             safe_log_format(
@@ -0,0 +1,363 @@
+"""
+Agent Task History Queries
+Aggregate analytics over agent task history, used by AgentTaskHistoryService
+
+Each query aggregates in Postgres (GROUP BY, JSONB extraction, ordered-set
+percentiles) and returns a handful of rows however many tasks the window
+holds.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import BigInteger, Date, case, cast, desc, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.agent_discovered_patterns import AgentDiscoveredPatterns
+from app.models.agent_task_history import AgentTaskHistory
+
+DURATION_PERCENTILES = (25, 50, 75, 90, 95, 99)
+
+# Width of the LLM call count buckets in resource usage analysis
+LLM_CALL_BUCKET_SIZE = 5
+
+# Simple error categorization, first match wins
+_ERROR_CATEGORIES = (
+    ("timeout", "timeout"),
+    ("llm", "llm_error"),
+    ("validation", "validation_error"),
+)
+
+
+def _token_sum(key: str):
+    """SUM of one integer field of the token_usage JSONB column"""
+    return func.coalesce(
+        func.sum(cast(AgentTaskHistory.token_usage[key].astext, BigInteger)), 0
+    )
+
+
+def _error_type():
+    """Error category of a failed task, derived from its message"""
+    message = AgentTaskHistory.error_message
+    return case(
+        (func.coalesce(message, "") == "", AgentTaskHistory.status),
+        *[
+            (message.ilike(f"%{needle}%"), category)
+            for needle, category in _ERROR_CATEGORIES
+        ],
+        else_="other_error",
+    )
+
+
+def _complexity():
+    """Complexity bucket of a task from its duration and LLM call count"""
+    duration = func.coalesce(AgentTaskHistory.duration_seconds, 0)
+    llm_calls = func.coalesce(AgentTaskHistory.llm_calls_count, 0)
+    return case(
+        ((duration < 10) & (llm_calls < 3), "simple"),  # < 10s, < 3 LLM calls
+        ((duration < 60) & (llm_calls <= 5), "moderate"),  # 10-60s, 3-5 LLM calls
+        ((duration < 300) & (llm_calls <= 10), "complex"),  # 60-300s, 5-10 calls
+        else_="very_complex",  # > 300s, > 10 LLM calls
+    )
+
+
+def _fill_daily_trends(
+    rows: Sequence[Any], first_day: date, days: int
+) -> Dict[str, List[Any]]:
+    """Trend series for each day from first_day on, zeros for idle days"""
+    by_day = {row.day: row for row in rows}
+    trends = {
+        "dates": [],
+        "success_rates": [],
+        "avg_durations": [],
+        "task_counts": [],
+        "confidence_scores": [],
+    }
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        row = by_day.get(day)
+        total = row.total if row else 0
+        successful = row.successful if row else 0
+        success_rate = (successful / total * 100) if total > 0 else 0
+
+        trends["dates"].append(day.isoformat())
+        trends["success_rates"].append(round(success_rate, 2))
+        trends["avg_durations"].append(float(row.avg_duration or 0) if row else 0.0)
+        trends["task_counts"].append(total)
+        trends["confidence_scores"].append(
+            float(row.avg_confidence or 0) if row else 0.0
+        )
+    return trends
+
+
+def task_filters(
+    agent_name: str,
+    client_account_id: str,
+    engagement_id: str,
+    since_date: datetime,
+) -> List[Any]:
+    """One agent's tasks within a tenant, started since since_date"""
+    return [
+        AgentTaskHistory.client_account_id == client_account_id,
+        AgentTaskHistory.engagement_id == engagement_id,
+        AgentTaskHistory.agent_name == agent_name,
+        AgentTaskHistory.started_at >= since_date,
+    ]
+
+
+async def get_token_usage(
+    db: AsyncSession,
+    agent_name: str,
+    client_account_id: str,
+    engagement_id: str,
+    since_date: datetime,
+) -> Dict[str, Any]:
+    """Calculate token usage statistics"""
+    usage = (
+        await db.execute(
+            select(
+                func.count(AgentTaskHistory.id).label("tasks"),
+                _token_sum("input_tokens").label("input_tokens"),
+                _token_sum("output_tokens").label("output_tokens"),
+                _token_sum("total_tokens").label("total_tokens"),
+            ).where(
+                *task_filters(agent_name, client_account_id, engagement_id, since_date)
+            )
+        )
+    ).one()
+
+    total_tokens = int(usage.total_tokens)
+    return {
+        "total_input_tokens": int(usage.input_tokens),
+        "total_output_tokens": int(usage.output_tokens),
+        "total_tokens": total_tokens,
+        "avg_tokens_per_task": total_tokens / usage.tasks if usage.tasks else 0,
+    }
+
+
+async def get_error_patterns(
+    db: AsyncSession,
+    agent_name: str,
+    client_account_id: str,
+    engagement_id: str,
+    since_date: datetime,
+) -> List[Dict[str, Any]]:
+    """Analyze error patterns"""
+    error_type = _error_type().label("error_type")
+    result = await db.execute(
+        select(error_type, func.count().label("count"))
+        .where(
+            *task_filters(agent_name, client_account_id, engagement_id, since_date),
+            AgentTaskHistory.status.in_(["failed", "timeout"]),
+        )
+        .group_by(error_type)
+        .order_by(desc("count"))
+    )
+
+    return [{"error_type": row.error_type, "count": row.count} for row in result]
+
+
+async def get_performance_trends(
+    db: AsyncSession,
+    agent_name: str,
+    client_account_id: str,
+    engagement_id: str,
+    days: int,
+) -> Dict[str, Any]:
+    """Calculate daily performance trends"""
+    today = datetime.utcnow().date()
+    first_day = today - timedelta(days=days - 1)
+    day = cast(AgentTaskHistory.started_at, Date).label("day")
+
+    result = await db.execute(
+        select(
+            day,
+            func.count(AgentTaskHistory.id).label("total"),
+            func.count(func.nullif(AgentTaskHistory.success, False)).label(
+                "successful"
+            ),
+            func.avg(AgentTaskHistory.duration_seconds).label("avg_duration"),
+            func.avg(AgentTaskHistory.confidence_score).label("avg_confidence"),
+        )
+        .where(
+            *task_filters(
+                agent_name,
+                client_account_id,
+                engagement_id,
+                datetime.combine(first_day, datetime.min.time()),
+            ),
+            AgentTaskHistory.started_at
+            < datetime.combine(today + timedelta(days=1), datetime.min.time()),
+        )
+        .group_by(day)
+    )
+
+    return _fill_daily_trends(result.all(), first_day, days)
+
+
+async def get_performance_distribution(
+    db: AsyncSession,
+    agent_name: str,
+    client_account_id: str,
+    engagement_id: str,
+    since_date: datetime,
+) -> Dict[str, Any]:
+    """Get performance distribution metrics"""
+    filters = task_filters(agent_name, client_account_id, engagement_id, since_date) + [
+        AgentTaskHistory.duration_seconds.isnot(None)
+    ]
+
+    percentile_row = (
+        await db.execute(
+            select(
+                func.count(AgentTaskHistory.id).label("tasks"),
+                *[
+                    func.percentile_disc(p / 100)
+                    .within_group(AgentTaskHistory.duration_seconds)
+                    .label(f"p{p}")
+                    for p in DURATION_PERCENTILES
+                ],
+            ).where(*filters)
+        )
+    ).one()
+
+    if not percentile_row.tasks:
+        return {"duration_percentiles": {}, "status_distribution": {}}
+
+    status_result = await db.execute(
+        select(AgentTaskHistory.status, func.count().label("count"))
+        .where(*filters)
+        .group_by(AgentTaskHistory.status)
+    )
+
+    return {
+        "duration_percentiles": {
+            f"p{p}": round(float(getattr(percentile_row, f"p{p}")), 2)
+            for p in DURATION_PERCENTILES
+        },
+        "status_distribution": {row.status: row.count for row in status_result},
+    }
+
+
+async def get_resource_usage_analysis(
+    db: AsyncSession,
+    agent_name: str,
+    client_account_id: str,
+    engagement_id: str,
+    since_date: datetime,
+) -> Dict[str, Any]:
+    """Analyze resource usage patterns"""
+    filters = task_filters(agent_name, client_account_id, engagement_id, since_date)
+
+    memory = (
+        await db.execute(
+            select(
+                # Zero means not measured
+                func.avg(func.nullif(AgentTaskHistory.memory_usage_mb, 0)).label(
+                    "avg_memory"
+                ),
+                func.max(AgentTaskHistory.memory_usage_mb).label("peak_memory"),
+            ).where(*filters)
+        )
+    ).one()
+
+    bucket = (AgentTaskHistory.llm_calls_count // LLM_CALL_BUCKET_SIZE).label("bucket")
+    bucket_result = await db.execute(
+        select(bucket, func.count().label("count"))
+        .where(*filters)
+        .group_by(bucket)
+        .order_by(bucket)
+    )
+
+    return {
+        "avg_memory_usage_mb": (
+            round(float(memory.avg_memory), 2) if memory.avg_memory else 0
+        ),
+        "peak_memory_usage_mb": float(memory.peak_memory or 0),
+        "llm_call_distribution": {
+            f"{row.bucket * LLM_CALL_BUCKET_SIZE}-"
+            f"{(row.bucket + 1) * LLM_CALL_BUCKET_SIZE}": row.count
+            for row in bucket_result
+        },
+    }
+
+
+async def get_pattern_discovery_stats(
+    db: AsyncSession,
+    agent_name: str,
+    client_account_id: str,
+    engagement_id: str,
+    since_date: datetime,
+) -> Dict[str, Any]:
+    """Get pattern discovery statistics"""
+    filters = [
+        AgentDiscoveredPatterns.client_account_id == client_account_id,
+        AgentDiscoveredPatterns.engagement_id == engagement_id,
+        AgentDiscoveredPatterns.discovered_by_agent == agent_name,
+        AgentDiscoveredPatterns.created_at >= since_date,
+    ]
+
+    type_result = await db.execute(
+        select(
+            AgentDiscoveredPatterns.pattern_type,
+            func.count().label("patterns"),
+            func.coalesce(func.sum(AgentDiscoveredPatterns.times_referenced), 0).label(
+                "references"
+            ),
+            func.count()
+            .filter(AgentDiscoveredPatterns.confidence_score >= 0.8)
+            .label("high_confidence"),
+            func.sum(AgentDiscoveredPatterns.confidence_score).label("confidence_sum"),
+        )
+        .where(*filters)
+        .group_by(AgentDiscoveredPatterns.pattern_type)
+    )
+    rows = type_result.all()
+
+    total_patterns = sum(row.patterns for row in rows)
+    confidence_sum = sum(row.confidence_sum or 0 for row in rows)
+    return {
+        "total_patterns_discovered": total_patterns,
+        "pattern_types": {row.pattern_type: row.patterns for row in rows},
+        "total_pattern_references": sum(int(row.references) for row in rows),
+        "high_confidence_patterns": sum(row.high_confidence for row in rows),
+        "avg_confidence_score": (
+            float(confidence_sum / total_patterns) if total_patterns else 0
+        ),
+    }
+
+
+async def get_task_complexity_analysis(
+    db: AsyncSession,
+    agent_name: str,
+    client_account_id: str,
+    engagement_id: str,
+    since_date: datetime,
+) -> Dict[str, Any]:
+    """Analyze task complexity based on various metrics"""
+    complexity = _complexity()
+    row = (
+        await db.execute(
+            select(
+                *[
+                    func.count().filter(complexity == bucket).label(bucket)
+                    for bucket in ("simple", "moderate", "complex", "very_complex")
+                ],
+                func.avg(AgentTaskHistory.thinking_phases_count).label(
+                    "avg_thinking_phases"
+                ),
+            ).where(
+                *task_filters(agent_name, client_account_id, engagement_id, since_date)
+            )
+        )
+    ).one()
+
+    return {
+        "complexity_distribution": {
+            "simple": row.simple,
+            "moderate": row.moderate,
+            "complex": row.complex,
+            "very_complex": row.very_complex,
+        },
+        "avg_thinking_phases_per_task": float(row.avg_thinking_phases or 0),
+    }
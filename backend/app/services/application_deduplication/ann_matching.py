@@ -0,0 +1,168 @@
+"""
+pgvector nearest-neighbour lookups for application deduplication
+
+The HNSW index on canonical_applications.name_embedding is global: the tenant
+filter is applied to the candidates the index scan returns. For a tenant that
+holds a small share of the table those candidates may contain none of its
+rows, and the lookup would silently return no match. The lookup therefore
+uses the index only when pgvector can keep scanning until tenant rows are
+found (iterative scans, pgvector >= 0.8) and the tenant is large enough for
+an exact scan to be slow. Otherwise it scans the tenant's rows exactly.
+"""
+
+import logging
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# HNSW candidate list size for index lookups (pgvector default is 40)
+ANN_EF_SEARCH = 100
+
+# Tenants with at most this many embedded applications are scanned exactly
+ANN_EXACT_SCAN_MAX_ROWS = 20000
+
+# First pgvector release with hnsw.iterative_scan
+ITERATIVE_SCAN_MIN_VERSION = (0, 8)
+
+# pgvector version and the tenant's embedded application count
+ANN_SCAN_PLAN_QUERY = text(
+    """
+        SELECT
+            (SELECT extversion FROM pg_extension WHERE extname = 'vector')
+                AS version,
+            (
+                SELECT count(*)
+                FROM migration.canonical_applications
+                WHERE client_account_id = :client_account_id
+                  AND engagement_id = :engagement_id
+                  AND name_embedding IS NOT NULL
+            ) AS tenant_rows
+    """
+)
+
+# Nearest embedded canonical application for each query vector. {distance}
+# is the ORDER BY expression: the bare operator lets the HNSW index serve the
+# scan; wrapping it in an expression forces an exact scan of the tenant's rows
+# through the tenant-prefixed unique index.
+_MATCH_QUERY_TEMPLATE = """
+    SELECT q.position, match.id,
+           1 - (match.name_embedding <=> q.embedding) AS similarity
+    FROM (
+        SELECT CAST(u.embedding AS vector) AS embedding, u.position
+        FROM unnest(CAST(:embeddings AS text[])) WITH ORDINALITY
+            AS u(embedding, position)
+    ) AS q
+    CROSS JOIN LATERAL (
+        SELECT id, name_embedding
+        FROM migration.canonical_applications
+        WHERE client_account_id = :client_account_id
+          AND engagement_id = :engagement_id
+          AND name_embedding IS NOT NULL
+        ORDER BY {distance}
+        LIMIT 1
+    ) AS match
+"""
+
+ANN_MATCH_QUERY = text(
+    _MATCH_QUERY_TEMPLATE.format(distance="name_embedding <=> q.embedding")
+)
+EXACT_MATCH_QUERY = text(
+    _MATCH_QUERY_TEMPLATE.format(distance="(name_embedding <=> q.embedding) + 0")
+)
+
+
+def supports_iterative_scan(version: Optional[str]) -> bool:
+    """Whether an installed pgvector version has hnsw.iterative_scan"""
+    if not version:
+        return False
+    try:
+        parts = tuple(int(part) for part in version.split(".")[:2])
+    except ValueError:
+        return False
+    return parts >= ITERATIVE_SCAN_MIN_VERSION
+
+
+def use_exact_scan(version: Optional[str], tenant_rows: int) -> bool:
+    """Scan the tenant exactly unless the index is both safe and worthwhile"""
+    return tenant_rows <= ANN_EXACT_SCAN_MAX_ROWS or not supports_iterative_scan(
+        version
+    )
+
+
+async def _run_match_query(
+    db: AsyncSession,
+    query,
+    embeddings: List[List[float]],
+    client_account_id: uuid.UUID,
+    engagement_id: uuid.UUID,
+) -> Dict[int, Tuple[uuid.UUID, float]]:
+    result = await db.execute(
+        query,
+        {
+            "embeddings": [
+                "[" + ",".join(map(str, embedding)) + "]" for embedding in embeddings
+            ],
+            "client_account_id": client_account_id,
+            "engagement_id": engagement_id,
+        },
+    )
+    # ORDINALITY positions are 1-based
+    return {
+        row.position - 1: (row.id, max(0.0, min(1.0, float(row.similarity))))
+        for row in result.all()
+    }
+
+
+async def query_ann_hits(
+    db: AsyncSession,
+    embeddings: List[List[float]],
+    client_account_id: uuid.UUID,
+    engagement_id: uuid.UUID,
+) -> Dict[int, Tuple[uuid.UUID, float]]:
+    """Nearest (application id, similarity) per embedding via pgvector."""
+    # Savepoint so a failed lookup does not abort the caller's transaction
+    async with db.begin_nested():
+        plan = (
+            await db.execute(
+                ANN_SCAN_PLAN_QUERY,
+                {
+                    "client_account_id": client_account_id,
+                    "engagement_id": engagement_id,
+                },
+            )
+        ).one()
+        if not plan.tenant_rows:
+            return {}
+
+        if use_exact_scan(plan.version, plan.tenant_rows):
+            return await _run_match_query(
+                db, EXACT_MATCH_QUERY, embeddings, client_account_id, engagement_id
+            )
+
+        await db.execute(text(f"SET LOCAL hnsw.ef_search = {ANN_EF_SEARCH}"))
+        await db.execute(text("SET LOCAL hnsw.iterative_scan = strict_order"))
+        hits = await _run_match_query(
+            db, ANN_MATCH_QUERY, embeddings, client_account_id, engagement_id
+        )
+
+        # The tenant has embedded rows, so every vector has a nearest one; an
+        # index scan that stopped at hnsw.max_scan_tuples is retried exactly
+        missing = [i for i in range(len(embeddings)) if i not in hits]
+        if missing:
+            logger.debug(
+                f"HNSW scan found no tenant row for {len(missing)} vectors; "
+                f"retrying with an exact scan"
+            )
+            exact = await _run_match_query(
+                db,
+                EXACT_MATCH_QUERY,
+                [embeddings[i] for i in missing],
+                client_account_id,
+                engagement_id,
+            )
+            hits.update({missing[i]: hit for i, hit in exact.items()})
+        return hits
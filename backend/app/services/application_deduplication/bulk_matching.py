@@ -0,0 +1,200 @@
+"""
+In-memory resolution of application names for bulk deduplication.
+
+Names are grouped by normalized form, then names without an exact match are
+fuzzy and vector matched against existing applications (looked up in batch)
+and against applications created for earlier names in the same list.
+"""
+
+import logging
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.canonical_applications import (
+    ApplicationNameVariant,
+    CanonicalApplication,
+    MatchMethod,
+)
+
+from .vector_index import EngagementVectorIndex
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class NameGroup:
+    """Input names sharing one normalized form, resolved together"""
+
+    normalized_name: str
+    name_hash: str
+    names: List[str] = field(default_factory=list)
+    # Matched existing application, or the group earlier in the list whose
+    # new application this one matched
+    canonical: Optional[CanonicalApplication] = None
+    parent: Optional["NameGroup"] = None
+    variant: Optional[ApplicationNameVariant] = None
+    match_method: MatchMethod = MatchMethod.EXACT
+    similarity_score: float = 1.0
+    embedding: Optional[List[float]] = None
+    # Id proposed for the group's new canonical application
+    new_id: Optional[uuid.UUID] = None
+
+    @property
+    def is_new_canonical(self) -> bool:
+        return self.canonical is None and self.parent is None
+
+    @property
+    def root(self) -> "NameGroup":
+        return self.parent or self
+
+
+MatchTarget = Union[CanonicalApplication, NameGroup]
+
+
+def group_application_names(applications: List[str]) -> Dict[str, NameGroup]:
+    """Group unique names by name hash, preserving first-seen order"""
+    groups: Dict[str, NameGroup] = {}
+    for name in dict.fromkeys(applications):
+        normalized_name = CanonicalApplication.normalize_name(name)
+        if not normalized_name:
+            logger.debug(f"Skipping application name with no matchable text: {name!r}")
+            continue
+        name_hash = CanonicalApplication.generate_name_hash(normalized_name)
+        groups.setdefault(name_hash, NameGroup(normalized_name, name_hash))
+        groups[name_hash].names.append(name)
+    return groups
+
+
+def _best_hit(
+    *hits: Optional[Tuple[MatchTarget, float]]
+) -> Optional[Tuple[MatchTarget, float]]:
+    """Highest scoring hit; the earlier one wins ties"""
+    best = None
+    for hit in hits:
+        if hit is not None and (best is None or hit[1] > best[1]):
+            best = hit
+    return best
+
+
+def _resolve(
+    group: NameGroup, hit: Tuple[MatchTarget, float], method: MatchMethod
+) -> None:
+    target, similarity_score = hit
+    if isinstance(target, NameGroup):
+        group.parent = target
+    else:
+        group.canonical = target
+    group.match_method = method
+    group.similarity_score = similarity_score
+
+
+def resolve_pending_groups(
+    service_instance,  # ApplicationDeduplicationService instance
+    pending: List[NameGroup],
+    existing_fuzzy_hits: List[Optional[Tuple[CanonicalApplication, float]]],
+    existing_vector_hits: List[Optional[Tuple[CanonicalApplication, float]]],
+    fuzzy_pool_size: int,
+) -> None:
+    """
+    Fuzzy then vector match names without an exact match, in input order.
+
+    Hits against existing applications are precomputed; a name that matches
+    neither those nor an application created for an earlier name in the list
+    becomes a new canonical application itself.
+    """
+    config = service_instance.config
+    fuzzy_matcher = service_instance.fuzzy_matcher
+    new_pool: List[Tuple[str, NameGroup]] = []
+    new_index = EngagementVectorIndex()
+    new_groups: Dict[uuid.UUID, NameGroup] = {}
+
+    for group, fuzzy_hit, vector_hit in zip(
+        pending, existing_fuzzy_hits, existing_vector_hits
+    ):
+        fuzzy = _best_hit(
+            fuzzy_hit,
+            fuzzy_matcher.best_match(
+                group.normalized_name, new_pool, config.fuzzy_text_threshold
+            ),
+        )
+        if fuzzy:
+            _resolve(group, fuzzy, MatchMethod.FUZZY_TEXT)
+            continue
+
+        if config.enable_vector_search and group.embedding:
+            batch_hit = None
+            for new_id, similarity in new_index.search([group.embedding], k=1)[0]:
+                if similarity >= config.vector_similarity_threshold:
+                    batch_hit = (new_groups[new_id], similarity)
+            vector = _best_hit(vector_hit, batch_hit)
+            if vector:
+                _resolve(group, vector, MatchMethod.VECTOR_SIMILARITY)
+                continue
+
+        group.new_id = uuid.uuid4()
+        new_groups[group.new_id] = group
+        if len(new_pool) < fuzzy_pool_size:
+            new_pool.append((group.normalized_name, group))
+        if group.embedding:
+            new_index.add(group.new_id, group.embedding)
+
+
+async def match_pending_groups(
+    service_instance,  # ApplicationDeduplicationService instance
+    db: AsyncSession,
+    pending: List[NameGroup],
+    client_account_id: uuid.UUID,
+    engagement_id: uuid.UUID,
+) -> None:
+    """Look up fuzzy and ANN hits for all pending names, then resolve them"""
+    config = service_instance.config
+    fuzzy_matcher = service_instance.fuzzy_matcher
+
+    candidates = await fuzzy_matcher.load_candidates(
+        db, client_account_id, engagement_id, config.max_candidates_for_fuzzy
+    )
+    candidate_pairs = [(app.normalized_name, app) for app in candidates]
+    fuzzy_hits = [
+        fuzzy_matcher.best_match(
+            group.normalized_name, candidate_pairs, config.fuzzy_text_threshold
+        )
+        for group in pending
+    ]
+
+    vector_hits: List[Optional[Tuple[CanonicalApplication, float]]] = [None] * len(
+        pending
+    )
+    if config.enable_vector_search:
+        vector_ops = service_instance.vector_ops
+        embeddings = await vector_ops.generate_embeddings(
+            [group.names[0] for group in pending]
+        )
+        for group, embedding in zip(pending, embeddings):
+            group.embedding = embedding
+
+        # Names that fuzzy match an existing application never reach vector matching
+        positions = [
+            i
+            for i, group in enumerate(pending)
+            if group.embedding and fuzzy_hits[i] is None
+        ]
+        ann_hits = await vector_ops.find_ann_matches(
+            db,
+            [pending[i].embedding for i in positions],
+            client_account_id,
+            engagement_id,
+            config.vector_similarity_threshold,
+        )
+        for position, hit in zip(positions, ann_hits):
+            vector_hits[position] = hit
+
+    resolve_pending_groups(
+        service_instance,
+        pending,
+        fuzzy_hits,
+        vector_hits,
+        max(config.max_candidates_for_fuzzy - len(candidates), 0),
+    )
@@ -1,22 +1,192 @@
 """
 Bulk deduplication operations for processing multiple applications efficiently.
 
-This module handles batch processing of multiple applications with optimizations
-for database performance and error handling.
+The whole list is resolved set-wise in a fixed number of database round trips,
+however long it is:
+
+1. one IN query each for exact canonical name and name variant matches
+2. one candidate query for fuzzy matching
+3. one batched embedding call and one pgvector ANN query for the rest
+4. bulk INSERT ... ON CONFLICT for new canonical applications, name variants
+   and collection flow links, plus one usage UPDATE for matched applications
+
+Names are also matched against applications created earlier in the same list,
+so the outcome is the same as deduplicating the names one at a time. Name
+grouping and that in-memory resolution live in bulk_matching.
 """
 
-import asyncio
 import logging
 import uuid
-from typing import List, Optional
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
 
+from sqlalchemy import case, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.canonical_applications import (
+    ApplicationNameVariant,
+    CanonicalApplication,
+    MatchMethod,
+)
+
+from .bulk_matching import NameGroup, group_application_names, match_pending_groups
+from .canonical_operations import (
+    bulk_upsert_canonical_applications,
+    bulk_upsert_collection_flow_links,
+    bulk_upsert_name_variants,
+)
+from .matching_strategies import find_exact_matches
+from .tenant_scoped_operations import enforce_tenant_scope
 from .types import DeduplicationResult
 
 logger = logging.getLogger(__name__)
 
 
+async def _record_usage(db: AsyncSession, usage_counts: Counter) -> None:
+    """Bump usage stats of matched existing applications in one UPDATE"""
+    if not usage_counts:
+        return
+
+    await db.execute(
+        update(CanonicalApplication)
+        .where(CanonicalApplication.id.in_(list(usage_counts)))
+        .values(
+            usage_count=CanonicalApplication.usage_count
+            + case(dict(usage_counts), value=CanonicalApplication.id, else_=0),
+            last_used_at=func.now(),
+            updated_at=func.now(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def _load_by_id(db: AsyncSession, model, ids) -> Dict[uuid.UUID, object]:
+    """Reload rows written by bulk statements into the session"""
+    if not ids:
+        return {}
+    result = await db.execute(
+        select(model)
+        .where(model.id.in_(list(ids)))
+        .execution_options(populate_existing=True)
+    )
+    return {row.id: row for row in result.scalars().all()}
+
+
+async def _write_groups(
+    db: AsyncSession,
+    groups: List[NameGroup],
+    client_account_id: uuid.UUID,
+    engagement_id: uuid.UUID,
+    user_id: Optional[uuid.UUID],
+) -> Tuple[Dict[str, uuid.UUID], Dict[str, uuid.UUID]]:
+    """
+    Upsert new canonical applications and variants and record usage.
+
+    Returns:
+        Canonical application id and new variant id by group normalized name
+    """
+    usage_counts: Counter = Counter()
+    for group in groups:
+        usage_counts[group.root.normalized_name] += len(group.names)
+
+    new_ids = await bulk_upsert_canonical_applications(
+        db,
+        [
+            {
+                "id": group.new_id,
+                "canonical_name": group.names[0],
+                "usage_count": usage_counts[group.normalized_name],
+                "name_embedding": group.embedding,
+            }
+            for group in groups
+            if group.is_new_canonical
+        ],
+        client_account_id,
+        engagement_id,
+        user_id,
+    )
+
+    canonical_ids: Dict[str, uuid.UUID] = {}
+    existing_usage: Counter = Counter()
+    for group in groups:
+        if group.canonical is not None:
+            canonical_ids[group.normalized_name] = group.canonical.id
+            existing_usage[group.canonical.id] += len(group.names)
+        else:
+            canonical_ids[group.normalized_name] = new_ids[group.root.normalized_name]
+    await _record_usage(db, existing_usage)
+
+    variant_ids = await bulk_upsert_name_variants(
+        db,
+        [
+            {
+                "canonical_application_id": canonical_ids[group.normalized_name],
+                "variant_name": group.names[0],
+                "match_method": group.match_method,
+                "similarity_score": group.similarity_score,
+            }
+            for group in groups
+            if group.match_method != MatchMethod.EXACT
+        ],
+        client_account_id,
+        engagement_id,
+    )
+    return canonical_ids, variant_ids
+
+
+def _build_results(
+    service_instance,  # ApplicationDeduplicationService instance
+    groups: List[NameGroup],
+    apps: Dict[uuid.UUID, CanonicalApplication],
+    canonical_ids: Dict[str, uuid.UUID],
+) -> Dict[str, DeduplicationResult]:
+    """One result per input name, as deduplicating them one at a time would"""
+    verification_threshold = (
+        service_instance.config.require_manual_verification_threshold
+    )
+    results: Dict[str, DeduplicationResult] = {}
+    for group in groups:
+        canonical_app = apps[canonical_ids[group.normalized_name]]
+        is_new_canonical = group.is_new_canonical and canonical_app.id == group.new_id
+        fuzzy_or_vector = group.match_method != MatchMethod.EXACT
+        for position, name in enumerate(group.names):
+            # Later names with the same normalized form hit the first exactly
+            first = position == 0
+            results[name] = DeduplicationResult(
+                canonical_application=canonical_app,
+                name_variant=group.variant,
+                is_new_canonical=first and is_new_canonical,
+                is_new_variant=first
+                and (
+                    fuzzy_or_vector
+                    or (group.variant is not None and group.variant.usage_count == 1)
+                ),
+                match_method=group.match_method if first else MatchMethod.EXACT,
+                similarity_score=group.similarity_score if first else 1.0,
+                confidence_score=group.similarity_score if first else 1.0,
+                requires_verification=first
+                and fuzzy_or_vector
+                and group.similarity_score < verification_threshold,
+                potential_duplicates=[],
+            )
+    return results
+
+
+def _link_rows(groups: List[NameGroup], results: Dict[str, DeduplicationResult]):
+    for group in groups:
+        for name in group.names:
+            variant = results[name].name_variant
+            yield {
+                "canonical_application_id": results[name].canonical_application.id,
+                "name_variant_id": variant.id if variant else None,
+                "application_name": name,
+                "deduplication_method": (
+                    variant.match_method if variant else MatchMethod.EXACT.value
+                ),
+                "match_confidence": variant.match_confidence if variant else 1.0,
+            }
+
+
 async def bulk_deduplicate_applications(
     service_instance,  # ApplicationDeduplicationService instance
     db: AsyncSession,
@@ -28,52 +198,82 @@ async def bulk_deduplicate_applications(
     batch_size: int = 50,
 ) -> List[DeduplicationResult]:
     """
-    Bulk deduplication for multiple applications with optimizations.
+    Bulk deduplication for multiple applications in a constant number of round trips.
+
+    All names are written in one transaction: on failure it is rolled back and
+    the error raised. batch_size is accepted for compatibility; the list is no
+    longer processed in batches.
     """
 
     if not applications:
         return []
 
-    results = []
-    unique_applications = list(
-        dict.fromkeys(applications)
-    )  # Preserve order, remove duplicates
+    groups = group_application_names(applications)
+    group_list = list(groups.values())
 
     logger.info(
-        f"🔄 Starting bulk deduplication for {len(unique_applications)} applications "
+        f"🔄 Starting bulk deduplication for {len(group_list)} distinct applications "
         f"in engagement {engagement_id}"
     )
 
-    # Process in batches to avoid overwhelming the database
-    for i in range(0, len(unique_applications), batch_size):
-        batch = unique_applications[i : i + batch_size]
-        batch_results = []
-
-        for app_name in batch:
-            try:
-                result = await service_instance.deduplicate_application(
-                    db,
-                    app_name,
-                    client_account_id,
-                    engagement_id,
-                    user_id,
-                    collection_flow_id,
-                )
-                batch_results.append(result)
-
-            except Exception as e:
-                logger.warning(f"Failed to deduplicate '{app_name}' in batch: {str(e)}")
-                # Continue processing other applications
-                continue
-
-        results.extend(batch_results)
-
-        # Small delay between batches to avoid overwhelming the system
-        if i + batch_size < len(unique_applications):
-            await asyncio.sleep(0.1)
+    try:
+        await enforce_tenant_scope(
+            db, client_account_id, engagement_id, service_instance.config
+        )
+
+        exact_matches = await find_exact_matches(
+            db, list(groups), client_account_id, engagement_id
+        )
+        for name_hash, (canonical_app, variant) in exact_matches.items():
+            groups[name_hash].canonical = canonical_app
+            groups[name_hash].variant = variant
+
+        pending = [group for group in group_list if group.canonical is None]
+        if pending:
+            await match_pending_groups(
+                service_instance, db, pending, client_account_id, engagement_id
+            )
+
+        canonical_ids, variant_ids = await _write_groups(
+            db, group_list, client_account_id, engagement_id, user_id
+        )
+        apps = await _load_by_id(db, CanonicalApplication, set(canonical_ids.values()))
+        variants = await _load_by_id(db, ApplicationNameVariant, variant_ids.values())
+        for group in group_list:
+            if group.normalized_name in variant_ids:
+                group.variant = variants[variant_ids[group.normalized_name]]
+
+        results = _build_results(service_instance, group_list, apps, canonical_ids)
+
+        if collection_flow_id:
+            await bulk_upsert_collection_flow_links(
+                db,
+                collection_flow_id,
+                list(_link_rows(group_list, results)),
+                client_account_id,
+                engagement_id,
+            )
+
+        await db.commit()
+
+    except Exception as e:
+        await db.rollback()
+        logger.error(
+            f"❌ Bulk deduplication failed for engagement {engagement_id}: "
+            f"{type(e).__name__}"
+        )
+        raise
+
+    # Make new applications visible to vector matching for later requests
+    for group in group_list:
+        if group.embedding and results[group.names[0]].is_new_canonical:
+            service_instance.vector_ops.index_registry.add(
+                client_account_id, engagement_id, group.new_id, group.embedding
+            )
 
     logger.info(
-        f"✅ Bulk deduplication completed: {len(results)}/{len(unique_applications)} successful"
+        f"✅ Bulk deduplication completed: {len(results)} applications, "
+        f"{sum(r.is_new_canonical for r in results.values())} new"
     )
 
-    return results
+    return [results[name] for name in dict.fromkeys(applications) if name in results]
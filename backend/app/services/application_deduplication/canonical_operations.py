@@ -5,21 +5,25 @@ This module handles:
 - Creating new canonical applications
 - Managing collection flow application links
 - Proper embedding generation and metadata handling
+- Bulk INSERT ... ON CONFLICT upserts used by bulk deduplication
 """
 
 import uuid
 from datetime import datetime
-from typing import Dict, Any, Optional
-from sqlalchemy import and_, select
+from typing import Dict, Any, List, Optional
+from sqlalchemy import and_, func, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.canonical_applications import (
     CanonicalApplication,
     ApplicationNameVariant,
-    CollectionFlowApplication,
     MatchMethod,
     VerificationSource,
 )
+from app.models.canonical_applications.collection_flow_app import (
+    CollectionFlowApplication,
+)
 from .config import DeduplicationConfig
 from .vector_ops import VectorOperations
 
@@ -59,6 +63,12 @@ async def create_new_canonical_application(
     db.add(new_canonical)
     await db.flush()  # Get the ID without committing
 
+    # Make the new application visible to vector matching for later names
+    if embedding:
+        vector_ops.index_registry.add(
+            client_account_id, engagement_id, new_canonical.id, embedding
+        )
+
     return new_canonical
 
 
@@ -112,3 +122,162 @@ async def create_collection_flow_link(
 
     db.add(new_link)
     return new_link
+
+
+async def bulk_upsert_canonical_applications(
+    db: AsyncSession,
+    new_apps: List[Dict[str, Any]],
+    client_account_id: uuid.UUID,
+    engagement_id: uuid.UUID,
+    user_id: Optional[uuid.UUID],
+) -> Dict[str, uuid.UUID]:
+    """
+    Insert many canonical applications with one statement.
+
+    Each entry has id, canonical_name, usage_count and name_embedding. A name
+    inserted concurrently by another request is not duplicated; the existing
+    row's usage count is bumped and its id returned instead.
+
+    Returns:
+        Normalized name -> canonical application id (the entry's own id when
+        the row was inserted)
+    """
+    if not new_apps:
+        return {}
+
+    now = datetime.utcnow()
+    rows = []
+    for app in new_apps:
+        normalized_name = CanonicalApplication.normalize_name(app["canonical_name"])
+        rows.append(
+            {
+                "id": app["id"],
+                "canonical_name": app["canonical_name"].strip(),
+                "normalized_name": normalized_name,
+                "name_hash": CanonicalApplication.generate_name_hash(normalized_name),
+                "client_account_id": client_account_id,
+                "engagement_id": engagement_id,
+                "name_embedding": app.get("name_embedding"),
+                "created_by": user_id,
+                "verification_source": VerificationSource.USER_INPUT.value,
+                "usage_count": app.get("usage_count", 1),
+                "last_used_at": now,
+            }
+        )
+
+    stmt = insert(CanonicalApplication).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["client_account_id", "engagement_id", "normalized_name"],
+        set_=dict(
+            usage_count=CanonicalApplication.usage_count + stmt.excluded.usage_count,
+            last_used_at=stmt.excluded.last_used_at,
+            updated_at=func.now(),
+        ),
+    ).returning(CanonicalApplication.id, CanonicalApplication.normalized_name)
+
+    result = await db.execute(stmt)
+    return {row.normalized_name: row.id for row in result}
+
+
+async def bulk_upsert_name_variants(
+    db: AsyncSession,
+    variants: List[Dict[str, Any]],
+    client_account_id: uuid.UUID,
+    engagement_id: uuid.UUID,
+) -> Dict[str, uuid.UUID]:
+    """
+    Insert many name variants with one statement.
+
+    Each entry has canonical_application_id, variant_name, match_method and
+    similarity_score. Existing variants get their usage stats updated, as in
+    ApplicationNameVariant.create_variant.
+
+    Returns:
+        Normalized variant -> variant id
+    """
+    if not variants:
+        return {}
+
+    now = datetime.utcnow()
+    rows = []
+    for variant in variants:
+        normalized_variant = CanonicalApplication.normalize_name(
+            variant["variant_name"]
+        )
+        rows.append(
+            {
+                "id": uuid.uuid4(),
+                "canonical_application_id": variant["canonical_application_id"],
+                "variant_name": variant["variant_name"].strip(),
+                "normalized_variant": normalized_variant,
+                "variant_hash": CanonicalApplication.generate_name_hash(
+                    normalized_variant
+                ),
+                "client_account_id": client_account_id,
+                "engagement_id": engagement_id,
+                "similarity_score": variant["similarity_score"],
+                "match_method": variant["match_method"].value,
+                "match_confidence": min(variant["similarity_score"], 1.0),
+                "first_seen_at": now,
+                "last_used_at": now,
+            }
+        )
+
+    stmt = insert(ApplicationNameVariant).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["client_account_id", "engagement_id", "normalized_variant"],
+        set_=dict(
+            usage_count=ApplicationNameVariant.usage_count + 1,
+            last_used_at=stmt.excluded.last_used_at,
+        ),
+    ).returning(ApplicationNameVariant.id, ApplicationNameVariant.normalized_variant)
+
+    result = await db.execute(stmt)
+    return {row.normalized_variant: row.id for row in result}
+
+
+async def bulk_upsert_collection_flow_links(
+    db: AsyncSession,
+    collection_flow_id: uuid.UUID,
+    links: List[Dict[str, Any]],
+    client_account_id: uuid.UUID,
+    engagement_id: uuid.UUID,
+) -> None:
+    """
+    Create or update collection flow application links with one statement.
+
+    Each entry has canonical_application_id, name_variant_id,
+    application_name, deduplication_method and match_confidence. As with
+    create_collection_flow_link called once per name, the first name linked
+    to a canonical application creates the link and later ones only move its
+    name_variant_id.
+    """
+    rows: Dict[uuid.UUID, Dict[str, Any]] = {}
+    for link in links:
+        canonical_id = link["canonical_application_id"]
+        if canonical_id in rows:
+            rows[canonical_id]["name_variant_id"] = link["name_variant_id"]
+            continue
+        rows[canonical_id] = {
+            "id": uuid.uuid4(),
+            "collection_flow_id": collection_flow_id,
+            "canonical_application_id": canonical_id,
+            "name_variant_id": link["name_variant_id"],
+            "application_name": link["application_name"],
+            "client_account_id": client_account_id,
+            "engagement_id": engagement_id,
+            "deduplication_method": link["deduplication_method"],
+            "match_confidence": link["match_confidence"],
+        }
+    if not rows:
+        return
+
+    stmt = insert(CollectionFlowApplication).values(list(rows.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["collection_flow_id", "canonical_application_id"],
+        set_=dict(
+            name_variant_id=stmt.excluded.name_variant_id,
+            updated_at=func.now(),
+        ),
+    )
+    await db.execute(stmt)
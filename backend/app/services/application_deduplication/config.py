@@ -40,6 +40,9 @@ class DeduplicationConfig:
     max_candidates_for_fuzzy: int = 100
     enable_vector_search: bool = VECTOR_AVAILABLE
     cache_embeddings: bool = True
+    # Seconds before an engagement's in-memory vector index is reloaded from
+    # the database to pick up applications created by other processes
+    vector_index_max_age_seconds: float = 300.0
 
     # Behavior settings
     auto_merge_high_confidence: bool = True
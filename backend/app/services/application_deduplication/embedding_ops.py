@@ -0,0 +1,228 @@
+"""
+Embedding generation for application deduplication
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+from .config import get_embedding_model, VECTOR_AVAILABLE, DeduplicationConfig
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingOperations:
+    """Generates and caches name embeddings for vector matching"""
+
+    def __init__(self, config: DeduplicationConfig):
+        self.config = config
+        self._embedding_cache: dict = {}
+
+    def _validate_embedding_input(self, text: str) -> Optional[str]:
+        """Validate and normalize input text for embedding generation."""
+        if not self.config.enable_vector_search or not VECTOR_AVAILABLE:
+            logger.debug("Vector search disabled or vector libraries not available")
+            return None
+
+        if not text or not text.strip():
+            logger.debug("Empty or whitespace-only text provided for embedding")
+            return None
+
+        return text.strip()
+
+    def _check_embedding_cache(self, text: str) -> Optional[List[float]]:
+        """Check cache for existing embedding and clean up invalid entries."""
+        if not self.config.cache_embeddings or text not in self._embedding_cache:
+            return None
+
+        cached_result = self._embedding_cache[text]
+        if isinstance(cached_result, list) and all(
+            isinstance(x, (int, float)) for x in cached_result
+        ):
+            return cached_result
+        else:
+            # Clean up invalid cache entry
+            logger.warning("Invalid cached embedding for text, removing from cache")
+            del self._embedding_cache[text]
+            return None
+
+    def _encode_with_model(self, text: str) -> Optional[any]:
+        """Encode text using the embedding model with error handling."""
+        model = get_embedding_model()
+        if not model:
+            logger.debug("No embedding model available")
+            return None
+
+        try:
+            return model.encode(text, convert_to_tensor=False)
+        except Exception as model_error:
+            logger.warning(
+                f"Model encoding failed for text '{text[:50]}...': {str(model_error)}"
+            )
+            return None
+
+    def _encode_batch_with_model(self, texts: List[str]) -> List[Optional[any]]:
+        """Encode many texts in one model call; all None if encoding fails."""
+        model = get_embedding_model()
+        if not model:
+            logger.debug("No embedding model available")
+            return [None] * len(texts)
+
+        try:
+            return list(model.encode(texts, convert_to_tensor=False))
+        except Exception as model_error:
+            logger.warning(
+                f"Batch model encoding failed for {len(texts)} texts: {str(model_error)}"
+            )
+            return [None] * len(texts)
+
+    def _convert_embedding_to_list(self, embedding) -> Optional[List[float]]:
+        """Convert embedding to list format with validation."""
+        if embedding is None:
+            logger.warning("Model returned None embedding")
+            return None
+
+        try:
+            if hasattr(embedding, "tolist"):
+                return embedding.tolist()
+            elif isinstance(embedding, (list, tuple)):
+                return list(embedding)
+            else:
+                logger.warning(f"Unexpected embedding type: {type(embedding)}")
+                return None
+        except Exception as conversion_error:
+            logger.warning(
+                f"Failed to convert embedding to list: {str(conversion_error)}"
+            )
+            return None
+
+    def _validate_embedding_values(self, embedding_list: List) -> Optional[List[float]]:
+        """Validate embedding dimensions and numeric values."""
+        if not isinstance(embedding_list, list) or len(embedding_list) == 0:
+            logger.warning("Generated embedding is empty or not a list")
+            return None
+
+        try:
+            numeric_embedding = [float(x) for x in embedding_list]
+            if not all(
+                isinstance(x, (int, float)) and not (x != x) for x in numeric_embedding
+            ):  # NaN check
+                logger.warning("Embedding contains non-numeric or NaN values")
+                return None
+        except (ValueError, TypeError) as numeric_error:
+            logger.warning(
+                f"Failed to validate embedding numeric values: {str(numeric_error)}"
+            )
+            return None
+
+        # Check for reasonable embedding dimensions
+        if len(numeric_embedding) < 50 or len(numeric_embedding) > 4096:
+            logger.warning(f"Embedding dimension suspicious: {len(numeric_embedding)}")
+
+        return numeric_embedding
+
+    def _cache_embedding(self, text: str, embedding: List[float]) -> None:
+        """Cache the validated embedding result."""
+        if self.config.cache_embeddings:
+            self._embedding_cache[text] = embedding
+
+    async def generate_embedding(self, text: str) -> Optional[List[float]]:
+        """
+        Generate vector embedding for text using sentence transformers with robust error handling.
+
+        Args:
+            text: Input text to encode
+
+        Returns:
+            List of floats representing the embedding vector, or None if generation fails
+        """
+        # Step 1: Validate input
+        normalized_text = self._validate_embedding_input(text)
+        if not normalized_text:
+            return None
+
+        # Step 2: Check cache
+        cached_result = self._check_embedding_cache(normalized_text)
+        if cached_result is not None:
+            return cached_result
+
+        try:
+            # Step 3: Generate embedding with model
+            raw_embedding = self._encode_with_model(normalized_text)
+            if raw_embedding is None:
+                return None
+
+            # Step 4: Convert to list format
+            embedding_list = self._convert_embedding_to_list(raw_embedding)
+            if embedding_list is None:
+                return None
+
+            # Step 5: Validate values
+            validated_embedding = self._validate_embedding_values(embedding_list)
+            if validated_embedding is None:
+                return None
+
+            # Step 6: Cache result
+            self._cache_embedding(normalized_text, validated_embedding)
+
+            return validated_embedding
+
+        except ImportError as e:
+            logger.warning(f"Missing dependency for embedding generation: {str(e)}")
+            return None
+        except MemoryError as e:
+            logger.error(f"Out of memory while generating embedding: {str(e)}")
+            return None
+        except Exception as e:
+            logger.warning(
+                f"Failed to generate embedding for '{text[:50]}...': {str(e)}"
+            )
+            return None
+
+    async def generate_embeddings(
+        self, texts: List[str]
+    ) -> List[Optional[List[float]]]:
+        """
+        Generate embeddings for many texts with a single model call.
+
+        Cached texts are served from the cache and only the rest are encoded.
+
+        Args:
+            texts: Input texts to encode
+
+        Returns:
+            One embedding (or None if generation failed) per input text
+        """
+        normalized_texts = [self._validate_embedding_input(text) for text in texts]
+
+        embeddings: Dict[str, Optional[List[float]]] = {}
+        pending = []
+        for normalized_text in normalized_texts:
+            if normalized_text and normalized_text not in embeddings:
+                embeddings[normalized_text] = self._check_embedding_cache(
+                    normalized_text
+                )
+                if embeddings[normalized_text] is None:
+                    pending.append(normalized_text)
+
+        if pending:
+            for normalized_text, raw_embedding in zip(
+                pending, self._encode_batch_with_model(pending)
+            ):
+                embedding_list = (
+                    self._convert_embedding_to_list(raw_embedding)
+                    if raw_embedding is not None
+                    else None
+                )
+                validated_embedding = (
+                    self._validate_embedding_values(embedding_list)
+                    if embedding_list is not None
+                    else None
+                )
+                if validated_embedding is not None:
+                    self._cache_embedding(normalized_text, validated_embedding)
+                embeddings[normalized_text] = validated_embedding
+
+        return [
+            embeddings.get(normalized_text) if normalized_text else None
+            for normalized_text in normalized_texts
+        ]
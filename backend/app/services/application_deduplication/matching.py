@@ -2,13 +2,15 @@
 Fuzzy matching utilities for application deduplication
 """
 
-from typing import Optional, Tuple
+from typing import Iterable, List, Optional, Tuple, TypeVar
 import uuid
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.canonical_applications import CanonicalApplication
 
+T = TypeVar("T")
+
 
 class FuzzyMatcher:
     """Handles fuzzy text matching for application names"""
@@ -47,18 +49,45 @@ class FuzzyMatcher:
         max_len = max(len(str1), len(str2))
         return 1.0 - (distance / max_len)
 
-    async def find_fuzzy_match(
+    def best_match(
         self,
-        db: AsyncSession,
         normalized_name: str,
+        candidates: Iterable[Tuple[str, T]],
+        threshold: float,
+    ) -> Optional[Tuple[T, float]]:
+        """Most similar (normalized name, item) candidate at or above threshold"""
+        best_match = None
+        best_similarity = 0.0
+
+        for candidate_name, item in candidates:
+            # Edit distance is at least the length difference, which bounds
+            # the similarity without running Levenshtein
+            max_len = max(len(normalized_name), len(candidate_name)) or 1
+            upper_bound = (
+                1.0 - abs(len(normalized_name) - len(candidate_name)) / max_len
+            )
+            if upper_bound < threshold or upper_bound <= best_similarity:
+                continue
+
+            similarity = self.calculate_text_similarity(normalized_name, candidate_name)
+
+            if similarity > best_similarity and similarity >= threshold:
+                best_similarity = similarity
+                best_match = item
+
+        if best_match is not None:
+            return best_match, best_similarity
+
+        return None
+
+    async def load_candidates(
+        self,
+        db: AsyncSession,
         client_account_id: uuid.UUID,
         engagement_id: uuid.UUID,
-        threshold: float,
         max_candidates: int = 100,
-    ) -> Optional[Tuple[CanonicalApplication, float]]:
-        """Try fuzzy text matching using Levenshtein distance"""
-
-        # Get all canonical applications for this engagement
+    ) -> List[CanonicalApplication]:
+        """Canonical applications of the engagement to fuzzy match against"""
         apps_query = (
             select(CanonicalApplication)
             .where(
@@ -71,21 +100,23 @@ class FuzzyMatcher:
         )
 
         result = await db.execute(apps_query)
-        all_apps = result.scalars().all()
-
-        best_match = None
-        best_similarity = 0.0
-
-        for app in all_apps:
-            similarity = self.calculate_text_similarity(
-                normalized_name, app.normalized_name
-            )
+        return list(result.scalars().all())
 
-            if similarity > best_similarity and similarity >= threshold:
-                best_similarity = similarity
-                best_match = app
+    async def find_fuzzy_match(
+        self,
+        db: AsyncSession,
+        normalized_name: str,
+        client_account_id: uuid.UUID,
+        engagement_id: uuid.UUID,
+        threshold: float,
+        max_candidates: int = 100,
+    ) -> Optional[Tuple[CanonicalApplication, float]]:
+        """Try fuzzy text matching using Levenshtein distance"""
 
-        if best_match:
-            return best_match, best_similarity
+        all_apps = await self.load_candidates(
+            db, client_account_id, engagement_id, max_candidates
+        )
 
-        return None
+        return self.best_match(
+            normalized_name, ((app.normalized_name, app) for app in all_apps), threshold
+        )
@@ -5,10 +5,12 @@ This module implements different matching strategies:
 - Exact matching using hash lookup
 - Fuzzy text matching
 - Vector similarity matching
+
+Batch variants resolve many names with a fixed number of queries.
 """
 
 import uuid
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -79,6 +81,63 @@ async def try_exact_match(
     return None
 
 
+async def find_exact_matches(
+    db: AsyncSession,
+    name_hashes: List[str],
+    client_account_id: uuid.UUID,
+    engagement_id: uuid.UUID,
+) -> Dict[str, Tuple[CanonicalApplication, Optional[ApplicationNameVariant]]]:
+    """Exact matches for many name hashes with one IN query per table
+
+    Canonical names win over variants, and the most recent row wins among
+    duplicates, as in try_exact_match.
+    """
+    matches: Dict[
+        str, Tuple[CanonicalApplication, Optional[ApplicationNameVariant]]
+    ] = {}
+    if not name_hashes:
+        return matches
+
+    canonical_query = (
+        select(CanonicalApplication)
+        .where(
+            and_(
+                CanonicalApplication.client_account_id == client_account_id,
+                CanonicalApplication.engagement_id == engagement_id,
+                CanonicalApplication.name_hash.in_(name_hashes),
+            )
+        )
+        .order_by(CanonicalApplication.created_at.desc())
+    )
+    result = await db.execute(canonical_query)
+    for canonical_app in result.scalars().all():
+        matches.setdefault(canonical_app.name_hash, (canonical_app, None))
+
+    remaining = [name_hash for name_hash in name_hashes if name_hash not in matches]
+    if not remaining:
+        return matches
+
+    variant_query = (
+        select(ApplicationNameVariant)
+        .where(
+            and_(
+                ApplicationNameVariant.client_account_id == client_account_id,
+                ApplicationNameVariant.engagement_id == engagement_id,
+                ApplicationNameVariant.variant_hash.in_(remaining),
+            )
+        )
+        .options(selectinload(ApplicationNameVariant.canonical_application))
+        .order_by(ApplicationNameVariant.created_at.desc())
+    )
+    result = await db.execute(variant_query)
+    for variant in result.scalars().all():
+        matches.setdefault(
+            variant.variant_hash, (variant.canonical_application, variant)
+        )
+
+    return matches
+
+
 async def try_fuzzy_text_match(
     db: AsyncSession,
     normalized_name: str,
@@ -115,5 +174,4 @@ async def try_vector_similarity_match(
         client_account_id,
         engagement_id,
         config.vector_similarity_threshold,
-        config.max_candidates_for_fuzzy,
     )
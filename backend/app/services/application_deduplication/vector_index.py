@@ -0,0 +1,267 @@
+"""
+In-memory vector index for canonical application name embeddings.
+
+Each engagement gets one row-normalized float32 matrix of name embeddings with
+a row -> canonical application id mapping, so cosine similarity for a whole
+batch of names is a single matrix multiply. Indexes are loaded from the
+database on first use, kept current as canonical applications are created in
+this process, and reloaded after a maximum age to pick up rows written
+elsewhere.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.canonical_applications import CanonicalApplication
+from app.services.embeddings.similarity import (
+    QUERY_CHUNK_ROWS,
+    normalize_rows,
+    similarity_matrix,
+    top_k,
+)
+
+logger = logging.getLogger(__name__)
+
+# Engagements whose index is kept in memory at once
+MAX_CACHED_ENGAGEMENTS = 64
+
+IndexKey = Tuple[uuid.UUID, uuid.UUID]
+
+
+class EngagementVectorIndex:
+    """Normalized embedding matrix for the canonical apps of one engagement"""
+
+    def __init__(self, dimension: Optional[int] = None):
+        self.dimension = dimension
+        self.loaded_at = time.monotonic()
+        # Rows [0, len) are live; spare capacity makes appends amortized O(1)
+        self._buffer = np.empty((0, dimension or 0), dtype=np.float32)
+        self._ids: List[uuid.UUID] = []
+        self._rows: Dict[uuid.UUID, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def _matrix(self) -> np.ndarray:
+        return self._buffer[: len(self._ids)]
+
+    def is_expired(self, max_age_seconds: float) -> bool:
+        return time.monotonic() - self.loaded_at > max_age_seconds
+
+    def _as_row(self, embedding: Sequence[float]) -> Optional[np.ndarray]:
+        """Validate one embedding as a normalized row, or None if unusable"""
+        try:
+            row = np.asarray(embedding, dtype=np.float32).reshape(1, -1)
+        except (TypeError, ValueError):
+            return None
+        if row.shape[1] == 0 or not np.isfinite(row).all():
+            return None
+        if self.dimension is None:
+            self.dimension = row.shape[1]
+            self._buffer = np.empty((0, self.dimension), dtype=np.float32)
+        if row.shape[1] != self.dimension:
+            logger.warning(
+                f"Embedding dimension mismatch: {row.shape[1]} vs {self.dimension}"
+            )
+            return None
+        return normalize_rows(row)
+
+    def add_many(
+        self, app_ids: Sequence[uuid.UUID], embeddings: Sequence[Sequence[float]]
+    ) -> int:
+        """Add or replace many embeddings; returns how many were usable"""
+        new_rows: Dict[uuid.UUID, np.ndarray] = {}
+        for app_id, embedding in zip(app_ids, embeddings):
+            row = self._as_row(embedding)
+            if row is None:
+                continue
+            if app_id in self._rows:
+                self._buffer[self._rows[app_id]] = row[0]
+            else:
+                new_rows[app_id] = row[0]
+
+        if new_rows:
+            start = len(self._ids)
+            needed = start + len(new_rows)
+            if needed > self._buffer.shape[0]:
+                grown = np.empty(
+                    (max(needed, 2 * self._buffer.shape[0]), self.dimension),
+                    dtype=np.float32,
+                )
+                grown[:start] = self._buffer[:start]
+                self._buffer = grown
+            self._buffer[start:needed] = list(new_rows.values())
+            for offset, app_id in enumerate(new_rows):
+                self._rows[app_id] = start + offset
+            self._ids.extend(new_rows)
+        return len(new_rows)
+
+    def add(self, app_id: uuid.UUID, embedding: Sequence[float]) -> bool:
+        """Add or replace one application's embedding"""
+        if app_id in self._rows:
+            row = self._as_row(embedding)
+            if row is None:
+                return False
+            self._buffer[self._rows[app_id]] = row[0]
+            return True
+        return self.add_many([app_id], [embedding]) == 1
+
+    def remove(self, app_id: uuid.UUID) -> None:
+        """Drop an application, moving the last row into its slot"""
+        row = self._rows.pop(app_id, None)
+        if row is None:
+            return
+        last = len(self._ids) - 1
+        if row != last:
+            moved_id = self._ids[last]
+            self._buffer[row] = self._buffer[last]
+            self._ids[row] = moved_id
+            self._rows[moved_id] = row
+        self._ids.pop()
+
+    def search(
+        self, queries: Sequence[Sequence[float]], k: int = 1
+    ) -> List[List[Tuple[uuid.UUID, float]]]:
+        """Top-k (application id, cosine similarity) for each query, best first
+
+        Similarities are clamped to [0, 1]. Queries that are unusable (wrong
+        dimension, non-finite) get an empty result.
+        """
+        results: List[List[Tuple[uuid.UUID, float]]] = [[] for _ in queries]
+        if not self._ids or not len(queries) or k <= 0:
+            return results
+
+        valid = []
+        rows = []
+        for position, query in enumerate(queries):
+            row = self._as_row(query)
+            if row is not None:
+                valid.append(position)
+                rows.append(row[0])
+        if not rows:
+            return results
+
+        query_matrix = np.vstack(rows)
+        matrix = self._matrix
+        for start in range(0, len(valid), QUERY_CHUNK_ROWS):
+            scores = similarity_matrix(
+                query_matrix[start : start + QUERY_CHUNK_ROWS], matrix, normalized=True
+            )
+            top, top_scores = top_k(scores, k)
+            top_scores = np.clip(top_scores, 0.0, 1.0)
+            for offset, (columns, values) in enumerate(zip(top, top_scores)):
+                results[valid[start + offset]] = [
+                    (self._ids[column], float(value))
+                    for column, value in zip(columns.tolist(), values.tolist())
+                ]
+        return results
+
+
+class VectorIndexRegistry:
+    """Per-engagement vector indexes, loaded lazily and shared across requests"""
+
+    def __init__(self, max_engagements: int = MAX_CACHED_ENGAGEMENTS):
+        self.max_engagements = max_engagements
+        self._indexes: "OrderedDict[IndexKey, EngagementVectorIndex]" = OrderedDict()
+        self._locks: Dict[IndexKey, asyncio.Lock] = {}
+
+    async def get(
+        self,
+        db: AsyncSession,
+        client_account_id: uuid.UUID,
+        engagement_id: uuid.UUID,
+        max_age_seconds: float,
+    ) -> EngagementVectorIndex:
+        """Index for an engagement, loading it if missing or expired"""
+        key = (client_account_id, engagement_id)
+        index = self._cached(key, max_age_seconds)
+        if index is not None:
+            return index
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            index = self._cached(key, max_age_seconds)
+            if index is None:
+                index = await self._load(db, client_account_id, engagement_id)
+                self._indexes[key] = index
+                while len(self._indexes) > self.max_engagements:
+                    evicted, _ = self._indexes.popitem(last=False)
+                    self._locks.pop(evicted, None)
+        return index
+
+    def _cached(
+        self, key: IndexKey, max_age_seconds: float
+    ) -> Optional[EngagementVectorIndex]:
+        index = self._indexes.get(key)
+        if index is None or index.is_expired(max_age_seconds):
+            return None
+        self._indexes.move_to_end(key)
+        return index
+
+    async def _load(
+        self, db: AsyncSession, client_account_id: uuid.UUID, engagement_id: uuid.UUID
+    ) -> EngagementVectorIndex:
+        """Read every embedded canonical application in the engagement"""
+        result = await db.execute(
+            select(CanonicalApplication.id, CanonicalApplication.name_embedding).where(
+                and_(
+                    CanonicalApplication.client_account_id == client_account_id,
+                    CanonicalApplication.engagement_id == engagement_id,
+                    CanonicalApplication.name_embedding.isnot(None),
+                )
+            )
+        )
+        rows = result.all()
+        index = EngagementVectorIndex()
+        added = index.add_many([row[0] for row in rows], [row[1] for row in rows])
+        logger.debug(
+            f"Loaded vector index for engagement {engagement_id}: "
+            f"{added}/{len(rows)} embeddings"
+        )
+        return index
+
+    def add(
+        self,
+        client_account_id: uuid.UUID,
+        engagement_id: uuid.UUID,
+        app_id: uuid.UUID,
+        embedding: Sequence[float],
+    ) -> None:
+        """Record a new embedding if the engagement's index is loaded"""
+        index = self._indexes.get((client_account_id, engagement_id))
+        if index is not None:
+            index.add(app_id, embedding)
+
+    def discard(
+        self, client_account_id: uuid.UUID, engagement_id: uuid.UUID, app_id: uuid.UUID
+    ) -> None:
+        """Forget an application that no longer exists"""
+        index = self._indexes.get((client_account_id, engagement_id))
+        if index is not None:
+            index.remove(app_id)
+
+    def invalidate(
+        self, client_account_id: uuid.UUID, engagement_id: uuid.UUID
+    ) -> None:
+        """Drop an engagement's index so the next lookup reloads it"""
+        self._indexes.pop((client_account_id, engagement_id), None)
+
+
+_vector_index_registry: Optional[VectorIndexRegistry] = None
+
+
+def get_vector_index_registry() -> VectorIndexRegistry:
+    """Get the process-wide application vector index registry"""
+    global _vector_index_registry
+    if _vector_index_registry is None:
+        _vector_index_registry = VectorIndexRegistry()
+    return _vector_index_registry
@@ -3,15 +3,20 @@ Vector operations for semantic similarity matching
 """
 
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional
 import uuid
 
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.canonical_applications import CanonicalApplication
+from app.models.canonical_applications.base import PGVECTOR_AVAILABLE
+from app.services.embeddings.similarity import cosine_similarity
 
-from .config import get_embedding_model, VECTOR_AVAILABLE, DeduplicationConfig
+from .ann_matching import query_ann_hits
+from .config import DeduplicationConfig
+from .embedding_ops import EmbeddingOperations
+from .vector_index import VectorIndexRegistry, get_vector_index_registry
 
 logger = logging.getLogger(__name__)
 
@@ -23,158 +28,17 @@ except ImportError:
     NUMPY_AVAILABLE = False
 
 
-class VectorOperations:
+class VectorOperations(EmbeddingOperations):
     """Handles vector similarity operations for application deduplication"""
 
-    def __init__(self, config: DeduplicationConfig):
-        self.config = config
-        self._embedding_cache: dict = {}
-
-    def _validate_embedding_input(self, text: str) -> Optional[str]:
-        """Validate and normalize input text for embedding generation."""
-        if not self.config.enable_vector_search or not VECTOR_AVAILABLE:
-            logger.debug("Vector search disabled or vector libraries not available")
-            return None
-
-        if not text or not text.strip():
-            logger.debug("Empty or whitespace-only text provided for embedding")
-            return None
-
-        return text.strip()
-
-    def _check_embedding_cache(self, text: str) -> Optional[List[float]]:
-        """Check cache for existing embedding and clean up invalid entries."""
-        if not self.config.cache_embeddings or text not in self._embedding_cache:
-            return None
-
-        cached_result = self._embedding_cache[text]
-        if isinstance(cached_result, list) and all(
-            isinstance(x, (int, float)) for x in cached_result
-        ):
-            return cached_result
-        else:
-            # Clean up invalid cache entry
-            logger.warning("Invalid cached embedding for text, removing from cache")
-            del self._embedding_cache[text]
-            return None
-
-    def _encode_with_model(self, text: str) -> Optional[any]:
-        """Encode text using the embedding model with error handling."""
-        model = get_embedding_model()
-        if not model:
-            logger.debug("No embedding model available")
-            return None
-
-        try:
-            return model.encode(text, convert_to_tensor=False)
-        except Exception as model_error:
-            logger.warning(
-                f"Model encoding failed for text '{text[:50]}...': {str(model_error)}"
-            )
-            return None
-
-    def _convert_embedding_to_list(self, embedding) -> Optional[List[float]]:
-        """Convert embedding to list format with validation."""
-        if embedding is None:
-            logger.warning("Model returned None embedding")
-            return None
-
-        try:
-            if hasattr(embedding, "tolist"):
-                return embedding.tolist()
-            elif isinstance(embedding, (list, tuple)):
-                return list(embedding)
-            else:
-                logger.warning(f"Unexpected embedding type: {type(embedding)}")
-                return None
-        except Exception as conversion_error:
-            logger.warning(
-                f"Failed to convert embedding to list: {str(conversion_error)}"
-            )
-            return None
-
-    def _validate_embedding_values(self, embedding_list: List) -> Optional[List[float]]:
-        """Validate embedding dimensions and numeric values."""
-        if not isinstance(embedding_list, list) or len(embedding_list) == 0:
-            logger.warning("Generated embedding is empty or not a list")
-            return None
-
-        try:
-            numeric_embedding = [float(x) for x in embedding_list]
-            if not all(
-                isinstance(x, (int, float)) and not (x != x) for x in numeric_embedding
-            ):  # NaN check
-                logger.warning("Embedding contains non-numeric or NaN values")
-                return None
-        except (ValueError, TypeError) as numeric_error:
-            logger.warning(
-                f"Failed to validate embedding numeric values: {str(numeric_error)}"
-            )
-            return None
-
-        # Check for reasonable embedding dimensions
-        if len(numeric_embedding) < 50 or len(numeric_embedding) > 4096:
-            logger.warning(f"Embedding dimension suspicious: {len(numeric_embedding)}")
-
-        return numeric_embedding
-
-    def _cache_embedding(self, text: str, embedding: List[float]) -> None:
-        """Cache the validated embedding result."""
-        if self.config.cache_embeddings:
-            self._embedding_cache[text] = embedding
-
-    async def generate_embedding(self, text: str) -> Optional[List[float]]:
-        """
-        Generate vector embedding for text using sentence transformers with robust error handling.
-
-        Args:
-            text: Input text to encode
-
-        Returns:
-            List of floats representing the embedding vector, or None if generation fails
-        """
-        # Step 1: Validate input
-        normalized_text = self._validate_embedding_input(text)
-        if not normalized_text:
-            return None
-
-        # Step 2: Check cache
-        cached_result = self._check_embedding_cache(normalized_text)
-        if cached_result is not None:
-            return cached_result
-
-        try:
-            # Step 3: Generate embedding with model
-            raw_embedding = self._encode_with_model(normalized_text)
-            if raw_embedding is None:
-                return None
-
-            # Step 4: Convert to list format
-            embedding_list = self._convert_embedding_to_list(raw_embedding)
-            if embedding_list is None:
-                return None
-
-            # Step 5: Validate values
-            validated_embedding = self._validate_embedding_values(embedding_list)
-            if validated_embedding is None:
-                return None
-
-            # Step 6: Cache result
-            self._cache_embedding(normalized_text, validated_embedding)
-
-            return validated_embedding
-
-        except ImportError as e:
-            logger.warning(f"Missing dependency for embedding generation: {str(e)}")
-            return None
-        except MemoryError as e:
-            logger.error(f"Out of memory while generating embedding: {str(e)}")
-            return None
-        except Exception as e:
-            logger.warning(
-                f"Failed to generate embedding for '{text[:50]}...': {str(e)}"
-            )
-            return None
+    def __init__(
+        self,
+        config: DeduplicationConfig,
+        index_registry: Optional[VectorIndexRegistry] = None,
+    ):
+        super().__init__(config)
+        # Per-engagement normalized embedding matrices shared across requests
+        self.index_registry = index_registry or get_vector_index_registry()
 
     def calculate_cosine_similarity(
         self, vec1: List[float], vec2: List[float]
@@ -215,29 +79,15 @@ class VectorOperations:
             return 0.0
 
         try:
-            # Convert to numpy arrays with explicit dtype for stability
-            arr1 = np.array(vec1_numeric, dtype=np.float64)
-            arr2 = np.array(vec2_numeric, dtype=np.float64)
+            pair = np.array([vec1_numeric, vec2_numeric], dtype=np.float32)
 
             # Check for NaN or infinite values
-            if not (np.isfinite(arr1).all() and np.isfinite(arr2).all()):
+            if not np.isfinite(pair).all():
                 logger.warning("Vectors contain NaN or infinite values")
                 return 0.0
 
-            # Calculate norms first to check for zero vectors
-            norm1 = np.linalg.norm(arr1)
-            norm2 = np.linalg.norm(arr2)
-
-            # Handle zero vectors or very small norms
-            if norm1 < 1e-10 or norm2 < 1e-10:
-                logger.debug("One or both vectors have zero or near-zero norm")
-                return 0.0
-
-            # Calculate cosine similarity
-            dot_product = np.dot(arr1, arr2)
-            similarity = dot_product / (norm1 * norm2)
-
-            # Ensure result is finite and in valid range [-1, 1]
+            # Zero vectors score 0.0
+            similarity = cosine_similarity(pair[0], pair[1])
             if not np.isfinite(similarity):
                 logger.warning(
                     "Cosine similarity calculation resulted in non-finite value"
@@ -245,11 +95,9 @@ class VectorOperations:
                 return 0.0
 
             # Clamp to valid range and convert to non-negative [0, 1]
-            similarity_clamped = max(0.0, min(1.0, float(similarity)))
-
-            return similarity_clamped
+            return max(0.0, min(1.0, similarity))
 
-        except (np.linalg.LinAlgError, ValueError, OverflowError) as e:
+        except (ValueError, OverflowError) as e:
             logger.warning(
                 f"NumPy error during cosine similarity calculation: {str(e)}"
             )
@@ -258,111 +106,199 @@ class VectorOperations:
             logger.error(f"Unexpected error in cosine similarity calculation: {str(e)}")
             return 0.0
 
-    def _validate_similarity_search_params(
-        self, application_name: str, threshold: float, max_candidates: int
-    ) -> Optional[tuple[str, float, int]]:
-        """Validate parameters for similarity search."""
-        if not self.config.enable_vector_search:
-            logger.debug("Vector search disabled in configuration")
-            return None
-
-        if not application_name or not application_name.strip():
-            logger.debug("Empty application name provided for vector similarity search")
-            return None
-
-        # Validate threshold parameter
+    def _validate_similarity_threshold(self, threshold: float) -> float:
+        """Validate the similarity threshold, falling back to 0.7."""
         if (
             not isinstance(threshold, (int, float))
             or threshold < 0.0
             or threshold > 1.0
         ):
             logger.warning(f"Invalid threshold value: {threshold}, using default 0.7")
-            threshold = 0.7
+            return 0.7
+        return threshold
 
-        # Validate max_candidates parameter
-        if not isinstance(max_candidates, int) or max_candidates <= 0:
-            logger.warning(
-                f"Invalid max_candidates value: {max_candidates}, using default 100"
+    async def _fetch_applications_by_id(
+        self,
+        db: AsyncSession,
+        app_ids: List[uuid.UUID],
+        client_account_id: uuid.UUID,
+        engagement_id: uuid.UUID,
+    ) -> Dict[uuid.UUID, CanonicalApplication]:
+        """Load matched canonical applications in one tenant-scoped query."""
+        result = await db.execute(
+            select(CanonicalApplication).where(
+                and_(
+                    CanonicalApplication.id.in_(app_ids),
+                    CanonicalApplication.client_account_id == client_account_id,
+                    CanonicalApplication.engagement_id == engagement_id,
+                )
             )
-            max_candidates = 100
+        )
+        return {app.id: app for app in result.scalars().all()}
 
-        return application_name.strip(), threshold, max_candidates
+    async def _resolve_best_hits(
+        self,
+        db: AsyncSession,
+        best_hits: Dict[int, tuple],
+        results: List[Optional[tuple]],
+        client_account_id: uuid.UUID,
+        engagement_id: uuid.UUID,
+    ) -> None:
+        """Fill results[position] with (application, similarity) for each hit."""
+        if not best_hits:
+            return
+
+        apps = await self._fetch_applications_by_id(
+            db,
+            list({app_id for app_id, _ in best_hits.values()}),
+            client_account_id,
+            engagement_id,
+        )
+        for position, (app_id, similarity) in best_hits.items():
+            app = apps.get(app_id)
+            if app is None:
+                # Indexed in a transaction that was rolled back, or deleted
+                self.index_registry.discard(client_account_id, engagement_id, app_id)
+                continue
+            results[position] = (app, similarity)
 
-    async def _fetch_candidate_applications(
+    async def find_vector_similarity_matches(
         self,
         db: AsyncSession,
+        application_names: List[str],
         client_account_id: uuid.UUID,
         engagement_id: uuid.UUID,
-        max_candidates: int,
-    ) -> Optional[List]:
-        """Fetch candidate applications with embeddings from database."""
-        try:
-            apps_query = (
-                select(CanonicalApplication)
-                .where(
-                    and_(
-                        CanonicalApplication.client_account_id == client_account_id,
-                        CanonicalApplication.engagement_id == engagement_id,
-                        CanonicalApplication.name_embedding.isnot(None),
-                    )
-                )
-                .limit(min(max_candidates, 1000))  # Cap at reasonable limit
-            )
+        threshold: float,
+    ) -> List[Optional[tuple]]:
+        """
+        Find the most similar canonical application for each of many names.
+
+        All names are embedded in one model call and scored against every
+        embedded canonical application in the engagement with one matrix
+        multiply over the engagement's vector index.
+
+        Args:
+            db: Database session
+            application_names: Names to find similar matches for
+            client_account_id: Client account scope
+            engagement_id: Engagement scope
+            threshold: Minimum similarity threshold (0.0-1.0)
+
+        Returns:
+            One (best_match, similarity_score) tuple or None per input name
+        """
+        results: List[Optional[tuple]] = [None] * len(application_names)
+        if not self.config.enable_vector_search:
+            logger.debug("Vector search disabled in configuration")
+            return results
 
-            result = await db.execute(apps_query)
-            all_apps = result.scalars().all()
+        validated_threshold = self._validate_similarity_threshold(threshold)
 
-            if not all_apps:
-                logger.debug("No canonical applications with embeddings found in scope")
-                return None
+        try:
+            embeddings = await self.generate_embeddings(application_names)
+            positions = [i for i, embedding in enumerate(embeddings) if embedding]
+            if not positions:
+                return results
+
+            index = await self.index_registry.get(
+                db,
+                client_account_id,
+                engagement_id,
+                self.config.vector_index_max_age_seconds,
+            )
+            hits = index.search([embeddings[i] for i in positions], k=1)
+            best_hits = {
+                position: hit[0]
+                for position, hit in zip(positions, hits)
+                if hit and hit[0][1] >= validated_threshold
+            }
+            await self._resolve_best_hits(
+                db, best_hits, results, client_account_id, engagement_id
+            )
 
-            return all_apps
+            logger.debug(
+                f"Vector index matched {sum(r is not None for r in results)}/"
+                f"{len(application_names)} names against {len(index)} applications"
+            )
 
-        except Exception as db_error:
+        except Exception as e:
             logger.error(
-                f"Database error during vector similarity query: {str(db_error)}"
+                f"Unexpected error in batch vector similarity matching: {str(e)}"
             )
-            return None
 
-    def _find_best_similarity_match(
-        self, input_embedding: List[float], candidate_apps: List, threshold: float
-    ) -> Optional[tuple]:
-        """Find the best similarity match from candidate applications."""
-        best_match = None
-        best_similarity = 0.0
-        comparison_count = 0
-
-        for app in candidate_apps:
-            try:
-                if app.name_embedding and isinstance(app.name_embedding, list):
-                    similarity = self.calculate_cosine_similarity(
-                        input_embedding, app.name_embedding
-                    )
+        return results
 
-                    comparison_count += 1
+    async def find_ann_matches(
+        self,
+        db: AsyncSession,
+        embeddings: List[Optional[List[float]]],
+        client_account_id: uuid.UUID,
+        engagement_id: uuid.UUID,
+        threshold: float,
+    ) -> List[Optional[tuple]]:
+        """
+        Find the nearest canonical application for many embeddings in one query.
 
-                    # Update best match if this similarity is better and meets threshold
-                    if (
-                        similarity > best_similarity
-                        and similarity >= threshold
-                        and isinstance(similarity, (int, float))
-                        and 0.0 <= similarity <= 1.0
-                    ):
-                        best_similarity = similarity
-                        best_match = app
+        The lookup runs in Postgres through pgvector, so nothing is loaded
+        into memory; ann_matching decides per tenant between the HNSW index
+        and an exact scan of the tenant's rows. Without pgvector the
+        column is a plain float array and the engagement's in-memory vector
+        index is searched instead.
 
-            except Exception as comparison_error:
-                logger.warning(
-                    f"Error comparing with app {getattr(app, 'id', 'unknown')}: {str(comparison_error)}"
-                )
-                continue
+        Args:
+            db: Database session
+            embeddings: Query embeddings; None entries are skipped
+            client_account_id: Client account scope
+            engagement_id: Engagement scope
+            threshold: Minimum similarity threshold (0.0-1.0)
 
-        logger.debug(f"Completed {comparison_count} similarity comparisons")
+        Returns:
+            One (best_match, similarity_score) tuple or None per embedding
+        """
+        results: List[Optional[tuple]] = [None] * len(embeddings)
+        positions = [i for i, embedding in enumerate(embeddings) if embedding]
+        if not self.config.enable_vector_search or not positions:
+            return results
 
-        if best_match and best_similarity >= threshold:
-            return best_match, best_similarity
+        validated_threshold = self._validate_similarity_threshold(threshold)
 
-        return None
+        try:
+            if PGVECTOR_AVAILABLE:
+                hits = await query_ann_hits(
+                    db,
+                    [embeddings[i] for i in positions],
+                    client_account_id,
+                    engagement_id,
+                )
+                hits = {positions[i]: hit for i, hit in hits.items()}
+            else:
+                index = await self.index_registry.get(
+                    db,
+                    client_account_id,
+                    engagement_id,
+                    self.config.vector_index_max_age_seconds,
+                )
+                hits = {
+                    position: hit[0]
+                    for position, hit in zip(
+                        positions, index.search([embeddings[i] for i in positions])
+                    )
+                    if hit
+                }
+
+            best_hits = {
+                position: hit
+                for position, hit in hits.items()
+                if hit[1] >= validated_threshold
+            }
+            await self._resolve_best_hits(
+                db, best_hits, results, client_account_id, engagement_id
+            )
+
+        except Exception as e:
+            logger.error(f"Unexpected error in ANN similarity matching: {str(e)}")
+
+        return results
 
     async def find_vector_similarity_match(
         self,
@@ -371,7 +307,6 @@ class VectorOperations:
         client_account_id: uuid.UUID,
         engagement_id: uuid.UUID,
         threshold: float,
-        max_candidates: int = 100,
     ) -> Optional[tuple]:
         """
         Try vector similarity matching using sentence transformers with robust error handling.
@@ -382,53 +317,24 @@ class VectorOperations:
             client_account_id: Client account scope
             engagement_id: Engagement scope
             threshold: Minimum similarity threshold (0.0-1.0)
-            max_candidates: Maximum number of candidates to compare
 
         Returns:
             Tuple of (best_match, similarity_score) or None if no match found
         """
-        try:
-            # Step 1: Validate parameters
-            validated_params = self._validate_similarity_search_params(
-                application_name, threshold, max_candidates
-            )
-            if not validated_params:
-                return None
-
-            app_name, validated_threshold, validated_max_candidates = validated_params
-
-            # Step 2: Generate embedding for input application name
-            input_embedding = await self.generate_embedding(app_name)
-            if not input_embedding:
-                logger.debug(f"Could not generate embedding for '{application_name}'")
-                return None
-
-            # Step 3: Fetch candidate applications
-            candidate_apps = await self._fetch_candidate_applications(
-                db, client_account_id, engagement_id, validated_max_candidates
-            )
-            if not candidate_apps:
-                return None
+        if not application_name or not application_name.strip():
+            logger.debug("Empty application name provided for vector similarity search")
+            return None
 
-            # Step 4: Find best similarity match
-            best_match_result = self._find_best_similarity_match(
-                input_embedding, candidate_apps, validated_threshold
+        best_match_result = (
+            await self.find_vector_similarity_matches(
+                db, [application_name], client_account_id, engagement_id, threshold
             )
+        )[0]
 
-            if best_match_result:
-                best_match, best_similarity = best_match_result
-                logger.info(
-                    f"Vector similarity match found: {best_similarity:.3f} for '{application_name}'"
-                )
-                return best_match, best_similarity
-            else:
-                logger.debug(
-                    f"No vector similarity match found above threshold {validated_threshold}"
-                )
-                return None
-
-        except Exception as e:
-            logger.error(
-                f"Unexpected error in vector similarity matching for '{application_name}': {str(e)}"
+        if best_match_result:
+            logger.info(
+                f"Vector similarity match found: {best_match_result[1]:.3f} for '{application_name}'"
             )
-            return None
+        else:
+            logger.debug(f"No vector similarity match found for '{application_name}'")
+        return best_match_result
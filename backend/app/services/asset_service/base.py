@@ -111,84 +111,17 @@ class AssetService:
         self, asset_data: Dict[str, Any], flow_id: str
     ) -> tuple[str, str, uuid.UUID, uuid.UUID]:
         """Resolve various flow IDs from asset data and parameters."""
-        # Honor explicit flow IDs if provided, fallback to flow_id parameter
-        master_flow_id = asset_data.pop("master_flow_id", None) or flow_id
-        discovery_flow_id = asset_data.pop("discovery_flow_id", None)
+        from app.services.asset_service.flow_resolution import resolve_asset_flow_ids
 
-        # Extract raw_import_records_id for linking
-        raw_import_records_id = self._get_uuid(
-            asset_data.pop("raw_import_records_id", None)
-        )
-
-        # If no discovery_flow_id, lookup from master_flow_id
-        # CC: Fix - discovery_flows have flow_id == master_flow_id, not a separate master_flow_id column
-        if not discovery_flow_id and master_flow_id:
-            try:
-                from app.models.discovery_flow import DiscoveryFlow
-                from sqlalchemy import select
-
-                # Try looking up by flow_id first (which should equal master_flow_id)
-                result = await self.db.execute(
-                    select(DiscoveryFlow.flow_id).where(
-                        DiscoveryFlow.flow_id == master_flow_id
-                    )
-                )
-                discovery_flow = result.scalar_one_or_none()
-                if discovery_flow:
-                    discovery_flow_id = str(discovery_flow)
-                    logger.info(
-                        f"✅ Found discovery_flow_id {discovery_flow_id} for master_flow_id {master_flow_id}"
-                    )
-                else:
-                    # If master_flow_id is the discovery flow ID itself, use it
-                    discovery_flow_id = master_flow_id
-                    logger.info(
-                        f"📌 Using master_flow_id as discovery_flow_id: {discovery_flow_id}"
-                    )
-            except Exception as e:
-                logger.warning(f"Could not lookup discovery_flow_id: {e}")
-                # Fallback to using master_flow_id as discovery_flow_id
-                discovery_flow_id = master_flow_id
-
-        # Use provided flow IDs or fallback to context
-        effective_flow_id = self._get_uuid(
-            master_flow_id
-            or flow_id
-            or asset_data.get("flow_id")
-            or self.context_info.get("flow_id")
-        )
-
-        logger.info(
-            f"🔗 Associating asset with master_flow_id: {master_flow_id}, discovery_flow_id: {discovery_flow_id}"
-        )
-
-        return (
-            master_flow_id,
-            discovery_flow_id,
-            raw_import_records_id,
-            effective_flow_id,
-        )
+        return await resolve_asset_flow_ids(self, asset_data, flow_id)
 
     async def _find_existing_asset(
         self, name: str, client_id: uuid.UUID, engagement_id: uuid.UUID
     ):
         """Check for existing asset with same name in same context."""
-        from app.models.asset import Asset
-        from sqlalchemy import select, and_
+        from app.services.asset_service.operations import find_existing_asset
 
-        try:
-            stmt = select(Asset).where(
-                and_(
-                    Asset.name == name,
-                    Asset.client_account_id == client_id,
-                    Asset.engagement_id == engagement_id,
-                )
-            )
-            result = await self.db.execute(stmt)
-            return result.scalar_one_or_none()
-        except Exception as e:
-            logger.warning(f"Failed to check for existing asset: {e}")
-            return None
+        return await find_existing_asset(self, name, client_id, engagement_id)
 
     async def create_asset(self, asset_data: Dict[str, Any], flow_id: str = None):
         """
@@ -423,3 +356,35 @@ class AssetService:
             flow_id=flow_id,
             upsert=upsert,
         )
+
+    async def bulk_ingest_assets(
+        self,
+        assets_data: List[Dict[str, Any]],
+        flow_id: Optional[str] = None,
+        *,
+        upsert: bool = False,
+        merge_strategy: str = "enrich",
+    ):
+        """
+        COPY-based ingestion for large imports with per-row status reporting.
+
+        Args:
+            assets_data: List of asset information dictionaries
+            flow_id: Optional flow ID
+            upsert: Whether to update existing assets
+            merge_strategy: "enrich" (non-destructive) or "overwrite" (replace)
+
+        Returns:
+            BulkIngestReport with one result per input row
+        """
+        from app.services.asset_service.deduplication.bulk_ingestion import (
+            bulk_ingest_assets,
+        )
+
+        return await bulk_ingest_assets(
+            self,
+            assets_data,
+            flow_id,
+            upsert=upsert,
+            merge_strategy=merge_strategy,
+        )
@@ -9,7 +9,7 @@ Only creates records when user actually supplies data via CSV import.
 """
 
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.context import RequestContext
@@ -40,14 +40,14 @@ def has_contact_data(asset_data: Dict[str, Any]) -> bool:
     return any(asset_data.get(field) for field in contact_fields)
 
 
-async def create_eol_assessment(
-    db: AsyncSession,
-    asset,
+def eol_assessment_values(
+    asset_id,
+    asset_name: str,
     asset_data: Dict[str, Any],
-    context: RequestContext,
-) -> None:
-    """Create EOL assessment record for asset."""
-    from app.models.asset.specialized import AssetEOLAssessment
+    client_account_id,
+    engagement_id,
+) -> Dict[str, Any]:
+    """Column values of the EOL assessment record for an asset."""
     from dateutil import parser as date_parser
 
     # Extract EOL date if provided
@@ -68,38 +68,55 @@ async def create_eol_assessment(
         else:
             logger.warning(
                 f"⚠️ Invalid EOL risk level '{asset_data['eol_risk_level']}' "
-                f"for asset {asset.name}. Must be one of: {valid_levels}"
+                f"for asset {asset_name}. Must be one of: {valid_levels}"
             )
 
-    # Create EOL assessment
-    eol_assessment = AssetEOLAssessment(
-        client_account_id=context.client_account_id,
-        engagement_id=context.engagement_id,
-        asset_id=asset.id,
-        technology_component=asset_data.get("technology_component")
+    return {
+        "client_account_id": client_account_id,
+        "engagement_id": engagement_id,
+        "asset_id": asset_id,
+        "technology_component": asset_data.get("technology_component")
         or asset_data.get("technology_stack")
         or "Unknown",
-        eol_date=eol_date,
-        eol_risk_level=eol_risk_level,
-        assessment_notes=asset_data.get("assessment_notes")
+        "eol_date": eol_date,
+        "eol_risk_level": eol_risk_level,
+        "assessment_notes": asset_data.get("assessment_notes")
         or asset_data.get("eol_notes"),
-        remediation_options=asset_data.get("remediation_options", []),
-    )
-
-    db.add(eol_assessment)
-    await db.flush()
-    logger.info(f"✅ Created EOL assessment for asset {asset.name}")
+        "remediation_options": asset_data.get("remediation_options", []),
+    }
 
 
-async def create_contacts_if_exists(
+async def create_eol_assessment(
     db: AsyncSession,
     asset,
     asset_data: Dict[str, Any],
     context: RequestContext,
 ) -> None:
-    """Create asset contact records if contact information exists."""
-    from app.models.asset.specialized import AssetContact
+    """Create EOL assessment record for asset."""
+    from app.models.asset.specialized import AssetEOLAssessment
+
+    eol_assessment = AssetEOLAssessment(
+        **eol_assessment_values(
+            asset.id,
+            asset.name,
+            asset_data,
+            context.client_account_id,
+            context.engagement_id,
+        )
+    )
 
+    db.add(eol_assessment)
+    await db.flush()
+    logger.info(f"✅ Created EOL assessment for asset {asset.name}")
+
+
+def contact_values(
+    asset_id,
+    asset_data: Dict[str, Any],
+    client_account_id,
+    engagement_id,
+) -> List[Dict[str, Any]]:
+    """Column values of the contact records for an asset, one per contact field."""
     # Define contact mappings: CSV field → contact_type
     contact_mappings = {
         "business_owner_email": ("business_owner", "business_owner_name"),
@@ -109,27 +126,43 @@ async def create_contacts_if_exists(
         "technical_owner": ("technical_owner", "technical_owner_name"),  # Fallback
     }
 
-    contacts_created = 0
+    contacts = []
     for email_field, (contact_type, name_field) in contact_mappings.items():
         email = asset_data.get(email_field)
         if email:
-            # Create contact record
-            contact = AssetContact(
-                client_account_id=context.client_account_id,
-                engagement_id=context.engagement_id,
-                asset_id=asset.id,
-                contact_type=contact_type,
-                email=email,
-                name=asset_data.get(name_field)
-                or email.split("@")[0],  # Extract name from email if not provided
-                phone=asset_data.get(f"{contact_type}_phone"),
+            contacts.append(
+                {
+                    "client_account_id": client_account_id,
+                    "engagement_id": engagement_id,
+                    "asset_id": asset_id,
+                    "contact_type": contact_type,
+                    "email": email,
+                    "name": asset_data.get(name_field)
+                    or email.split("@")[0],  # Extract name from email if not provided
+                    "phone": asset_data.get(f"{contact_type}_phone"),
+                }
             )
-            db.add(contact)
-            contacts_created += 1
+    return contacts
+
+
+async def create_contacts_if_exists(
+    db: AsyncSession,
+    asset,
+    asset_data: Dict[str, Any],
+    context: RequestContext,
+) -> None:
+    """Create asset contact records if contact information exists."""
+    from app.models.asset.specialized import AssetContact
+
+    contacts = contact_values(
+        asset.id, asset_data, context.client_account_id, context.engagement_id
+    )
+    for values in contacts:
+        db.add(AssetContact(**values))
 
-    if contacts_created > 0:
+    if contacts:
         await db.flush()
-        logger.info(f"✅ Created {contacts_created} contact(s) for asset {asset.name}")
+        logger.info(f"✅ Created {len(contacts)} contact(s) for asset {asset.name}")
 
 
 async def create_child_records_if_needed(
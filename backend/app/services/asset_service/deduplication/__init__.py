@@ -45,6 +45,15 @@ from .batch_operations import (
     _find_existing_in_indexes,
 )
 
+# COPY-based bulk ingestion
+from .bulk_ingestion import (
+    BulkIngestReport,
+    BulkIngestRowsFailed,
+    IngestRowResult,
+    bulk_ingest_assets,
+    failed_asset_record,
+)
+
 __all__ = [
     # Constants
     "DEFAULT_ALLOWED_MERGE_FIELDS",
@@ -66,4 +75,10 @@ __all__ = [
     "_build_prefetch_criteria",
     "_build_lookup_indexes",
     "_find_existing_in_indexes",
+    # COPY-based bulk ingestion
+    "BulkIngestReport",
+    "BulkIngestRowsFailed",
+    "IngestRowResult",
+    "bulk_ingest_assets",
+    "failed_asset_record",
 ]
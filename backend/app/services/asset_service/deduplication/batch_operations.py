@@ -106,6 +106,34 @@ def _find_existing_in_indexes(
     return None
 
 
+async def _ingest_via_copy(
+    service_instance,
+    assets_data: List[Dict[str, Any]],
+    flow_id: Optional[str],
+    upsert: bool,
+    merge_strategy: Literal["enrich", "overwrite"],
+) -> List[Tuple[Asset, Literal["created", "existed", "updated"]]]:
+    """Run a large batch through bulk_ingest_assets, returning ORM results."""
+    from .bulk_ingestion import (
+        BulkIngestRowsFailed,
+        bulk_ingest_assets,
+        load_ingested_assets,
+    )
+
+    report = await bulk_ingest_assets(
+        service_instance,
+        assets_data,
+        flow_id,
+        upsert=upsert,
+        merge_strategy=merge_strategy,
+    )
+    results = await load_ingested_assets(service_instance.db, report)
+    failures = report.failure_records(assets_data)
+    if failures:
+        raise BulkIngestRowsFailed(results, failures)
+    return results
+
+
 async def bulk_create_or_update_assets(
     service_instance,
     assets_data: List[Dict[str, Any]],
@@ -127,15 +155,29 @@ async def bulk_create_or_update_assets(
         upsert: If True, allow updates to existing assets
         merge_strategy: "enrich" (non-destructive) or "overwrite" (replace)
 
+    Batches of BULK_INGEST_THRESHOLD rows or more on asyncpg go through the
+    COPY-based bulk_ingest_assets path. The rows it ingests stay in the
+    session; if any row fails, BulkIngestRowsFailed carries their results
+    and one failure record per failed row.
+
     Returns:
         List of (asset, status) tuples
     """
     # Import here to avoid circular dependency
     from .orchestration import create_new_asset
+    from .bulk_ingestion import BULK_INGEST_THRESHOLD
+    from .bulk_ingestion_staging import supports_copy_ingestion
 
     if not assets_data:
         return []
 
+    if len(assets_data) >= BULK_INGEST_THRESHOLD and supports_copy_ingestion(
+        service_instance.db
+    ):
+        return await _ingest_via_copy(
+            service_instance, assets_data, flow_id, upsert, merge_strategy
+        )
+
     # Extract context IDs once
     client_id, engagement_id = await service_instance._extract_context_ids(
         assets_data[0]
@@ -0,0 +1,353 @@
+"""
+Bulk Asset Ingestion
+
+COPY-based ingestion path for large discovery imports. Rows are validated and
+typed in Python, streamed into a temporary staging table with asyncpg COPY,
+matched against existing assets set-wise in SQL using the same hierarchy as
+the batch path (name + type, then hostname, FQDN, IP), and merged into assets
+and the EOL/contact child tables with INSERT ... ON CONFLICT.
+
+Every input row gets a status. Rows the database rejects (CHECK or NOT NULL
+constraints) are isolated by bisecting the failing merge chunk under
+savepoints, so one bad row fails only itself.
+
+Row typing and the COPY live in bulk_ingestion_staging, the matching and
+merge statements in bulk_ingestion_sql.
+
+CC: COPY-based bulk ingestion for asset imports
+"""
+
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple
+
+import sqlalchemy as sa
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DBAPIError
+
+from app.models.asset import Asset
+from ..child_table_helpers import (
+    contact_values,
+    eol_assessment_values,
+    has_contact_data,
+    has_eol_data,
+)
+from ..helpers import get_smart_asset_name
+from .bulk_ingestion_sql import (
+    COLLAPSE_DUPLICATE_CHAINS_SQL,
+    MATCH_BATCH_DUPLICATES_SQL,
+    MATCH_EXISTING_SQL,
+    insert_assets_sql,
+    merge_existing_sql,
+)
+from .bulk_ingestion_staging import (
+    INSERT_DEFAULTS,
+    STAGING_TABLE,
+    stage_rows,
+    staging_ddl,
+)
+
+logger = logging.getLogger(__name__)
+
+# Batches at least this large take the COPY path in bulk_create_or_update_assets
+BULK_INGEST_THRESHOLD = 500
+
+# Staged rows merged into assets per INSERT (and per savepoint)
+MERGE_CHUNK_ROWS = 5000
+
+# Rows per IN (...) list when loading ingested assets back as ORM objects
+LOAD_CHUNK_ROWS = 5000
+
+IngestStatus = Literal["created", "existed", "updated", "failed"]
+
+
+@dataclass
+class IngestRowResult:
+    """Outcome of one input row"""
+
+    row: int
+    status: IngestStatus
+    asset_id: Optional[uuid.UUID] = None
+    error: Optional[str] = None
+    # Earlier row in the same import this one duplicates
+    duplicate_of_row: Optional[int] = None
+
+
+@dataclass
+class BulkIngestReport:
+    """Per-row outcome of a bulk ingestion, in input order"""
+
+    rows: List[IngestRowResult] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    def counts(self) -> Dict[str, int]:
+        counts = {"created": 0, "existed": 0, "updated": 0, "failed": 0}
+        for result in self.rows:
+            counts[result.status] += 1
+        return counts
+
+    @property
+    def rows_per_second(self) -> float:
+        return len(self.rows) / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def failure_records(
+        self, assets_data: Sequence[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """failed_asset_record for every failed row, in input order"""
+        return [
+            failed_asset_record(assets_data[result.row], result.error)
+            for result in self.rows
+            if result.status == "failed"
+        ]
+
+
+def failed_asset_record(asset_data: Dict[str, Any], error: Any) -> Dict[str, Any]:
+    """Failure entry for one import row, as bulk asset creation reports it"""
+    return {
+        "asset_name": asset_data.get("name", "unknown"),
+        "error": str(error),
+        "ip_address": asset_data.get("ip_address"),
+    }
+
+
+class BulkIngestRowsFailed(Exception):
+    """Some rows of a bulk ingest failed; the remaining rows were ingested
+
+    results holds the (asset, status) pairs of the ingested rows and failures
+    one failed_asset_record per failed row.
+    """
+
+    def __init__(
+        self,
+        results: List[Tuple[Asset, str]],
+        failures: List[Dict[str, Any]],
+    ):
+        super().__init__(
+            f"{len(failures)} of {len(results) + len(failures)} rows failed to ingest"
+        )
+        self.results = results
+        self.failures = failures
+
+
+async def _insert_range(
+    db, start: int, stop: int, results: List[Optional[IngestRowResult]]
+) -> None:
+    """Insert staged rows in [start, stop), bisecting around rejected rows"""
+    params = {"start": start, "stop": stop}
+    params.update({f"default_{name}": value for name, value in INSERT_DEFAULTS.items()})
+    try:
+        async with db.begin_nested():
+            result = await db.execute(text(insert_assets_sql()), params)
+            rows = result.all()
+    except DBAPIError as e:
+        if stop - start > 1:
+            middle = (start + stop) // 2
+            await _insert_range(db, start, middle, results)
+            await _insert_range(db, middle, stop, results)
+            return
+        error = str(getattr(e, "orig", e)).splitlines()[0]
+        await db.execute(
+            text(f"UPDATE {STAGING_TABLE} SET failed = true WHERE ordinal = :ordinal"),
+            {"ordinal": start},
+        )
+        if results[start] is None:
+            results[start] = IngestRowResult(start, "failed", error=error)
+        return
+
+    for ordinal, asset_id in rows:
+        results[ordinal] = IngestRowResult(
+            ordinal, "created", asset_id=uuid.UUID(str(asset_id))
+        )
+
+
+async def _insert_child_records(
+    db,
+    assets_data: Sequence[Dict[str, Any]],
+    created: List[IngestRowResult],
+    client_id: uuid.UUID,
+    engagement_id: uuid.UUID,
+) -> None:
+    """EOL assessments and contacts for newly created assets"""
+    from app.models.asset.specialized import AssetContact, AssetEOLAssessment
+
+    eol_rows: List[Dict[str, Any]] = []
+    contact_rows: List[Dict[str, Any]] = []
+    for result in created:
+        asset_data = assets_data[result.row]
+        if has_eol_data(asset_data):
+            eol_rows.append(
+                eol_assessment_values(
+                    result.asset_id,
+                    get_smart_asset_name(asset_data),
+                    asset_data,
+                    client_id,
+                    engagement_id,
+                )
+            )
+        if has_contact_data(asset_data):
+            contact_rows.extend(
+                contact_values(result.asset_id, asset_data, client_id, engagement_id)
+            )
+
+    for model, rows in ((AssetEOLAssessment, eol_rows), (AssetContact, contact_rows)):
+        for start in range(0, len(rows), MERGE_CHUNK_ROWS):
+            await db.execute(
+                pg_insert(model).on_conflict_do_nothing(),
+                rows[start : start + MERGE_CHUNK_ROWS],
+            )
+
+
+async def bulk_ingest_assets(
+    service_instance,
+    assets_data: Sequence[Dict[str, Any]],
+    flow_id: Optional[str] = None,
+    *,
+    upsert: bool = False,
+    merge_strategy: Literal["enrich", "overwrite"] = "enrich",
+) -> BulkIngestReport:
+    """
+    Ingest a large import through a COPY-loaded staging table.
+
+    Deduplication follows bulk_create_or_update_assets: a row matching an
+    existing asset (name + type, hostname, FQDN or IP) is "existed", or
+    "updated" with upsert. A row repeating an earlier row of the same import
+    resolves to that row's asset instead of creating a second one.
+
+    Runs inside the caller's transaction and does not commit. Assets already
+    loaded in the session are not refreshed by upserts.
+
+    Args:
+        service_instance: AssetService instance (self)
+        assets_data: List of asset data dictionaries, all for one tenant context
+        flow_id: Optional flow ID for context
+        upsert: If True, merge rows into the existing assets they match
+        merge_strategy: "enrich" (non-destructive) or "overwrite" (replace)
+
+    Returns:
+        BulkIngestReport with one result per input row, in input order
+    """
+    started = time.perf_counter()
+    results: List[Optional[IngestRowResult]] = [None] * len(assets_data)
+    if not assets_data:
+        return BulkIngestReport()
+
+    db = service_instance.db
+    client_id, engagement_id = await service_instance._extract_context_ids(
+        assets_data[0]
+    )
+
+    # Pending ORM changes must reach the database before the set-wise matching
+    await db.flush()
+    for statement in staging_ddl():
+        await db.execute(text(statement))
+
+    staged, rejected = await stage_rows(
+        service_instance, assets_data, flow_id, client_id, engagement_id
+    )
+    for ordinal, error in rejected.items():
+        results[ordinal] = IngestRowResult(ordinal, "failed", error=error)
+
+    if staged:
+        scope = {"client_account_id": client_id, "engagement_id": engagement_id}
+        await db.execute(text(f"ANALYZE {STAGING_TABLE}"))
+        await db.execute(text(MATCH_EXISTING_SQL), scope)
+        await db.execute(text(MATCH_BATCH_DUPLICATES_SQL))
+        while (await db.execute(text(COLLAPSE_DUPLICATE_CHAINS_SQL))).rowcount:
+            pass
+
+        for start in range(0, len(assets_data), MERGE_CHUNK_ROWS):
+            await _insert_range(
+                db, start, min(start + MERGE_CHUNK_ROWS, len(assets_data)), results
+            )
+
+        # Rows skipped by ON CONFLICT lost a race or repeated a unique key
+        # (hostname) another row claimed first; match them again
+        await db.execute(text(MATCH_EXISTING_SQL), scope)
+
+        if upsert:
+            await db.execute(text(merge_existing_sql(merge_strategy)))
+
+        matched = await db.execute(
+            text(
+                f"SELECT ordinal, existing_id, duplicate_of FROM {STAGING_TABLE} "
+                "WHERE NOT inserted AND NOT failed ORDER BY ordinal"
+            )
+        )
+        for ordinal, existing_id, duplicate_of in matched.all():
+            if existing_id is not None:
+                results[ordinal] = IngestRowResult(
+                    ordinal,
+                    "updated" if upsert else "existed",
+                    asset_id=uuid.UUID(str(existing_id)),
+                )
+            elif duplicate_of is not None:
+                first = results[duplicate_of]
+                if first is not None and first.asset_id is not None:
+                    results[ordinal] = IngestRowResult(
+                        ordinal,
+                        "existed",
+                        asset_id=first.asset_id,
+                        duplicate_of_row=duplicate_of,
+                    )
+                else:
+                    results[ordinal] = IngestRowResult(
+                        ordinal,
+                        "failed",
+                        error=f"duplicate of row {duplicate_of}, which failed",
+                        duplicate_of_row=duplicate_of,
+                    )
+            else:
+                results[ordinal] = IngestRowResult(
+                    ordinal, "failed", error="conflicts with an existing asset"
+                )
+
+        created = [r for r in results if r is not None and r.status == "created"]
+        if created and service_instance._request_context:
+            await _insert_child_records(
+                db, assets_data, created, client_id, engagement_id
+            )
+
+    report = BulkIngestReport(
+        rows=[
+            result or IngestRowResult(ordinal, "failed", error="not processed")
+            for ordinal, result in enumerate(results)
+        ],
+        elapsed_seconds=time.perf_counter() - started,
+    )
+    counts = report.counts()
+    logger.info(
+        f"✅ Bulk ingested {len(assets_data)} assets in "
+        f"{report.elapsed_seconds:.1f}s ({report.rows_per_second:.0f} rows/s): "
+        f"{counts['created']} created, {counts['existed']} existed, "
+        f"{counts['updated']} updated, {counts['failed']} failed"
+    )
+    return report
+
+
+async def load_ingested_assets(
+    db, report: BulkIngestReport
+) -> List[Tuple[Asset, Literal["created", "existed", "updated"]]]:
+    """(asset, status) pairs for the rows of a report that have an asset
+
+    Failed rows are left out. Updated assets are reloaded so the session
+    sees the merged values.
+    """
+    asset_ids = list(
+        dict.fromkeys(r.asset_id for r in report.rows if r.asset_id is not None)
+    )
+    assets: Dict[uuid.UUID, Asset] = {}
+    for start in range(0, len(asset_ids), LOAD_CHUNK_ROWS):
+        result = await db.execute(
+            sa.select(Asset)  # SKIP_TENANT_CHECK - ids come from a scoped ingest
+            .where(Asset.id.in_(asset_ids[start : start + LOAD_CHUNK_ROWS]))
+            .execution_options(populate_existing=True)
+        )
+        assets.update((asset.id, asset) for asset in result.scalars())
+    return [
+        (assets[r.asset_id], r.status)
+        for r in report.rows
+        if r.asset_id is not None and r.asset_id in assets
+    ]
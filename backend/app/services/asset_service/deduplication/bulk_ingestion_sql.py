@@ -0,0 +1,167 @@
+"""
+Bulk Ingestion SQL
+
+Set-wise statements that resolve staged import rows against existing assets
+and merge them into migration.assets. Matching mirrors the batch path's
+hierarchy (name + type, then hostname, FQDN, IP).
+"""
+
+from typing import List, Literal
+
+from .bulk_ingestion_staging import INSERT_DEFAULTS, STAGING_TABLE, staged_columns
+from .constants import DEFAULT_ALLOWED_MERGE_FIELDS, NEVER_MERGE_FIELDS
+
+# Rows still looking for an asset: not matched, merged, or rejected
+_UNRESOLVED = (
+    "s.existing_id IS NULL AND s.duplicate_of IS NULL "
+    "AND NOT s.inserted AND NOT s.failed"
+)
+
+# Priority order of _find_existing_in_indexes: name + type, hostname, fqdn, ip
+MATCH_EXISTING_SQL = f"""
+    WITH candidates AS (
+        SELECT s.ordinal, a.id, 1 AS priority
+        FROM {STAGING_TABLE} s
+        JOIN migration.assets a
+            ON a.name = s.name AND a.asset_type = s.asset_type
+        WHERE a.client_account_id = :client_account_id
+            AND a.engagement_id = :engagement_id AND {_UNRESOLVED}
+        UNION ALL
+        SELECT s.ordinal, a.id, 2
+        FROM {STAGING_TABLE} s
+        JOIN migration.assets a ON a.hostname = s.hostname
+        WHERE s.hostname <> '' AND a.client_account_id = :client_account_id
+            AND a.engagement_id = :engagement_id AND {_UNRESOLVED}
+        UNION ALL
+        SELECT s.ordinal, a.id, 3
+        FROM {STAGING_TABLE} s
+        JOIN migration.assets a ON a.fqdn = s.fqdn
+        WHERE s.fqdn <> '' AND a.client_account_id = :client_account_id
+            AND a.engagement_id = :engagement_id AND {_UNRESOLVED}
+        UNION ALL
+        SELECT s.ordinal, a.id, 4
+        FROM {STAGING_TABLE} s
+        JOIN migration.assets a ON a.ip_address = s.ip_address
+        WHERE s.ip_address <> '' AND a.client_account_id = :client_account_id
+            AND a.engagement_id = :engagement_id AND {_UNRESOLVED}
+    ),
+    best AS (
+        SELECT DISTINCT ON (ordinal) ordinal, id
+        FROM candidates
+        ORDER BY ordinal, priority, id
+    )
+    UPDATE {STAGING_TABLE} s
+    SET existing_id = best.id
+    FROM best
+    WHERE s.ordinal = best.ordinal
+"""
+
+# Rows repeating an earlier new row's key point at that row's first occurrence.
+# Window minimums keep this linear even when many rows share one key.
+MATCH_BATCH_DUPLICATES_SQL = f"""
+    WITH firsts AS (
+        SELECT
+            ordinal,
+            CASE WHEN asset_type IS NOT NULL
+                THEN min(ordinal) OVER (PARTITION BY name, asset_type) END AS by_name,
+            CASE WHEN hostname <> ''
+                THEN min(ordinal) OVER (PARTITION BY hostname) END AS by_hostname,
+            CASE WHEN fqdn <> ''
+                THEN min(ordinal) OVER (PARTITION BY fqdn) END AS by_fqdn,
+            CASE WHEN ip_address <> ''
+                THEN min(ordinal) OVER (PARTITION BY ip_address) END AS by_ip
+        FROM {STAGING_TABLE}
+        WHERE existing_id IS NULL
+    )
+    UPDATE {STAGING_TABLE} s
+    SET duplicate_of = CASE
+        WHEN f.by_name < f.ordinal THEN f.by_name
+        WHEN f.by_hostname < f.ordinal THEN f.by_hostname
+        WHEN f.by_fqdn < f.ordinal THEN f.by_fqdn
+        ELSE f.by_ip
+    END
+    FROM firsts f
+    WHERE s.ordinal = f.ordinal
+        AND LEAST(f.by_name, f.by_hostname, f.by_fqdn, f.by_ip) < f.ordinal
+"""
+
+# A first occurrence found through one key may itself repeat an earlier row
+# through another; point such chains at their root
+COLLAPSE_DUPLICATE_CHAINS_SQL = f"""
+    UPDATE {STAGING_TABLE} s
+    SET duplicate_of = root.duplicate_of
+    FROM {STAGING_TABLE} root
+    WHERE s.duplicate_of = root.ordinal AND root.duplicate_of IS NOT NULL
+"""
+
+
+def insert_assets_sql() -> str:
+    """INSERT of a range of unresolved staged rows into assets"""
+    names = [name for name, _, _ in staged_columns()]
+    selected = [
+        f"COALESCE({name}, :default_{name})" if name in INSERT_DEFAULTS else name
+        for name in names
+    ]
+    return f"""
+        WITH inserted AS (
+            INSERT INTO migration.assets ({", ".join(names)})
+            SELECT {", ".join(selected)}
+            FROM {STAGING_TABLE} s
+            WHERE s.ordinal >= :start AND s.ordinal < :stop AND {_UNRESOLVED}
+            ORDER BY s.ordinal
+            ON CONFLICT DO NOTHING
+            RETURNING id
+        )
+        UPDATE {STAGING_TABLE} s
+        SET inserted = true
+        FROM inserted
+        WHERE s.id = inserted.id
+        RETURNING s.ordinal, s.id
+    """
+
+
+def merge_fields() -> List[str]:
+    """Staged fields an upsert may write to an existing asset"""
+    staged = {name for name, _, _ in staged_columns()}
+    mergeable = DEFAULT_ALLOWED_MERGE_FIELDS - NEVER_MERGE_FIELDS
+    return sorted((mergeable & staged) - {"custom_attributes"})
+
+
+def merge_existing_sql(merge_strategy: Literal["enrich", "overwrite"]) -> str:
+    """UPDATE merging matched staged rows into their existing assets
+
+    Mirrors enrich_asset (fill only missing values; custom attributes merged
+    with the import winning) and overwrite_asset (replace with any supplied
+    value). When several rows match one asset, enrich takes the first and
+    overwrite the last, as sequential processing would leave it.
+    """
+    if merge_strategy == "enrich":
+        assignments = [
+            f"{name} = COALESCE(a.{name}, s.{name})" for name in merge_fields()
+        ]
+        assignments.append(
+            "custom_attributes = (COALESCE(a.custom_attributes::jsonb, '{}'::jsonb) "
+            "|| COALESCE(s.custom_attributes::jsonb, '{}'::jsonb))::json"
+        )
+        row_order = "ASC"
+    else:
+        assignments = [
+            f"{name} = COALESCE(s.{name}, a.{name})" for name in merge_fields()
+        ]
+        assignments.append(
+            "custom_attributes = COALESCE("
+            "NULLIF(s.custom_attributes::jsonb, '{}'::jsonb)::json, a.custom_attributes)"
+        )
+        row_order = "DESC"
+    assignments.append("updated_at = now()")
+    return f"""
+        UPDATE migration.assets a
+        SET {", ".join(assignments)}
+        FROM (
+            SELECT DISTINCT ON (existing_id) *
+            FROM {STAGING_TABLE}
+            WHERE existing_id IS NOT NULL
+            ORDER BY existing_id, ordinal {row_order}
+        ) s
+        WHERE a.id = s.existing_id
+    """
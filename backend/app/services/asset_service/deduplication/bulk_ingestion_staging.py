@@ -0,0 +1,380 @@
+"""
+Bulk Ingestion Staging
+
+COPY half of the bulk ingestion path: import rows are validated and typed
+against the asset column types in Python, then streamed into a temporary
+staging table with asyncpg copy_records_to_table. The staging table has the
+assets column types but none of its constraints, so COPY never rejects a
+typed row; constraint failures surface per row when bulk_ingestion merges
+the staged rows into assets.
+"""
+
+import enum
+import json
+import uuid
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import sqlalchemy as sa
+from dateutil import parser as date_parser
+
+from app.models.asset import Asset, AssetStatus
+from ..helpers import (
+    NUMERIC_FIELD_CONVERTERS,
+    convert_numeric_fields,
+    get_smart_asset_name,
+    safe_float_convert,
+    safe_int_convert,
+)
+from .orchestration import sanitize_check_constraint_fields
+
+# Rows sent per COPY call while streaming into the staging table
+COPY_BATCH_ROWS = 5000
+
+STAGING_TABLE = "asset_ingest_staging"
+
+# Flow references resolved per distinct combination rather than per row
+FLOW_ID_KEYS = ("master_flow_id", "discovery_flow_id", "raw_import_records_id")
+
+# Defaults create_new_asset applies when a field is missing; applied at
+# insert time so that upserts only merge values the import actually supplied
+INSERT_DEFAULTS = {
+    "asset_type": "Unknown",
+    "description": "Discovered by agent",
+    "environment": "Unknown",
+    "criticality": "Medium",
+    "business_criticality": "Medium",
+}
+
+# Asset fields taken from each row, mirroring create_new_asset
+ASSET_DATA_FIELDS = (
+    "asset_type",
+    "description",
+    "hostname",
+    "ip_address",
+    "fqdn",
+    "mac_address",
+    "environment",
+    "location",
+    "datacenter",
+    "rack_location",
+    "availability_zone",
+    "operating_system",
+    "os_version",
+    "business_owner",
+    "technical_owner",
+    "department",
+    "application_name",
+    "technology_stack",
+    "criticality",
+    "business_criticality",
+    "migration_complexity",
+    "business_unit",
+    "vendor",
+    "application_type",
+    "lifecycle",
+    "hosting_model",
+    "server_role",
+    "asset_tags",
+    "security_zone",
+    "database_type",
+    "database_version",
+    "pii_flag",
+    "application_data_classification",
+    "has_saas_replacement",
+    "risk_level",
+    "tshirt_size",
+    "proposed_treatmentplan_rationale",
+    "imported_by",
+    "imported_at",
+    "source_filename",
+)
+
+_TRUE_STRINGS = {"true", "t", "yes", "y", "1"}
+_FALSE_STRINGS = {"false", "f", "no", "n", "0"}
+
+
+def supports_copy_ingestion(db) -> bool:
+    """Whether the session runs on asyncpg, which the COPY path needs"""
+    try:
+        return db.get_bind().dialect.driver == "asyncpg"
+    except Exception:
+        return False
+
+
+def _coerce_boolean(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    normalized = str(value).strip().lower()
+    if normalized in _TRUE_STRINGS:
+        return True
+    if normalized in _FALSE_STRINGS:
+        return False
+    raise ValueError(f"not a boolean: {value!r}")
+
+
+def _coerce_uuid(value: Any) -> uuid.UUID:
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+
+
+def _coerce_datetime(value: Any) -> datetime:
+    if not isinstance(value, datetime):
+        value = date_parser.parse(str(value))
+    # Naive timestamps are UTC throughout the asset service (datetime.utcnow)
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _coerce_json(value: Any) -> str:
+    # PostgreSQL rejects NaN/Infinity in JSON, so they fail the row here
+    return json.dumps(value, default=str, allow_nan=False)
+
+
+def _string_coercer(length: Optional[int]) -> Callable[[Any], str]:
+    def coerce(value: Any) -> str:
+        if isinstance(value, enum.Enum):
+            value = value.value
+        value = value if isinstance(value, str) else str(value)
+        return value[:length] if length else value
+
+    return coerce
+
+
+def _column_coercer(column: sa.Column) -> Callable[[Any], Any]:
+    """Function converting a raw import value to what COPY sends for a column"""
+    column_type = column.type
+    if isinstance(column_type, sa.Boolean):
+        return _coerce_boolean
+    if isinstance(column_type, sa.Integer):
+        return safe_int_convert
+    if isinstance(column_type, sa.Float):
+        return safe_float_convert
+    if isinstance(column_type, sa.JSON):
+        return _coerce_json
+    if isinstance(column_type, sa.Uuid):
+        return _coerce_uuid
+    if isinstance(column_type, sa.DateTime):
+        return _coerce_datetime
+    if isinstance(column_type, sa.String):
+        return _string_coercer(column_type.length)
+    return lambda value: value
+
+
+@lru_cache(maxsize=1)
+def staged_columns() -> Tuple[Tuple[str, Callable[[Any], Any], bool], ...]:
+    """(name, coercer, required) for every asset column an ingest writes
+
+    Columns create_new_asset sets, plus the ones it leaves to Python-side
+    model defaults, which a plain INSERT would otherwise leave NULL.
+    """
+    table = Asset.__table__
+    names = [
+        "id",
+        "client_account_id",
+        "engagement_id",
+        "flow_id",
+        "master_flow_id",
+        "discovery_flow_id",
+        "raw_import_records_id",
+        "name",
+        "asset_name",
+        *ASSET_DATA_FIELDS,
+        *NUMERIC_FIELD_CONVERTERS,
+        "status",
+        "migration_status",
+        "created_at",
+        "updated_at",
+        "custom_attributes",
+        "discovery_method",
+        "discovery_source",
+        "discovery_timestamp",
+        "raw_data",
+    ]
+    names += [
+        column.name
+        for column in table.columns
+        if column.default is not None and column.name not in names
+    ]
+    return tuple(
+        (
+            name,
+            _column_coercer(table.c[name]),
+            not table.c[name].nullable and name not in INSERT_DEFAULTS,
+        )
+        for name in dict.fromkeys(names)
+    )
+
+
+@lru_cache(maxsize=1)
+def _model_defaults() -> Dict[str, Any]:
+    """Python-side defaults of asset columns create_new_asset does not set"""
+    defaults = {}
+    for column in Asset.__table__.columns:
+        if column.default is None or column.name == "id":
+            continue
+        if column.default.is_scalar:
+            defaults[column.name] = column.default.arg
+        elif column.default.is_callable:
+            defaults[column.name] = column.default.arg(None)
+    return defaults
+
+
+def staging_record(
+    asset_data: Dict[str, Any],
+    ordinal: int,
+    client_id: uuid.UUID,
+    engagement_id: uuid.UUID,
+    flow_ids: Tuple[Any, Any, Any],
+    raw_import_records_id: Optional[uuid.UUID],
+    now: datetime,
+) -> tuple:
+    """Typed staging row for one import row
+
+    Raises ValueError (or TypeError) when a value cannot be converted to its
+    column type or a required column is empty; the caller fails just that
+    row.
+    """
+    master_flow_id, discovery_flow_id, effective_flow_id = flow_ids
+    smart_name = get_smart_asset_name(asset_data)
+    values = _model_defaults().copy()
+    values.update({name: asset_data.get(name) for name in ASSET_DATA_FIELDS})
+    values.update(
+        {
+            "id": uuid.uuid4(),
+            "client_account_id": client_id,
+            "engagement_id": engagement_id,
+            "flow_id": effective_flow_id,
+            "master_flow_id": master_flow_id or effective_flow_id,
+            "discovery_flow_id": discovery_flow_id or effective_flow_id,
+            "raw_import_records_id": raw_import_records_id,
+            "name": smart_name,
+            "asset_name": smart_name,
+            "status": AssetStatus.DISCOVERED,
+            "migration_status": AssetStatus.DISCOVERED,
+            "created_at": now,
+            "updated_at": now,
+            "custom_attributes": asset_data.get("attributes", {})
+            or asset_data.get("custom_attributes", {}),
+            "discovery_method": "service_api",
+            "discovery_source": asset_data.get("discovery_source", "Service API"),
+            "discovery_timestamp": now,
+            "raw_data": {
+                key: value
+                for key, value in asset_data.items()
+                if key not in FLOW_ID_KEYS
+            },
+        }
+    )
+    values.update(convert_numeric_fields(asset_data))
+    sanitize_check_constraint_fields(values)
+
+    record = []
+    for name, coerce, required in staged_columns():
+        value = values.get(name)
+        if value is not None:
+            try:
+                value = coerce(value)
+            except (ValueError, TypeError, OverflowError) as e:
+                raise ValueError(f"{name}: {e}") from e
+        if value is None and required:
+            raise ValueError(f"{name} is required")
+        record.append(value)
+    record.append(ordinal)
+    return tuple(record)
+
+
+def staging_ddl() -> List[str]:
+    columns = ", ".join(name for name, _, _ in staged_columns())
+    return [
+        f"DROP TABLE IF EXISTS pg_temp.{STAGING_TABLE}",
+        # Same column types as assets; no constraints, so COPY never rejects
+        # a typed row and constraint failures surface per row at merge time
+        f"CREATE TEMP TABLE {STAGING_TABLE} ON COMMIT DROP AS "
+        f"SELECT {columns} FROM migration.assets WITH NO DATA",
+        f"ALTER TABLE {STAGING_TABLE} "
+        "ADD COLUMN ordinal integer, "
+        "ADD COLUMN existing_id uuid, "
+        "ADD COLUMN duplicate_of integer, "
+        "ADD COLUMN inserted boolean NOT NULL DEFAULT false, "
+        "ADD COLUMN failed boolean NOT NULL DEFAULT false",
+    ]
+
+
+async def stage_rows(
+    service_instance,
+    assets_data: Sequence[Dict[str, Any]],
+    flow_id: Optional[str],
+    client_id: uuid.UUID,
+    engagement_id: uuid.UUID,
+) -> Tuple[int, Dict[int, str]]:
+    """Validate rows and COPY them into the staging table
+
+    Returns the number of rows staged and the validation error of each row
+    that was not, by ordinal.
+    """
+    connection = await service_instance.db.connection()
+    raw_connection = await connection.get_raw_connection()
+    driver_connection = raw_connection.driver_connection
+    column_names = [name for name, _, _ in staged_columns()] + ["ordinal"]
+
+    flow_id_cache: Dict[Tuple[Any, Any, Any], Tuple[Any, Any, Any]] = {}
+    now = datetime.now(timezone.utc)
+    batch: List[tuple] = []
+    staged = 0
+    rejected: Dict[int, str] = {}
+
+    async def copy_batch() -> None:
+        await driver_connection.copy_records_to_table(
+            STAGING_TABLE, records=batch, columns=column_names
+        )
+
+    for ordinal, asset_data in enumerate(assets_data):
+        try:
+            row_client_id, row_engagement_id = (
+                await service_instance._extract_context_ids(asset_data)
+            )
+            if (row_client_id, row_engagement_id) != (client_id, engagement_id):
+                raise ValueError("tenant context differs from the rest of the import")
+
+            flow_key = (
+                asset_data.get("master_flow_id"),
+                asset_data.get("discovery_flow_id"),
+                asset_data.get("flow_id"),
+            )
+            if flow_key not in flow_id_cache:
+                master, discovery, _, effective = (
+                    await service_instance._resolve_flow_ids(
+                        {
+                            "master_flow_id": flow_key[0],
+                            "discovery_flow_id": flow_key[1],
+                            "flow_id": flow_key[2],
+                        },
+                        flow_id,
+                    )
+                )
+                flow_id_cache[flow_key] = (master, discovery, effective)
+
+            batch.append(
+                staging_record(
+                    asset_data,
+                    ordinal,
+                    client_id,
+                    engagement_id,
+                    flow_id_cache[flow_key],
+                    service_instance._get_uuid(asset_data.get("raw_import_records_id")),
+                    now,
+                )
+            )
+        except (ValueError, TypeError) as e:
+            rejected[ordinal] = str(e)
+            continue
+
+        if len(batch) >= COPY_BATCH_ROWS:
+            await copy_batch()
+            staged += len(batch)
+            batch = []
+
+    if batch:
+        await copy_batch()
+        staged += len(batch)
+    return staged, rejected
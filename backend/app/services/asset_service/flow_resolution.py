@@ -0,0 +1,75 @@
+"""
+Asset Flow Resolution
+
+Resolves the master flow, discovery flow and raw import record an asset is
+linked to, looking up the discovery flow when only the master flow is known.
+"""
+
+import logging
+import uuid
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+
+async def resolve_asset_flow_ids(
+    service_instance, asset_data: Dict[str, Any], flow_id: str
+) -> tuple[str, str, uuid.UUID, uuid.UUID]:
+    """Resolve various flow IDs from asset data and parameters."""
+    # Honor explicit flow IDs if provided, fallback to flow_id parameter
+    master_flow_id = asset_data.pop("master_flow_id", None) or flow_id
+    discovery_flow_id = asset_data.pop("discovery_flow_id", None)
+
+    # Extract raw_import_records_id for linking
+    raw_import_records_id = service_instance._get_uuid(
+        asset_data.pop("raw_import_records_id", None)
+    )
+
+    # If no discovery_flow_id, lookup from master_flow_id
+    # CC: Fix - discovery_flows have flow_id == master_flow_id, not a separate master_flow_id column
+    if not discovery_flow_id and master_flow_id:
+        try:
+            from app.models.discovery_flow import DiscoveryFlow
+            from sqlalchemy import select
+
+            # Try looking up by flow_id first (which should equal master_flow_id)
+            result = await service_instance.db.execute(
+                select(DiscoveryFlow.flow_id).where(
+                    DiscoveryFlow.flow_id == master_flow_id
+                )
+            )
+            discovery_flow = result.scalar_one_or_none()
+            if discovery_flow:
+                discovery_flow_id = str(discovery_flow)
+                logger.info(
+                    f"✅ Found discovery_flow_id {discovery_flow_id} for master_flow_id {master_flow_id}"
+                )
+            else:
+                # If master_flow_id is the discovery flow ID itself, use it
+                discovery_flow_id = master_flow_id
+                logger.info(
+                    f"📌 Using master_flow_id as discovery_flow_id: {discovery_flow_id}"
+                )
+        except Exception as e:
+            logger.warning(f"Could not lookup discovery_flow_id: {e}")
+            # Fallback to using master_flow_id as discovery_flow_id
+            discovery_flow_id = master_flow_id
+
+    # Use provided flow IDs or fallback to context
+    effective_flow_id = service_instance._get_uuid(
+        master_flow_id
+        or flow_id
+        or asset_data.get("flow_id")
+        or service_instance.context_info.get("flow_id")
+    )
+
+    logger.info(
+        f"🔗 Associating asset with master_flow_id: {master_flow_id}, discovery_flow_id: {discovery_flow_id}"
+    )
+
+    return (
+        master_flow_id,
+        discovery_flow_id,
+        raw_import_records_id,
+        effective_flow_id,
+    )
@@ -16,7 +16,9 @@ from sqlalchemy import select, and_
 
 from app.models.asset import Asset, AssetStatus
 from .helpers import get_smart_asset_name, convert_numeric_fields
-from .deduplication import create_or_update_asset
+from .deduplication import create_or_update_asset, bulk_create_or_update_assets
+from .deduplication.bulk_ingestion import BULK_INGEST_THRESHOLD
+from .deduplication.bulk_ingestion_staging import supports_copy_ingestion
 
 logger = logging.getLogger(__name__)
 
@@ -57,12 +59,24 @@ async def bulk_create_assets(
         service_instance: AssetService instance (self)
         assets_data: List of asset data dictionaries
 
+    Large batches are handed to bulk_create_or_update_assets, which loads
+    them through the COPY-based ingestion path and raises
+    BulkIngestRowsFailed when some of their rows fail.
+
     Returns:
         List of created assets
     """
     created_assets = []
 
     try:
+        if len(assets_data) >= BULK_INGEST_THRESHOLD and supports_copy_ingestion(
+            service_instance.db
+        ):
+            results = await bulk_create_or_update_assets(service_instance, assets_data)
+            created_assets = [asset for asset, _ in results]
+            logger.info(f"✅ Bulk created {len(created_assets)} assets")
+            return created_assets
+
         for asset_data in assets_data:
             asset = await create_asset(service_instance, asset_data)
             if asset:
@@ -105,12 +105,15 @@ class CacheOperationsMixin:
         success = False
 
         try:
-            # Try Redis first
+            # Try Redis first; indexed under its prefixes so pattern
+            # invalidations resolve it without a SCAN
             if self.redis_cache.enabled:
                 if use_secure:
-                    redis_success = await self.redis_cache.set_secure(key, value, ttl)
+                    redis_success = await self.redis_cache.set_secure(
+                        key, value, ttl, tags=[]
+                    )
                 else:
-                    redis_success = await self.redis_cache.set(key, value, ttl)
+                    redis_success = await self.redis_cache.set(key, value, ttl, tags=[])
 
                 if redis_success:
                     success = True
@@ -63,6 +63,11 @@ class MonitoringMixin:
             "cache_size_estimate": self.stats.cache_size_estimate,
             "last_reset": self.stats.last_reset.isoformat(),
             "fallback_cache": fallback_stats,
+            "layers": (
+                self.redis_cache.get_layer_stats()
+                if hasattr(self.redis_cache, "get_layer_stats")
+                else None
+            ),
             "activity_buffers": {
                 "active_users": len(self.activity_buffers),
                 "total_buffered_activities": sum(
@@ -232,7 +232,9 @@ class RepairHandler:
 
             # Update cache with fresh data
             ttl = CacheKeys.get_ttl_recommendation(result.cache_key)
-            success = await self.redis_cache.set(result.cache_key, db_value, ttl)
+            success = await self.redis_cache.set(
+                result.cache_key, db_value, ttl, tags=[]
+            )
 
             if success:
                 logger.info(f"Successfully refreshed cache for {result.cache_key}")
@@ -293,6 +293,8 @@ class CacheInvalidationManager:
             Task ID or InvalidationResult
         """
         metadata = metadata or {}
+        # The strategies resolve prefix:* patterns through the tag index and
+        # scan only for the patterns it cannot resolve
         metadata.update(
             {
                 "patterns": [pattern],
@@ -310,6 +312,40 @@ class CacheInvalidationManager:
             wait_for_completion=wait_for_completion,
         )
 
+    async def invalidate_tags(
+        self,
+        tags: List[str],
+        client_account_id: str,
+        priority: InvalidationPriority = InvalidationPriority.MEDIUM,
+        metadata: Optional[Dict[str, Any]] = None,
+        wait_for_completion: bool = False,
+    ) -> Union[str, InvalidationResult]:
+        """
+        Invalidate every cache key written under any of the given tags.
+
+        Args:
+            tags: Tags such as ``flow:<id>``, ``engagement:<id>`` or ``client:<id>``
+            client_account_id: Client account for tenant isolation
+            priority: Invalidation priority
+            metadata: Additional metadata
+            wait_for_completion: If True, wait for completion
+
+        Returns:
+            Task ID or InvalidationResult
+        """
+        metadata = metadata or {}
+        metadata.update({"tags": list(tags), "invalidation_type": "tag"})
+
+        return await self.invalidate(
+            trigger=InvalidationTrigger.MANUAL_INVALIDATION,
+            entity_type="tag",
+            entity_id=",".join(tags),
+            client_account_id=client_account_id,
+            priority=priority,
+            metadata=metadata,
+            wait_for_completion=wait_for_completion,
+        )
+
     async def invalidate_bulk(
         self,
         events: List[
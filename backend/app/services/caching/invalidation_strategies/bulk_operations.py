@@ -12,6 +12,7 @@ import time
 from typing import Any, Dict, List, Optional
 
 from app.core.logging import get_logger
+from app.services.caching.redis_cache.tags import split_patterns
 
 from .base import (
     BaseInvalidationStrategy,
@@ -53,9 +54,10 @@ class BulkInvalidationStrategy(BaseInvalidationStrategy):
             # Extract bulk operation parameters
             keys_to_invalidate = event.metadata.get("keys", [])
             patterns = event.metadata.get("patterns", [])
+            tags = list(event.metadata.get("tags", []))
             operation_type = event.metadata.get("operation_type", "delete")
 
-            if not keys_to_invalidate and not patterns:
+            if not keys_to_invalidate and not patterns and not tags:
                 return InvalidationResult(
                     success=False,
                     keys_invalidated=0,
@@ -64,9 +66,14 @@ class BulkInvalidationStrategy(BaseInvalidationStrategy):
                     errors=["No keys or patterns provided for bulk operation"],
                 )
 
-            # Expand patterns to actual keys
+            # Expand patterns to actual keys; prefix:* patterns use the tag
+            # index, and are also scanned with the SCAN fallback on
+            pattern_tags, scan_patterns = split_patterns(
+                patterns, self.redis_cache.tag_scan_fallback
+            )
+            tags.extend(pattern_tags)
             all_keys = list(keys_to_invalidate)
-            for pattern in patterns:
+            for pattern in scan_patterns:
                 pattern_keys = await self._find_keys_by_pattern(pattern)
                 all_keys.extend(pattern_keys)
 
@@ -76,6 +83,10 @@ class BulkInvalidationStrategy(BaseInvalidationStrategy):
             # Execute bulk operation
             if operation_type == "delete":
                 result = await self._bulk_delete(unique_keys)
+                if tags:
+                    result[
+                        "keys_invalidated"
+                    ] += await self.redis_cache.invalidate_tags(tags)
             else:
                 return InvalidationResult(
                     success=False,
@@ -94,6 +105,7 @@ class BulkInvalidationStrategy(BaseInvalidationStrategy):
                 strategy_used=self.get_strategy_name(),
                 metadata={
                     "total_keys": len(unique_keys),
+                    "tags": tags,
                     "failed_keys": result["failed_keys"],
                     "operation_type": operation_type,
                 },
@@ -195,10 +207,7 @@ class BulkInvalidationStrategy(BaseInvalidationStrategy):
     async def _find_keys_by_pattern(self, pattern: str) -> List[str]:
         """Find cache keys matching a pattern"""
         try:
-            # This would require Redis SCAN functionality
-            # For now, return empty list - would need to implement with RedisCache
-            logger.warning(f"Pattern matching not implemented for pattern: {pattern}")
-            return []
+            return await self.redis_cache.scan_keys(pattern)
         except Exception as e:
             logger.error(f"Error finding keys by pattern {pattern}: {e}")
             return []
@@ -261,20 +270,24 @@ class BulkInvalidationStrategy(BaseInvalidationStrategy):
         start_time = time.time()
 
         try:
-            # This would require implementing tag-based caching
-            # For now, return empty result
-            logger.warning(f"Tag-based invalidation not implemented for tags: {tags}")
+            if operation != "union":
+                # Sets of keys sharing every tag are not indexed
+                return InvalidationResult(
+                    success=False,
+                    keys_invalidated=0,
+                    execution_time_ms=(time.time() - start_time) * 1000,
+                    strategy_used=self.get_strategy_name(),
+                    errors=[f"Unsupported tag operation: {operation}"],
+                )
+
+            keys_invalidated = await self.redis_cache.invalidate_tags(tags)
 
             return InvalidationResult(
                 success=True,
-                keys_invalidated=0,
+                keys_invalidated=keys_invalidated,
                 execution_time_ms=(time.time() - start_time) * 1000,
                 strategy_used=self.get_strategy_name(),
-                metadata={
-                    "tags": tags,
-                    "operation": operation,
-                    "implementation_status": "not_implemented",
-                },
+                metadata={"tags": tags, "operation": operation},
             )
 
         except Exception as e:
@@ -197,9 +197,7 @@ class EventDrivenInvalidationStrategy(BaseInvalidationStrategy, EventHandlerMixi
 
     async def _find_keys_by_pattern(self, pattern: str) -> List[str]:
         """Find cache keys matching a pattern"""
-        # This would require Redis SCAN functionality
-        # For now, return empty list - would need to implement with RedisCache
-        return []
+        return await self.redis_cache.scan_keys(pattern)
 
     def _build_cascade_relationships(self) -> Dict[str, Set[str]]:
         """Build cache key cascade relationships"""
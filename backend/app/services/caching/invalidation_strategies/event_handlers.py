@@ -13,6 +13,7 @@ from typing import List
 
 from app.constants.cache_keys import CacheKeys
 from app.core.logging import get_logger
+from app.services.caching.redis_cache.tags import split_patterns
 
 from .base import InvalidationEvent, InvalidationResult, InvalidationTrigger
 
@@ -262,23 +263,31 @@ class EventHandlerMixin:
         """Handle manual invalidation requests"""
         start_time = time.time()
 
-        # Use patterns or specific keys from metadata
+        # Use tags, patterns or specific keys from metadata
+        tags = list(event.metadata.get("tags", []))
         patterns = event.metadata.get("patterns", [])
         specific_keys = event.metadata.get("keys", [])
 
+        # prefix:* patterns resolve through the tag index; others (and, with
+        # the SCAN fallback on, indexed ones too) are matched by scanning
+        pattern_tags, scan_patterns = split_patterns(
+            patterns, self.redis_cache.tag_scan_fallback
+        )
+        tags.extend(pattern_tags)
+
         keys_invalidated = 0
 
-        # Handle specific keys
-        for cache_key in specific_keys:
+        # Tagged keys and specific keys
+        if tags or specific_keys:
             try:
-                deleted = await self.redis_cache.delete(cache_key)
-                if deleted:
-                    keys_invalidated += 1
+                keys_invalidated += await self.redis_cache.invalidate_tags(
+                    tags, keys=specific_keys
+                )
             except Exception as e:
-                logger.error(f"Failed to delete cache key {cache_key}: {e}")
+                logger.error(f"Failed to invalidate tags {tags}: {e}")
 
         # Handle patterns (would need pattern matching support in Redis)
-        for pattern in patterns:
+        for pattern in scan_patterns:
             try:
                 # This would require implementing pattern-based deletion
                 pattern_keys = await self._find_keys_by_pattern(pattern)
@@ -299,6 +308,7 @@ class EventHandlerMixin:
             metadata={
                 "trigger": "manual_invalidation",
                 "patterns": patterns,
+                "tags": tags,
                 "keys": specific_keys,
             },
         )
@@ -347,9 +357,7 @@ class EventHandlerMixin:
 
     async def _find_keys_by_pattern(self, pattern: str) -> List[str]:
         """Find cache keys matching a pattern"""
-        # This would require Redis SCAN functionality
-        # For now, return empty list - would need to implement with RedisCache
-        return []
+        return await self.redis_cache.scan_keys(pattern)
 
 
 __all__ = [
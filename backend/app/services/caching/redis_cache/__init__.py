@@ -2,8 +2,8 @@
 Redis Cache Service with Upstash and Local Redis Support
 
 This service provides a unified interface for Redis caching with support for:
-- Upstash Redis (for production)
-- redis.asyncio (for local async Redis)
+- Upstash Redis (for production, async REST client with pipelining)
+- redis.asyncio (for local async Redis, connection-pooled)
 - Synchronous Redis fallback (wrapped in async)
 - In-memory fallback when Redis is unavailable
 
@@ -15,15 +15,19 @@ The service is modularized into:
 - failures: Failure handling and dead letter queue
 - patterns: Pattern learning cache
 - sse: Server-sent events client registry
-- wrappers: Async compatibility for sync clients
+- tags: Tag index that replaces SCAN-based pattern invalidation
+- near_cache: Optional process-local LRU in front of Redis, coherent over pub/sub
+- wrappers: Async compatibility for sync clients and Upstash pipelines
+- codec: Pluggable value codecs (json, orjson, msgpack) with zstd compression
 - serializers: JSON serialization/deserialization utilities
 - utils: Utility functions and decorators
 """
 
+from .codec import CacheSerializer
 from .core import RedisCache
 from .serializers import datetime_json_deserializer, datetime_json_serializer
 from .utils import redis_fallback
-from .wrappers import AsyncPipelineWrapper, AsyncRedisWrapper
+from .wrappers import AsyncPipelineWrapper, AsyncRedisWrapper, AsyncUpstashWrapper
 
 # Singleton instance
 _redis_cache_instance = None
@@ -45,9 +49,11 @@ __all__ = [
     "RedisCache",
     "get_redis_cache",
     "redis_cache",
+    "CacheSerializer",
     "datetime_json_serializer",
     "datetime_json_deserializer",
     "redis_fallback",
     "AsyncRedisWrapper",
     "AsyncPipelineWrapper",
+    "AsyncUpstashWrapper",
 ]
@@ -5,27 +5,58 @@ Handles client setup for different Redis providers (Upstash, async, sync).
 """
 
 import json
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
 
 from app.core.config import settings
 from app.core.logging import get_logger
 from app.core.security.cache_encryption import SecureCache
 
-from .serializers import datetime_json_serializer, datetime_json_deserializer
+from .codec import CacheSerializer, is_framed
+from .near_cache import LayerStats, NearCache
+from .serializers import datetime_json_deserializer
 from .utils import redis_fallback
-from .wrappers import AsyncRedisWrapper
+from .wrappers import AsyncRedisWrapper, AsyncUpstashWrapper
 
 logger = get_logger(__name__)
 
+# Connection pool settings shared by the async and sync-wrapped clients
+POOL_CONFIG = {
+    "max_connections": 50,
+    "socket_connect_timeout": 10,
+    "socket_timeout": 10,
+    "socket_keepalive": True,
+    "retry_on_timeout": True,
+    "health_check_interval": 30,
+}
+
 
 class RedisBaseCache:
     """Base Redis cache service with client initialization"""
 
+    # Plain JSON for instances built without __init__; __init__ applies the
+    # configured codec. Reads handle every codec either way
+    serializer = CacheSerializer()
+
     def __init__(self):
         self.enabled = settings.REDIS_ENABLED
         self.client = None
         self.client_type = None
         self.default_ttl = settings.REDIS_DEFAULT_TTL
+        self.redis_stats = LayerStats()
+        self.near_cache = (
+            NearCache(
+                max_entries=settings.REDIS_NEAR_CACHE_MAX_ENTRIES,
+                max_bytes=settings.REDIS_NEAR_CACHE_MAX_BYTES,
+            )
+            if settings.REDIS_NEAR_CACHE_ENABLED
+            else None
+        )
+        self.serializer = CacheSerializer(
+            codec=settings.REDIS_CACHE_CODEC,
+            compression=settings.REDIS_CACHE_COMPRESSION,
+            compress_threshold=settings.REDIS_CACHE_COMPRESS_THRESHOLD,
+        )
+        self.tag_scan_fallback = settings.REDIS_CACHE_TAG_SCAN_FALLBACK
 
         if not self.enabled:
             logger.info("Redis cache is disabled")
@@ -37,14 +68,21 @@ class RedisBaseCache:
         self.secure_cache = SecureCache(self)
 
     def _initialize_client(self):
-        """Initialize the appropriate Redis client based on configuration"""
+        """Initialize the appropriate Redis client based on configuration.
+
+        Every client type is awaitable: Upstash goes through its async REST
+        client, local Redis through a pooled redis.asyncio client.
+        """
         # Try Upstash Redis first (for production)
         if hasattr(settings, "UPSTASH_REDIS_URL") and settings.UPSTASH_REDIS_URL:
             try:
-                from upstash_redis import Redis as UpstashRedis
+                from upstash_redis.asyncio import Redis as UpstashRedis
 
-                self.client = UpstashRedis(
-                    url=settings.UPSTASH_REDIS_URL, token=settings.UPSTASH_REDIS_TOKEN
+                self.client = AsyncUpstashWrapper(
+                    UpstashRedis(
+                        url=settings.UPSTASH_REDIS_URL,
+                        token=settings.UPSTASH_REDIS_TOKEN,
+                    )
                 )
                 self.client_type = "upstash"
                 logger.info("Connected to Upstash Redis")
@@ -57,9 +95,10 @@ class RedisBaseCache:
             try:
                 import redis.asyncio as redis_async
 
-                self.client = redis_async.from_url(
-                    settings.REDIS_URL, decode_responses=True
+                pool = redis_async.ConnectionPool.from_url(
+                    settings.REDIS_URL, decode_responses=True, **POOL_CONFIG
                 )
+                self.client = redis_async.Redis(connection_pool=pool)
                 self.client_type = "async"
                 logger.info("Connected to async Redis")
                 return
@@ -71,8 +110,10 @@ class RedisBaseCache:
             try:
                 import redis
 
-                sync_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
-                self.client = AsyncRedisWrapper(sync_client)
+                pool = redis.ConnectionPool.from_url(
+                    settings.REDIS_URL, decode_responses=True, **POOL_CONFIG
+                )
+                self.client = AsyncRedisWrapper(redis.Redis(connection_pool=pool))
                 self.client_type = "sync_wrapped"
                 logger.info("Connected to Redis (sync client wrapped)")
                 return
@@ -83,78 +124,96 @@ class RedisBaseCache:
         logger.warning("No Redis connection available, caching disabled")
         self.enabled = False
 
-    @redis_fallback
-    async def get(self, key: str) -> Optional[Any]:
-        """Get value from cache with robust error handling"""
-        try:
-            if self.client_type == "upstash":
-                value = self.client.get(key)
-            else:
-                value = await self.client.get(key)
-
-            if value is None:
-                return None
-
-            # Handle bytes values explicitly before JSON parsing
-            if isinstance(value, (bytes, bytearray)):
-                try:
-                    # Attempt to decode as UTF-8
-                    value_str = value.decode("utf-8")
-                except UnicodeDecodeError:
-                    # If not valid UTF-8, return as raw bytes
-                    logger.warning(
-                        f"Non-UTF8 bytes found in cache key {key}, returning raw bytes"
-                    )
-                    return value
-            elif isinstance(value, str):
-                value_str = value
-            else:
-                # Non-string, non-bytes value - return as-is
-                return value
+    def _decode_value(self, key: str, value: Any) -> Any:
+        """Turn a raw cached value back into the object that was stored"""
+        if value is None:
+            return None
 
-            # Attempt JSON parsing with comprehensive error handling
+        # Handle bytes values explicitly before JSON parsing
+        if isinstance(value, (bytes, bytearray)):
             try:
-                parsed_value = json.loads(value_str)
-                # Apply recursive deserializer to reconstruct typed objects
-                return datetime_json_deserializer(parsed_value)
-            except json.JSONDecodeError as e:
-                # Log JSON parse errors but return raw string value
-                logger.debug(
-                    f"JSON decode failed for key {key}: {str(e)}, returning raw string"
-                )
-                return value_str
-            except (TypeError, ValueError) as e:
-                # Handle other parsing errors
+                # Attempt to decode as UTF-8
+                value_str = value.decode("utf-8")
+            except UnicodeDecodeError:
+                # If not valid UTF-8, return as raw bytes
                 logger.warning(
-                    f"Value parsing error for key {key}: {str(e)}, returning raw value"
+                    f"Non-UTF8 bytes found in cache key {key}, returning raw bytes"
                 )
-                return value_str
+                return value
+        elif isinstance(value, str):
+            value_str = value
+        else:
+            # Non-string, non-bytes value - return as-is
+            return value
+
+        if is_framed(value_str):
+            try:
+                return self.serializer.decode(value_str)
+            except Exception as e:
+                # Unreadable entries are treated as a cache miss
+                logger.warning(f"Cache entry decode failed for key {key}: {str(e)}")
+                return None
 
+        # Attempt JSON parsing with comprehensive error handling
+        try:
+            parsed_value = json.loads(value_str)
+            # Apply recursive deserializer to reconstruct typed objects
+            return datetime_json_deserializer(parsed_value)
+        except json.JSONDecodeError as e:
+            # Log JSON parse errors but return raw string value
+            logger.debug(
+                f"JSON decode failed for key {key}: {str(e)}, returning raw string"
+            )
+            return value_str
+        except (TypeError, ValueError) as e:
+            # Handle other parsing errors
+            logger.warning(
+                f"Value parsing error for key {key}: {str(e)}, returning raw value"
+            )
+            return value_str
+
+    def _encode_value(self, value: Any) -> str:
+        """Serialize a value with the configured codec; strings are stored as-is"""
+        if isinstance(value, str):
+            return value
+        return self.serializer.encode(value)
+
+    @redis_fallback
+    async def get(self, key: str) -> Optional[Any]:
+        """Get value from cache with robust error handling"""
+        try:
+            (raw,) = await self._fetch_raw([key])
+            return self._decode_value(key, raw)
         except Exception as e:
             logger.error(f"Redis get error for key {key}: {str(e)}")
             return None
 
     @redis_fallback
-    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
-        """Set value in cache with optional TTL"""
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+    ) -> bool:
+        """Set value in cache with optional TTL.
+
+        With ``tags`` the key is also added to the tag index in the same round
+        trip, so ``invalidate_tags`` and ``prefix:*`` patterns can find it.
+        """
         try:
             ttl = ttl or self.default_ttl
-            serialized = (
-                json.dumps(value, default=datetime_json_serializer, ensure_ascii=False)
-                if not isinstance(value, str)
-                else value
-            )
-
-            if self.client_type == "upstash":
-                # Upstash uses setex with different parameter order
-                self.client.setex(key, ttl, serialized)
-            elif hasattr(self.client, "setex"):
-                # Standard Redis clients
+            serialized = self._encode_value(value)
+            if tags is None and not self._near_cached_keys([key]):
                 await self.client.setex(key, ttl, serialized)
-            else:
-                # Use set with ex parameter
-                await self.client.set(key, serialized, ex=ttl)
+                return True
 
+            pipeline = self.client.pipeline()
+            pipeline.setex(key, ttl, serialized)
+            if tags is not None:
+                self._queue_tagging(pipeline, [key], tags, ttl)
+            self._queue_near_invalidation(pipeline, [key])
+            await pipeline.execute()
             return True
         except Exception as e:
             # Sanitize error logging to prevent sensitive data exposure
@@ -163,15 +222,49 @@ class RedisBaseCache:
             )
             return False
 
+    @redis_fallback
+    async def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get several values in one round trip; missing keys come back as None"""
+        if not keys:
+            return []
+        try:
+            values = await self._fetch_raw(keys)
+            return [self._decode_value(key, value) for key, value in zip(keys, values)]
+        except Exception as e:
+            logger.error(f"Redis mget error for {len(keys)} keys: {str(e)}")
+            return [None] * len(keys)
+
+    @redis_fallback
+    async def mset(self, mapping: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """Set several values with a shared TTL in one round trip"""
+        if not mapping:
+            return True
+        try:
+            ttl = ttl or self.default_ttl
+            pipeline = self.client.pipeline()
+            for key, value in mapping.items():
+                pipeline.setex(key, ttl, self._encode_value(value))
+            self._queue_near_invalidation(pipeline, list(mapping))
+            await pipeline.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Redis mset error for {len(mapping)} keys: {str(e)}")
+            return False
+
+    def pipeline(self):
+        """Start a command pipeline; ``await pipeline.execute()`` sends it in one round trip"""
+        return self.client.pipeline()
+
     async def set_secure(
         self,
         key: str,
         value: Any,
         ttl: Optional[int] = None,
         force_encrypt: bool = False,
+        tags: Optional[List[str]] = None,
     ) -> bool:
         """Set value in cache with automatic encryption for sensitive data"""
-        return await self.secure_cache.set(key, value, ttl, force_encrypt)
+        return await self.secure_cache.set(key, value, ttl, force_encrypt, tags=tags)
 
     async def get_secure(self, key: str) -> Optional[Any]:
         """Get value from cache with automatic decryption"""
@@ -181,24 +274,51 @@ class RedisBaseCache:
     async def delete(self, key: str) -> bool:
         """Delete value from cache"""
         try:
-            if self.client_type == "upstash":
-                self.client.delete(key)
-            else:
-                await self.client.delete(key)
+            await self._delete_keys([key])
             return True
         except Exception as e:
             logger.error(f"Redis delete error for key {key}: {str(e)}")
             return False
 
+    @redis_fallback
+    async def delete_many(self, keys: List[str]) -> int:
+        """Delete several keys with a single DEL; returns how many existed"""
+        if not keys:
+            return 0
+        try:
+            return await self._delete_keys(keys)
+        except Exception as e:
+            logger.error(f"Redis delete error for {len(keys)} keys: {str(e)}")
+            return 0
+
+    async def _delete_keys(self, keys: List[str]) -> int:
+        """DEL the keys, announcing near-cached ones in the same round trip"""
+        if not self._near_cached_keys(keys):
+            return int(await self.client.delete(*keys) or 0)
+        pipeline = self.client.pipeline()
+        pipeline.delete(*keys)
+        self._queue_near_invalidation(pipeline, keys)
+        results = await pipeline.execute()
+        return int(results[0] or 0)
+
     @redis_fallback
     async def exists(self, key: str) -> bool:
         """Check if key exists"""
         try:
-            if self.client_type == "upstash":
-                return bool(self.client.exists(key))
-            else:
-                result = await self.client.exists(key)
-                return bool(result)
+            return bool(await self.client.exists(key))
         except Exception as e:
             logger.error(f"Redis exists error for key {key}: {str(e)}")
             return False
+
+    async def close(self) -> None:
+        """Stop the near-cache listener and release the client's connection pool"""
+        await self.stop_near_cache()
+        if self.client is None:
+            return
+        try:
+            if hasattr(self.client, "aclose"):
+                await self.client.aclose()
+            elif hasattr(self.client, "close"):
+                await self.client.close()
+        except Exception as e:
+            logger.warning(f"Error closing Redis client: {e}")
@@ -0,0 +1,252 @@
+"""
+Pluggable value codecs for Redis cache entries.
+
+Entries written through a codec are framed with a three-byte header: a
+format version byte, the codec id and a flags byte. Entries without the
+header are legacy JSON written by ``json.dumps`` and still decode through the
+original path. Every Redis client is configured for text responses, so binary
+bodies (msgpack, compressed) are base64-encoded.
+
+Codecs:
+- json: stdlib JSON with the tagged ``_type``/``_data`` encoding
+- orjson: same tagged encoding, serialized by orjson. UUIDs come back as strings
+- msgpack: native extension types for datetime, date, time and UUID
+"""
+
+import base64
+import json
+import uuid
+from datetime import date, datetime, time
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+import orjson
+import zstandard
+
+from app.core.logging import get_logger
+
+from .serializers import datetime_json_deserializer, datetime_json_serializer
+
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+# Header layout: version byte, codec id, flags. The version byte is a control
+# character, which no JSON document starts with.
+FORMAT_VERSION = "\x01"
+HEADER_LENGTH = 3
+
+# Flags are stored as a printable character, 0x40 + bits
+FLAG_BASE = 0x40
+FLAG_ZSTD = 0x01
+FLAG_TYPED = 0x02  # body holds tagged values and needs the deserializer pass
+
+DEFAULT_COMPRESS_THRESHOLD = 4096
+ZSTD_LEVEL = 3
+
+# msgpack extension type codes
+EXT_DATETIME = 1
+EXT_DATE = 2
+EXT_TIME = 3
+EXT_UUID = 4
+
+_zstd_compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+_zstd_decompressor = zstandard.ZstdDecompressor()
+
+
+def _tracking_serializer() -> Tuple[Callable[[Any], Any], list]:
+    """Wrap the tagged-type serializer and record whether it was ever called"""
+    used = []
+
+    def default(obj: Any) -> Any:
+        used.append(True)
+        return datetime_json_serializer(obj)
+
+    return default, used
+
+
+class CacheCodec:
+    """Turns cache values into bytes and back"""
+
+    name = ""
+    codec_id = ""
+    # Body is not UTF-8 text and has to be base64-encoded in the frame
+    binary = False
+
+    def dumps(self, value: Any) -> Tuple[bytes, bool]:
+        """Serialize a value; the flag says whether loads needs the typed pass"""
+        raise NotImplementedError
+
+    def loads(self, body: Union[bytes, str], typed: bool) -> Any:
+        """Deserialize a body produced by dumps"""
+        raise NotImplementedError
+
+
+class JsonCodec(CacheCodec):
+    """Stdlib JSON, byte-compatible with the legacy unframed entries"""
+
+    name = "json"
+    codec_id = "j"
+
+    def dumps(self, value: Any) -> Tuple[bytes, bool]:
+        default, used = _tracking_serializer()
+        text = json.dumps(value, default=default, ensure_ascii=False)
+        return text.encode("utf-8"), bool(used)
+
+    def loads(self, body: Union[bytes, str], typed: bool) -> Any:
+        data = json.loads(body)
+        return datetime_json_deserializer(data) if typed else data
+
+
+class OrjsonCodec(CacheCodec):
+    """orjson with the legacy tagged encoding for datetimes and binary data.
+
+    orjson always serializes UUIDs natively, so they read back as strings.
+    """
+
+    name = "orjson"
+    codec_id = "o"
+    OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, value: Any) -> Tuple[bytes, bool]:
+        default, used = _tracking_serializer()
+        body = orjson.dumps(value, default=default, option=self.OPTIONS)
+        return body, bool(used)
+
+    def loads(self, body: Union[bytes, str], typed: bool) -> Any:
+        data = orjson.loads(body)
+        return datetime_json_deserializer(data) if typed else data
+
+
+def _msgpack_default(obj: Any) -> Any:
+    if isinstance(obj, datetime):
+        return msgpack.ExtType(EXT_DATETIME, obj.isoformat().encode("ascii"))
+    if isinstance(obj, date):
+        return msgpack.ExtType(EXT_DATE, obj.isoformat().encode("ascii"))
+    if isinstance(obj, time):
+        return msgpack.ExtType(EXT_TIME, obj.isoformat().encode("ascii"))
+    if isinstance(obj, uuid.UUID):
+        return msgpack.ExtType(EXT_UUID, obj.bytes)
+    if isinstance(obj, (bytearray, memoryview)):
+        return bytes(obj)
+    raise TypeError(
+        f"Object of type '{type(obj).__name__}' is not serializable. "
+        f"Supported types: datetime, date, time, UUID, bytes, bytearray, memoryview."
+    )
+
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    if code == EXT_DATETIME:
+        return datetime.fromisoformat(data.decode("ascii"))
+    if code == EXT_DATE:
+        return date.fromisoformat(data.decode("ascii"))
+    if code == EXT_TIME:
+        return time.fromisoformat(data.decode("ascii"))
+    if code == EXT_UUID:
+        return uuid.UUID(bytes=data)
+    return msgpack.ExtType(code, data)
+
+
+class MsgpackCodec(CacheCodec):
+    """msgpack with extension types, so decoding never walks the structure"""
+
+    name = "msgpack"
+    codec_id = "m"
+    binary = True
+
+    def dumps(self, value: Any) -> Tuple[bytes, bool]:
+        return msgpack.packb(value, default=_msgpack_default, use_bin_type=True), False
+
+    def loads(self, body: Union[bytes, str], typed: bool) -> Any:
+        return msgpack.unpackb(
+            body, ext_hook=_msgpack_ext_hook, raw=False, strict_map_key=False
+        )
+
+
+CODECS: Dict[str, CacheCodec] = {
+    codec.name: codec for codec in (JsonCodec(), OrjsonCodec(), MsgpackCodec())
+}
+_CODECS_BY_ID: Dict[str, CacheCodec] = {
+    codec.codec_id: codec for codec in CODECS.values()
+}
+
+
+def is_framed(raw: Union[bytes, str]) -> bool:
+    """Whether a raw cached value was written by a codec"""
+    if isinstance(raw, (bytes, bytearray)):
+        return raw[:1] == FORMAT_VERSION.encode("ascii")
+    return raw[:1] == FORMAT_VERSION
+
+
+class CacheSerializer:
+    """Encodes values with one codec; decodes entries written by any codec"""
+
+    def __init__(
+        self,
+        codec: str = "json",
+        compression: Optional[str] = None,
+        compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD,
+    ):
+        if codec not in CODECS:
+            raise ValueError(
+                f"Unknown cache codec '{codec}'. Supported: {', '.join(CODECS)}"
+            )
+        if codec == "msgpack" and not MSGPACK_AVAILABLE:
+            logger.warning("msgpack is not installed, using json for cache values")
+            codec = "json"
+        if compression not in (None, "none", "zstd"):
+            raise ValueError(f"Unknown cache compression '{compression}'")
+
+        self.codec = CODECS[codec]
+        self.compress = compression == "zstd"
+        self.compress_threshold = compress_threshold
+
+    def encode(self, value: Any) -> str:
+        """Serialize a value into the string stored in Redis"""
+        body, typed = self.codec.dumps(value)
+        flags = FLAG_TYPED if typed else 0
+
+        if self.compress and len(body) >= self.compress_threshold:
+            compressed = _zstd_compressor.compress(body)
+            if len(compressed) < len(body):
+                body = compressed
+                flags |= FLAG_ZSTD
+
+        binary = self.codec.binary or flags & FLAG_ZSTD
+        if not binary and self.codec.name == "json":
+            # Keep plain JSON readable by deployments without codec support
+            return body.decode("utf-8")
+
+        text = (
+            base64.b64encode(body).decode("ascii") if binary else body.decode("utf-8")
+        )
+        return FORMAT_VERSION + self.codec.codec_id + chr(FLAG_BASE | flags) + text
+
+    @staticmethod
+    def decode(raw: Union[bytes, str]) -> Any:
+        """Deserialize a framed value; raises ValueError for unknown frames"""
+        if isinstance(raw, (bytes, bytearray)):
+            raw = raw.decode("utf-8")
+        if len(raw) < HEADER_LENGTH or not is_framed(raw):
+            raise ValueError("Value is not a framed cache entry")
+
+        codec = _CODECS_BY_ID.get(raw[1])
+        if codec is None:
+            raise ValueError(f"Unknown cache codec id '{raw[1]}'")
+        if codec is CODECS["msgpack"] and not MSGPACK_AVAILABLE:
+            raise ValueError("Cache entry needs msgpack, which is not installed")
+
+        flags = ord(raw[2]) - FLAG_BASE
+        if not 0 <= flags < FLAG_BASE:
+            raise ValueError(f"Invalid cache entry flags {raw[2]!r}")
+        body: Union[bytes, str] = raw[HEADER_LENGTH:]
+        if codec.binary or flags & FLAG_ZSTD:
+            body = base64.b64decode(body)
+        if flags & FLAG_ZSTD:
+            body = _zstd_decompressor.decompress(body)
+        return codec.loads(body, bool(flags & FLAG_TYPED))
@@ -9,8 +9,10 @@ from .failures import RedisFailureMixin
 from .flows import RedisFlowMixin
 from .imports import RedisImportMixin
 from .locking import RedisLockingMixin
+from .near_cache import RedisNearCacheMixin
 from .patterns import RedisPatternMixin
 from .sse import RedisSSEMixin
+from .tags import RedisTagMixin
 
 
 class RedisCache(
@@ -21,6 +23,8 @@ class RedisCache(
     RedisFailureMixin,
     RedisPatternMixin,
     RedisSSEMixin,
+    RedisTagMixin,
+    RedisNearCacheMixin,
 ):
     """Unified Redis cache service with multiple backend support"""
 
@@ -10,7 +10,7 @@ from typing import Any, Dict, List, Optional
 
 from app.core.logging import get_logger
 
-from .serializers import datetime_json_serializer
+from .tags import entity_tags, tag_key
 from .utils import redis_fallback
 
 logger = get_logger(__name__)
@@ -25,48 +25,30 @@ class RedisFlowMixin:
     ) -> bool:
         """Cache flow state with encryption for sensitive data"""
         key = f"flow:state:{flow_id}"
+        tags = entity_tags(
+            flow_id, state.get("engagement_id"), state.get("client_account_id")
+        )
         # Flow state contains sensitive data like client_account_id, user_id, etc.
-        return await self.set_secure(key, state, ttl, force_encrypt=True)
+        return await self.set_secure(key, state, ttl, force_encrypt=True, tags=tags)
 
     @redis_fallback
     async def invalidate_flow_cache(self, flow_id: str) -> bool:
-        """Invalidate all cached data related to a flow"""
-        try:
-            keys_to_delete = [
-                f"flow:state:{flow_id}",
-                f"flow:exists:{flow_id}",
-                f"flow:metadata:{flow_id}",
-                f"flow:phase:*:{flow_id}",  # Phase results
-                f"flow:agent:*:{flow_id}",  # Agent results
-                f"lock:flow:{flow_id}",  # Flow locks
-                f"lock:flow:status:{flow_id}",  # Status locks
-            ]
-
-            if self.client_type == "upstash":
-                # Upstash doesn't support pattern deletion, delete known keys
-                for key in keys_to_delete:
-                    if "*" not in key:
-                        await self.client.delete(key)
-            else:
-                # For Redis with SCAN support, find and delete pattern keys
-                pipeline = self.client.pipeline()
-
-                for key_pattern in keys_to_delete:
-                    if "*" in key_pattern:
-                        # Use SCAN to find matching keys
-                        cursor = "0"
-                        while True:
-                            cursor, keys = await self.client.scan(
-                                cursor=cursor, match=key_pattern, count=100
-                            )
-                            for key in keys:
-                                pipeline.delete(key)
-                            if cursor == "0":
-                                break
-                    else:
-                        pipeline.delete(key_pattern)
+        """Invalidate all cached data related to a flow.
 
-                await pipeline.execute()
+        Phase and agent results are found through the flow's tag set, so
+        the cost depends on how many keys the flow has, not on the keyspace.
+        """
+        try:
+            await self.invalidate_tags(
+                [f"flow:{flow_id}"],
+                keys=[
+                    f"flow:state:{flow_id}",
+                    f"flow:exists:{flow_id}",
+                    f"flow:metadata:{flow_id}",
+                    f"lock:flow:{flow_id}",  # Flow locks
+                    f"lock:flow:status:{flow_id}",  # Status locks
+                ],
+            )
 
             logger.info(f"Invalidated all cache entries for flow {flow_id}")
             return True
@@ -75,12 +57,45 @@ class RedisFlowMixin:
             logger.error(f"Failed to invalidate flow cache: {str(e)}")
             return False
 
+    @redis_fallback
+    async def cache_flow_result(
+        self,
+        flow_id: str,
+        kind: str,
+        name: str,
+        result: Any,
+        ttl: int = 3600,
+        engagement_id: Optional[str] = None,
+        client_account_id: Optional[str] = None,
+    ) -> bool:
+        """Cache a phase or agent result under ``flow:{kind}:{name}:{flow_id}``"""
+        key = f"flow:{kind}:{name}:{flow_id}"
+        tags = entity_tags(flow_id, engagement_id, client_account_id)
+        return await self.set(key, result, ttl, tags=tags)
+
+    @redis_fallback
+    async def get_flow_result(self, flow_id: str, kind: str, name: str) -> Any:
+        """Get a result cached with ``cache_flow_result``"""
+        return await self.get(f"flow:{kind}:{name}:{flow_id}")
+
     @redis_fallback
     async def get_flow_state(self, flow_id: str) -> Optional[Dict[str, Any]]:
         """Get flow state from cache with decryption"""
         key = f"flow:state:{flow_id}"
         return await self.get_secure(key)
 
+    @redis_fallback
+    async def get_flow_states(
+        self, flow_ids: List[str]
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Get several flow states in one round trip, keyed by flow id"""
+        keys = [f"flow:state:{flow_id}" for flow_id in flow_ids]
+        cached = await self.mget(keys) or [None] * len(keys)
+        return {
+            flow_id: self.secure_cache.unwrap(key, value)
+            for flow_id, key, value in zip(flow_ids, keys, cached)
+        }
+
     @redis_fallback
     async def register_flow_atomic(
         self,
@@ -92,115 +107,77 @@ class RedisFlowMixin:
         """
         Atomically register a new flow with all necessary keys.
         This prevents race conditions during flow creation.
+
+        One round trip checks for an existing registration, a second writes
+        every key through a pipeline.
         """
         try:
-            # Use pipeline for atomic operations where supported
+            exists_key = f"flow:exists:{flow_id}"
+            active_key = f"flows:active:{flow_type}"
+
+            # Check if flow already exists (prevent duplicate registration);
+            # Upstash keeps active flows as a JSON list, read it alongside
             if self.client_type == "upstash":
-                # Upstash doesn't support pipelines, use individual operations
-                # But still maintain order and check for conflicts
-
-                # Check if flow already exists (prevent duplicate registration)
-                exists_key = f"flow:exists:{flow_id}"
-                if await self.client.get(exists_key):
-                    logger.warning(f"Flow {flow_id} already registered")
-                    return False
-
-                # Set all flow-related keys
-                success = True
-
-                # 1. Mark flow as existing
-                await self.client.setex(exists_key, ttl, "1")
-
-                # 2. Store flow metadata
-                metadata_key = f"flow:metadata:{flow_id}"
-                await self.client.setex(
-                    metadata_key,
-                    ttl,
-                    json.dumps(
-                        {
-                            "flow_type": flow_type,
-                            "created_at": datetime.utcnow().isoformat(),
-                            "client_id": flow_data.get("client_id"),
-                            "engagement_id": flow_data.get("engagement_id"),
-                            "user_id": flow_data.get("user_id"),
-                        },
-                        default=datetime_json_serializer,
-                        ensure_ascii=False,
-                    ),
-                )
-
-                # 3. Initialize flow state
-                state_key = f"flow:state:{flow_id}"
-                await self.client.setex(
-                    state_key,
-                    ttl,
-                    json.dumps(
-                        flow_data, default=datetime_json_serializer, ensure_ascii=False
-                    ),
-                )
-
-                # 4. Add to active flows set
-                active_key = f"flows:active:{flow_type}"
-                # Upstash doesn't have SADD with TTL, use regular key
-                active_flows = await self.client.get(active_key)
-                if active_flows:
-                    active_list = json.loads(active_flows)
-                    if flow_id not in active_list:
-                        active_list.append(flow_id)
-                else:
-                    active_list = [flow_id]
-                await self.client.setex(active_key, ttl, json.dumps(active_list))
+                exists, active_flows = await self.client.mget(exists_key, active_key)
+            else:
+                exists, active_flows = await self.client.get(exists_key), None
+            if exists:
+                logger.warning(f"Flow {flow_id} already registered")
+                return False
 
-                return success
+            pipeline = self.client.pipeline()
 
-            else:
-                # Use pipeline for Redis implementations that support it
-                pipeline = self.client.pipeline()
-
-                # Check if flow already exists
-                exists_key = f"flow:exists:{flow_id}"
-                exists = await self.client.get(exists_key)
-                if exists:
-                    logger.warning(f"Flow {flow_id} already registered")
-                    return False
-
-                # Set all flow-related keys atomically
-                pipeline.setex(exists_key, ttl, "1")
-
-                metadata_key = f"flow:metadata:{flow_id}"
-                pipeline.setex(
-                    metadata_key,
-                    ttl,
-                    json.dumps(
-                        {
-                            "flow_type": flow_type,
-                            "created_at": datetime.utcnow().isoformat(),
-                            "client_id": flow_data.get("client_id"),
-                            "engagement_id": flow_data.get("engagement_id"),
-                            "user_id": flow_data.get("user_id"),
-                        },
-                        default=datetime_json_serializer,
-                        ensure_ascii=False,
-                    ),
-                )
-
-                state_key = f"flow:state:{flow_id}"
-                pipeline.setex(
-                    state_key,
-                    ttl,
-                    json.dumps(
-                        flow_data, default=datetime_json_serializer, ensure_ascii=False
-                    ),
-                )
-
-                # Add to active flows set
-                active_key = f"flows:active:{flow_type}"
-                pipeline.sadd(active_key, flow_id)
-                pipeline.expire(active_key, ttl)
-
-                # Execute pipeline atomically
-                results = await pipeline.execute()
-                return all(results)
+            # Set all flow-related keys atomically
+            pipeline.setex(exists_key, ttl, "1")
+            pipeline.setex(
+                f"flow:metadata:{flow_id}",
+                ttl,
+                self._encode_value(
+                    {
+                        "flow_type": flow_type,
+                        "created_at": datetime.utcnow().isoformat(),
+                        "client_id": flow_data.get("client_id"),
+                        "engagement_id": flow_data.get("engagement_id"),
+                        "user_id": flow_data.get("user_id"),
+                    }
+                ),
+            )
+            pipeline.setex(f"flow:state:{flow_id}", ttl, self._encode_value(flow_data))
+
+            flow_keys = [
+                exists_key,
+                f"flow:metadata:{flow_id}",
+                f"flow:state:{flow_id}",
+            ]
+            self._queue_near_invalidation(pipeline, flow_keys)
+            self._queue_tagging(
+                pipeline,
+                flow_keys,
+                entity_tags(
+                    flow_id,
+                    flow_data.get("engagement_id"),
+                    flow_data.get("client_account_id") or flow_data.get("client_id"),
+                ),
+                ttl,
+            )
+
+            # Add to active flows
+            if self.client_type == "upstash":
+                active_list = json.loads(active_flows) if active_flows else []
+                if flow_id not in active_list:
+                    active_list.append(flow_id)
+                pipeline.setex(active_key, ttl, json.dumps(active_list))
+                await pipeline.execute()
+                return True
+
+            pipeline.sadd(active_key, flow_id)
+            pipeline.expire(active_key, ttl)
+
+            # Execute pipeline atomically. Only the SETEX replies (queued first,
+            # one per flow key) signal success: PUBLISH returns the subscriber
+            # count and SADD/tagging return how many members were new.
+            results = await pipeline.execute()
+            return all(results[: len(flow_keys)])
 
         except Exception as e:
             logger.error(f"Failed to register flow atomically: {str(e)}")
@@ -212,39 +189,40 @@ class RedisFlowMixin:
         Atomically unregister a flow and clean up all related keys.
         """
         try:
-            if self.client_type == "upstash":
-                # Manual cleanup for Upstash
-                await self.client.delete(f"flow:exists:{flow_id}")
-                await self.client.delete(f"flow:metadata:{flow_id}")
-                await self.client.delete(f"flow:state:{flow_id}")
-                await self.client.delete(f"lock:flow:{flow_id}")
-
-                # Remove from active flows
-                active_key = f"flows:active:{flow_type}"
-                active_flows = await self.client.get(active_key)
-                if active_flows:
-                    active_list = json.loads(active_flows)
-                    if flow_id in active_list:
-                        active_list.remove(flow_id)
-                        await self.client.set(active_key, json.dumps(active_list))
+            flow_keys = [
+                f"flow:exists:{flow_id}",
+                f"flow:metadata:{flow_id}",
+                f"flow:state:{flow_id}",
+                f"lock:flow:{flow_id}",
+                tag_key(f"flow:{flow_id}"),
+            ]
+            active_key = f"flows:active:{flow_type}"
 
-                return True
+            pipeline = self.client.pipeline()
+            pipeline.delete(*flow_keys)
 
+            if self.client_type == "upstash":
+                # Remove from the JSON list of active flows
+                pipeline.get(active_key)
             else:
-                # Use pipeline for atomic cleanup
-                pipeline = self.client.pipeline()
-
-                pipeline.delete(f"flow:exists:{flow_id}")
-                pipeline.delete(f"flow:metadata:{flow_id}")
-                pipeline.delete(f"flow:state:{flow_id}")
-                pipeline.delete(f"lock:flow:{flow_id}")
-
                 # Remove from active flows set
-                active_key = f"flows:active:{flow_type}"
                 pipeline.srem(active_key, flow_id)
 
-                results = await pipeline.execute()
-                return any(results)  # At least one key was deleted
+            # Queued last so the DEL and GET/SREM replies keep their positions
+            self._queue_near_invalidation(pipeline, flow_keys)
+            results = await pipeline.execute()
+            deleted, active = results[0], results[1]
+
+            if self.client_type == "upstash":
+                if active:
+                    active_list = json.loads(active)
+                    if flow_id in active_list:
+                        active_list.remove(flow_id)
+                        await self.client.set(active_key, json.dumps(active_list))
+                return True
+
+            # At least one key was deleted or the flow was listed as active
+            return bool(deleted or active)
 
         except Exception as e:
             logger.error(f"Failed to unregister flow atomically: {str(e)}")
@@ -24,15 +24,9 @@ class RedisLockingMixin:
         lock_id = str(uuid.uuid4())
 
         try:
-            if self.client_type == "upstash":
-                # Upstash doesn't support SET NX directly, use atomic get-set pattern
-                # Use SETNX equivalent with Upstash
-                result = self.client.set(key, lock_id, nx=True, ex=ttl)
-                return lock_id if result else None
-            else:
-                # Standard Redis with SET NX
-                result = await self.client.set(key, lock_id, nx=True, ex=ttl)
-                return lock_id if result else None
+            # SET NX is atomic on every client, Upstash included
+            result = await self.client.set(key, lock_id, nx=True, ex=ttl)
+            return lock_id if result else None
         except AttributeError:
             # Fallback for clients without nx parameter
             # This is NOT atomic and has race condition, but better than nothing
@@ -0,0 +1,329 @@
+"""
+Process-local near cache in front of Redis.
+
+Recently read values of selected key namespaces are kept in an LRU bounded
+by entry count and total size, each namespace with its own TTL. Entries hold
+the raw Redis value, so every hit decodes a fresh object.
+
+Writers publish the keys they change on ``NEAR_CACHE_CHANNEL`` in the same
+pipeline as the write; every worker, including the writer, drops them when
+the message arrives. A worker only serves near-cache hits while its
+subscription is live, and clears the cache whenever it is lost.
+"""
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+NEAR_CACHE_CHANNEL = "cache:near:invalidate"
+
+# Seconds a value may be served locally, by key namespace. A namespace
+# matches the leading segments of a key, "*" matching any one segment; the
+# longest match wins and keys outside these namespaces are not cached. Only
+# the per-request auth and session lookups are listed: flow state and
+# engagement data under v1:client:{id}:engagement:... change too often to
+# serve stale.
+DEFAULT_NAMESPACE_TTLS: Dict[str, float] = {
+    "v1:user:context": 30,
+    "v1:user:*:clients": 30,
+    "v1:user:*:client:*:engagements": 30,
+    "v1:user:*:defaults": 30,
+    "v1:client:*:engagements": 60,
+    "v1:client:*:users": 60,
+    "v1:client:*:settings": 60,
+}
+
+MISSING = object()
+
+
+def same_redis_host(url: str, other_url: str) -> bool:
+    """Whether two Redis URLs (REST or redis://) point at the same host"""
+    host = urlsplit(url or "").hostname
+    return bool(host) and host == urlsplit(other_url or "").hostname
+
+
+RECONNECT_DELAY_SECONDS = 1
+MAX_RECONNECT_DELAY_SECONDS = 30
+
+
+@dataclass
+class LayerStats:
+    """Hit/miss counters for one cache layer"""
+
+    hits: int = 0
+    misses: int = 0
+
+    def record(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) * 100 if total else 0.0,
+        }
+
+
+class NearCache:
+    """LRU of raw Redis values with per-namespace TTLs and size bounds"""
+
+    def __init__(
+        self,
+        namespace_ttls: Optional[Dict[str, float]] = None,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.namespace_ttls = dict(namespace_ttls or DEFAULT_NAMESPACE_TTLS)
+        # (segments, ttl), longest namespace first
+        self._namespaces = sorted(
+            (
+                (tuple(namespace.split(":")), ttl)
+                for namespace, ttl in self.namespace_ttls.items()
+            ),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # key -> (raw value, expires at, size)
+        self.entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self.size_bytes = 0
+        # Set while the invalidation subscription is live
+        self.active = False
+        # Bumped by every invalidation; fills that started earlier are dropped
+        self.generation = 0
+        self.stats = LayerStats()
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def ttl_for(self, key: str) -> Optional[float]:
+        """TTL of the longest configured namespace matching the key"""
+        parts = key.split(":")
+        for segments, ttl in self._namespaces:
+            if len(segments) <= len(parts) and all(
+                segment == "*" or segment == part
+                for segment, part in zip(segments, parts)
+            ):
+                return ttl
+        return None
+
+    def serves(self, key: str) -> bool:
+        return self.active and self.ttl_for(key) is not None
+
+    def lookup(self, key: str) -> Any:
+        """Raw value for a key, or MISSING"""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.stats.record(False)
+            return MISSING
+        raw, expires_at, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.stats.record(False)
+            return MISSING
+        self.entries.move_to_end(key)
+        self.stats.record(True)
+        return raw
+
+    def store(self, key: str, raw: Any, generation: int) -> None:
+        """Keep a value read from Redis unless it was invalidated meanwhile"""
+        ttl = self.ttl_for(key)
+        if not self.active or ttl is None or raw is None:
+            return
+        if generation != self.generation:
+            return
+        size = len(raw) if isinstance(raw, (str, bytes)) else 0
+        if size > self.max_bytes:
+            return
+
+        self._remove(key)
+        self.entries[key] = (raw, time.monotonic() + ttl, size)
+        self.size_bytes += size
+        while len(self.entries) > self.max_entries or self.size_bytes > self.max_bytes:
+            self._remove(next(iter(self.entries)))
+            self.evictions += 1
+
+    def invalidate(self, keys: Iterable[str]) -> None:
+        self.generation += 1
+        for key in keys:
+            if self._remove(key):
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        self.generation += 1
+        self.entries.clear()
+        self.size_bytes = 0
+
+    def set_active(self, active: bool) -> None:
+        """Start or stop serving hits; the cache starts empty either way"""
+        self.clear()
+        self.active = active
+
+    def apply_message(self, message: Any) -> None:
+        """Drop the keys named in an invalidation message"""
+        try:
+            keys = json.loads(message)["keys"]
+        except (TypeError, ValueError, KeyError):
+            # A malformed message could hide any key; start over
+            logger.warning("Malformed near-cache invalidation message, clearing")
+            self.clear()
+            return
+        self.invalidate(keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats.to_dict(),
+            "active": self.active,
+            "entries": len(self.entries),
+            "size_bytes": self.size_bytes,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def _remove(self, key: str) -> bool:
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return False
+        self.size_bytes -= entry[2]
+        return True
+
+
+class RedisNearCacheMixin:
+    """Mixin wiring the near cache into reads, writes and pub/sub"""
+
+    near_cache: Optional[NearCache] = None
+    _near_cache_task: Optional[asyncio.Task] = None
+
+    def _near_cached_keys(self, keys: Iterable[str]) -> List[str]:
+        """Keys some worker may hold locally, so a write must announce them"""
+        if self.near_cache is None:
+            return []
+        return [key for key in keys if self.near_cache.ttl_for(key) is not None]
+
+    def _queue_near_invalidation(self, pipeline, keys: Sequence[str]) -> None:
+        """Drop keys locally and queue their invalidation message on a pipeline"""
+        keys = self._near_cached_keys(keys)
+        if keys:
+            self.near_cache.invalidate(keys)
+            pipeline.publish(NEAR_CACHE_CHANNEL, json.dumps({"keys": keys}))
+
+    async def _publish_near_invalidation(self, keys: Sequence[str]) -> None:
+        """Drop keys locally and announce them; for writes made without a pipeline"""
+        keys = self._near_cached_keys(keys)
+        if keys:
+            self.near_cache.invalidate(keys)
+            await self.client.publish(NEAR_CACHE_CHANNEL, json.dumps({"keys": keys}))
+
+    async def _fetch_raw(self, keys: Sequence[str]) -> List[Any]:
+        """Raw values for keys, from the near cache where possible"""
+        near = self.near_cache
+        values: Dict[str, Any] = {}
+        missing = []
+        for key in keys:
+            raw = near.lookup(key) if near and near.serves(key) else MISSING
+            if raw is MISSING:
+                missing.append(key)
+            else:
+                values[key] = raw
+
+        if missing:
+            generation = near.generation if near else 0
+            if len(missing) == 1:
+                fetched = [await self.client.get(missing[0])]
+            else:
+                fetched = await self.client.mget(*missing)
+            for key, raw in zip(missing, fetched):
+                self.redis_stats.record(raw is not None)
+                values[key] = raw
+                if near is not None:
+                    near.store(key, raw, generation)
+
+        return [values[key] for key in keys]
+
+    async def start_near_cache(self) -> bool:
+        """Subscribe to invalidations in the background; hits start once subscribed"""
+        if self.near_cache is None or self._near_cache_task is not None:
+            return False
+        if not getattr(settings, "REDIS_URL", None):
+            logger.warning("Near cache needs REDIS_URL for pub/sub, leaving it off")
+            return False
+        if self.client_type == "upstash" and not same_redis_host(
+            getattr(settings, "UPSTASH_REDIS_URL", ""), settings.REDIS_URL
+        ):
+            # Writes publish through the Upstash REST API; listening on any
+            # other server would never see them and serve stale entries
+            logger.warning(
+                "Near cache subscribes via REDIS_URL, which is not the Upstash "
+                "database invalidations are published to, leaving it off"
+            )
+            return False
+        self._near_cache_task = asyncio.create_task(self._listen_for_invalidations())
+        return True
+
+    async def stop_near_cache(self) -> None:
+        task, self._near_cache_task = self._near_cache_task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    def _open_invalidation_pubsub(self):
+        """A dedicated connection: Upstash's REST client cannot subscribe"""
+        import redis.asyncio as redis_async
+
+        client = redis_async.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+        return client, client.pubsub()
+
+    async def _listen_for_invalidations(self) -> None:
+        delay = RECONNECT_DELAY_SECONDS
+        while True:
+            client, pubsub = self._open_invalidation_pubsub()
+            try:
+                await pubsub.subscribe(NEAR_CACHE_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "subscribe":
+                        self.near_cache.set_active(True)
+                        delay = RECONNECT_DELAY_SECONDS
+                        logger.info("Near cache subscribed to invalidations")
+                    elif message["type"] == "message":
+                        self.near_cache.apply_message(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Near cache invalidation subscription lost: {e}")
+            finally:
+                # Messages may be missed from here on; stop serving stale hits
+                self.near_cache.set_active(False)
+                try:
+                    await pubsub.aclose()
+                    await client.aclose()
+                except Exception:
+                    pass
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY_SECONDS)
+
+    def get_layer_stats(self) -> Dict[str, Any]:
+        """Hit/miss metrics for the near cache and for Redis reads"""
+        return {
+            "near": self.near_cache.get_stats() if self.near_cache else None,
+            "redis": self.redis_stats.to_dict(),
+        }
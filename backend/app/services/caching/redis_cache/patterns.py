@@ -4,7 +4,7 @@ Pattern learning and mapping cache operations for Redis.
 Handles caching of field mapping patterns with encryption.
 """
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from .utils import redis_fallback
 
@@ -26,3 +26,15 @@ class RedisPatternMixin:
         """Get field mapping pattern from cache with decryption"""
         key = f"pattern:mapping:{pattern_key}"
         return await self.get_secure(key)
+
+    @redis_fallback
+    async def get_mapping_patterns(
+        self, pattern_keys: List[str]
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Get several field mapping patterns in one round trip"""
+        keys = [f"pattern:mapping:{pattern_key}" for pattern_key in pattern_keys]
+        cached = await self.mget(keys) or [None] * len(keys)
+        return {
+            pattern_key: self.secure_cache.unwrap(key, value)
+            for pattern_key, key, value in zip(pattern_keys, keys, cached)
+        }
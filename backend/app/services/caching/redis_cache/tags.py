@@ -0,0 +1,230 @@
+"""
+Tag-based invalidation index for Redis.
+
+Tagged writes add the key to one Redis sorted set per tag (``tagidx:<tag>``),
+so an invalidation deletes exactly the member keys instead of scanning the
+keyspace. Every tagged key is also indexed under each of its ``:``-separated
+prefixes, which lets ``prefix:*`` patterns resolve through the index as well.
+
+Members are scored with the expiry of the key they name. Each write to a tag
+set first drops the members whose key has expired, so long-lived broad sets
+(``prefix:v1``, ``client:<id>``) stay bounded by their live keys. Scripts work
+on at most TAG_CHUNK_SIZE keys, so neither ``unpack`` nor a large
+invalidation blocks Redis for long.
+
+Keys written without tags are invisible to the index. Cache writers pass
+``tags`` (``[]`` for prefix tags only); REDIS_CACHE_TAG_SCAN_FALLBACK also
+matches prefix patterns with SCAN while a deployment still holds keys written
+before they were tagged (see ``split_patterns``).
+"""
+
+import time
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from app.core.logging import get_logger
+
+from .utils import redis_fallback
+
+logger = get_logger(__name__)
+
+# Distinct from the earlier plain-set index (``tag:``) so leftover sets are
+# never read as sorted sets; they expire with their TTL
+TAG_KEY_PREFIX = "tagidx:"
+
+# Member keys per tagging script call and per invalidation step
+TAG_CHUNK_SIZE = 500
+
+# KEYS: tag sets; ARGV[1]: now (unix seconds), ARGV[2]: TTL, ARGV[3..]: keys.
+# Drops expired members, scores the keys with their expiry, and keeps each
+# set alive at least as long as its longest-lived member.
+TAG_KEYS_SCRIPT = """
+local now = tonumber(ARGV[1])
+local ttl = tonumber(ARGV[2])
+local entries = {}
+for i = 3, #ARGV do
+    entries[#entries + 1] = now + ttl
+    entries[#entries + 1] = ARGV[i]
+end
+for i = 1, #KEYS do
+    redis.call('ZREMRANGEBYSCORE', KEYS[i], '-inf', now)
+    redis.call('ZADD', KEYS[i], unpack(entries))
+    if redis.call('TTL', KEYS[i]) < ttl then
+        redis.call('EXPIRE', KEYS[i], ttl)
+    end
+end
+return #KEYS
+"""
+
+# KEYS[1]: tag set; ARGV[1]: chunk size.
+# Deletes up to ARGV[1] members and removes them from the set (the set goes
+# away with its last member); returns how many cached keys existed and how
+# many members remain, followed by the member keys that were targeted.
+INVALIDATE_TAG_CHUNK_SCRIPT = """
+local members = redis.call('ZRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+local deleted = 0
+if #members > 0 then
+    deleted = redis.call('DEL', unpack(members))
+    redis.call('ZREM', KEYS[1], unpack(members))
+end
+local result = {deleted, redis.call('ZCARD', KEYS[1])}
+for i = 1, #members do
+    result[#result + 1] = members[i]
+end
+return result
+"""
+
+
+def tag_key(tag: str) -> str:
+    """Redis key of the set holding a tag's members"""
+    return f"{TAG_KEY_PREFIX}{tag}"
+
+
+def prefix_tags(key: str) -> List[str]:
+    """Tags for every ``:``-separated prefix of a key, shortest first"""
+    parts = key.split(":")[:-1]
+    return [f"prefix:{':'.join(parts[:depth])}" for depth in range(1, len(parts) + 1)]
+
+
+def tags_for_pattern(pattern: str) -> Optional[List[str]]:
+    """Resolve a ``prefix:*`` glob to its prefix tag; None if it needs a scan"""
+    if not pattern.endswith(":*"):
+        return None
+    prefix = pattern[:-2]
+    if not prefix or any(char in prefix for char in "*?[]\\"):
+        return None
+    return [f"prefix:{prefix}"]
+
+
+def split_patterns(
+    patterns: Iterable[str], scan_fallback: bool = False
+) -> Tuple[List[str], List[str]]:
+    """Tags resolving the indexed patterns, and the patterns to match by SCAN
+
+    With ``scan_fallback`` indexed patterns are scanned as well, so keys
+    written without tags are still invalidated.
+    """
+    tags: List[str] = []
+    scan_patterns: List[str] = []
+    for pattern in patterns:
+        pattern_tags = tags_for_pattern(pattern)
+        if pattern_tags:
+            tags.extend(pattern_tags)
+        if not pattern_tags or scan_fallback:
+            scan_patterns.append(pattern)
+    return tags, scan_patterns
+
+
+def entity_tags(
+    flow_id: Optional[str] = None,
+    engagement_id: Optional[str] = None,
+    client_account_id: Optional[str] = None,
+) -> List[str]:
+    """Tags scoping a cached entry to its flow, engagement and tenant"""
+    tags = []
+    if flow_id:
+        tags.append(f"flow:{flow_id}")
+    if engagement_id:
+        tags.append(f"engagement:{engagement_id}")
+    if client_account_id:
+        tags.append(f"client:{client_account_id}")
+    return tags
+
+
+class RedisTagMixin:
+    """Mixin for tag-indexed writes and invalidation"""
+
+    # Also SCAN for prefix patterns the index resolves (pre-tagging keys)
+    tag_scan_fallback: bool = False
+
+    def _queue_tagging(
+        self, pipeline, keys: Sequence[str], tags: Iterable[str], ttl: int
+    ) -> None:
+        """Add script calls indexing keys under their tags to a pipeline"""
+        tags = [tag_key(tag) for tag in tags]
+        now = int(time.time())
+        for start in range(0, len(keys), TAG_CHUNK_SIZE):
+            chunk = list(keys[start : start + TAG_CHUNK_SIZE])
+            tag_sets = set(tags)
+            for key in chunk:
+                tag_sets.update(tag_key(tag) for tag in prefix_tags(key))
+            if tag_sets:
+                tag_sets = sorted(tag_sets)
+                pipeline.eval(
+                    TAG_KEYS_SCRIPT, len(tag_sets), *tag_sets, now, int(ttl), *chunk
+                )
+
+    @redis_fallback
+    async def tag_keys(
+        self, keys: Sequence[str], tags: Iterable[str], ttl: int
+    ) -> bool:
+        """Index already-written keys under tags"""
+        try:
+            pipeline = self.client.pipeline()
+            self._queue_tagging(pipeline, keys, tags, ttl)
+            await pipeline.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Redis tag error for {len(keys)} keys: {str(e)}")
+            return False
+
+    @redis_fallback
+    async def scan_keys(self, pattern: str) -> List[str]:
+        """Keys matching a glob, found with SCAN; covers keys written untagged"""
+        keys: List[str] = []
+        cursor = 0
+        while True:
+            cursor, batch = await self.client.scan(
+                cursor=cursor, match=pattern, count=TAG_CHUNK_SIZE
+            )
+            keys.extend(
+                key.decode() if isinstance(key, bytes) else key for key in batch
+            )
+            if int(cursor) == 0:
+                return keys
+
+    async def _invalidate_tag_set(self, tag_set: str) -> int:
+        """Drain one tag set chunk by chunk; returns how many keys existed"""
+        deleted = 0
+        steps_left = None
+        while steps_left != 0:
+            result = await self.client.eval(
+                INVALIDATE_TAG_CHUNK_SCRIPT, 1, tag_set, TAG_CHUNK_SIZE
+            )
+            members = result[2:] if result else []
+            if not members:
+                break
+            deleted += int(result[0])
+            await self._publish_near_invalidation(members)
+            remaining = int(result[1])
+            if steps_left is None:
+                # Bounded by the size seen on the first step, so keys tagged
+                # concurrently cannot keep the drain running
+                steps_left = -(-remaining // TAG_CHUNK_SIZE) + 1
+            steps_left = steps_left - 1 if remaining else 0
+        return deleted
+
+    @redis_fallback
+    async def invalidate_tags(
+        self, tags: Iterable[str], keys: Sequence[str] = ()
+    ) -> int:
+        """Delete every key indexed under the tags, plus any plain keys.
+
+        Each tag set is drained in chunks of TAG_CHUNK_SIZE members, one short
+        script per chunk, so a broad tag does not block Redis. Keys tagged
+        while a set is drained are deleted with it or stay indexed; none are
+        orphaned.
+        """
+        tag_sets = sorted({tag_key(tag) for tag in tags})
+        if not tag_sets and not keys:
+            return 0
+        deleted = 0
+        try:
+            for tag_set in tag_sets:
+                deleted += await self._invalidate_tag_set(tag_set)
+            for start in range(0, len(keys), TAG_CHUNK_SIZE):
+                chunk = list(keys[start : start + TAG_CHUNK_SIZE])
+                deleted += await self._delete_keys(chunk)
+            return deleted
+        except Exception as e:
+            logger.error(f"Redis tag invalidation error for {tag_sets}: {str(e)}")
+            return deleted
@@ -64,10 +64,29 @@ def _get_fallback_result(operation_name: str) -> Any:
         )
         return True
     # Write operations that should "succeed" silently
-    elif operation_name in ["set", "delete", "release_lock", "unregister_flow_atomic"]:
+    elif operation_name in [
+        "set",
+        "mset",
+        "tag_keys",
+        "cache_flow_result",
+        "delete",
+        "release_lock",
+        "unregister_flow_atomic",
+    ]:
         return True
+    # Nothing was deleted
+    elif operation_name in ["delete_many", "invalidate_tags"]:
+        return 0
+    # Batch reads return an empty mapping
+    elif operation_name in ["get_flow_states", "get_mapping_patterns"]:
+        return {}
     # List operations return empty list
-    elif operation_name in ["get_active_flows", "get_sse_clients"]:
+    elif operation_name in [
+        "mget",
+        "get_active_flows",
+        "get_sse_clients",
+        "scan_keys",
+    ]:
         return []
     # Default to False for unknown operations
     else:
@@ -1,7 +1,8 @@
 """
-Async wrapper classes for synchronous Redis clients.
+Async wrapper classes for Redis clients without a redis-py async interface.
 
-Provides async compatibility for sync Redis operations using asyncio.to_thread.
+Provides async compatibility for sync Redis operations using asyncio.to_thread,
+and adapts the Upstash async REST client to the redis-py pipeline interface.
 """
 
 import asyncio
@@ -32,6 +33,10 @@ class AsyncRedisWrapper:
         """Async wrapper for sync get"""
         return await asyncio.to_thread(self.sync_client.get, key)
 
+    async def mget(self, *keys: str):
+        """Async wrapper for sync mget"""
+        return await asyncio.to_thread(self.sync_client.mget, *keys)
+
     async def set(
         self, key: str, value: str, ex: Optional[int] = None, nx: bool = False
     ):
@@ -42,9 +47,9 @@ class AsyncRedisWrapper:
         """Async wrapper for sync setex"""
         return await asyncio.to_thread(self.sync_client.setex, key, ttl, value)
 
-    async def delete(self, key: str):
+    async def delete(self, *keys: str):
         """Async wrapper for sync delete"""
-        return await asyncio.to_thread(self.sync_client.delete, key)
+        return await asyncio.to_thread(self.sync_client.delete, *keys)
 
     async def exists(self, key: str):
         """Async wrapper for sync exists"""
@@ -80,6 +85,12 @@ class AsyncRedisWrapper:
         """Async wrapper for sync expire"""
         return await asyncio.to_thread(self.sync_client.expire, key, ttl)
 
+    async def eval(self, script: str, numkeys: int, *keys_and_args):
+        """Async wrapper for sync eval"""
+        return await asyncio.to_thread(
+            self.sync_client.eval, script, numkeys, *keys_and_args
+        )
+
 
 class AsyncPipelineWrapper:
     """Wrapper to make synchronous Redis pipeline async-compatible"""
@@ -87,14 +98,34 @@ class AsyncPipelineWrapper:
     def __init__(self, sync_pipeline):
         self.sync_pipeline = sync_pipeline
 
+    def get(self, key: str):
+        """Add get command to pipeline"""
+        self.sync_pipeline.get(key)
+        return self
+
+    def mget(self, *keys: str):
+        """Add mget command to pipeline"""
+        self.sync_pipeline.mget(*keys)
+        return self
+
+    def set(self, key: str, value: str, ex: Optional[int] = None, nx: bool = False):
+        """Add set command to pipeline"""
+        self.sync_pipeline.set(key, value, ex=ex, nx=nx)
+        return self
+
+    def publish(self, channel: str, message: str):
+        """Add publish command to pipeline"""
+        self.sync_pipeline.publish(channel, message)
+        return self
+
     def setex(self, key: str, ttl: int, value: str):
         """Add setex command to pipeline"""
         self.sync_pipeline.setex(key, ttl, value)
         return self
 
-    def delete(self, key: str):
+    def delete(self, *keys: str):
         """Add delete command to pipeline"""
-        self.sync_pipeline.delete(key)
+        self.sync_pipeline.delete(*keys)
         return self
 
     def sadd(self, key: str, *values):
@@ -112,6 +143,71 @@ class AsyncPipelineWrapper:
         self.sync_pipeline.expire(key, ttl)
         return self
 
+    def eval(self, script: str, numkeys: int, *keys_and_args):
+        """Add eval command to pipeline"""
+        self.sync_pipeline.eval(script, numkeys, *keys_and_args)
+        return self
+
     async def execute(self):
         """Execute pipeline asynchronously"""
         return await asyncio.to_thread(self.sync_pipeline.execute)
+
+
+class AsyncUpstashWrapper:
+    """
+    Adapter giving the Upstash async REST client the redis-py interface.
+
+    Commands are forwarded unchanged; pipelines are wrapped so that
+    ``execute()`` sends the whole batch in one HTTP request.
+    """
+
+    def __init__(self, async_client):
+        self.async_client = async_client
+
+    def __getattr__(self, name: str):
+        return getattr(self.async_client, name)
+
+    def pipeline(self):
+        """Create a pipeline that is sent as a single REST request"""
+        return AsyncUpstashPipeline(self.async_client.pipeline())
+
+    async def eval(self, script: str, numkeys: int, *keys_and_args):
+        """Evaluate a script using the redis-py argument layout"""
+        return await self.async_client.eval(
+            script,
+            keys=[str(key) for key in keys_and_args[:numkeys]],
+            args=[str(arg) for arg in keys_and_args[numkeys:]],
+        )
+
+    async def close(self):
+        """Close the underlying HTTP connection pool"""
+        await self.async_client.close()
+
+
+class AsyncUpstashPipeline:
+    """Wrapper exposing an Upstash pipeline through the redis-py interface"""
+
+    def __init__(self, upstash_pipeline):
+        self.upstash_pipeline = upstash_pipeline
+
+    def __getattr__(self, name: str):
+        command = getattr(self.upstash_pipeline, name)
+
+        def queue(*args, **kwargs):
+            command(*args, **kwargs)
+            return self
+
+        return queue
+
+    def eval(self, script: str, numkeys: int, *keys_and_args):
+        """Queue a script using the redis-py argument layout"""
+        self.upstash_pipeline.eval(
+            script,
+            keys=[str(key) for key in keys_and_args[:numkeys]],
+            args=[str(arg) for arg in keys_and_args[numkeys:]],
+        )
+        return self
+
+    async def execute(self):
+        """Send the queued commands in one request"""
+        return await self.upstash_pipeline.exec()
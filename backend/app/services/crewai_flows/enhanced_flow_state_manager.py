@@ -683,16 +683,17 @@ class EnhancedFlowStateManager(FlowStateManager):
         self, flow_id: str, phase: str, results: Dict[str, Any]
     ) -> bool:
         """Cache phase-specific results for reuse"""
-        key = f"flow:{flow_id}:phase:{phase}:results"
         ttl = 1800  # 30 minutes for phase results
-        return await redis_cache.set(key, results, ttl=ttl)
+        # Tagged with the flow, so invalidate_flow_cache drops them
+        return await redis_cache.cache_flow_result(
+            flow_id, "phase", phase, results, ttl=ttl
+        )
 
     async def get_cached_phase_results(
         self, flow_id: str, phase: str
     ) -> Optional[Dict[str, Any]]:
         """Get cached phase results if available"""
-        key = f"flow:{flow_id}:phase:{phase}:results"
-        return await redis_cache.get(key)
+        return await redis_cache.get_flow_result(flow_id, "phase", phase)
 
     async def acquire_flow_lock(
         self, flow_id: str, operation: str, ttl: int = 30
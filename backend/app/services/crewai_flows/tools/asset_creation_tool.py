@@ -254,6 +254,10 @@ class BulkAssetCreationToolWithServiceImpl:
 
             # Get AssetService from registry
             from app.services.asset_service import AssetService
+            from app.services.asset_service.deduplication import (
+                BulkIngestRowsFailed,
+                failed_asset_record,
+            )
 
             asset_service = self._registry.get_service(AssetService)
 
@@ -283,6 +287,18 @@ class BulkAssetCreationToolWithServiceImpl:
                         }
                     )
 
+            except BulkIngestRowsFailed as partial:
+                # Large imports keep the rows that ingested and report the rest
+                for asset, status in partial.results:
+                    created_assets.append(
+                        {
+                            "asset_id": str(asset.id),
+                            "asset_name": asset.name,
+                            "status": status,
+                        }
+                    )
+                failed_assets.extend(partial.failures)
+
             except Exception as service_error:
                 # If bulk service fails, try individual creation
                 logger.warning(
@@ -307,13 +323,7 @@ class BulkAssetCreationToolWithServiceImpl:
                         logger.error(
                             f"❌ Failed to create asset {asset_data.get('name', 'unknown')}: {str(e)}"
                         )
-                        failed_assets.append(
-                            {
-                                "asset_name": asset_data.get("name", "unknown"),
-                                "error": str(e),
-                                "ip_address": asset_data.get("ip_address"),
-                            }
-                        )
+                        failed_assets.append(failed_asset_record(asset_data, e))
 
             logger.info(
                 f"✅ Bulk creation via ServiceRegistry complete: "
@@ -0,0 +1,208 @@
+"""
+Asset Lookup Index for Topology and Dependency Tools
+Hash index over an asset inventory, built once per analysis run
+
+Resolves names, hostnames, IPs, URLs, /24 subnet prefixes and
+(environment, location) pairs to assets with dictionary lookups instead of
+scanning the inventory for every application or dependency. Buckets keep
+assets in inventory order, so the first hit is the one a linear scan would
+have found.
+"""
+
+import ipaddress
+import re
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Asset fields that may hold a hostname or FQDN
+HOSTNAME_FIELDS = ("hostname", "fqdn", "server_name", "host")
+
+# Name tokens whose contiguous runs are indexed; bounds keys per long name
+MAX_NAME_TOKENS = 8
+
+_NAME_SEPARATORS = re.compile(r"[^a-z0-9]+")
+_HOSTNAME = re.compile(r"^[a-z0-9][a-z0-9.-]*$")
+
+
+def name_tokens(name: Any) -> List[str]:
+    """Lower-cased alphanumeric tokens of a name"""
+    return [token for token in _NAME_SEPARATORS.split(str(name or "").lower()) if token]
+
+
+def name_keys(name: Any) -> List[str]:
+    """Every contiguous run of a name's tokens, joined with "-"
+
+    "Order API Prod" -> order, order-api, order-api-prod, api, api-prod, prod.
+    A name contains another on token boundaries when the other's full key is
+    one of its runs.
+    """
+    tokens = name_tokens(name)[:MAX_NAME_TOKENS]
+    return [
+        "-".join(tokens[start:end])
+        for start in range(len(tokens))
+        for end in range(start + 1, len(tokens) + 1)
+    ]
+
+
+def normalize_hostname(value: Any) -> str:
+    """Lower-cased host part of a hostname, FQDN, host:port or URL"""
+    text = str(value or "").strip().lower()
+    if "://" in text:
+        try:
+            text = urlsplit(text).hostname or ""
+        except ValueError:
+            return ""
+    elif text.count(":") == 1:
+        text = text.split(":", 1)[0]
+    return text.rstrip(".")
+
+
+def subnet_prefix(ip: Any) -> Optional[str]:
+    """The /24 network of an IPv4 address ("10.0.1.0/24"), or None"""
+    try:
+        address = ipaddress.ip_address(str(ip or "").strip())
+    except ValueError:
+        return None
+    if address.version != 4:
+        return None
+    return str(ipaddress.ip_network(f"{address}/24", strict=False))
+
+
+class AssetLookupIndex:
+    """Dictionary indexes from identifying attributes to asset records"""
+
+    def __init__(self, assets: Iterable[Dict[str, Any]]):
+        self.assets: List[Dict[str, Any]] = list(assets)
+        self._by_name: Dict[str, List[int]] = defaultdict(list)
+        self._by_name_key: Dict[str, List[int]] = defaultdict(list)
+        self._by_full_name_key: Dict[str, List[int]] = defaultdict(list)
+        self._by_hostname: Dict[str, List[int]] = defaultdict(list)
+        self._by_ip: Dict[str, List[int]] = defaultdict(list)
+        self._by_subnet: Dict[str, List[int]] = defaultdict(list)
+        self._by_environment_location: Dict[Tuple[str, str], List[int]] = defaultdict(
+            list
+        )
+
+        for position, asset in enumerate(self.assets):
+            self._index_asset(position, asset)
+
+    def _index_asset(self, position: int, asset: Dict[str, Any]) -> None:
+        name = asset.get("name")
+        if name:
+            self._by_name[name].append(position)
+            for key in set(name_keys(name)):
+                self._by_name_key[key].append(position)
+            self._by_full_name_key["-".join(name_tokens(name))].append(position)
+
+        hostnames = {normalize_hostname(name)} if name else set()
+        hostnames.update(
+            normalize_hostname(asset.get(field))
+            for field in HOSTNAME_FIELDS
+            if asset.get(field)
+        )
+        hostnames = {hostname for hostname in hostnames if _HOSTNAME.match(hostname)}
+        for hostname in list(hostnames):
+            if "." in hostname and subnet_prefix(hostname) is None:
+                hostnames.add(hostname.split(".", 1)[0])
+        for hostname in hostnames:
+            self._by_hostname[hostname].append(position)
+
+        ip = str(asset.get("ip_address") or "").strip()
+        if ip:
+            self._by_ip[ip].append(position)
+            subnet = subnet_prefix(ip)
+            if subnet:
+                self._by_subnet[subnet].append(position)
+
+        environment = asset.get("environment")
+        location = asset.get("location")
+        if environment and location:
+            self._by_environment_location[(environment, location)].append(position)
+
+    def __len__(self) -> int:
+        return len(self.assets)
+
+    def _first(
+        self, positions: List[int], exclude_id: Optional[str] = None
+    ) -> Optional[int]:
+        for position in positions:
+            if exclude_id is None:
+                return position
+            if str(self.assets[position].get("id", "")) != exclude_id:
+                return position
+        return None
+
+    def _asset(self, position: Optional[int]) -> Optional[Dict[str, Any]]:
+        return None if position is None else self.assets[position]
+
+    def by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        """First asset with exactly this name"""
+        return self._asset(self._first(self._by_name.get(name, [])))
+
+    def by_ip(self, ip: str) -> Optional[Dict[str, Any]]:
+        """First asset with this IP address"""
+        return self._asset(self._first(self._by_ip.get(str(ip or "").strip(), [])))
+
+    def by_hostname(self, hostname: str) -> Optional[Dict[str, Any]]:
+        """First asset whose name, hostname or FQDN (or its short name) matches"""
+        return self._asset(
+            self._first(self._by_hostname.get(normalize_hostname(hostname), []))
+        )
+
+    def by_environment_location(
+        self, environment: str, location: str
+    ) -> Optional[Dict[str, Any]]:
+        """First asset in this environment and location"""
+        return self._asset(
+            self._first(self._by_environment_location.get((environment, location), []))
+        )
+
+    def in_subnet(self, ip_or_prefix: str) -> List[Dict[str, Any]]:
+        """Assets in the /24 subnet of an IP, or of a "a.b.c.0/24" prefix"""
+        prefix = (
+            ip_or_prefix if "/" in str(ip_or_prefix) else subnet_prefix(ip_or_prefix)
+        )
+        return [self.assets[position] for position in self._by_subnet.get(prefix, [])]
+
+    def subnets(self) -> List[str]:
+        """Every /24 subnet prefix seen in the inventory"""
+        return list(self._by_subnet)
+
+    def by_overlapping_name(self, name: str) -> Optional[Dict[str, Any]]:
+        """First asset whose name contains this name or is contained in it
+
+        Containment is on token boundaries, so "crm" matches "CRM-Prod-01"
+        but not "ecrm".
+        """
+        full_key = "-".join(name_tokens(name))
+        if not full_key:
+            return None
+        candidates = self._by_name_key.get(full_key, [])[:1]
+        for key in name_keys(name):
+            candidates.extend(self._by_full_name_key.get(key, [])[:1])
+        return self._asset(min(candidates)) if candidates else None
+
+    def resolve(
+        self, reference: str, exclude_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Asset a free-form reference points at: name, IP, hostname or URL
+
+        Tries, in order, an exact name, an IP address, a hostname (including
+        the host of a URL or connection string) and a name containing the
+        reference on token boundaries. exclude_id skips the referring asset.
+        """
+        reference = str(reference or "").strip()
+        if not reference:
+            return None
+        hostname = normalize_hostname(reference)
+        for positions in (
+            self._by_name.get(reference, []),
+            self._by_ip.get(hostname, []),
+            self._by_hostname.get(hostname, []),
+            self._by_name_key.get("-".join(name_tokens(reference)), []),
+        ):
+            position = self._first(positions, exclude_id)
+            if position is not None:
+                return self.assets[position]
+        return None
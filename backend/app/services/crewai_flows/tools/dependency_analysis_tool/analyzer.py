@@ -8,6 +8,7 @@ comprehensive dependency analysis capabilities for asset migration.
 from typing import Any, Dict, List
 from datetime import datetime
 
+from ..asset_lookup_index import AssetLookupIndex
 from .base import (
     logger,
     ASSET_TYPE_DATABASE,
@@ -16,7 +17,7 @@ from .base import (
     ASSET_TYPE_SECURITY_GROUP,
     FLOW_TYPE_READ_WRITE,
 )
-from .graph_builders import DependencyGraphBuilder
+from .graph_builders import CompiledDependencyGraph, DependencyGraphBuilder
 from .wave_planners import CriticalPathAnalyzer, MigrationInsightsGenerator
 
 
@@ -49,14 +50,22 @@ class DependencyAnalyzer:
             data_deps = DependencyAnalyzer._analyze_data_dependencies(assets)
             service_deps = DependencyAnalyzer._analyze_service_dependencies(assets)
 
-            # Build dependency graph
+            # Build dependency graph, resolving references through one index
             dependency_graph = DependencyGraphBuilder.build_dependency_graph(
-                assets, network_deps, config_deps, data_deps, service_deps
+                assets,
+                network_deps,
+                config_deps,
+                data_deps,
+                service_deps,
+                AssetLookupIndex(assets),
             )
 
+            # Compile once for cycle, path and wave analysis
+            compiled_graph = CompiledDependencyGraph.from_graph(dependency_graph)
+
             # Analyze critical paths and bottlenecks
             critical_analysis = CriticalPathAnalyzer.analyze_critical_paths(
-                dependency_graph
+                dependency_graph, compiled_graph
             )
 
             # Generate migration insights
@@ -67,7 +76,7 @@ class DependencyAnalyzer:
             # Generate wave planning recommendations
             wave_recommendations = (
                 MigrationInsightsGenerator.generate_wave_planning_recommendations(
-                    dependency_graph, critical_analysis
+                    dependency_graph, critical_analysis, compiled_graph
                 )
             )
 
@@ -4,6 +4,7 @@ Graph building modules for dependency analysis.
 Generated by CC (Claude Code)
 """
 
+from .compiled_graph import CompiledDependencyGraph
 from .dependency_graph_builder import DependencyGraphBuilder
 
-__all__ = ["DependencyGraphBuilder"]
+__all__ = ["CompiledDependencyGraph", "DependencyGraphBuilder"]
@@ -0,0 +1,227 @@
+"""
+Compiled dependency graph for linear-time analysis.
+
+Asset ids are mapped to dense integers once and the edges are stored as CSR
+adjacency arrays (offsets + neighbours) in both directions. Cycle detection,
+critical paths and migration waves then run iteratively over the strongly
+connected component condensation in O(nodes + edges), with no recursion.
+
+An edge points from an asset to an asset it depends on, so dependencies land
+in earlier migration waves than their dependents.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def _csr(keys: np.ndarray, values: np.ndarray, size: int) -> Tuple[list, list]:
+    """Offsets and neighbours so neighbours of i are values[offsets[i]:offsets[i+1]]"""
+    offsets = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=size), out=offsets[1:])
+    order = np.argsort(keys, kind="stable")
+    # Plain lists: the traversals below index them element by element
+    return offsets.tolist(), values[order].tolist()
+
+
+class CompiledDependencyGraph:
+    """Integer-indexed dependency graph with SCC condensation"""
+
+    def __init__(self, node_ids: Sequence[str], edges: Iterable[Tuple[str, str]]):
+        self.node_ids: List[str] = list(dict.fromkeys(node_ids))
+        self.index: Dict[str, int] = {
+            node_id: i for i, node_id in enumerate(self.node_ids)
+        }
+
+        sources: List[int] = []
+        targets: List[int] = []
+        self.dropped_edges = 0
+        for source, target in edges:
+            source_index = self.index.get(source)
+            target_index = self.index.get(target)
+            if source_index is None or target_index is None:
+                self.dropped_edges += 1
+                continue
+            sources.append(source_index)
+            targets.append(target_index)
+
+        size = len(self.node_ids)
+        source_array = np.asarray(sources, dtype=np.int64)
+        target_array = np.asarray(targets, dtype=np.int64)
+        self.edge_count = len(sources)
+        self.out_degree = np.bincount(source_array, minlength=size)
+        self.in_degree = np.bincount(target_array, minlength=size)
+        self._self_loops = set(source_array[source_array == target_array].tolist())
+        self._out_offsets, self._out_targets = _csr(source_array, target_array, size)
+        self._in_offsets, self._in_sources = _csr(target_array, source_array, size)
+
+        self._component: Optional[List[int]] = None
+        self._components: Optional[List[List[int]]] = None
+
+    @classmethod
+    def from_graph(cls, dependency_graph: Dict[str, Any]) -> "CompiledDependencyGraph":
+        """Compile a {"nodes": [...], "edges": [...]} graph dict"""
+        return cls(
+            [node["id"] for node in dependency_graph.get("nodes", [])],
+            (
+                (edge["source"], edge["target"])
+                for edge in dependency_graph.get("edges", [])
+            ),
+        )
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_ids)
+
+    def _strongly_connected(self) -> Tuple[List[int], List[List[int]]]:
+        """Tarjan's algorithm with an explicit stack.
+
+        Components come out in reverse topological order: every edge between
+        two components points from a higher component id to a lower one.
+        """
+        if self._components is not None:
+            return self._component, self._components
+
+        size = self.node_count
+        offsets, targets = self._out_offsets, self._out_targets
+        order = [-1] * size
+        low = [0] * size
+        on_stack = [False] * size
+        stack: List[int] = []
+        component = [-1] * size
+        components: List[List[int]] = []
+        counter = 0
+
+        for root in range(size):
+            if order[root] != -1:
+                continue
+            order[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            work = [(root, offsets[root])]
+
+            while work:
+                node, edge = work[-1]
+                if edge < offsets[node + 1]:
+                    work[-1] = (node, edge + 1)
+                    successor = targets[edge]
+                    if order[successor] == -1:
+                        order[successor] = low[successor] = counter
+                        counter += 1
+                        stack.append(successor)
+                        on_stack[successor] = True
+                        work.append((successor, offsets[successor]))
+                    elif on_stack[successor] and order[successor] < low[node]:
+                        low[node] = order[successor]
+                    continue
+
+                work.pop()
+                if work and low[node] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[node]
+                if low[node] == order[node]:
+                    members = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component[member] = len(components)
+                        members.append(member)
+                        if member == node:
+                            break
+                    members.sort()
+                    components.append(members)
+
+        self._component, self._components = component, components
+        return component, components
+
+    def strongly_connected_components(self) -> List[List[str]]:
+        """Node ids of every component, dependencies before dependents"""
+        _, components = self._strongly_connected()
+        return [[self.node_ids[i] for i in members] for members in components]
+
+    def cycles(self) -> List[List[str]]:
+        """Components that contain a cycle (two or more nodes, or a self-loop)"""
+        _, components = self._strongly_connected()
+        return [
+            [self.node_ids[i] for i in members]
+            for members in components
+            if len(members) > 1 or members[0] in self._self_loops
+        ]
+
+    def wave_layers(self) -> List[int]:
+        """Wave index (0-based) of each component.
+
+        A component with no dependencies outside itself is wave 0; any other
+        component comes one wave after its latest dependency.
+        """
+        component, components = self._strongly_connected()
+        offsets, targets = self._out_offsets, self._out_targets
+        layer = [0] * len(components)
+        # Ascending component ids visit dependencies before dependents
+        for component_id, members in enumerate(components):
+            deepest = -1
+            for node in members:
+                for edge in range(offsets[node], offsets[node + 1]):
+                    dependency = component[targets[edge]]
+                    if dependency != component_id and layer[dependency] > deepest:
+                        deepest = layer[dependency]
+            layer[component_id] = deepest + 1
+        return layer
+
+    def migration_waves(self) -> List[List[List[str]]]:
+        """Waves of migration groups; a cycle's members share one group"""
+        _, components = self._strongly_connected()
+        layer = self.wave_layers()
+        waves: List[List[List[str]]] = [[] for _ in range(max(layer, default=-1) + 1)]
+        for component_id, members in enumerate(components):
+            waves[layer[component_id]].append([self.node_ids[i] for i in members])
+        return waves
+
+    def critical_paths(self, limit: int) -> List[List[str]]:
+        """Longest dependency chains, longest first, at most one per end node.
+
+        A path follows edge direction and ends at a component with no further
+        dependencies; a cycle on the path contributes all of its members.
+        """
+        component, components = self._strongly_connected()
+        offsets, sources = self._in_offsets, self._in_sources
+        length = [0] * len(components)
+        previous = [-1] * len(components)
+        # Descending component ids visit dependents before their dependencies
+        for component_id in range(len(components) - 1, -1, -1):
+            best, best_previous = 0, -1
+            for node in components[component_id]:
+                for edge in range(offsets[node], offsets[node + 1]):
+                    dependent = component[sources[edge]]
+                    if dependent != component_id and length[dependent] > best:
+                        best, best_previous = length[dependent], dependent
+            length[component_id] = best + len(components[component_id])
+            previous[component_id] = best_previous
+
+        ends = [
+            component_id
+            for component_id, members in enumerate(components)
+            if length[component_id] > 1
+            and not any(
+                component[self._out_targets[edge]] != component_id
+                for node in members
+                for edge in range(self._out_offsets[node], self._out_offsets[node + 1])
+            )
+        ]
+        ends.sort(key=lambda component_id: -length[component_id])
+
+        paths = []
+        for end in ends[:limit]:
+            chain = []
+            component_id = end
+            while component_id != -1:
+                chain.append(component_id)
+                component_id = previous[component_id]
+            paths.append(
+                [
+                    self.node_ids[node]
+                    for component_id in reversed(chain)
+                    for node in components[component_id]
+                ]
+            )
+        return paths
@@ -5,8 +5,9 @@ Generated by CC (Claude Code)
 """
 
 import uuid
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
+from ...asset_lookup_index import AssetLookupIndex
 from ..base import (
     RISK_MEDIUM,
     DEPENDENCY_TYPE_DATA_FLOW,
@@ -38,14 +39,9 @@ class DependencyGraphBuilder:
             )
         return nodes
 
-    @staticmethod
-    def _find_asset_by_name(assets: List[Dict[str, Any]], name: str) -> Dict[str, Any]:
-        """Find asset by name match."""
-        return next((a for a in assets if name in a.get("name", "")), None)
-
     @staticmethod
     def _process_data_dependencies(
-        data_deps: List[Dict[str, Any]], assets: List[Dict[str, Any]], edge_id: int
+        data_deps: List[Dict[str, Any]], asset_index: AssetLookupIndex, edge_id: int
     ) -> tuple[List[Dict[str, Any]], int]:
         """Process data dependencies and create edges."""
         edges = []
@@ -54,9 +50,7 @@ class DependencyGraphBuilder:
             source_id = dep["asset_id"]
             for flow in dep.get("data_flows", []):
                 # Find target asset by name
-                target_asset = next(
-                    (a for a in assets if a.get("name") == flow["source"]), None
-                )
+                target_asset = asset_index.by_name(flow["source"])
                 if target_asset:
                     edge_id += 1
                     edges.append(
@@ -74,7 +68,9 @@ class DependencyGraphBuilder:
 
     @staticmethod
     def _process_network_dependencies(
-        network_deps: List[Dict[str, Any]], assets: List[Dict[str, Any]], edge_id: int
+        network_deps: List[Dict[str, Any]],
+        asset_index: AssetLookupIndex,
+        edge_id: int,
     ) -> tuple[List[Dict[str, Any]], int]:
         """Process network dependencies and create edges."""
         edges = []
@@ -85,9 +81,7 @@ class DependencyGraphBuilder:
                 if conn["type"] == "explicit":
                     # Try to find target asset
                     target_name = conn["value"]
-                    target_asset = DependencyGraphBuilder._find_asset_by_name(
-                        assets, target_name
-                    )
+                    target_asset = asset_index.resolve(target_name, source_id)
                     if target_asset:
                         edge_id += 1
                         edges.append(
@@ -105,7 +99,9 @@ class DependencyGraphBuilder:
 
     @staticmethod
     def _process_config_dependencies(
-        config_deps: List[Dict[str, Any]], assets: List[Dict[str, Any]], edge_id: int
+        config_deps: List[Dict[str, Any]],
+        asset_index: AssetLookupIndex,
+        edge_id: int,
     ) -> tuple[List[Dict[str, Any]], int]:
         """Process configuration dependencies and create edges."""
         edges = []
@@ -114,9 +110,7 @@ class DependencyGraphBuilder:
             source_id = dep["asset_id"]
             for ref in dep.get("references", []):
                 # Try to find referenced asset
-                target_asset = DependencyGraphBuilder._find_asset_by_name(
-                    assets, ref["value"]
-                )
+                target_asset = asset_index.resolve(ref["value"], source_id)
                 if target_asset:
                     edge_id += 1
                     edges.append(
@@ -134,7 +128,9 @@ class DependencyGraphBuilder:
 
     @staticmethod
     def _process_service_dependencies(
-        service_deps: List[Dict[str, Any]], assets: List[Dict[str, Any]], edge_id: int
+        service_deps: List[Dict[str, Any]],
+        asset_index: AssetLookupIndex,
+        edge_id: int,
     ) -> tuple[List[Dict[str, Any]], int]:
         """Process service dependencies and create edges."""
         edges = []
@@ -144,9 +140,7 @@ class DependencyGraphBuilder:
             for svc in dep.get("services", []):
                 if svc["type"] == "explicit":
                     # Try to find service provider asset
-                    target_asset = DependencyGraphBuilder._find_asset_by_name(
-                        assets, svc["service"]
-                    )
+                    target_asset = asset_index.resolve(svc["service"], source_id)
                     if target_asset:
                         edge_id += 1
                         edges.append(
@@ -169,32 +163,40 @@ class DependencyGraphBuilder:
         config_deps: List[Dict[str, Any]],
         data_deps: List[Dict[str, Any]],
         service_deps: List[Dict[str, Any]],
+        asset_index: Optional[AssetLookupIndex] = None,
     ) -> Dict[str, Any]:
-        """Build comprehensive dependency graph"""
+        """Build comprehensive dependency graph
+
+        Referenced assets are resolved through asset_index (built here if the
+        caller has not already built one for this run) rather than by
+        scanning the asset list for every dependency.
+        """
         # Create nodes for all assets
         nodes = DependencyGraphBuilder._create_asset_nodes(assets)
+        if asset_index is None:
+            asset_index = AssetLookupIndex(assets)
 
         all_edges = []
         edge_id = 0
 
         # Process different types of dependencies
         data_edges, edge_id = DependencyGraphBuilder._process_data_dependencies(
-            data_deps, assets, edge_id
+            data_deps, asset_index, edge_id
         )
         all_edges.extend(data_edges)
 
         network_edges, edge_id = DependencyGraphBuilder._process_network_dependencies(
-            network_deps, assets, edge_id
+            network_deps, asset_index, edge_id
         )
         all_edges.extend(network_edges)
 
         config_edges, edge_id = DependencyGraphBuilder._process_config_dependencies(
-            config_deps, assets, edge_id
+            config_deps, asset_index, edge_id
         )
         all_edges.extend(config_edges)
 
         service_edges, edge_id = DependencyGraphBuilder._process_service_dependencies(
-            service_deps, assets, edge_id
+            service_deps, asset_index, edge_id
         )
         all_edges.extend(service_edges)
 
@@ -10,6 +10,7 @@ from typing import Any, Dict
 
 from .base import BaseTool, CREWAI_TOOLS_AVAILABLE, logger
 from .analyzer import DependencyAnalyzer
+from .graph_builders import CompiledDependencyGraph
 
 
 # Tool classes - defined conditionally to reduce complexity
@@ -212,72 +213,40 @@ class MigrationWavePlannerTool(BaseTool if CREWAI_TOOLS_AVAILABLE else object):
             bottlenecks = request.get("bottlenecks", [])
             circular_deps = request.get("circular_dependencies", [])
 
-            waves = []
-
-            # Wave 1: Independent assets (no dependencies)
-            nodes = dependency_graph.get("nodes", [])
-            edges = dependency_graph.get("edges", [])
-
-            dependent_nodes = set()
-            for edge in edges:
-                dependent_nodes.add(edge["source"])
-                dependent_nodes.add(edge["target"])
-
-            independent = [n for n in nodes if n["id"] not in dependent_nodes]
-            if independent:
-                waves.append(
-                    {
-                        "wave": 1,
-                        "name": "Independent Components",
-                        "assets": [n["label"] for n in independent],
-                        "asset_count": len(independent),
-                        "risk": "low",
-                        "strategy": "Can be migrated in parallel",
-                    }
-                )
-
-            # Wave 2: Low-dependency assets
-            low_dep = [
-                n
-                for n in nodes
-                if n["id"] in dependent_nodes
-                and n["id"] not in [b["node_id"] for b in bottlenecks]
-            ]
-            if low_dep:
-                waves.append(
-                    {
-                        "wave": 2,
-                        "name": "Low Dependency Components",
-                        "assets": [n["label"] for n in low_dep[:10]],  # Limit to 10
-                        "asset_count": len(low_dep),
-                        "risk": "medium",
-                        "strategy": "Migrate with dependency validation",
-                    }
-                )
-
-            # Wave 3: Critical/bottleneck assets
-            if bottlenecks:
-                waves.append(
-                    {
-                        "wave": 3,
-                        "name": "Critical Dependencies",
-                        "assets": [b["node_name"] for b in bottlenecks[:5]],
-                        "asset_count": len(bottlenecks),
-                        "risk": "high",
-                        "strategy": "Requires careful planning and testing",
-                    }
-                )
+            # Layer assets by dependency order; circular groups share a wave
+            compiled = CompiledDependencyGraph.from_graph(dependency_graph)
+            labels = {
+                node["id"]: node.get("label", node["id"])
+                for node in dependency_graph.get("nodes", [])
+            }
+            bottleneck_ids = {b["node_id"] for b in bottlenecks}
 
-            # Wave 4: Circular dependencies (migrate together)
-            if circular_deps:
+            waves = []
+            for number, groups in enumerate(compiled.migration_waves(), start=1):
+                assets = [asset for group in groups for asset in group]
+                cyclic = [group for group in groups if len(group) > 1]
+                if cyclic or bottleneck_ids.intersection(assets):
+                    risk = "high"
+                    strategy = "Migrate circular groups as atomic units; test bottlenecks carefully"
+                elif number == 1:
+                    risk = "low"
+                    strategy = "No upstream dependencies - can be migrated in parallel"
+                else:
+                    risk = "medium"
+                    strategy = (
+                        f"Migrate after wave {number - 1} with dependency validation"
+                    )
                 waves.append(
                     {
-                        "wave": 4,
-                        "name": "Circular Dependency Groups",
-                        "assets": [f"Group {i+1}" for i in range(len(circular_deps))],
-                        "asset_count": len(circular_deps) * 2,  # Assuming pairs
-                        "risk": "high",
-                        "strategy": "Must be migrated as atomic units",
+                        "wave": number,
+                        "name": f"Dependency Layer {number}",
+                        "assets": [labels[asset] for asset in assets],
+                        "asset_count": len(assets),
+                        "circular_groups": [
+                            [labels[asset] for asset in group] for group in cyclic
+                        ],
+                        "risk": risk,
+                        "strategy": strategy,
                     }
                 )
 
@@ -287,7 +256,9 @@ class MigrationWavePlannerTool(BaseTool if CREWAI_TOOLS_AVAILABLE else object):
                     "total_waves": len(waves),
                     "estimated_duration": f"{len(waves) * 2} weeks",
                     "risk_assessment": (
-                        "high" if bottlenecks or circular_deps else "medium"
+                        "high"
+                        if bottlenecks or circular_deps or compiled.cycles()
+                        else "medium"
                     ),
                 }
             )
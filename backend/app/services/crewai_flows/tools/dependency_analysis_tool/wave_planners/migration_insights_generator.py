@@ -4,7 +4,7 @@ Migration insights generation for wave planning.
 Generated by CC (Claude Code)
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from ..base import (
     ANALYSIS_TYPE_BOTTLENECK,
@@ -18,6 +18,7 @@ from ..base import (
     RISK_MEDIUM,
     RISK_LOW,
 )
+from ..graph_builders import CompiledDependencyGraph
 
 
 class MigrationInsightsGenerator:
@@ -104,9 +105,16 @@ class MigrationInsightsGenerator:
 
     @staticmethod
     def generate_wave_planning_recommendations(
-        dependency_graph: Dict[str, Any], critical_analysis: Dict[str, Any]
+        dependency_graph: Dict[str, Any],
+        critical_analysis: Dict[str, Any],
+        compiled: Optional[CompiledDependencyGraph] = None,
     ) -> Dict[str, Any]:
-        """Generate specific wave planning recommendations."""
+        """Generate wave planning recommendations from the dependency order.
+
+        Waves are the topological layers of the cycle-condensed graph: each
+        asset is placed one wave after the latest asset it depends on, and
+        the members of a circular dependency share a wave.
+        """
         recommendations = {
             "total_waves": 1,
             "wave_strategy": "single_wave",
@@ -115,33 +123,53 @@ class MigrationInsightsGenerator:
         }
 
         node_count = dependency_graph.get("node_count", 0)
-        dependency_graph.get("edge_count", 0)
         density = dependency_graph.get("density", 0)
 
         # Determine wave strategy based on complexity
         if node_count <= 5:
-            recommendations["wave_strategy"] = "single_wave"
-            recommendations["total_waves"] = 1
             recommendations["reasoning"].append(
                 "Small system - can migrate in single wave"
             )
-        elif density > HIGH_COUPLING_THRESHOLD:
+            if node_count:
+                recommendations["waves"].append(
+                    {
+                        "wave": 1,
+                        "assets": [node["id"] for node in dependency_graph["nodes"]],
+                        "migrate_together": [],
+                    }
+                )
+            return recommendations
+
+        if density > HIGH_COUPLING_THRESHOLD:
             recommendations["wave_strategy"] = "dependency_groups"
-            recommendations["total_waves"] = min(3, node_count // 3)
             recommendations["reasoning"].append(
                 "High coupling requires grouped migration"
             )
         elif len(critical_analysis.get("circular_dependencies", [])) > 0:
             recommendations["wave_strategy"] = "circular_resolution"
-            recommendations["total_waves"] = 2
             recommendations["reasoning"].append(
                 "Circular dependencies need special handling"
             )
         else:
             recommendations["wave_strategy"] = "dependency_order"
-            recommendations["total_waves"] = min(4, node_count // 2)
             recommendations["reasoning"].append(
                 "Medium complexity - wave-based approach"
             )
 
+        if compiled is None:
+            compiled = CompiledDependencyGraph.from_graph(dependency_graph)
+        for number, groups in enumerate(compiled.migration_waves(), start=1):
+            recommendations["waves"].append(
+                {
+                    "wave": number,
+                    "assets": [asset for group in groups for asset in group],
+                    "migrate_together": [group for group in groups if len(group) > 1],
+                }
+            )
+        recommendations["total_waves"] = len(recommendations["waves"])
+        recommendations["reasoning"].append(
+            f"{recommendations['total_waves']} waves follow the dependency order; "
+            "each asset migrates after everything it depends on"
+        )
+
         return recommendations
@@ -9,6 +9,8 @@ from typing import Any, Dict, List, Optional
 
 from crewai.tools import BaseTool
 
+from .asset_lookup_index import AssetLookupIndex, subnet_prefix
+
 logger = logging.getLogger(__name__)
 
 
@@ -60,12 +62,13 @@ class TopologyMappingTool(BaseTool):
     ) -> List[Dict[str, Any]]:
         """Map which applications are hosted on which servers"""
         relationships = []
+        server_index = AssetLookupIndex(servers)
 
         for app in applications:
             app_name = app.get("name", "")
 
             # Try to find hosting server through various methods
-            hosting_server = self._find_hosting_server(app, servers)
+            hosting_server = self._find_hosting_server(app, server_index)
 
             if hosting_server:
                 relationships.append(
@@ -93,40 +96,28 @@ class TopologyMappingTool(BaseTool):
         return relationships
 
     def _find_hosting_server(
-        self, app: Dict[str, Any], servers: List[Dict[str, Any]]
+        self, app: Dict[str, Any], server_index: AssetLookupIndex
     ) -> Optional[Dict[str, Any]]:
         """Find the server hosting a specific application"""
-        app_name = app.get("name", "").lower()
-        app_ip = app.get("ip_address", "")
-
         # Method 1: Direct IP match
-        for server in servers:
-            server_ip = server.get("ip_address", "")
-            if app_ip and server_ip and app_ip == server_ip:
+        app_ip = app.get("ip_address", "")
+        if app_ip:
+            server = server_index.by_ip(app_ip)
+            if server:
                 return server
 
         # Method 2: Hostname/name similarity
-        for server in servers:
-            server_name = server.get("name", "").lower()
-            if app_name and server_name:
-                if app_name in server_name or server_name in app_name:
-                    return server
+        app_name = app.get("name", "")
+        if app_name:
+            server = server_index.by_overlapping_name(app_name)
+            if server:
+                return server
 
         # Method 3: Environment and location matching
         app_env = app.get("environment", "")
         app_location = app.get("location", "")
-
-        for server in servers:
-            server_env = server.get("environment", "")
-            server_location = server.get("location", "")
-
-            env_match = app_env and server_env and app_env == server_env
-            location_match = (
-                app_location and server_location and app_location == server_location
-            )
-
-            if env_match and location_match:
-                return server
+        if app_env and app_location:
+            return server_index.by_environment_location(app_env, app_location)
 
         return None
 
@@ -236,10 +227,8 @@ class TopologyMappingTool(BaseTool):
         subnets = set()
 
         for asset in assets:
-            ip = asset.get("ip_address", "")
-            if ip and "." in ip:
-                # Simple subnet identification (first 3 octets)
-                subnet = ".".join(ip.split(".")[:3]) + ".0/24"
+            subnet = subnet_prefix(asset.get("ip_address"))
+            if subnet:
                 subnets.add(subnet)
 
         return list(subnets)
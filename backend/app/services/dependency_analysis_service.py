@@ -3,7 +3,7 @@ Service for analyzing and managing asset dependencies with CrewAI integration.
 """
 
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -11,6 +11,10 @@ from app.core.exceptions import ValidationError
 from app.models.asset import AssetDependency
 from app.repositories.dependency_repository import DependencyRepository
 from app.services.crewai_flow_service import CrewAIFlowService
+from app.services.dependency_graph_store import (
+    DependencyGraphStore,
+    graph_dependencies,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -31,18 +35,21 @@ class DependencyAnalysisService:
         self.engagement_id = engagement_id
         self.flow_id = flow_id
         self.repository = DependencyRepository(db, client_account_id, engagement_id)
+        self.graph_store = DependencyGraphStore(db, client_account_id, engagement_id)
         self.discovery_flow = CrewAIFlowService(db)
 
     async def get_dependency_analysis(self) -> Dict[str, Any]:
         """Get comprehensive dependency analysis."""
-        # Get raw dependencies
+        # Get raw app-server dependencies
         app_server_deps = await self.repository.get_app_server_dependencies()
-        app_app_deps = await self.repository.get_app_app_dependencies()
 
         # Get available assets for mapping
         available_apps = await self.repository.get_available_applications()
         available_servers = await self.repository.get_available_servers()
 
+        # App-app dependencies come from the materialized graph, not a query
+        graph = await self.graph_store.get_graph()
+
         # Format for UI
         return {
             "app_server_mapping": {
@@ -51,42 +58,17 @@ class DependencyAnalysisService:
                 "available_servers": available_servers,
             },
             "cross_application_mapping": {
-                "cross_app_dependencies": app_app_deps,
+                "cross_app_dependencies": graph_dependencies(graph),
                 "available_applications": available_apps,
-                "dependency_graph": self._build_dependency_graph(app_app_deps),
+                "dependency_graph": graph,
             },
         }
 
-    def _build_dependency_graph(
-        self, dependencies: List[Dict[str, Any]]
+    async def get_dependency_graph(
+        self, since_version: Optional[int] = None
     ) -> Dict[str, Any]:
-        """Build graph structure for visualization."""
-        nodes = set()
-        edges = []
-
-        for dep in dependencies:
-            source_id = dep["source_app_id"]
-            target_app = dep["target_app_info"]
-            target_id = target_app["id"]
-
-            # Add nodes
-            nodes.add((source_id, dep["source_app_name"]))
-            nodes.add((target_id, target_app["name"]))
-
-            # Add edge
-            edges.append(
-                {
-                    "source": source_id,
-                    "target": target_id,
-                    "type": dep["dependency_type"],
-                    "description": dep.get("description", ""),
-                }
-            )
-
-        return {
-            "nodes": [{"id": id, "label": name} for id, name in nodes],
-            "edges": edges,
-        }
+        """Get the materialized dependency graph, or changes since a version."""
+        return await self.graph_store.get_graph(since_version)
 
     async def analyze_with_crew(self, analysis_type: str) -> Dict[str, Any]:
         """Trigger CrewAI analysis for dependencies."""
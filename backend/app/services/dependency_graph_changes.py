@@ -0,0 +1,379 @@
+"""
+Incremental maintenance of materialized dependency graphs.
+
+Writes to application dependencies and assets are turned into one versioned
+GraphChange per engagement and flush. Mapper events on Asset and
+AssetDependency mark the sessions that wrote a relevant row; only those
+sessions run the after_flush listener, which applies the change to the
+engagement's snapshot in the same transaction and appends it to
+migration.dependency_graph_changes. Engagements without a built snapshot cost
+one advisory lock and one existence check per relevant flush; the lock,
+shared with snapshot rebuilds, keeps a rebuild from overwriting the change.
+Bulk SQL statements bypass the ORM and must call lock_graphs and
+apply_graph_change, or invalidate_dependency_graph.
+
+Reading and building snapshots lives in dependency_graph_store, and the
+shared statements and locks in dependency_graph_sql.
+"""
+
+import json
+import logging
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect, select, text, tuple_
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, object_session
+
+from app.models.asset import Asset, AssetDependency, AssetType
+from app.models.dependency_graph import DependencyGraphSnapshot
+from app.services.dependency_graph_sql import (
+    INVALIDATE_SNAPSHOT_SQL,
+    LOG_CHANGE_SQL,
+    PRUNE_CHANGES_SQL,
+    EngagementKey,
+    lock_graphs,
+)
+
+logger = logging.getLogger(__name__)
+
+# Changes kept per engagement for delta reads; older clients reload in full
+MAX_RETAINED_CHANGES = 500
+
+# Old changes are pruned once every this many versions
+PRUNE_INTERVAL = 50
+
+# session.info flag set by the mapper events when a flush touches the graph
+GRAPH_PENDING_KEY = "dependency_graph_pending"
+
+
+@dataclass
+class GraphChange:
+    """One delta to an engagement's graph"""
+
+    # dependency id -> [source id, target id, dependency type, description]
+    edges: Dict[str, list] = field(default_factory=dict)
+    removed_edges: Set[str] = field(default_factory=set)
+    # Labels of edge endpoints (always stored) and renamed assets (only
+    # stored when the asset is already a node)
+    labels: Dict[str, str] = field(default_factory=dict)
+    renamed: Dict[str, str] = field(default_factory=dict)
+    removed_nodes: Set[str] = field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        return bool(
+            self.edges
+            or self.removed_edges
+            or self.labels
+            or self.renamed
+            or self.removed_nodes
+        )
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "edges": self.edges,
+            "removed_edges": sorted(self.removed_edges),
+            "labels": {**self.renamed, **self.labels},
+            "removed_nodes": sorted(self.removed_nodes),
+        }
+
+
+def edge_entry(dependency: AssetDependency) -> list:
+    """Compact snapshot form of one dependency"""
+    return [
+        str(dependency.asset_id),
+        str(dependency.depends_on_asset_id),
+        dependency.dependency_type,
+        dependency.description or "",
+    ]
+
+
+def _engagement_key(entity: Any) -> Optional[EngagementKey]:
+    if entity.client_account_id is None or entity.engagement_id is None:
+        return None
+    return (
+        uuid.UUID(str(entity.client_account_id)),
+        uuid.UUID(str(entity.engagement_id)),
+    )
+
+
+def _endpoints_changed(dependency: AssetDependency) -> bool:
+    state = inspect(dependency)
+    return (
+        state.attrs.asset_id.history.has_changes()
+        or state.attrs.depends_on_asset_id.history.has_changes()
+    )
+
+
+def collect_flush_changes(
+    new: Iterable[Any], dirty: Iterable[Any], deleted: Iterable[Any]
+) -> Tuple[
+    Dict[EngagementKey, GraphChange], Dict[EngagementKey, List[AssetDependency]]
+]:
+    """Split a flush into graph changes and dependencies still to classify
+
+    Dependencies need their endpoint asset types before they can become
+    edges, so they are returned separately from the changes that are
+    already known (removals and renames).
+    """
+    changes: Dict[EngagementKey, GraphChange] = {}
+    upserts: Dict[EngagementKey, List[AssetDependency]] = {}
+
+    def change_for(key: EngagementKey) -> GraphChange:
+        return changes.setdefault(key, GraphChange())
+
+    for entity in new:
+        if isinstance(entity, AssetDependency):
+            key = _engagement_key(entity)
+            if key:
+                upserts.setdefault(key, []).append(entity)
+
+    for entity in dirty:
+        key = (
+            _engagement_key(entity)
+            if isinstance(entity, (Asset, AssetDependency))
+            else None
+        )
+        if key is None:
+            continue
+        if isinstance(entity, AssetDependency):
+            if _endpoints_changed(entity):
+                change_for(key).removed_edges.add(str(entity.id))
+            upserts.setdefault(key, []).append(entity)
+        elif inspect(entity).attrs.name.history.has_changes() and entity.name:
+            change_for(key).renamed[str(entity.id)] = entity.name
+
+    for entity in deleted:
+        key = (
+            _engagement_key(entity)
+            if isinstance(entity, (Asset, AssetDependency))
+            else None
+        )
+        if key is None:
+            continue
+        if isinstance(entity, AssetDependency):
+            change_for(key).removed_edges.add(str(entity.id))
+        else:
+            change_for(key).removed_nodes.add(str(entity.id))
+
+    return changes, upserts
+
+
+def _update_statement(change: GraphChange) -> str:
+    """UPDATE applying a change to a snapshot row, touching only what it needs"""
+    edges = "edges"
+    if change.removed_edges:
+        edges = f"({edges} - CAST(:removed_edges AS text[]))"
+    if change.removed_nodes:
+        edges = (
+            "(SELECT COALESCE(jsonb_object_agg(key, value), '{}'::jsonb) "
+            f"FROM jsonb_each({edges}) "
+            "WHERE NOT (value->>0 = ANY(CAST(:removed_nodes AS text[])) "
+            "OR value->>1 = ANY(CAST(:removed_nodes AS text[]))))"
+        )
+    if change.edges:
+        edges = f"{edges} || CAST(:edges AS jsonb)"
+
+    nodes = "nodes"
+    if change.removed_nodes:
+        nodes = f"({nodes} - CAST(:removed_nodes AS text[]))"
+    if change.renamed:
+        nodes = (
+            f"{nodes} || (SELECT COALESCE(jsonb_object_agg(key, value), '{{}}'::jsonb) "
+            "FROM jsonb_each(CAST(:renamed AS jsonb)) WHERE nodes -> key IS NOT NULL)"
+        )
+    if change.labels:
+        nodes = f"{nodes} || CAST(:labels AS jsonb)"
+
+    return f"""
+        UPDATE migration.dependency_graph_snapshots
+        SET edges = {edges},
+            nodes = {nodes},
+            version = version + 1,
+            updated_at = now()
+        WHERE client_account_id = :client_account_id
+          AND engagement_id = :engagement_id
+          AND edges IS NOT NULL
+        RETURNING version
+    """
+
+
+def apply_graph_change(
+    connection: Connection, key: EngagementKey, change: GraphChange
+) -> Optional[int]:
+    """Apply a change to a materialized snapshot and log it
+
+    Returns the new version, or None if the engagement has no snapshot.
+    """
+    if not change:
+        return None
+    client_account_id, engagement_id = key
+    params = {
+        "client_account_id": client_account_id,
+        "engagement_id": engagement_id,
+        "removed_edges": sorted(change.removed_edges),
+        "removed_nodes": sorted(change.removed_nodes),
+        "edges": json.dumps(change.edges),
+        "renamed": json.dumps(change.renamed),
+        "labels": json.dumps(change.labels),
+    }
+    version = connection.execute(text(_update_statement(change)), params).scalar()
+    if version is None:
+        return None
+
+    connection.execute(
+        text(LOG_CHANGE_SQL),
+        {
+            "client_account_id": client_account_id,
+            "engagement_id": engagement_id,
+            "version": version,
+            "change": json.dumps(change.to_json()),
+        },
+    )
+    if version % PRUNE_INTERVAL == 0:
+        connection.execute(
+            text(PRUNE_CHANGES_SQL),
+            {
+                "client_account_id": client_account_id,
+                "engagement_id": engagement_id,
+                "oldest": version - MAX_RETAINED_CHANGES,
+            },
+        )
+    return version
+
+
+def _classify_upserts(
+    connection: Connection,
+    changes: Dict[EngagementKey, GraphChange],
+    upserts: Dict[EngagementKey, List[AssetDependency]],
+) -> None:
+    """Turn dependencies between two applications into edge upserts"""
+    asset_ids = {
+        asset_id
+        for dependencies in upserts.values()
+        for dependency in dependencies
+        for asset_id in (dependency.asset_id, dependency.depends_on_asset_id)
+    }
+    if not asset_ids:
+        return
+    assets = {
+        str(row.id): row
+        for row in connection.execute(
+            select(Asset.id, Asset.name, Asset.asset_type).where(
+                Asset.id.in_(asset_ids)
+            )
+        )
+    }
+    for key, dependencies in upserts.items():
+        for dependency in dependencies:
+            source = assets.get(str(dependency.asset_id))
+            target = assets.get(str(dependency.depends_on_asset_id))
+            if not (
+                source
+                and target
+                and source.asset_type == AssetType.APPLICATION
+                and target.asset_type == AssetType.APPLICATION
+            ):
+                continue
+            change = changes.setdefault(key, GraphChange())
+            change.edges[str(dependency.id)] = edge_entry(dependency)
+            change.removed_edges.discard(str(dependency.id))
+            change.labels[str(source.id)] = source.name
+            change.labels[str(target.id)] = target.name
+
+
+def _mark_pending(mapper: Any, connection: Connection, target: Any) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info[GRAPH_PENDING_KEY] = True
+
+
+def _mark_renamed_asset(mapper: Any, connection: Connection, target: Asset) -> None:
+    if inspect(target).attrs.name.history.has_changes():
+        _mark_pending(mapper, connection, target)
+
+
+def _find_maintained(
+    connection: Connection, keys: Iterable[EngagementKey]
+) -> Set[EngagementKey]:
+    """Engagements among keys whose snapshot is currently built"""
+    return {
+        (row.client_account_id, row.engagement_id)
+        for row in connection.execute(
+            select(
+                DependencyGraphSnapshot.client_account_id,
+                DependencyGraphSnapshot.engagement_id,
+            ).where(
+                tuple_(
+                    DependencyGraphSnapshot.client_account_id,
+                    DependencyGraphSnapshot.engagement_id,
+                ).in_(list(keys)),
+                DependencyGraphSnapshot.edges.isnot(None),
+            )
+        )
+    }
+
+
+def _invalidate_snapshots(
+    connection: Connection, keys: Iterable[EngagementKey]
+) -> None:
+    for client_account_id, engagement_id in keys:
+        connection.execute(
+            text(INVALIDATE_SNAPSHOT_SQL),
+            {"client_account_id": client_account_id, "engagement_id": engagement_id},
+        )
+
+
+def _after_flush(session: Session, flush_context: Any) -> None:
+    """Apply the graph changes of a flush to materialized snapshots"""
+    if not session.info.pop(GRAPH_PENDING_KEY, False):
+        return
+    changes, upserts = collect_flush_changes(
+        session.new, session.dirty, session.deleted
+    )
+    keys = set(changes) | set(upserts)
+    if not keys:
+        return
+
+    connection = session.connection()
+    lock_graphs(connection, keys)
+    maintained = _find_maintained(connection, keys)
+    if not maintained:
+        return
+
+    savepoint = connection.begin_nested()
+    try:
+        _classify_upserts(
+            connection,
+            changes,
+            {key: deps for key, deps in upserts.items() if key in maintained},
+        )
+        for key in maintained:
+            if key in changes:
+                apply_graph_change(connection, key, changes[key])
+        savepoint.commit()
+    except Exception as e:
+        # The write itself must not fail because its graph could not be
+        # updated; drop the snapshot instead so the next read rebuilds it
+        savepoint.rollback()
+        logger.warning(f"Dependency graph update failed, invalidating: {e}")
+        try:
+            _invalidate_snapshots(connection, maintained)
+        except Exception as invalidate_error:
+            logger.error(f"Dependency graph invalidation failed: {invalidate_error}")
+
+
+def register_dependency_graph_listeners() -> None:
+    """Keep materialized dependency graphs current on asset/dependency flushes"""
+    listeners = [
+        (AssetDependency, "after_insert", _mark_pending),
+        (AssetDependency, "after_update", _mark_pending),
+        (AssetDependency, "after_delete", _mark_pending),
+        (Asset, "after_update", _mark_renamed_asset),
+        (Asset, "after_delete", _mark_pending),
+        (Session, "after_flush", _after_flush),
+    ]
+    for target, identifier, listener in listeners:
+        if not event.contains(target, identifier, listener):
+            event.listen(target, identifier, listener)
@@ -0,0 +1,63 @@
+"""
+SQL statements and locks shared by the dependency graph modules.
+
+dependency_graph_changes applies flush deltas to snapshots and
+dependency_graph_store rebuilds them; both take the per-engagement graph lock
+here before touching a snapshot.
+"""
+
+import uuid
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+EngagementKey = Tuple[uuid.UUID, uuid.UUID]
+
+# Drops an engagement's snapshot so the next read rebuilds it. The version
+# still moves forward, so clients holding an older version get the full graph
+# rather than a delta.
+INVALIDATE_SNAPSHOT_SQL = """
+    UPDATE migration.dependency_graph_snapshots
+    SET nodes = NULL, edges = NULL, version = version + 1, updated_at = now()
+    WHERE client_account_id = :client_account_id
+      AND engagement_id = :engagement_id
+"""
+
+# Serializes a snapshot rebuild (read + upsert) with the flushes changing the
+# same engagement, so neither overwrites the other's version. Transaction
+# scoped: released when the rebuild or the writing transaction ends.
+LOCK_GRAPH_SQL = """
+    SELECT pg_advisory_xact_lock(
+        hashtextextended('dependency_graph:' || :client_account_id
+                         || ':' || :engagement_id, 0)
+    )
+"""
+
+# Change log appends and periodic pruning of old changes
+LOG_CHANGE_SQL = """
+    INSERT INTO migration.dependency_graph_changes
+        (client_account_id, engagement_id, version, change)
+    VALUES (:client_account_id, :engagement_id, :version, CAST(:change AS jsonb))
+"""
+
+PRUNE_CHANGES_SQL = """
+    DELETE FROM migration.dependency_graph_changes
+    WHERE client_account_id = :client_account_id
+      AND engagement_id = :engagement_id
+      AND version <= :oldest
+"""
+
+
+def graph_lock_params(key: EngagementKey) -> Dict[str, str]:
+    client_account_id, engagement_id = key
+    return {
+        "client_account_id": str(client_account_id),
+        "engagement_id": str(engagement_id),
+    }
+
+
+def lock_graphs(connection: Connection, keys: Iterable[EngagementKey]) -> None:
+    """Take the graph locks of several engagements, in a fixed order"""
+    for key in sorted(keys):
+        connection.execute(text(LOCK_GRAPH_SQL), graph_lock_params(key))
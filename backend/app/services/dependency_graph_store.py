@@ -0,0 +1,252 @@
+"""
+Materialized application dependency graph per engagement.
+
+The graph shown in dependency views is stored as one compact row per
+engagement (migration.dependency_graph_snapshots) and kept current
+incrementally by dependency_graph_changes. Graph reads are a single row
+fetch, and clients that already hold a version can ask for the changes since
+then.
+
+The snapshot is only built from asset_dependencies on first use (or after it
+has been invalidated). The build runs in a session the store owns, so a read
+never commits the caller's request session, and holds the engagement's graph
+lock so no flush applies a change between its read and its upsert.
+"""
+
+import json
+import logging
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import AsyncSessionLocal
+from app.models.dependency_graph import DependencyGraphChange, DependencyGraphSnapshot
+from app.repositories.dependency_repository import DependencyRepository
+from app.services.dependency_graph_changes import GraphChange, apply_graph_change
+from app.services.dependency_graph_sql import (
+    INVALIDATE_SNAPSHOT_SQL,
+    LOCK_GRAPH_SQL,
+    graph_lock_params,
+    lock_graphs,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def assemble_graph(
+    nodes: Dict[str, str], edges: Dict[str, list]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Graph view payload: the assets taking part in an edge, and the edges"""
+    node_ids: Dict[str, None] = {}
+    edge_list = []
+    for edge_id, (source, target, dependency_type, description) in edges.items():
+        node_ids.setdefault(source)
+        node_ids.setdefault(target)
+        edge_list.append(
+            {
+                "id": edge_id,
+                "source": source,
+                "target": target,
+                "type": dependency_type,
+                "description": description or "",
+            }
+        )
+    return {
+        "nodes": [
+            {"id": node_id, "label": nodes.get(node_id, "")} for node_id in node_ids
+        ],
+        "edges": edge_list,
+    }
+
+
+def graph_dependencies(graph: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Cross-application dependency rows of a full graph payload
+
+    Same shape as DependencyRepository.get_app_app_dependencies, without the
+    fields the snapshot does not keep (creation time, target asset type).
+    """
+    labels = {node["id"]: node["label"] for node in graph["nodes"]}
+    return [
+        {
+            "dependency_id": edge["id"],
+            "source_app_id": edge["source"],
+            "source_app_name": labels.get(edge["source"], ""),
+            "target_app_info": {
+                "id": edge["target"],
+                "name": labels.get(edge["target"], ""),
+            },
+            "dependency_type": edge["type"],
+            "description": edge["description"],
+        }
+        for edge in graph["edges"]
+    ]
+
+
+class DependencyGraphStore:
+    """Reads (and lazily builds) the materialized graph of one engagement"""
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        client_account_id: str,
+        engagement_id: str,
+        session_factory: Optional[Callable[[], Any]] = None,
+    ):
+        self.db = db
+        self.client_account_id = uuid.UUID(str(client_account_id))
+        self.engagement_id = uuid.UUID(str(engagement_id))
+        # Rebuilds write and commit in their own session
+        self._session_factory = session_factory or AsyncSessionLocal
+
+    async def _snapshot(self) -> Optional[DependencyGraphSnapshot]:
+        result = await self.db.execute(
+            select(DependencyGraphSnapshot).where(
+                DependencyGraphSnapshot.client_account_id == self.client_account_id,
+                DependencyGraphSnapshot.engagement_id == self.engagement_id,
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def get_graph(self, since_version: Optional[int] = None) -> Dict[str, Any]:
+        """Current graph, or only the changes after since_version
+
+        Returns {"version", "full": True, "nodes", "edges"} or, when the
+        changes since since_version are still retained,
+        {"version", "full": False, "since_version", "changes": [...]}.
+        """
+        snapshot = await self._snapshot()
+        if snapshot is None or snapshot.edges is None:
+            return await self.rebuild()
+
+        if since_version is not None:
+            changes = await self._changes_since(snapshot, since_version)
+            if changes is not None:
+                return {
+                    "version": snapshot.version,
+                    "full": False,
+                    "since_version": since_version,
+                    "changes": changes,
+                }
+
+        return {
+            "version": snapshot.version,
+            "full": True,
+            **assemble_graph(snapshot.nodes or {}, snapshot.edges),
+        }
+
+    async def _changes_since(
+        self, snapshot: DependencyGraphSnapshot, since_version: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Changes after since_version, or None if they are not all retained"""
+        if since_version == snapshot.version:
+            return []
+        if not snapshot.base_version <= since_version < snapshot.version:
+            return None
+        result = await self.db.execute(
+            select(DependencyGraphChange.version, DependencyGraphChange.change)
+            .where(
+                DependencyGraphChange.client_account_id == self.client_account_id,
+                DependencyGraphChange.engagement_id == self.engagement_id,
+                DependencyGraphChange.version > since_version,
+            )
+            .order_by(DependencyGraphChange.version)
+        )
+        rows = result.all()
+        if not rows or rows[0].version != since_version + 1:
+            return None
+        return [{"version": row.version, **row.change} for row in rows]
+
+    async def rebuild(self) -> Dict[str, Any]:
+        """Build the snapshot from asset_dependencies and store it"""
+        async with self._session_factory() as session:
+            # Flushes applying changes wait until the new snapshot commits;
+            # the read below sees every change committed before it
+            await session.execute(
+                text(LOCK_GRAPH_SQL),
+                graph_lock_params((self.client_account_id, self.engagement_id)),
+            )
+            repository = DependencyRepository(
+                session, str(self.client_account_id), str(self.engagement_id)
+            )
+            nodes: Dict[str, str] = {}
+            edges: Dict[str, list] = {}
+            for dep in await repository.get_app_app_dependencies():
+                target = dep["target_app_info"]
+                nodes[dep["source_app_id"]] = dep["source_app_name"]
+                nodes[str(target["id"])] = target["name"]
+                edges[dep["dependency_id"]] = [
+                    dep["source_app_id"],
+                    str(target["id"]),
+                    dep["dependency_type"],
+                    dep.get("description") or "",
+                ]
+
+            result = await session.execute(
+                text(
+                    """
+                    INSERT INTO migration.dependency_graph_snapshots
+                        (client_account_id, engagement_id, version, base_version,
+                         nodes, edges)
+                    VALUES (:client_account_id, :engagement_id, 1, 1,
+                            CAST(:nodes AS jsonb), CAST(:edges AS jsonb))
+                    ON CONFLICT (client_account_id, engagement_id) DO UPDATE
+                    SET version = dependency_graph_snapshots.version + 1,
+                        base_version = dependency_graph_snapshots.version + 1,
+                        nodes = EXCLUDED.nodes,
+                        edges = EXCLUDED.edges,
+                        updated_at = now()
+                    RETURNING version
+                    """
+                ),
+                {
+                    "client_account_id": self.client_account_id,
+                    "engagement_id": self.engagement_id,
+                    "nodes": json.dumps(nodes),
+                    "edges": json.dumps(edges),
+                },
+            )
+            version = result.scalar_one()
+            await session.commit()
+
+        logger.info(
+            f"Rebuilt dependency graph for engagement {self.engagement_id}: "
+            f"{len(edges)} edges, version {version}"
+        )
+        return {"version": version, "full": True, **assemble_graph(nodes, edges)}
+
+
+async def invalidate_dependency_graph(
+    db: AsyncSession, client_account_id: Any, engagement_id: Any
+) -> None:
+    """Force the next read to rebuild an engagement's graph
+
+    The version still moves forward, so clients holding an older version
+    get the full graph rather than a delta.
+    """
+    key = (uuid.UUID(str(client_account_id)), uuid.UUID(str(engagement_id)))
+    await db.execute(text(LOCK_GRAPH_SQL), graph_lock_params(key))
+    await db.execute(
+        text(INVALIDATE_SNAPSHOT_SQL),
+        {"client_account_id": key[0], "engagement_id": key[1]},
+    )
+
+
+async def remove_graph_edges(
+    db: AsyncSession,
+    client_account_id: Any,
+    engagement_id: Any,
+    dependency_ids: Iterable[Any],
+) -> None:
+    """Record dependencies deleted with a bulk DELETE (which skips the ORM)"""
+    change = GraphChange(removed_edges={str(dep_id) for dep_id in dependency_ids})
+    if not change:
+        return
+    key = (uuid.UUID(str(client_account_id)), uuid.UUID(str(engagement_id)))
+
+    def apply(session: Any) -> None:
+        lock_graphs(session.connection(), [key])
+        apply_graph_change(session.connection(), key, change)
+
+    await db.run_sync(apply)
@@ -2,19 +2,39 @@
 Enhanced Embedding Service for Vector Search and Learning
 Provides AI-powered vector embeddings using DeepInfra's thenlper/gte-large model.
 Supports learning pattern storage and similarity search for assets.
+
+Requests share a pooled HTTP client, concurrent single-text calls are
+micro-batched into one API request, and results are cached by content.
+Without an API key, or when the API fails, texts are embedded locally with
+hashed character n-grams.
 """
 
-import hashlib
+import asyncio
 import logging
-import random
-from typing import List
-
-import httpx
+import weakref
+from typing import Dict, List, Optional
 
 from app.core.config import settings
+from app.services.embeddings import (
+    EmbeddingBatcher,
+    EmbeddingCache,
+    LocalEmbedder,
+    cosine_similarity,
+    get_http_client,
+    normalize_text,
+    top_k_similar,
+)
 
 logger = logging.getLogger(__name__)
 
+# Inputs per API request; larger batches are split
+MAX_INPUTS_PER_REQUEST = 256
+
+# Shared by every EmbeddingService so callers that build their own instance
+# still hit the same cache
+_embedding_cache = EmbeddingCache()
+_local_embedder = LocalEmbedder()
+
 
 class EmbeddingService:
     """Enhanced service for generating embeddings and performing similarity search."""
@@ -24,6 +44,13 @@ class EmbeddingService:
         self.api_key = settings.DEEPINFRA_API_KEY
         self.base_url = "https://api.deepinfra.com/v1/openai"
         self.model = "thenlper/gte-large"
+        self.cache = _embedding_cache
+        # Offline backend: used without an API key and when the API fails
+        self.local_embedder = _local_embedder
+        # Futures belong to one loop, so each loop gets its own batcher
+        self._batchers: (
+            "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, EmbeddingBatcher]"
+        ) = weakref.WeakKeyDictionary()
 
         if self.api_key:
             self.ai_available = True
@@ -32,7 +59,7 @@ class EmbeddingService:
             )
         else:
             logger.warning(
-                "AI embedding service using mock mode - DEEPINFRA_API_KEY not configured"
+                "AI embedding service using local embeddings - DEEPINFRA_API_KEY not configured"
             )
 
     async def embed_text(self, text: str) -> List[float]:
@@ -40,63 +67,36 @@ class EmbeddingService:
         Generate embeddings for text using DeepInfra's thenlper/gte-large model.
         Returns 1024-dimensional vector.
 
+        Concurrent calls are combined into a single batch request.
+
         Args:
             text: Text to embed
 
         Returns:
             List of floats representing the embedding vector
-
-        Raises:
-            Exception: If embedding generation fails
         """
         if not self.ai_available:
-            logger.debug("AI embedding not available, using mock embedding")
-            return self._generate_mock_embedding(text)
+            logger.debug("AI embedding not available, using local embedding")
+            return self.local_embedder.embed_text(text)
 
-        try:
-            # Make direct API call to DeepInfra
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/embeddings",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "model": self.model,
-                        "input": text,
-                        "encoding_format": "float",
-                    },
-                    timeout=30.0,
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    # Extract embedding from response
-                    if "data" in data and len(data["data"]) > 0:
-                        embedding = data["data"][0]["embedding"]
-                        logger.debug(
-                            f"Generated embedding for text (dim: {len(embedding)})"
-                        )
-                        return embedding
-                    else:
-                        logger.error(f"Unexpected response format: {data}")
-                        return self._generate_mock_embedding(text)
-                else:
-                    logger.error(
-                        f"DeepInfra API error {response.status_code}: {response.text}"
-                    )
-                    return self._generate_mock_embedding(text)
+        cached = self.cache.get_local(self.model, text)
+        if cached is not None:
+            return cached
 
+        try:
+            return await self._get_batcher().submit(text)
         except Exception as e:
             logger.error(f"Error generating embedding: {e}")
-            # Fallback to mock embedding
-            return self._generate_mock_embedding(text)
+            # Fallback to local embedding
+            return self.local_embedder.embed_text(text)
 
     async def embed_texts(self, texts: List[str]) -> List[List[float]]:
         """
         Generate embeddings for multiple texts efficiently.
 
+        Cached texts are served from the embedding cache and duplicates are
+        embedded once; only the rest go to the API.
+
         Args:
             texts: List of texts to embed
 
@@ -104,67 +104,97 @@ class EmbeddingService:
             List of embedding vectors
         """
         if not self.ai_available:
-            logger.debug("AI embedding not available, using mock embeddings")
-            return [self._generate_mock_embedding(text) for text in texts]
+            logger.debug("AI embedding not available, using local embeddings")
+            return self.local_embedder.embed_texts(texts)
 
-        try:
-            # Make batch API call to DeepInfra
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/embeddings",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "model": self.model,
-                        "input": texts,
-                        "encoding_format": "float",
-                    },
-                    timeout=60.0,  # Longer timeout for batch
-                )
+        normalized = [normalize_text(text) for text in texts]
+        embeddings = await self.cache.get_many(self.model, normalized)
 
-                if response.status_code == 200:
-                    data = response.json()
-                    # Extract embeddings from response
-                    if "data" in data:
-                        embeddings = [item["embedding"] for item in data["data"]]
-                        logger.debug(
-                            f"Generated {len(embeddings)} embeddings (dim: {len(embeddings[0]) if embeddings else 0})"
-                        )
-                        return embeddings
+        missing = list(
+            dict.fromkeys(
+                text
+                for text, embedding in zip(normalized, embeddings)
+                if embedding is None
+            )
+        )
+        if missing:
+            fetched = await self._fetch_embeddings(missing)
+            failed = []
+            for i, text in enumerate(normalized):
+                if embeddings[i] is None:
+                    if text in fetched:
+                        embeddings[i] = fetched[text]
                     else:
-                        logger.error(f"Unexpected response format: {data}")
-                        return [self._generate_mock_embedding(text) for text in texts]
-                else:
-                    logger.error(
-                        f"DeepInfra API error {response.status_code}: {response.text}"
-                    )
-                    return [self._generate_mock_embedding(text) for text in texts]
+                        failed.append(i)
+            # Texts the API did not embed fall back to local embeddings
+            if failed:
+                local = self.local_embedder.embed_texts([texts[i] for i in failed])
+                for i, embedding in zip(failed, local):
+                    embeddings[i] = embedding
+
+        return embeddings
+
+    def _get_batcher(self) -> EmbeddingBatcher:
+        loop = asyncio.get_running_loop()
+        batcher = self._batchers.get(loop)
+        if batcher is None:
+            batcher = EmbeddingBatcher(self.embed_texts)
+            self._batchers[loop] = batcher
+        return batcher
+
+    async def _fetch_embeddings(self, texts: List[str]) -> Dict[str, List[float]]:
+        """Embed texts through the API and cache them; failed texts are left out"""
+        fetched: Dict[str, List[float]] = {}
+        for start in range(0, len(texts), MAX_INPUTS_PER_REQUEST):
+            chunk = texts[start : start + MAX_INPUTS_PER_REQUEST]
+            embeddings = await self._request_embeddings(chunk)
+            if embeddings is None:
+                continue
+            fetched.update(zip(chunk, embeddings))
+            await self.cache.put_many(self.model, chunk, embeddings)
+        return fetched
+
+    async def _request_embeddings(
+        self, texts: List[str]
+    ) -> Optional[List[List[float]]]:
+        """One batch API call; None if it failed"""
+        try:
+            response = await get_http_client().post(
+                f"{self.base_url}/embeddings",
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json",
+                },
+                json={
+                    "model": self.model,
+                    "input": texts,
+                    "encoding_format": "float",
+                },
+            )
+
+            if response.status_code != 200:
+                logger.error(
+                    f"DeepInfra API error {response.status_code}: {response.text}"
+                )
+                return None
+
+            data = response.json()
+            items = data.get("data") if isinstance(data, dict) else None
+            if not items or len(items) != len(texts):
+                logger.error(f"Unexpected response format: {data}")
+                return None
+
+            # Results are matched to inputs by index, not response order
+            items = sorted(items, key=lambda item: item.get("index", 0))
+            embeddings = [item["embedding"] for item in items]
+            logger.debug(
+                f"Generated {len(embeddings)} embeddings (dim: {len(embeddings[0])})"
+            )
+            return embeddings
 
         except Exception as e:
             logger.error(f"Error generating batch embeddings: {e}")
-            # Fallback to mock embeddings
-            return [self._generate_mock_embedding(text) for text in texts]
-
-    def _generate_mock_embedding(self, text: str) -> List[float]:
-        """
-        Generate a mock embedding for testing/fallback purposes.
-        Creates a deterministic vector based on text content.
-        """
-        # Create deterministic mock embedding based on text hash
-        text_hash = hashlib.sha256(text.encode()).hexdigest()[:32]
-
-        # Use hash to seed random generator for consistent results
-        random.seed(text_hash)
-
-        # Generate 1024-dimensional vector (matching thenlper/gte-large)
-        embedding = [random.uniform(-1.0, 1.0) for _ in range(1024)]
-
-        # Reset random seed
-        random.seed()
-
-        return embedding
+            return None
 
     def calculate_cosine_similarity(
         self, vec1: List[float], vec2: List[float]
@@ -184,21 +214,7 @@ class EmbeddingService:
                 f"Vector dimensions don't match: {len(vec1)} vs {len(vec2)}"
             )
 
-        # Calculate dot product
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-
-        # Calculate magnitudes
-        magnitude1 = sum(a * a for a in vec1) ** 0.5
-        magnitude2 = sum(b * b for b in vec2) ** 0.5
-
-        # Avoid division by zero
-        if magnitude1 == 0 or magnitude2 == 0:
-            return 0.0
-
-        # Calculate cosine similarity
-        similarity = dot_product / (magnitude1 * magnitude2)
-
-        return similarity
+        return cosine_similarity(vec1, vec2)
 
     async def find_similar_assets(
         self,
@@ -222,20 +238,21 @@ class EmbeddingService:
         # Generate query embedding
         query_embedding = await self.embed_text(query_text)
 
-        # Calculate similarities
-        similarities = []
-        for asset_id, asset_embedding in asset_embeddings:
-            similarity = self.calculate_cosine_similarity(
-                query_embedding, asset_embedding
-            )
-            if similarity >= similarity_threshold:
-                similarities.append((asset_id, similarity))
-
-        # Sort by similarity score (descending)
-        similarities.sort(key=lambda x: x[1], reverse=True)
+        if not asset_embeddings:
+            return []
+        asset_ids = [asset_id for asset_id, _ in asset_embeddings]
+        embeddings = [embedding for _, embedding in asset_embeddings]
+        for embedding in embeddings:
+            if len(embedding) != len(query_embedding):
+                raise ValueError(
+                    f"Vector dimensions don't match: {len(query_embedding)} vs {len(embedding)}"
+                )
 
-        # Return top k results
-        return similarities[:top_k]
+        # Score every asset in one pass and keep the top k above the threshold
+        [matches] = top_k_similar(
+            [query_embedding], embeddings, top_k, threshold=similarity_threshold
+        )
+        return [(asset_ids[index], similarity) for index, similarity in matches]
 
 
 # Create singleton instance
@@ -0,0 +1,37 @@
+"""
+Embedding infrastructure shared by every EmbeddingService instance.
+
+Modules:
+- client: Long-lived pooled HTTP client for the embedding API
+- batcher: Micro-batcher combining concurrent single-text requests
+- cache: Content-addressed embedding cache (process LRU + Redis)
+- local: Deterministic offline embeddings from hashed character n-grams
+- similarity: Vectorized float32 cosine similarity and top-k selection
+"""
+
+from .batcher import EmbeddingBatcher
+from .cache import EmbeddingCache, embedding_cache_key, normalize_text
+from .client import close_http_client, get_http_client
+from .local import LocalEmbedder
+from .similarity import (
+    cosine_similarity,
+    normalize_rows,
+    similarity_matrix,
+    top_k,
+    top_k_similar,
+)
+
+__all__ = [
+    "EmbeddingBatcher",
+    "EmbeddingCache",
+    "embedding_cache_key",
+    "normalize_text",
+    "get_http_client",
+    "close_http_client",
+    "LocalEmbedder",
+    "cosine_similarity",
+    "normalize_rows",
+    "similarity_matrix",
+    "top_k",
+    "top_k_similar",
+]
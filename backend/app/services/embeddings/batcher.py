@@ -0,0 +1,77 @@
+"""
+Micro-batcher for embedding requests.
+
+Single-text requests arriving within a short window are combined into one
+batch call. A batch is sent when the window closes or when it is full,
+whichever comes first.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT_SECONDS = 0.005
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent ``submit`` calls on one event loop"""
+
+    def __init__(
+        self,
+        embed_batch: Callable[[List[str]], Awaitable[List[List[float]]]],
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_seconds: float = DEFAULT_MAX_WAIT_SECONDS,
+    ):
+        self.embed_batch = embed_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle = None
+        # Keep in-flight batches referenced until they finish
+        self._tasks: Set[asyncio.Task] = set()
+        self.batches_sent = 0
+        self.texts_sent = 0
+
+    async def submit(self, text: str) -> List[float]:
+        """Embed one text as part of the next batch"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_seconds, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._send(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        self.batches_sent += 1
+        self.texts_sent += len(batch)
+        try:
+            embeddings = await self.embed_batch([text for text, _ in batch])
+        except Exception as e:
+            logger.error(f"Embedding batch of {len(batch)} failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), embedding in zip(batch, embeddings):
+            # Callers that were cancelled meanwhile have nobody to deliver to
+            if not future.done():
+                future.set_result(embedding)
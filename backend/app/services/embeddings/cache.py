@@ -0,0 +1,161 @@
+"""
+Content-addressed embedding cache.
+
+Embeddings are keyed by a hash of the model name and the normalized input
+text, so identical content is embedded once no matter who asks for it.
+Two tiers: a process-local LRU in front of the shared Redis cache. Vectors
+are stored as packed float32, which is what the models produce and a
+quarter of the size of their JSON form.
+"""
+
+import base64
+import hashlib
+import logging
+import re
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.services.caching.redis_cache.near_cache import LayerStats
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "embedding"
+DEFAULT_MAX_ENTRIES = 10_000
+# Embeddings of a given model never change; the TTL only bounds Redis memory
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form of an embedding input: NFC, collapsed whitespace
+
+    Case is kept, since embedding models are case sensitive.
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def embedding_cache_key(model: str, text: str) -> str:
+    digest = hashlib.sha256(
+        f"{model}\x00{normalize_text(text)}".encode("utf-8")
+    ).hexdigest()
+    return f"{KEY_PREFIX}:{digest}"
+
+
+def pack_embedding(embedding: Sequence[float]) -> bytes:
+    return array("f", embedding).tobytes()
+
+
+def unpack_embedding(packed: bytes) -> List[float]:
+    vector = array("f")
+    vector.frombytes(packed)
+    return vector.tolist()
+
+
+class EmbeddingCache:
+    """Process LRU plus Redis, both holding packed float32 vectors"""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: int = DEFAULT_TTL_SECONDS,
+        redis: Any = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._redis = redis
+        self.entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self.local_stats = LayerStats()
+        self.redis_stats = LayerStats()
+
+    @property
+    def redis(self):
+        # Resolved lazily so importing the embedding service stays cheap
+        if self._redis is None:
+            from app.services.caching.redis_cache import get_redis_cache
+
+            self._redis = get_redis_cache()
+        return self._redis
+
+    def get_local(self, model: str, text: str) -> Optional[List[float]]:
+        """Process-tier lookup, usable without awaiting"""
+        packed = self._lookup(embedding_cache_key(model, text))
+        return unpack_embedding(packed) if packed is not None else None
+
+    async def get_many(
+        self, model: str, texts: Sequence[str]
+    ) -> List[Optional[List[float]]]:
+        """Cached embeddings for texts, None where neither tier has one"""
+        keys = [embedding_cache_key(model, text) for text in texts]
+        found: Dict[str, bytes] = {}
+        missing = []
+        for key in keys:
+            packed = self._lookup(key)
+            if packed is None:
+                missing.append(key)
+            else:
+                found[key] = packed
+
+        if missing:
+            missing = list(dict.fromkeys(missing))
+            try:
+                values = await self.redis.mget(missing) or []
+            except Exception as e:
+                logger.warning(f"Embedding cache read failed: {e}")
+                values = []
+            values = list(values) + [None] * (len(missing) - len(values))
+            for key, value in zip(missing, values):
+                self.redis_stats.record(value is not None)
+                if value is None:
+                    continue
+                try:
+                    packed = base64.b64decode(value)
+                except (TypeError, ValueError):
+                    continue
+                found[key] = packed
+                self._store(key, packed)
+
+        return [unpack_embedding(found[key]) if key in found else None for key in keys]
+
+    async def put_many(
+        self,
+        model: str,
+        texts: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+    ) -> None:
+        mapping = {}
+        for text, embedding in zip(texts, embeddings):
+            key = embedding_cache_key(model, text)
+            packed = pack_embedding(embedding)
+            self._store(key, packed)
+            mapping[key] = base64.b64encode(packed).decode("ascii")
+
+        if mapping:
+            try:
+                await self.redis.mset(mapping, ttl=self.ttl)
+            except Exception as e:
+                logger.warning(f"Embedding cache write failed: {e}")
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "local": {**self.local_stats.to_dict(), "entries": len(self.entries)},
+            "redis": self.redis_stats.to_dict(),
+        }
+
+    def _lookup(self, key: str) -> Optional[bytes]:
+        packed = self.entries.get(key)
+        self.local_stats.record(packed is not None)
+        if packed is not None:
+            self.entries.move_to_end(key)
+        return packed
+
+    def _store(self, key: str, packed: bytes) -> None:
+        self.entries[key] = packed
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
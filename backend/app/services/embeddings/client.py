@@ -0,0 +1,44 @@
+"""
+Pooled HTTP client for the embedding API.
+
+One ``httpx.AsyncClient`` is kept per event loop so connections (and their
+TLS sessions) are reused across calls instead of being set up per request.
+"""
+
+import asyncio
+import logging
+import weakref
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+POOL_LIMITS = httpx.Limits(
+    max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0
+)
+TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+# httpx clients are bound to the loop they were first used on
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """The running loop's shared client, created on first use"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(limits=POOL_LIMITS, timeout=TIMEOUT)
+        _clients[loop] = client
+    return client
+
+
+async def close_http_client() -> None:
+    """Close the running loop's client; the next call opens a new one"""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None and not client.is_closed:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"Error closing embedding HTTP client: {e}")
@@ -0,0 +1,116 @@
+"""
+Deterministic local embeddings for offline use.
+
+Texts are broken into word tokens and character n-grams, which are hashed
+into a fixed number of dimensions with a random sign (signed feature
+hashing, a random projection of the sparse n-gram counts). Counts are
+weighted by sublinear term frequency, rarer (longer) n-grams weigh more, and
+rows are L2-normalized, so cosine similarity reflects shared spelling:
+"Oracle DB 19c" lands near "oracle_db_19" and far from "Apache Tomcat".
+
+Hashing uses blake2b rather than ``hash()``, so vectors are identical
+across processes and machines; no model or network access is needed.
+"""
+
+import hashlib
+import math
+import re
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .similarity import normalize_rows
+
+DEFAULT_DIMENSIONS = 1024
+DEFAULT_NGRAM_RANGE = (2, 4)
+
+# Splits camelCase and letter/digit boundaries before tokenizing
+_CASE_BOUNDARY = re.compile(r"(?<=[a-z])(?=[A-Z])|(?<=[A-Za-z])(?=[0-9])")
+_TOKEN = re.compile(r"[^\W_]+")
+
+# Whole tokens carry more meaning than any single n-gram inside them
+TOKEN_WEIGHT = 2.0
+
+
+def _bucket(feature: str, dimensions: int) -> Tuple[int, float]:
+    """Dimension and sign a feature is hashed to"""
+    digest = int.from_bytes(
+        hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+    return (digest >> 1) % dimensions, 1.0 if digest & 1 else -1.0
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, splitting camelCase, snake_case and digits"""
+    text = _CASE_BOUNDARY.sub(" ", unicodedata.normalize("NFKC", text))
+    return _TOKEN.findall(text.lower())
+
+
+class LocalEmbedder:
+    """Hashed character n-gram embeddings, computed in batches with NumPy"""
+
+    def __init__(
+        self,
+        dimensions: int = DEFAULT_DIMENSIONS,
+        ngram_range: Tuple[int, int] = DEFAULT_NGRAM_RANGE,
+    ):
+        self.dimensions = dimensions
+        self.ngram_range = ngram_range
+        # Token vocabularies are small, so each token is hashed once
+        self._token_features = lru_cache(maxsize=1 << 16)(self._hash_token)
+
+    def _hash_token(self, token: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Hashed columns and signed weights of one token and its n-grams"""
+        weights: Dict[str, float] = {f"w:{token}": TOKEN_WEIGHT}
+        low, high = self.ngram_range
+        # Boundary markers keep prefixes and suffixes distinct
+        padded = f"<{token}>"
+        for n in range(low, high + 1):
+            for start in range(len(padded) - n + 1):
+                gram = padded[start : start + n]
+                # Longer n-grams are rarer and more telling
+                weights[gram] = weights.get(gram, 0.0) + n / high
+
+        columns = np.empty(len(weights), dtype=np.intp)
+        values = np.empty(len(weights), dtype=np.float32)
+        for i, (feature, weight) in enumerate(weights.items()):
+            columns[i], sign = _bucket(feature, self.dimensions)
+            values[i] = sign * weight
+        return columns, values
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """(len(texts) x dimensions) float32 matrix of unit rows
+
+        Texts without any word characters get a zero row.
+        """
+        lengths: List[int] = []
+        columns: List[np.ndarray] = []
+        values: List[np.ndarray] = []
+        for text in texts:
+            length = 0
+            for token, count in Counter(tokenize(text)).items():
+                token_columns, token_values = self._token_features(token)
+                columns.append(token_columns)
+                # Sublinear term frequency: repeats add diminishing weight
+                values.append(
+                    token_values * (1.0 + math.log(count))
+                    if count > 1
+                    else token_values
+                )
+                length += len(token_columns)
+            lengths.append(length)
+
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        if values:
+            rows = np.repeat(np.arange(len(texts)), lengths)
+            np.add.at(matrix, (rows, np.concatenate(columns)), np.concatenate(values))
+        return normalize_rows(matrix)
+
+    def embed_text(self, text: str) -> List[float]:
+        return self.embed([text])[0].tolist()
+
+    def embed_texts(self, texts: Sequence[str]) -> List[List[float]]:
+        return self.embed(texts).tolist()
@@ -0,0 +1,90 @@
+"""
+Vectorized cosine similarity for embedding consumers.
+
+Vectors are L2-normalized once into float32 matrices, so scoring a batch of
+queries against all candidates is a single matrix multiply, and the best k
+candidates per query are picked with ``argpartition`` instead of a full sort.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Query rows scored per matrix multiply; bounds the (queries x candidates) buffer
+QUERY_CHUNK_ROWS = 1024
+
+
+def normalize_rows(vectors) -> np.ndarray:
+    """L2-normalize each row as float32; zero rows stay zero"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms < 1e-10] = 1.0
+    return vectors / norms
+
+
+def cosine_similarity(vec1: Sequence[float], vec2: Sequence[float]) -> float:
+    """Cosine similarity of two vectors; 0.0 if either has zero norm"""
+    pair = normalize_rows(np.vstack([vec1, vec2]))
+    return float(pair[0] @ pair[1])
+
+
+def similarity_matrix(queries, candidates, normalized: bool = False) -> np.ndarray:
+    """(queries x candidates) cosine similarities
+
+    Pass ``normalized=True`` when both inputs already went through
+    ``normalize_rows``, e.g. a candidate matrix kept across calls.
+    """
+    if not normalized:
+        queries = normalize_rows(queries)
+        candidates = normalize_rows(candidates)
+    return queries @ candidates.T
+
+
+def top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Column indices and scores of the k best candidates per row, best first"""
+    scores = np.atleast_2d(scores)
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        empty = np.empty((scores.shape[0], 0))
+        return empty.astype(np.intp), empty.astype(scores.dtype)
+    if k == 1:
+        top = scores.argmax(axis=1)[:, None]
+    else:
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        order = np.take_along_axis(scores, top, axis=1).argsort(axis=1)
+        top = np.take_along_axis(top, order[:, ::-1], axis=1)
+    return top, np.take_along_axis(scores, top, axis=1)
+
+
+def top_k_similar(
+    queries,
+    candidates,
+    k: int,
+    threshold: Optional[float] = None,
+    normalized: bool = False,
+) -> List[List[Tuple[int, float]]]:
+    """Top-k (candidate index, similarity) for each query, best first
+
+    Candidates scoring below ``threshold`` are left out.
+    """
+    queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+    candidates = np.asarray(candidates, dtype=np.float32)
+    results: List[List[Tuple[int, float]]] = [[] for _ in range(len(queries))]
+    if not len(queries) or not len(candidates) or k <= 0:
+        return results
+
+    if not normalized:
+        queries = normalize_rows(queries)
+        candidates = normalize_rows(candidates)
+    for start in range(0, len(queries), QUERY_CHUNK_ROWS):
+        scores = similarity_matrix(
+            queries[start : start + QUERY_CHUNK_ROWS], candidates, normalized=True
+        )
+        indices, values = top_k(scores, k)
+        for offset, (columns, row) in enumerate(zip(indices, values)):
+            results[start + offset] = [
+                (column, score)
+                for column, score in zip(columns.tolist(), row.tolist())
+                if threshold is None or score >= threshold
+            ]
+    return results
@@ -8,6 +8,7 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from app.services.agent_learning_system import LearningContext, agent_learning_system
+from app.services.embeddings.similarity import top_k_similar
 from app.services.enhanced_agent_memory.base import MemoryItem
 
 logger = logging.getLogger(__name__)
@@ -163,19 +164,22 @@ class StorageMixin:
                 query_text = self._extract_text_content(query)
                 query_embedding = await self.embedding_service.embed_text(query_text)
 
-                # Calculate similarities
-                similarities = []
-                for memory in filtered_memories:
-                    if memory.embedding:
-                        similarity = self._calculate_similarity(
-                            query_embedding, memory.embedding
-                        )
-                        if similarity >= self.config.similarity_threshold:
-                            similarities.append((memory, similarity))
-
-                # Sort by similarity and limit
-                similarities.sort(key=lambda x: x[1], reverse=True)
-                result = [item[0] for item in similarities[:limit]]
+                # Score all embedded memories at once, keeping the best above
+                # the threshold
+                candidates = [
+                    m
+                    for m in filtered_memories
+                    if m.embedding and len(m.embedding) == len(query_embedding)
+                ]
+                result = []
+                if candidates:
+                    [matches] = top_k_similar(
+                        [query_embedding],
+                        [m.embedding for m in candidates],
+                        limit,
+                        threshold=self.config.similarity_threshold,
+                    )
+                    result = [candidates[index] for index, _ in matches]
             else:
                 # Return most recent memories
                 filtered_memories.sort(key=lambda x: x.timestamp, reverse=True)
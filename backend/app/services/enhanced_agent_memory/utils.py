@@ -10,9 +10,8 @@ from collections import defaultdict
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
-import numpy as np
-
 from app.services.agent_learning_system import LearningContext, agent_learning_system
+from app.services.embeddings.similarity import cosine_similarity
 from app.services.enhanced_agent_memory.base import CREWAI_MEMORY_AVAILABLE, MemoryItem
 
 logger = logging.getLogger(__name__)
@@ -213,18 +212,7 @@ class UtilsMixin:
     ) -> float:
         """Calculate cosine similarity between embeddings"""
         try:
-            vec1 = np.array(embedding1)
-            vec2 = np.array(embedding2)
-
-            dot_product = np.dot(vec1, vec2)
-            norm1 = np.linalg.norm(vec1)
-            norm2 = np.linalg.norm(vec2)
-
-            if norm1 == 0 or norm2 == 0:
-                return 0.0
-
-            return float(dot_product / (norm1 * norm2))
-
+            return cosine_similarity(embedding1, embedding2)
         except Exception as e:
             logger.error(f"Failed to calculate similarity: {e}")
             return 0.0
@@ -12,7 +12,6 @@ Usage:
     setup_litellm_tracking()
 """
 
-import asyncio
 import logging
 from typing import Any, Optional
 
@@ -113,41 +112,18 @@ class LLMUsageCallback(CustomLogger):
                 "feature_context", "crewai"
             )
 
-            # Log asynchronously - handle both sync and async contexts
-            # (CrewAI may call from either context)
-            try:
-                asyncio.get_running_loop()
-                # We're in an async context - create task
-                asyncio.create_task(
-                    self._log_usage(
-                        provider=provider,
-                        model=model,
-                        input_tokens=input_tokens,
-                        output_tokens=output_tokens,
-                        total_tokens=total_tokens,
-                        response_time_ms=response_time_ms,
-                        feature_context=feature_context,
-                        success=True,
-                    )
-                )
-            except RuntimeError:
-                # No running event loop - we're in sync context
-                # Use asyncio.run() to execute in new loop
-                try:
-                    asyncio.run(
-                        self._log_usage(
-                            provider=provider,
-                            model=model,
-                            input_tokens=input_tokens,
-                            output_tokens=output_tokens,
-                            total_tokens=total_tokens,
-                            response_time_ms=response_time_ms,
-                            feature_context=feature_context,
-                            success=True,
-                        )
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to log usage in sync context: {e}")
+            # Queued for the background usage-log writer; safe from both
+            # sync CrewAI threads and async code
+            self._log_usage(
+                provider=provider,
+                model=model,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                total_tokens=total_tokens,
+                response_time_ms=response_time_ms,
+                feature_context=feature_context,
+                success=True,
+            )
 
             logger.debug(
                 f"LiteLLM success: {provider}/{model}, "
@@ -202,42 +178,18 @@ class LLMUsageCallback(CustomLogger):
                 "feature_context", "crewai"
             )
 
-            # Log asynchronously - handle both sync and async contexts
-            try:
-                asyncio.get_running_loop()
-                asyncio.create_task(
-                    self._log_usage(
-                        provider=provider,
-                        model=model,
-                        input_tokens=0,
-                        output_tokens=0,
-                        total_tokens=0,
-                        response_time_ms=response_time_ms,
-                        feature_context=feature_context,
-                        success=False,
-                        error_type=error_type,
-                        error_message=error_message,
-                    )
-                )
-            except RuntimeError:
-                # No running event loop - use asyncio.run()
-                try:
-                    asyncio.run(
-                        self._log_usage(
-                            provider=provider,
-                            model=model,
-                            input_tokens=0,
-                            output_tokens=0,
-                            total_tokens=0,
-                            response_time_ms=response_time_ms,
-                            feature_context=feature_context,
-                            success=False,
-                            error_type=error_type,
-                            error_message=error_message,
-                        )
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to log failure in sync context: {e}")
+            self._log_usage(
+                provider=provider,
+                model=model,
+                input_tokens=0,
+                output_tokens=0,
+                total_tokens=0,
+                response_time_ms=response_time_ms,
+                feature_context=feature_context,
+                success=False,
+                error_type=error_type,
+                error_message=error_message,
+            )
 
             logger.warning(
                 f"LiteLLM failure: {provider}/{model}, "
@@ -247,7 +199,7 @@ class LLMUsageCallback(CustomLogger):
         except Exception as e:
             logger.error(f"Failed to log LiteLLM failure event: {e}", exc_info=True)
 
-    async def _log_usage(
+    def _log_usage(
         self,
         provider: str,
         model: str,
@@ -260,9 +212,9 @@ class LLMUsageCallback(CustomLogger):
         error_type: Optional[str] = None,
         error_message: Optional[str] = None,
     ):
-        """Log LLM usage to database."""
+        """Queue LLM usage for the database without blocking the caller."""
         try:
-            await llm_tracker.log_llm_usage(
+            llm_tracker.record_llm_usage(
                 provider=provider,
                 model=model,
                 input_tokens=input_tokens,
@@ -0,0 +1,263 @@
+"""LLM Usage Reports
+
+Builds the usage report query on top of the rollups kept by
+llm_usage_rollups. plan_segments() splits a report range so that whole days
+come from daily rows, remaining whole hours from hourly rows, and only the
+edges of the range and the not-yet-rolled tail are read from raw logs.
+usage_by_day_query() turns the segments into one UNION ALL query, and
+aggregate_usage() folds its rows into the report sections.
+"""
+
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from app.services.llm_usage_rollups import (
+    DAILY,
+    DAY,
+    HOUR,
+    HOURLY,
+    as_utc,
+    ceil_time,
+    floor_time,
+)
+
+RAW = "raw"
+
+
+class Segment(NamedTuple):
+    """A slice of a report range and where its usage is read from
+
+    start is inclusive and end exclusive, unless end_inclusive is set; None
+    leaves that side unbounded.
+    """
+
+    source: str
+    start: Optional[datetime]
+    end: Optional[datetime]
+    end_inclusive: bool = False
+
+
+def _is_empty(segment: Segment) -> bool:
+    if segment.start is None or segment.end is None:
+        return False
+    if segment.end_inclusive:
+        return segment.start > segment.end
+    return segment.start >= segment.end
+
+
+def _split(
+    segment: Segment, source: str, unit: timedelta, rolled_until: Optional[datetime]
+) -> List[Segment]:
+    """Carve the whole, rolled-up `unit` buckets out of a raw segment"""
+    if rolled_until is None:
+        return [segment]
+
+    first = None if segment.start is None else ceil_time(segment.start, unit)
+    last = rolled_until
+    if segment.end is not None:
+        # A bucket ending exactly at an inclusive end is still whole
+        last = min(last, floor_time(segment.end, unit))
+    if first is not None and first >= last:
+        return [segment]
+
+    parts = [
+        Segment(source, first, last),
+        Segment(RAW, last, segment.end, segment.end_inclusive),
+    ]
+    if segment.start is not None:
+        parts.insert(0, Segment(RAW, segment.start, first))
+    return [part for part in parts if part.source != RAW or not _is_empty(part)]
+
+
+def plan_segments(
+    start: Optional[datetime],
+    end: Optional[datetime],
+    hourly_until: Optional[datetime],
+    daily_until: Optional[datetime],
+) -> List[Segment]:
+    """Split [start, end] into daily, hourly and raw segments, in time order
+
+    Buckets are only used when they lie wholly inside the range and before
+    the point their period type has been rolled up to.
+    """
+    whole = Segment(
+        RAW,
+        None if start is None else as_utc(start),
+        None if end is None else as_utc(end),
+        end_inclusive=True,
+    )
+    segments: List[Segment] = []
+    for part in _split(whole, DAILY, DAY, daily_until):
+        if part.source == RAW:
+            segments.extend(_split(part, HOURLY, HOUR, hourly_until))
+        else:
+            segments.append(part)
+    return segments
+
+
+def _time_conditions(
+    column: str, segment: Segment, index: int, params: Dict[str, Any]
+) -> List[str]:
+    conditions = []
+    if segment.start is not None:
+        params[f"segment_{index}_start"] = segment.start
+        conditions.append(f"{column} >= :segment_{index}_start")
+    if segment.end is not None:
+        params[f"segment_{index}_end"] = segment.end
+        operator = "<=" if segment.end_inclusive else "<"
+        conditions.append(f"{column} {operator} :segment_{index}_end")
+    return conditions
+
+
+def usage_by_day_query(
+    segments: Sequence[Segment], conditions: Sequence[str], params: Dict[str, Any]
+) -> Tuple[str, Dict[str, Any]]:
+    """One UNION ALL query of usage per (UTC day, provider, model)
+
+    `conditions` filter on context columns, which rollup rows share with raw
+    logs; each segment adds its own time bounds.
+    """
+    params = dict(params)
+    selects = []
+    for index, segment in enumerate(segments):
+        if segment.source == RAW:
+            where = list(conditions) + _time_conditions(
+                "created_at", segment, index, params
+            )
+            selects.append(
+                """
+                SELECT
+                    (created_at AT TIME ZONE 'UTC')::date AS date,
+                    llm_provider,
+                    model_name,
+                    COUNT(*) AS requests,
+                    COUNT(*) FILTER (WHERE success = true) AS successful_requests,
+                    COUNT(*) FILTER (WHERE success = false) AS failed_requests,
+                    COALESCE(SUM(input_tokens), 0) AS input_tokens,
+                    COALESCE(SUM(output_tokens), 0) AS output_tokens,
+                    COALESCE(SUM(total_tokens), 0) AS tokens,
+                    COALESCE(SUM(total_cost), 0) AS cost,
+                    COALESCE(SUM(response_time_ms), 0) AS response_time_ms,
+                    COUNT(response_time_ms) AS timed_requests,
+                    MIN(created_at) AS first_request,
+                    MAX(created_at) AS last_request
+                FROM migration.llm_usage_logs
+                WHERE """
+                + " AND ".join(f"({condition})" for condition in where or ["TRUE"])
+                + """
+                GROUP BY 1, 2, 3"""  # nosec B608 - conditions are parameterized
+            )
+        else:
+            params[f"segment_{index}_period"] = segment.source
+            where = (
+                list(conditions)
+                + [f"period_type = :segment_{index}_period"]
+                + _time_conditions("period_start", segment, index, params)
+            )
+            selects.append(
+                """
+                SELECT
+                    (period_start AT TIME ZONE 'UTC')::date AS date,
+                    llm_provider,
+                    model_name,
+                    SUM(total_requests) AS requests,
+                    SUM(successful_requests) AS successful_requests,
+                    SUM(failed_requests) AS failed_requests,
+                    SUM(total_input_tokens) AS input_tokens,
+                    SUM(total_output_tokens) AS output_tokens,
+                    SUM(total_tokens) AS tokens,
+                    SUM(total_cost) AS cost,
+                    SUM(total_response_time_ms) AS response_time_ms,
+                    SUM(timed_requests) AS timed_requests,
+                    MIN(first_request_at) AS first_request,
+                    MAX(last_request_at) AS last_request
+                FROM migration.llm_usage_summary
+                WHERE """
+                + " AND ".join(f"({condition})" for condition in where)
+                + """
+                GROUP BY 1, 2, 3"""  # nosec B608 - conditions are parameterized
+            )
+    return "\nUNION ALL\n".join(selects), params
+
+
+def _min(a: Optional[datetime], b: Optional[datetime]) -> Optional[datetime]:
+    return b if a is None or (b is not None and b < a) else a
+
+
+def _max(a: Optional[datetime], b: Optional[datetime]) -> Optional[datetime]:
+    return b if a is None or (b is not None and b > a) else a
+
+
+def aggregate_usage(rows: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine per-(day, provider, model) rows into report sections
+
+    Returns the summary totals, the per-model breakdown ordered by cost and
+    the last 30 days of usage, newest first.
+    """
+    totals: Dict[str, Any] = {
+        "total_requests": 0,
+        "successful_requests": 0,
+        "failed_requests": 0,
+        "total_input_tokens": 0,
+        "total_output_tokens": 0,
+        "total_tokens": 0,
+        "total_cost": Decimal(0),
+        "response_time_ms": 0,
+        "timed_requests": 0,
+        "first_request": None,
+        "last_request": None,
+    }
+    by_model: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+    by_day: Dict[date, Dict[str, Any]] = {}
+
+    for row in rows:
+        requests = int(row["requests"])
+        tokens = int(row["tokens"])
+        cost = Decimal(row["cost"])
+
+        totals["total_requests"] += requests
+        totals["successful_requests"] += int(row["successful_requests"])
+        totals["failed_requests"] += int(row["failed_requests"])
+        totals["total_input_tokens"] += int(row["input_tokens"])
+        totals["total_output_tokens"] += int(row["output_tokens"])
+        totals["total_tokens"] += tokens
+        totals["total_cost"] += cost
+        totals["response_time_ms"] += int(row["response_time_ms"])
+        totals["timed_requests"] += int(row["timed_requests"])
+        totals["first_request"] = _min(totals["first_request"], row["first_request"])
+        totals["last_request"] = _max(totals["last_request"], row["last_request"])
+
+        key = (row["llm_provider"], row["model_name"])
+        model_usage = by_model.setdefault(
+            key,
+            {
+                "llm_provider": key[0],
+                "model_name": key[1],
+                "requests": 0,
+                "tokens": 0,
+                "cost": Decimal(0),
+            },
+        )
+        day_usage = by_day.setdefault(
+            row["date"],
+            {"date": row["date"], "requests": 0, "tokens": 0, "cost": Decimal(0)},
+        )
+        for usage in (model_usage, day_usage):
+            usage["requests"] += requests
+            usage["tokens"] += tokens
+            usage["cost"] += cost
+
+    timed = totals.pop("timed_requests")
+    response_time = totals.pop("response_time_ms")
+    totals["avg_response_time_ms"] = response_time / timed if timed else 0.0
+
+    return {
+        "summary": totals,
+        "breakdown_by_model": sorted(
+            by_model.values(), key=lambda usage: usage["cost"], reverse=True
+        ),
+        "daily_usage": sorted(
+            by_day.values(), key=lambda usage: usage["date"], reverse=True
+        )[:30],
+    }
@@ -0,0 +1,324 @@
+"""LLM Usage Rollups
+
+Keeps llm_usage_summary as an incremental rollup of llm_usage_logs: one
+'hourly' row per context for every closed UTC hour, and one 'daily' row per
+context for every UTC day whose hours are all rolled up. A background job
+rolls up new buckets and records how far it got in llm_usage_rollup_state.
+
+Usage reports (llm_usage_reports) read whole days and hours from these rows
+and only fall back to raw logs at the edges of their range and for the tail
+that is not rolled up yet.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+HOURLY = "hourly"
+DAILY = "daily"
+
+HOUR = timedelta(hours=1)
+DAY = timedelta(days=1)
+
+# Each transaction rolls up at most this much history
+MAX_SPAN_PER_PASS = timedelta(days=7)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Only one process rolls up at a time; others skip the pass
+_ROLLUP_LOCK_KEY = "llm_usage_rollup"
+
+# Context columns rollups are grouped by; report filters use the same names
+CONTEXT_COLUMNS = (
+    "client_account_id",
+    "engagement_id",
+    "user_id",
+    "llm_provider",
+    "model_name",
+    "page_context",
+    "feature_context",
+)
+
+_SUMMARY_COLUMNS = ", ".join(
+    (
+        "id",
+        "period_type",
+        "period_start",
+        "period_end",
+        *CONTEXT_COLUMNS,
+        "total_requests",
+        "successful_requests",
+        "failed_requests",
+        "total_input_tokens",
+        "total_output_tokens",
+        "total_tokens",
+        "total_cost",
+        "avg_response_time_ms",
+        "min_response_time_ms",
+        "max_response_time_ms",
+        "total_response_time_ms",
+        "timed_requests",
+        "first_request_at",
+        "last_request_at",
+    )
+)
+_CONTEXT_SQL = ", ".join(CONTEXT_COLUMNS)
+
+ROLL_HOURS_SQL = f"""
+    INSERT INTO migration.llm_usage_summary ({_SUMMARY_COLUMNS})
+    SELECT
+        gen_random_uuid(), 'hourly', bucket, bucket + INTERVAL '1 hour',
+        {_CONTEXT_SQL},
+        COUNT(*),
+        COUNT(*) FILTER (WHERE success = true),
+        COUNT(*) FILTER (WHERE success = false),
+        COALESCE(SUM(input_tokens), 0),
+        COALESCE(SUM(output_tokens), 0),
+        COALESCE(SUM(total_tokens), 0),
+        COALESCE(SUM(total_cost), 0),
+        ROUND(AVG(response_time_ms)),
+        MIN(response_time_ms),
+        MAX(response_time_ms),
+        COALESCE(SUM(response_time_ms), 0),
+        COUNT(response_time_ms),
+        MIN(created_at),
+        MAX(created_at)
+    FROM (
+        SELECT *, date_trunc('hour', created_at, 'UTC') AS bucket
+        FROM migration.llm_usage_logs
+        WHERE created_at >= :start AND created_at < :end
+    ) logs
+    GROUP BY bucket, {_CONTEXT_SQL}
+"""  # nosec B608 - only fixed column names are interpolated
+
+ROLL_DAYS_SQL = f"""
+    INSERT INTO migration.llm_usage_summary ({_SUMMARY_COLUMNS})
+    SELECT
+        gen_random_uuid(), 'daily', bucket, bucket + INTERVAL '1 day',
+        {_CONTEXT_SQL},
+        SUM(total_requests),
+        SUM(successful_requests),
+        SUM(failed_requests),
+        SUM(total_input_tokens),
+        SUM(total_output_tokens),
+        SUM(total_tokens),
+        SUM(total_cost),
+        ROUND(SUM(total_response_time_ms) / NULLIF(SUM(timed_requests), 0)),
+        MIN(min_response_time_ms),
+        MAX(max_response_time_ms),
+        SUM(total_response_time_ms),
+        SUM(timed_requests),
+        MIN(first_request_at),
+        MAX(last_request_at)
+    FROM (
+        SELECT *, date_trunc('day', period_start, 'UTC') AS bucket
+        FROM migration.llm_usage_summary
+        WHERE period_type = 'hourly'
+            AND period_start >= :start AND period_start < :end
+    ) hours
+    GROUP BY bucket, {_CONTEXT_SQL}
+"""  # nosec B608 - only fixed column names are interpolated
+
+
+def as_utc(value: datetime) -> datetime:
+    """Aware UTC datetime; naive values are taken to be UTC already"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def floor_time(value: datetime, unit: timedelta) -> datetime:
+    value = as_utc(value)
+    return value - (value - _EPOCH) % unit
+
+
+def ceil_time(value: datetime, unit: timedelta) -> datetime:
+    floored = floor_time(value, unit)
+    return floored if floored == as_utc(value) else floored + unit
+
+
+async def get_rollup_watermarks(
+    session: AsyncSession,
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """(hourly, daily) points usage has been rolled up to; None if never"""
+    result = await session.execute(
+        text("SELECT period_type, rolled_until FROM migration.llm_usage_rollup_state")
+    )
+    watermarks = {row.period_type: row.rolled_until for row in result}
+    return watermarks.get(HOURLY), watermarks.get(DAILY)
+
+
+class LLMUsageRollupJob:
+    """Periodically rolls closed hours and days of usage logs into summaries"""
+
+    def __init__(
+        self,
+        interval: Optional[float] = None,
+        grace: Optional[float] = None,
+    ):
+        self.interval = interval or settings.LLM_USAGE_ROLLUP_INTERVAL_SECONDS
+        # Hours are left open this long after they end, for queued writes
+        self.grace = timedelta(seconds=grace or settings.LLM_USAGE_ROLLUP_GRACE_SECONDS)
+        self.running = False
+        self.rollup_task: Optional[asyncio.Task] = None
+
+        self.passes = 0
+        self.hours_rolled = 0
+        self.days_rolled = 0
+        self.failures = 0
+        self.hourly_until: Optional[datetime] = None
+        self.daily_until: Optional[datetime] = None
+
+    async def start(self) -> None:
+        """Start the rollup loop"""
+        if self.running:
+            logger.warning("LLM usage rollup job already running")
+            return
+
+        self.running = True
+        self.rollup_task = asyncio.create_task(self._rollup_loop())
+        logger.info("LLM usage rollup job started")
+
+    async def stop(self) -> None:
+        """Stop the rollup loop"""
+        self.running = False
+        if self.rollup_task:
+            self.rollup_task.cancel()
+            try:
+                await self.rollup_task
+            except asyncio.CancelledError:
+                pass
+            self.rollup_task = None
+        logger.info("LLM usage rollup job stopped")
+
+    async def _rollup_loop(self) -> None:
+        while self.running:
+            try:
+                await self.run_once()
+            except Exception as e:
+                self.failures += 1
+                logger.error(f"LLM usage rollup failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def run_once(self, now: Optional[datetime] = None) -> None:
+        """Roll up every closed hour and day not rolled up yet"""
+        now = as_utc(now or datetime.now(timezone.utc))
+        closed_until = floor_time(now - self.grace, HOUR)
+
+        while True:
+            async with AsyncSessionLocal() as session:
+                if not await self._acquire_lock(session):
+                    logger.debug("LLM usage rollup already running elsewhere")
+                    return
+                done = await self._roll_hours(session, closed_until)
+                done = await self._roll_days(session) and done
+                await session.commit()
+            if done:
+                break
+        self.passes += 1
+
+    async def _acquire_lock(self, session: AsyncSession) -> bool:
+        result = await session.execute(
+            text("SELECT pg_try_advisory_xact_lock(hashtext(:key))"),
+            {"key": _ROLLUP_LOCK_KEY},
+        )
+        return bool(result.scalar())
+
+    async def _roll_hours(self, session: AsyncSession, closed_until: datetime) -> bool:
+        """Roll one span of closed hours; True once caught up"""
+        start, _ = await get_rollup_watermarks(session)
+        if start is None:
+            first_log = (
+                await session.execute(
+                    text("SELECT MIN(created_at) FROM migration.llm_usage_logs")
+                )
+            ).scalar()
+            start = floor_time(first_log or closed_until, HOUR)
+        if start >= closed_until:
+            self.hourly_until = start
+            return True
+
+        end = min(closed_until, start + MAX_SPAN_PER_PASS)
+        await self._replace(session, HOURLY, ROLL_HOURS_SQL, start, end)
+        self.hours_rolled += (end - start) // HOUR
+        self.hourly_until = end
+        return end >= closed_until
+
+    async def _roll_days(self, session: AsyncSession) -> bool:
+        """Roll one span of days whose hours are all rolled up; True once caught up"""
+        hourly_until, start = await get_rollup_watermarks(session)
+        if hourly_until is None:
+            return True
+        closed_until = floor_time(hourly_until, DAY)
+        if start is None:
+            first_hour = (
+                await session.execute(
+                    text(
+                        "SELECT MIN(period_start) FROM migration.llm_usage_summary "
+                        "WHERE period_type = 'hourly'"
+                    )
+                )
+            ).scalar()
+            start = floor_time(first_hour or closed_until, DAY)
+        if start >= closed_until:
+            self.daily_until = start
+            return True
+
+        end = min(closed_until, start + MAX_SPAN_PER_PASS)
+        await self._replace(session, DAILY, ROLL_DAYS_SQL, start, end)
+        self.days_rolled += (end - start) // DAY
+        self.daily_until = end
+        return end >= closed_until
+
+    async def _replace(
+        self,
+        session: AsyncSession,
+        period_type: str,
+        rollup_sql: str,
+        start: datetime,
+        end: datetime,
+    ) -> None:
+        """Rebuild one period type's rows in [start, end) and move its watermark"""
+        params = {"period_type": period_type, "start": start, "end": end}
+        await session.execute(
+            text(
+                "DELETE FROM migration.llm_usage_summary "
+                "WHERE period_type = :period_type "
+                "AND period_start >= :start AND period_start < :end"
+            ),
+            params,
+        )
+        await session.execute(text(rollup_sql), {"start": start, "end": end})
+        await session.execute(
+            text(
+                """
+                INSERT INTO migration.llm_usage_rollup_state (period_type, rolled_until)
+                VALUES (:period_type, :end)
+                ON CONFLICT (period_type) DO UPDATE
+                SET rolled_until = EXCLUDED.rolled_until, updated_at = NOW()
+                """
+            ),
+            params,
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "passes": self.passes,
+            "hours_rolled": self.hours_rolled,
+            "days_rolled": self.days_rolled,
+            "failures": self.failures,
+            "hourly_until": (
+                self.hourly_until.isoformat() if self.hourly_until else None
+            ),
+            "daily_until": self.daily_until.isoformat() if self.daily_until else None,
+        }
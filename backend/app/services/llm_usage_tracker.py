@@ -3,24 +3,37 @@
 Automatically tracks all LLM API calls for cost analysis and monitoring.
 """
 
-import asyncio
 import json
 import logging
 import time
 import uuid
 from contextlib import asynccontextmanager
-from datetime import datetime
+from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from fastapi import Request
 from sqlalchemy import text
 
 from app.core.database import AsyncSessionLocal
 from app.models.llm_usage import LLMModelPricing, LLMUsageLog
+from app.services.llm_usage_reports import (
+    aggregate_usage,
+    plan_segments,
+    usage_by_day_query,
+)
+from app.services.llm_usage_rollups import LLMUsageRollupJob, get_rollup_watermarks
+from app.services.llm_usage_writer import LLMUsageLogWriter
 
 logger = logging.getLogger(__name__)
 
+# Columns the tracker writes; updated_at is left to its server default
+USAGE_ROW_COLUMNS = [
+    column.name
+    for column in LLMUsageLog.__table__.columns
+    if column.name != "updated_at"
+]
+
 
 class LLMUsageTracker:
     """Service to track LLM usage, costs, and performance metrics."""
@@ -28,6 +41,12 @@ class LLMUsageTracker:
     def __init__(self):
         self.current_request_context: Dict[str, Any] = {}
 
+        # Batches usage rows into bulk inserts off the request path
+        self.writer = LLMUsageLogWriter(prepare=self._price_rows)
+
+        # Keeps hourly/daily summaries current for usage reports
+        self.rollups = LLMUsageRollupJob()
+
         # Model pricing cache (updated periodically)
         self.pricing_cache: Dict[str, Dict[str, Any]] = {}
         self._last_pricing_update = None
@@ -123,12 +142,8 @@ class LLMUsageTracker:
             end_time = time.time()
             usage_log.response_time_ms = int((end_time - start_time) * 1000)
 
-            # Calculate costs if token usage is set
-            if usage_log.input_tokens or usage_log.output_tokens:
-                await self._calculate_costs(usage_log)
-
-            # Save to database (async, non-blocking)
-            asyncio.create_task(self._save_usage_log(usage_log))
+            # Queue for the background writer, which also fills in costs
+            self.writer.submit(self._row_from_log(usage_log))
 
     async def log_llm_usage(
         self,
@@ -148,56 +163,121 @@ class LLMUsageTracker:
     ) -> str:
         """Manually log LLM usage (for when context manager can't be used)."""
 
-        usage_log = LLMUsageLog(
-            **self.current_request_context,
-            llm_provider=provider,
-            model_name=model,
-            model_version=model_version,
+        row = self._build_usage_row(
+            provider=provider,
+            model=model,
             input_tokens=input_tokens,
             output_tokens=output_tokens,
-            total_tokens=(input_tokens or 0) + (output_tokens or 0),
             response_time_ms=response_time_ms,
             success=success,
             error_type=error_type,
             error_message=error_message,
-            request_data=self._sanitize_data(request_data),
-            response_data=self._sanitize_data(response_data),
-            feature_context=feature_context
-            or self.current_request_context.get("feature_context"),
-            additional_metadata=metadata or {},
+            request_data=request_data,
+            response_data=response_data,
+            model_version=model_version,
+            feature_context=feature_context,
+            metadata=metadata,
         )
 
-        # Calculate costs
-        await self._calculate_costs(usage_log)
+        # Queued for a batched insert; written directly if the writer is off
+        await self.writer.write(row)
 
-        # Save to database
-        await self._save_usage_log(usage_log)
+        return str(row["id"])
 
-        return str(usage_log.id)
+    def record_llm_usage(self, provider: str, model: str, **kwargs) -> str:
+        """Log LLM usage without awaiting, from sync or async code.
 
-    async def _calculate_costs(self, usage_log: LLMUsageLog):
-        """Calculate costs for the LLM usage."""
-        if not usage_log.input_tokens and not usage_log.output_tokens:
-            return
+        Takes the same arguments as log_llm_usage. The row is queued for the
+        background writer; this never touches the database on the caller's
+        thread while the writer is running.
+        """
+        row = self._build_usage_row(provider=provider, model=model, **kwargs)
+        self.writer.submit(row)
+        return str(row["id"])
 
-        # Get pricing for the model
-        pricing = await self._get_model_pricing(
-            usage_log.llm_provider, usage_log.model_name
+    def _build_usage_row(
+        self,
+        provider: str,
+        model: str,
+        input_tokens: Optional[int] = None,
+        output_tokens: Optional[int] = None,
+        response_time_ms: Optional[int] = None,
+        success: bool = True,
+        error_type: Optional[str] = None,
+        error_message: Optional[str] = None,
+        request_data: Optional[Dict[str, Any]] = None,
+        response_data: Optional[Dict[str, Any]] = None,
+        model_version: Optional[str] = None,
+        feature_context: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Insert values for one llm_usage_logs row; costs are added on write."""
+        return self._complete_row(
+            {
+                **self.current_request_context,
+                "llm_provider": provider,
+                "model_name": model,
+                "model_version": model_version,
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": (input_tokens or 0) + (output_tokens or 0),
+                "response_time_ms": response_time_ms,
+                "success": success,
+                "error_type": error_type,
+                "error_message": error_message,
+                "request_data": self._sanitize_data(request_data),
+                "response_data": self._sanitize_data(response_data),
+                "feature_context": feature_context
+                or self.current_request_context.get("feature_context"),
+                "additional_metadata": metadata or {},
+            }
         )
 
-        if pricing:
-            input_cost = 0
-            output_cost = 0
-
-            if usage_log.input_tokens and pricing.get("input"):
-                input_cost = (usage_log.input_tokens / 1000) * pricing["input"]
-
-            if usage_log.output_tokens and pricing.get("output"):
-                output_cost = (usage_log.output_tokens / 1000) * pricing["output"]
+    def _row_from_log(self, usage_log: LLMUsageLog) -> Dict[str, Any]:
+        """Insert values for a log built by track_llm_call."""
+        return self._complete_row(
+            {column: getattr(usage_log, column) for column in USAGE_ROW_COLUMNS}
+        )
 
-            usage_log.input_cost = Decimal(str(input_cost))
-            usage_log.output_cost = Decimal(str(output_cost))
-            usage_log.total_cost = Decimal(str(input_cost + output_cost))
+    @staticmethod
+    def _complete_row(values: Dict[str, Any]) -> Dict[str, Any]:
+        """Give every row the same keys so a batch is one executemany.
+
+        created_at is the call time, not the time the batch is written.
+        """
+        row = {column: values.get(column) for column in USAGE_ROW_COLUMNS}
+        row["id"] = row["id"] or uuid.uuid4()
+        row["created_at"] = row["created_at"] or datetime.now(timezone.utc)
+        row["cost_currency"] = row["cost_currency"] or "USD"
+        row["success"] = True if row["success"] is None else row["success"]
+        return row
+
+    async def _price_rows(self, rows: List[Dict[str, Any]]):
+        """Fill in costs for a batch; one pricing lookup per model."""
+        for row in rows:
+            if row["total_cost"] is not None:
+                continue
+            if not row["input_tokens"] and not row["output_tokens"]:
+                continue
+
+            # Get pricing for the model
+            pricing = await self._get_model_pricing(
+                row["llm_provider"], row["model_name"]
+            )
+
+            if pricing:
+                input_cost = 0
+                output_cost = 0
+
+                if row["input_tokens"] and pricing.get("input"):
+                    input_cost = (row["input_tokens"] / 1000) * pricing["input"]
+
+                if row["output_tokens"] and pricing.get("output"):
+                    output_cost = (row["output_tokens"] / 1000) * pricing["output"]
+
+                row["input_cost"] = Decimal(str(input_cost))
+                row["output_cost"] = Decimal(str(output_cost))
+                row["total_cost"] = Decimal(str(input_cost + output_cost))
 
     async def _get_model_pricing(
         self, provider: str, model: str
@@ -248,17 +328,6 @@ class LLMUsageTracker:
         logger.warning(f"No pricing found for {provider}/{model}")
         return None
 
-    async def _save_usage_log(self, usage_log: LLMUsageLog):
-        """Save usage log to database."""
-        try:
-            async with AsyncSessionLocal() as session:
-                session.add(usage_log)
-                await session.commit()
-                logger.debug(f"Saved LLM usage log: {usage_log.id}")
-
-        except Exception as e:
-            logger.error(f"Failed to save LLM usage log: {e}")
-
     def _sanitize_data(
         self, data: Optional[Dict[str, Any]], max_length: int = 5000
     ) -> Optional[Dict[str, Any]]:
@@ -325,14 +394,6 @@ class LLMUsageTracker:
                     conditions.append("user_id = :user_id")
                     params["user_id"] = user_id
 
-                if start_date:
-                    conditions.append("created_at >= :start_date")
-                    params["start_date"] = start_date
-
-                if end_date:
-                    conditions.append("created_at <= :end_date")
-                    params["end_date"] = end_date
-
                 if provider:
                     conditions.append("llm_provider = :provider")
                     params["provider"] = provider
@@ -349,97 +410,45 @@ class LLMUsageTracker:
                     conditions.append("feature_context = :feature_context")
                     params["feature_context"] = feature_context
 
-                # Build WHERE clause safely without format() injection risk
-                where_sql = (
-                    " AND ".join(f"({condition})" for condition in conditions)
-                    if conditions
-                    else "TRUE"
+                # Rolled-up days and hours come from summaries; only range
+                # edges and the not-yet-rolled tail are read from raw logs
+                hourly_until, daily_until = await get_rollup_watermarks(session)
+                segments = plan_segments(
+                    start_date, end_date, hourly_until, daily_until
                 )
-
-                # Summary query - fully parameterized
-                summary_query = text(
-                    """
-                    SELECT
-                        COUNT(*) as total_requests,
-                        COUNT(*) FILTER (WHERE success = true) as successful_requests,
-                        COUNT(*) FILTER (WHERE success = false) as failed_requests,
-                        COALESCE(SUM(input_tokens), 0) as total_input_tokens,
-                        COALESCE(SUM(output_tokens), 0) as total_output_tokens,
-                        COALESCE(SUM(total_tokens), 0) as total_tokens,
-                        COALESCE(SUM(total_cost), 0) as total_cost,
-                        COALESCE(AVG(response_time_ms), 0) as avg_response_time_ms,
-                        MIN(created_at) as first_request,
-                        MAX(created_at) as last_request
-                    FROM llm_usage_logs
-                    WHERE """
-                    + where_sql  # nosec B608 - where_sql built from validated parameterized conditions
-                )
-
-                summary_result = await session.execute(summary_query, params)
-                summary = summary_result.fetchone()
-
-                # Breakdown by provider/model - fully parameterized
-                breakdown_query = text(
-                    """
-                    SELECT
-                        llm_provider,
-                        model_name,
-                        COUNT(*) as requests,
-                        COALESCE(SUM(total_tokens), 0) as tokens,
-                        COALESCE(SUM(total_cost), 0) as cost
-                    FROM llm_usage_logs
-                    WHERE """
-                    + where_sql  # nosec B608 - where_sql built from validated parameterized conditions
-                    + """
-                    GROUP BY llm_provider, model_name
-                    ORDER BY cost DESC
-                """
-                )
-
-                breakdown_result = await session.execute(breakdown_query, params)
-                breakdown = [dict(row._mapping) for row in breakdown_result]
-
-                # Daily usage trend - fully parameterized
-                daily_query = text(
-                    """
-                    SELECT
-                        DATE(created_at) as date,
-                        COUNT(*) as requests,
-                        COALESCE(SUM(total_tokens), 0) as tokens,
-                        COALESCE(SUM(total_cost), 0) as cost
-                    FROM llm_usage_logs
-                    WHERE """
-                    + where_sql  # nosec B608 - where_sql built from validated parameterized conditions
-                    + """
-                    GROUP BY DATE(created_at)
-                    ORDER BY date DESC
-                    LIMIT 30
-                """
-                )
-
-                daily_result = await session.execute(daily_query, params)
-                daily_usage = [dict(row._mapping) for row in daily_result]
+                usage_query, params = usage_by_day_query(segments, conditions, params)
+                usage_result = await session.execute(text(usage_query), params)
+                usage = aggregate_usage([dict(row._mapping) for row in usage_result])
+                summary = usage["summary"]
+                first_request = summary["first_request"]
+                last_request = summary["last_request"]
 
                 return {
                     "summary": {
-                        "total_requests": summary[0],
-                        "successful_requests": summary[1],
-                        "failed_requests": summary[2],
+                        "total_requests": summary["total_requests"],
+                        "successful_requests": summary["successful_requests"],
+                        "failed_requests": summary["failed_requests"],
                         "success_rate": (
-                            (summary[1] / summary[0] * 100) if summary[0] > 0 else 0
+                            summary["successful_requests"]
+                            / summary["total_requests"]
+                            * 100
+                            if summary["total_requests"] > 0
+                            else 0
                         ),
-                        "total_input_tokens": summary[3],
-                        "total_output_tokens": summary[4],
-                        "total_tokens": summary[5],
-                        "total_cost": float(summary[6]),
-                        "avg_response_time_ms": float(summary[7]),
+                        "total_input_tokens": summary["total_input_tokens"],
+                        "total_output_tokens": summary["total_output_tokens"],
+                        "total_tokens": summary["total_tokens"],
+                        "total_cost": float(summary["total_cost"]),
+                        "avg_response_time_ms": float(summary["avg_response_time_ms"]),
                         "period": {
-                            "start": summary[8].isoformat() if summary[8] else None,
-                            "end": summary[9].isoformat() if summary[9] else None,
+                            "start": (
+                                first_request.isoformat() if first_request else None
+                            ),
+                            "end": last_request.isoformat() if last_request else None,
                         },
                     },
-                    "breakdown_by_model": breakdown,
-                    "daily_usage": daily_usage,
+                    "breakdown_by_model": usage["breakdown_by_model"],
+                    "daily_usage": usage["daily_usage"],
                     "filters_applied": {
                         "client_account_id": client_account_id,
                         "engagement_id": engagement_id,
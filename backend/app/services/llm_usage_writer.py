@@ -0,0 +1,202 @@
+"""LLM Usage Log Writer
+
+Buffers LLM usage log rows in a bounded, thread-safe queue and bulk-inserts
+them from one background task, so LLM calls never wait on a database
+transaction. A batch is written when the queue reaches the batch size or
+when the flush interval passes, whichever comes first, and everything still
+queued is written on shutdown.
+
+Rows can be submitted from async code and from the sync threads CrewAI runs
+LiteLLM callbacks in. When the queue is full, new rows are dropped and
+counted rather than blocking the caller.
+"""
+
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.llm_usage import LLMUsageLog
+
+logger = logging.getLogger(__name__)
+
+UsageRow = Dict[str, Any]
+
+# Log one warning per this many dropped rows
+DROP_WARNING_INTERVAL = 1000
+
+
+class LLMUsageLogWriter:
+    """Process-wide queue of usage rows drained by a background task"""
+
+    def __init__(
+        self,
+        prepare: Optional[Callable[[List[UsageRow]], Awaitable[None]]] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_queue_size: Optional[int] = None,
+    ):
+        # Called on each batch before insert, e.g. to fill in costs
+        self.prepare = prepare
+        self.batch_size = batch_size or settings.LLM_USAGE_LOG_BATCH_SIZE
+        self.flush_interval = (
+            flush_interval or settings.LLM_USAGE_LOG_FLUSH_INTERVAL_SECONDS
+        )
+        self.max_queue_size = max_queue_size or settings.LLM_USAGE_LOG_MAX_QUEUE
+
+        self._rows: "deque[UsageRow]" = deque()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        # Direct writes made while the writer is not running
+        self._direct_writes: Set[asyncio.Task] = set()
+
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def submit(self, row: UsageRow) -> bool:
+        """Queue a row from any thread; False if it was dropped
+
+        Without a running writer (scripts, tests) the row is written
+        directly instead.
+        """
+        if not self.running:
+            self._write_directly(row)
+            return True
+
+        with self._lock:
+            if len(self._rows) >= self.max_queue_size:
+                self.dropped += 1
+                dropped = self.dropped
+                full = None
+            else:
+                self._rows.append(row)
+                self.enqueued += 1
+                full = len(self._rows) == self.batch_size
+
+        if full is None:
+            if dropped % DROP_WARNING_INTERVAL == 1:
+                logger.warning(
+                    f"LLM usage log queue full ({self.max_queue_size} rows), "
+                    f"{dropped} rows dropped so far"
+                )
+            return False
+        if full:
+            try:
+                self._loop.call_soon_threadsafe(self._wake.set)
+            except RuntimeError:
+                # Loop already closed; the shutdown flush picks the row up
+                pass
+        return True
+
+    async def write(self, row: UsageRow) -> None:
+        """Queue a row, or write it now if the writer is not running"""
+        if self.running:
+            self.submit(row)
+        else:
+            await self.write_rows([row])
+
+    async def start(self) -> None:
+        """Start draining the queue on the running event loop"""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+        logger.info("LLM usage log writer started")
+
+    async def stop(self) -> None:
+        """Write everything still queued and stop the background task"""
+        task = self._task
+        if task is None:
+            return
+        self._stopping = True
+        self._wake.set()
+        try:
+            await task
+        finally:
+            self._task = None
+        logger.info(f"LLM usage log writer stopped ({self.written} rows written)")
+
+    async def flush(self) -> int:
+        """Write all queued rows now; returns how many were written"""
+        written = 0
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return written
+            written += await self.write_rows(batch)
+
+    async def write_rows(self, rows: List[UsageRow]) -> int:
+        """Insert rows in one transaction; failures are logged and counted"""
+        try:
+            if self.prepare is not None:
+                await self.prepare(rows)
+            async with AsyncSessionLocal() as session:
+                await session.execute(insert(LLMUsageLog), rows)
+                await session.commit()
+        except Exception as e:
+            self.failed += len(rows)
+            logger.error(f"Failed to save {len(rows)} LLM usage logs: {e}")
+            return 0
+
+        self.written += len(rows)
+        self.batches += 1
+        logger.debug(f"Saved {len(rows)} LLM usage logs")
+        return len(rows)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "queued": len(self._rows),
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "batches": self.batches,
+        }
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+        # Rows queued while the last batch was being written
+        await self.flush()
+
+    def _take_batch(self) -> List[UsageRow]:
+        with self._lock:
+            count = min(self.batch_size, len(self._rows))
+            return [self._rows.popleft() for _ in range(count)]
+
+    def _write_directly(self, row: UsageRow) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Sync caller with no writer to hand the row to
+            try:
+                asyncio.run(self.write_rows([row]))
+            except Exception as e:
+                logger.error(f"Failed to save LLM usage log in sync context: {e}")
+            return
+        task = loop.create_task(self.write_rows([row]))
+        self._direct_writes.add(task)
+        task.add_done_callback(self._direct_writes.discard)
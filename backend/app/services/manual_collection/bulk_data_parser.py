@@ -2,19 +2,48 @@
 Bulk Data Parser
 
 Handles file parsing and format detection for bulk data uploads.
+
+Files are parsed incrementally into typed row batches. Each batch is read in
+a worker thread, so a large upload never blocks the event loop, and only one
+batch is held in flight at a time.
 """
 
+import asyncio
+import csv
 import io
 import json
 import logging
-from typing import Any, Dict, List
-
-import pandas as pd
+import re
+from typing import Any, AsyncIterator, Dict, Iterator, List
 
 from .bulk_data_models import BulkDataFormat
 
 logger = logging.getLogger(__name__)
 
+# Rows handed to the consumer per worker-thread round trip
+STREAM_BATCH_ROWS = 500
+
+_INTEGER = re.compile(r"[+-]?\d+")
+_DECIMAL = re.compile(r"[+-]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?")
+_ZERO_PADDED = re.compile(r"[+-]?0\d")
+_JSON_WHITESPACE = " \t\r\n"
+_JSON_DECODER = json.JSONDecoder()
+
+
+def coerce_cell(value: str) -> Any:
+    """Type a delimited-text cell: blanks become None, numbers int/float"""
+    text = value.strip()
+    if not text:
+        return None
+    # Leading zeros mark identifiers (asset tags, phone numbers), not numbers
+    if _ZERO_PADDED.match(text):
+        return value
+    if _INTEGER.fullmatch(text):
+        return int(text)
+    if _DECIMAL.fullmatch(text):
+        return float(text)
+    return value
+
 
 class BulkDataParser:
     """Handles parsing of various bulk data formats."""
@@ -40,6 +69,8 @@ class BulkDataParser:
             "xlsx": BulkDataFormat.EXCEL,
             "xls": BulkDataFormat.EXCEL,
             "json": BulkDataFormat.JSON,
+            "jsonl": BulkDataFormat.JSON,
+            "ndjson": BulkDataFormat.JSON,
             "tsv": BulkDataFormat.TSV,
             "txt": BulkDataFormat.TSV,
         }
@@ -49,54 +80,176 @@ class BulkDataParser:
         self, file_content: bytes, format_type: BulkDataFormat
     ) -> List[Dict[str, Any]]:
         """Parse file content based on format"""
+        rows: List[Dict[str, Any]] = []
+        async for batch in self.iter_row_batches(file_content, format_type):
+            rows.extend(batch)
+        return rows
+
+    async def iter_row_batches(
+        self,
+        file_content: bytes,
+        format_type: BulkDataFormat,
+        batch_size: int = STREAM_BATCH_ROWS,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield parsed rows in batches, reading each batch in a worker thread"""
         try:
-            if format_type == BulkDataFormat.CSV:
-                return self._parse_csv(file_content)
-            elif format_type == BulkDataFormat.EXCEL:
-                return self._parse_excel(file_content)
-            elif format_type == BulkDataFormat.JSON:
-                return self._parse_json(file_content)
-            elif format_type == BulkDataFormat.TSV:
-                return self._parse_tsv(file_content)
-            else:
-                raise ValueError(f"Unsupported format: {format_type}")
+            batches = self._batches(
+                self._iter_rows(file_content, format_type), batch_size
+            )
+            while True:
+                batch = await asyncio.to_thread(next, batches, None)
+                if batch is None:
+                    return
+                yield batch
         except Exception as e:
             logger.error(f"Error parsing file: {e}")
             raise ValueError(f"Failed to parse file: {str(e)}")
 
-    def _parse_csv(self, file_content: bytes) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _batches(
+        rows: Iterator[Dict[str, Any]], batch_size: int
+    ) -> Iterator[List[Dict[str, Any]]]:
+        batch: List[Dict[str, Any]] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _iter_rows(
+        self, file_content: bytes, format_type: BulkDataFormat
+    ) -> Iterator[Dict[str, Any]]:
+        if format_type == BulkDataFormat.CSV:
+            return self._parse_csv(file_content)
+        elif format_type == BulkDataFormat.EXCEL:
+            return self._parse_excel(file_content)
+        elif format_type == BulkDataFormat.JSON:
+            return self._parse_json(file_content)
+        elif format_type == BulkDataFormat.TSV:
+            return self._parse_tsv(file_content)
+        else:
+            raise ValueError(f"Unsupported format: {format_type}")
+
+    def _parse_csv(self, file_content: bytes) -> Iterator[Dict[str, Any]]:
         """Parse CSV content"""
+        return self._parse_delimited(file_content, ",", "CSV")
+
+    def _parse_tsv(self, file_content: bytes) -> Iterator[Dict[str, Any]]:
+        """Parse TSV content"""
+        return self._parse_delimited(file_content, "\t", "TSV")
+
+    def _parse_delimited(
+        self, file_content: bytes, delimiter: str, label: str
+    ) -> Iterator[Dict[str, Any]]:
+        text = io.TextIOWrapper(
+            io.BytesIO(file_content), encoding="utf-8-sig", newline=""
+        )
+        reader = csv.reader(text, delimiter=delimiter)
         try:
-            df = pd.read_csv(io.BytesIO(file_content))
-            return df.to_dict("records")
-        except Exception as e:
-            raise ValueError(f"Invalid CSV format: {str(e)}")
+            header = next(reader, None)
+            if not header:
+                raise ValueError("No columns to parse from file")
+            header = [column.strip() for column in header]
+            for values in reader:
+                if not any(value.strip() for value in values):
+                    continue
+                if len(values) > len(header):
+                    raise ValueError(
+                        f"Expected {len(header)} fields in line {reader.line_num}, "
+                        f"saw {len(values)}"
+                    )
+                values += [""] * (len(header) - len(values))
+                yield {
+                    column: coerce_cell(value) for column, value in zip(header, values)
+                }
+        except (csv.Error, UnicodeDecodeError, ValueError) as e:
+            raise ValueError(f"Invalid {label} format: {str(e)}")
+
+    def _parse_excel(self, file_content: bytes) -> Iterator[Dict[str, Any]]:
+        """Parse the first worksheet with openpyxl in read-only mode"""
+        from openpyxl import load_workbook
 
-    def _parse_excel(self, file_content: bytes) -> List[Dict[str, Any]]:
-        """Parse Excel content"""
         try:
-            df = pd.read_excel(io.BytesIO(file_content), engine="openpyxl")
-            return df.to_dict("records")
+            workbook = load_workbook(
+                io.BytesIO(file_content), read_only=True, data_only=True
+            )
         except Exception as e:
             raise ValueError(f"Invalid Excel format: {str(e)}")
-
-    def _parse_json(self, file_content: bytes) -> List[Dict[str, Any]]:
-        """Parse JSON content"""
         try:
-            data = json.loads(file_content.decode("utf-8"))
-            if isinstance(data, list):
-                return data
-            elif isinstance(data, dict):
-                return [data]
-            else:
-                raise ValueError("JSON must contain object or array")
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON format: {str(e)}")
-
-    def _parse_tsv(self, file_content: bytes) -> List[Dict[str, Any]]:
-        """Parse TSV content"""
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            header = next(rows, None)
+            if not header:
+                raise ValueError("Invalid Excel format: worksheet is empty")
+            header = [
+                str(column).strip() if column is not None else f"Unnamed: {index}"
+                for index, column in enumerate(header)
+            ]
+            for values in rows:
+                if all(value is None or value == "" for value in values):
+                    continue
+                yield {
+                    column: (None if value == "" else value)
+                    for column, value in zip(header, values)
+                }
+        finally:
+            # Read-only workbooks keep the archive open until closed
+            workbook.close()
+
+    def _parse_json(self, file_content: bytes) -> Iterator[Dict[str, Any]]:
+        """Parse a JSON array, a single object or JSON lines"""
         try:
-            df = pd.read_csv(io.BytesIO(file_content), sep="\t")
-            return df.to_dict("records")
-        except Exception as e:
-            raise ValueError(f"Invalid TSV format: {str(e)}")
+            text = file_content.decode("utf-8-sig")
+        except UnicodeDecodeError as e:
+            raise ValueError(f"Invalid JSON format: {str(e)}")
+        position = _skip_json_whitespace(text, 0)
+        if text.startswith("[", position):
+            items = _iter_json_array(text, position + 1)
+        else:
+            items = _iter_json_values(text, position)
+        for item in items:
+            if not isinstance(item, dict):
+                raise ValueError("JSON must contain object or array")
+            yield item
+
+
+def _skip_json_whitespace(text: str, position: int) -> int:
+    while position < len(text) and text[position] in _JSON_WHITESPACE:
+        position += 1
+    return position
+
+
+def _decode_json_value(text: str, position: int):
+    try:
+        return _JSON_DECODER.raw_decode(text, position)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON format: {str(e)}")
+
+
+def _iter_json_array(text: str, position: int) -> Iterator[Any]:
+    """Decode the elements of a top-level array one at a time"""
+    position = _skip_json_whitespace(text, position)
+    while not text.startswith("]", position):
+        item, position = _decode_json_value(text, position)
+        yield item
+        position = _skip_json_whitespace(text, position)
+        if text.startswith(",", position):
+            position = _skip_json_whitespace(text, position + 1)
+            if text.startswith("]", position):
+                raise ValueError(
+                    f"Invalid JSON format: trailing comma at char {position}"
+                )
+        elif not text.startswith("]", position):
+            raise ValueError(f"Invalid JSON format: expected ',' at char {position}")
+    position = _skip_json_whitespace(text, position + 1)
+    if position < len(text):
+        raise ValueError(f"Invalid JSON format: extra data at char {position}")
+
+
+def _iter_json_values(text: str, position: int) -> Iterator[Any]:
+    """Decode whitespace-separated values: one object or JSON lines"""
+    while position < len(text):
+        item, position = _decode_json_value(text, position)
+        yield item
+        position = _skip_json_whitespace(text, position)
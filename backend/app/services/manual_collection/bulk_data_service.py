@@ -9,7 +9,7 @@ Agent Team B3 - Task B3.2
 
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -19,7 +19,9 @@ from ..collection_flow.data_transformation import DataTransformationService
 from ..collection_flow.quality_scoring import QualityAssessmentService
 
 from .bulk_data_models import (
+    BulkDataFormat,
     BulkDataProcessingResult,
+    BulkDataValidationIssue,
     BulkTemplate,
     GridDataEntry,
     ProcessingStatus,
@@ -40,6 +42,9 @@ class BulkDataService:
     # Maximum number of rows to process
     MAX_ROWS = 1000
 
+    # Rows parsed, validated and transformed per pipeline step
+    BATCH_ROWS = 250
+
     def __init__(
         self,
         db_session: Optional[AsyncSession] = None,
@@ -92,34 +97,19 @@ class BulkDataService:
             # Validate file
             self.parser.validate_file(file_content, filename)
 
-            # Detect format and parse
-            format_type = self.parser.detect_format(filename)
-            parsed_data = await self.parser.parse_file_content(
-                file_content, format_type
-            )
-
-            if len(parsed_data) > self.MAX_ROWS:
-                raise ValueError(f"File exceeds maximum row limit of {self.MAX_ROWS}")
-
             # Get template if specified
             template = None
             if template_id:
                 template = await self.template_service.get_template(template_id)
 
-            # Apply template mapping if available
-            if template:
-                parsed_data = self._apply_template_mapping(
-                    parsed_data, template, mapping_overrides
+            # Parse, map, validate and transform batch by batch
+            format_type = self.parser.detect_format(filename)
+            total_rows, validation_issues, transformed_data = (
+                await self._process_file_batches(
+                    file_content, format_type, template, mapping_overrides
                 )
-
-            # Validate data
-            validation_issues = await self.validator.validate_bulk_data(
-                parsed_data, template.attributes if template else None
             )
 
-            # Transform data
-            transformed_data = await self._transform_bulk_data(parsed_data, template)
-
             # Calculate quality score
             await self._calculate_bulk_quality_score(
                 transformed_data, validation_issues
@@ -137,7 +127,7 @@ class BulkDataService:
                     if error_count == 0
                     else ProcessingStatus.PARTIALLY_COMPLETED
                 ),
-                total_rows=len(parsed_data),
+                total_rows=total_rows,
                 processed_rows=len(transformed_data),
                 failed_rows=error_count,
                 validation_issues=validation_issues,
@@ -251,6 +241,46 @@ class BulkDataService:
         result = self._processing_jobs.get(processing_id)
         return result.processed_data if result else []
 
+    async def _process_file_batches(
+        self,
+        file_content: bytes,
+        format_type: BulkDataFormat,
+        template: Optional[BulkTemplate],
+        mapping_overrides: Optional[Dict[str, str]],
+    ) -> Tuple[int, List[BulkDataValidationIssue], List[Dict[str, Any]]]:
+        """Run each parsed batch through mapping, validation and transformation.
+
+        The row limit is enforced as batches arrive, so an oversized file is
+        rejected without parsing the remainder.
+        """
+        total_rows = 0
+        validation_issues: List[BulkDataValidationIssue] = []
+        transformed_data: List[Dict[str, Any]] = []
+
+        batches = self.parser.iter_row_batches(
+            file_content, format_type, self.BATCH_ROWS
+        )
+        async for batch in batches:
+            offset = total_rows
+            total_rows += len(batch)
+            if total_rows > self.MAX_ROWS:
+                raise ValueError(f"File exceeds maximum row limit of {self.MAX_ROWS}")
+
+            if template:
+                batch = self._apply_template_mapping(batch, template, mapping_overrides)
+
+            batch_issues = await self.validator.validate_bulk_data(
+                batch, template.attributes if template else None
+            )
+            # The validator numbers rows within the batch
+            for issue in batch_issues:
+                issue.row_index += offset
+            validation_issues.extend(batch_issues)
+
+            transformed_data.extend(await self._transform_bulk_data(batch, template))
+
+        return total_rows, validation_issues, transformed_data
+
     def _apply_template_mapping(
         self,
         data: List[Dict[str, Any]],
@@ -0,0 +1,34 @@
+"""
+Market Data Service Module
+
+Shared infrastructure for stock market data used by the stock services and
+analysis agents.
+"""
+
+from .batch_quotes import BatchQuoteFetcher, parse_quote_prices
+from .cache import MarketDataCache, get_market_data_cache
+from .indicator_summary import format_indicator_summary, summarize_indicators
+from .indicators import IncrementalIndicators
+from .ohlcv_store import OHLCVStore, get_ohlcv_store
+from .price_series import PriceSeries
+from .single_flight import SingleFlight, get_market_data_single_flight
+from .symbol_index import SymbolEntry, SymbolIndex, TrigramIndex, get_symbol_index
+
+__all__ = [
+    "BatchQuoteFetcher",
+    "parse_quote_prices",
+    "MarketDataCache",
+    "get_market_data_cache",
+    "IncrementalIndicators",
+    "format_indicator_summary",
+    "summarize_indicators",
+    "OHLCVStore",
+    "get_ohlcv_store",
+    "PriceSeries",
+    "SingleFlight",
+    "get_market_data_single_flight",
+    "SymbolEntry",
+    "SymbolIndex",
+    "TrigramIndex",
+    "get_symbol_index",
+]
@@ -0,0 +1,152 @@
+"""
+Multi-symbol quote fetching.
+
+A batch is answered in three steps:
+
+- fresh cached quotes are served directly
+- current and previous closes for every other ticker come from one
+  multi-ticker price download
+- company info (yfinance has no multi-ticker profile call) is fetched per
+  ticker only when its profile is not cached, with bounded concurrency
+
+The upstream calls are passed in, so this module never imports yfinance.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+from .cache import MarketDataCache
+
+logger = get_logger(__name__)
+
+# (current, previous close); either may be unknown
+Prices = Tuple[Optional[float], Optional[float]]
+
+# tickers -> prices of the tickers upstream knows
+DownloadPrices = Callable[[List[str]], Awaitable[Dict[str, Prices]]]
+
+# (ticker, cached info or None, prices) -> (info, quote); (None, None) if invalid
+FetchQuote = Callable[
+    [str, Optional[Dict[str, Any]], Optional[Prices]],
+    Awaitable[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]],
+]
+
+
+def parse_quote_prices(data: Any, symbols: Sequence[str]) -> Dict[str, Prices]:
+    """Latest two closes per ticker from a yf.download(group_by="ticker") frame"""
+    prices: Dict[str, Prices] = {}
+    if data is None or data.empty:
+        return prices
+
+    for symbol in symbols:
+        try:
+            closes = (
+                data[symbol]["Close"]
+                if symbol in data.columns.get_level_values(0)
+                else data["Close"]
+            ).dropna()
+        except KeyError:
+            continue
+        if closes.empty:
+            continue
+        current = float(closes.iloc[-1])
+        previous = float(closes.iloc[-2]) if len(closes) > 1 else None
+        prices[symbol] = (current, previous)
+    return prices
+
+
+class BatchQuoteFetcher:
+    """Fetches quotes for many tickers with one price download"""
+
+    def __init__(
+        self,
+        market_cache: MarketDataCache,
+        download_prices: DownloadPrices,
+        fetch_quote: FetchQuote,
+        concurrency: Optional[int] = None,
+    ):
+        self.market_cache = market_cache
+        self.download_prices = download_prices
+        self.fetch_quote = fetch_quote
+        self.concurrency = concurrency or settings.MARKET_DATA_BATCH_CONCURRENCY
+
+    async def fetch(
+        self, by_ticker: Dict[str, List[str]], force_refresh: bool = False
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+        """Quotes and errors keyed by input symbol
+
+        Args:
+            by_ticker: normalized ticker -> the input symbols resolving to it
+            force_refresh: If True, bypass the quote and profile caches
+        """
+        quotes: Dict[str, Dict[str, Any]] = {}
+        errors: Dict[str, str] = {}
+
+        missing = (
+            list(by_ticker)
+            if force_refresh
+            else await self._collect_cached_quotes(by_ticker, quotes)
+        )
+        if not missing:
+            return quotes, errors
+
+        try:
+            prices = await self.download_prices(missing)
+        except Exception as e:
+            logger.warning(f"Batch price download failed, using per-symbol prices: {e}")
+            prices = {}
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        profile_ttl, _ = MarketDataCache.profile_ttls()
+
+        async def fetch_one(ticker_symbol: str) -> Optional[Dict[str, Any]]:
+            profile_key = MarketDataCache.profile_key(ticker_symbol)
+            info = None if force_refresh else await self.market_cache.get(profile_key)
+            async with semaphore:
+                fetched_info, quote = await self.fetch_quote(
+                    ticker_symbol, info, prices.get(ticker_symbol)
+                )
+            if info is None and fetched_info:
+                await self.market_cache.put(profile_key, fetched_info, profile_ttl)
+            return quote
+
+        results = await asyncio.gather(
+            *(fetch_one(ticker_symbol) for ticker_symbol in missing),
+            return_exceptions=True,
+        )
+        ttl, stale_ttl = MarketDataCache.quote_ttls()
+        for ticker_symbol, result in zip(missing, results):
+            inputs = by_ticker[ticker_symbol]
+            if isinstance(result, Exception):
+                errors.update(
+                    {s: f"Failed to fetch stock data: {result}" for s in inputs}
+                )
+            elif result is None:
+                errors.update(
+                    {s: "Stock not found or no data returned" for s in inputs}
+                )
+            else:
+                await self.market_cache.put(
+                    MarketDataCache.quote_key(ticker_symbol), result, ttl, stale_ttl
+                )
+                quotes.update({s: result for s in inputs})
+
+        return quotes, errors
+
+    async def _collect_cached_quotes(
+        self, by_ticker: Dict[str, List[str]], quotes: Dict[str, Dict[str, Any]]
+    ) -> List[str]:
+        """Fill quotes from fresh cache entries; return tickers still missing"""
+        missing = []
+        for ticker_symbol, inputs in by_ticker.items():
+            cached = await self.market_cache.get(
+                MarketDataCache.quote_key(ticker_symbol), fresh_only=True
+            )
+            if cached is None:
+                missing.append(ticker_symbol)
+            else:
+                quotes.update({symbol: cached for symbol in inputs})
+        return missing
@@ -0,0 +1,360 @@
+"""
+Tiered market data cache for stock quotes and price history.
+
+Layer 1 is an in-process LRU with per-entry TTL so repeated lookups inside a
+worker (e.g. the four /analyze/all agents asking for the same symbol) never
+leave the process. Layer 2 is the shared Redis cache so all workers reuse a
+single upstream fetch. Entries carry a fresh window and a stale window: stale
+entries are served immediately while one background task revalidates them.
+"""
+
+import asyncio
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Intervals whose bars close within a trading session
+INTRADAY_INTERVALS = {"1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h"}
+
+
+@dataclass
+class CacheEntry:
+    """Cached value with its freshness windows (epoch seconds)"""
+
+    value: Any
+    fresh_until: float
+    stale_until: float
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.fresh_until
+
+    def is_servable(self, now: float) -> bool:
+        return now < self.stale_until
+
+
+@dataclass
+class MarketDataCacheStats:
+    """Hit/miss counters for the market data cache"""
+
+    l1_hits: int = 0
+    l2_hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        total = self.l1_hits + self.l2_hits + self.stale_hits + self.misses
+        return {
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "hit_rate": (
+                (self.l1_hits + self.l2_hits + self.stale_hits) / total * 100
+                if total
+                else 0.0
+            ),
+        }
+
+
+class LRUTTLCache:
+    """Size-bounded LRU of CacheEntry objects, safe to share across threads"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, now: float) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if not entry.is_servable(now):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class MarketDataCache:
+    """Two-tier (process LRU + Redis) cache with stale-while-revalidate"""
+
+    KEY_PREFIX = "market"
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        redis_cache: Optional[Any] = None,
+        use_redis: bool = True,
+    ):
+        self._l1 = LRUTTLCache(max_entries or settings.MARKET_DATA_CACHE_MAX_ENTRIES)
+        self._redis = redis_cache
+        self._use_redis = use_redis
+        self._refreshing: Set[str] = set()
+        self._background_tasks: Set[asyncio.Task] = set()
+        self.stats = MarketDataCacheStats()
+
+    # Key and TTL policy -----------------------------------------------------
+
+    @classmethod
+    def quote_key(cls, symbol: str) -> str:
+        return f"{cls.KEY_PREFIX}:quote:{symbol.strip().upper()}"
+
+    @classmethod
+    def profile_key(cls, symbol: str) -> str:
+        return f"{cls.KEY_PREFIX}:profile:{symbol.strip().upper()}"
+
+    @classmethod
+    def search_key(cls, symbol: str) -> str:
+        return f"{cls.KEY_PREFIX}:search:{symbol.strip().upper()}"
+
+    @classmethod
+    def history_key(cls, symbol: str, period: str, interval: str) -> str:
+        return (
+            f"{cls.KEY_PREFIX}:history:{symbol.strip().upper()}:"
+            f"{period.strip().lower()}:{interval.strip().lower()}"
+        )
+
+    @staticmethod
+    def quote_ttls() -> tuple:
+        """Return (fresh_ttl, stale_ttl) for quotes"""
+        return settings.MARKET_DATA_QUOTE_TTL, settings.MARKET_DATA_QUOTE_STALE_TTL
+
+    @staticmethod
+    def profile_ttls() -> tuple:
+        """Return (fresh_ttl, stale_ttl) for company profiles"""
+        return settings.MARKET_DATA_PROFILE_TTL, 0
+
+    @staticmethod
+    def history_ttls(interval: str) -> tuple:
+        """Return (fresh_ttl, stale_ttl) for price history of an interval"""
+        if interval.strip().lower() in INTRADAY_INTERVALS:
+            ttl = settings.MARKET_DATA_INTRADAY_TTL
+            return ttl, ttl * 10
+        return settings.MARKET_DATA_HISTORY_TTL, settings.MARKET_DATA_HISTORY_STALE_TTL
+
+    # Core API ---------------------------------------------------------------
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetcher: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int = 0,
+        encode: Optional[Callable[[Any], Any]] = None,
+        decode: Optional[Callable[[Any], Any]] = None,
+    ) -> Any:
+        """
+        Return the cached value for key, fetching it on a miss.
+
+        Fresh entries are returned directly. Stale-but-servable entries are
+        returned immediately and refreshed in the background. ``None`` results
+        from the fetcher are never cached. ``encode``/``decode`` convert values
+        that are not JSON-serializable for the Redis tier; the in-process tier
+        always holds the decoded object.
+        """
+        now = time.time()
+        entry = self._l1.get(key, now)
+        if entry is not None and entry.is_fresh(now):
+            self.stats.l1_hits += 1
+            return entry.value
+
+        if entry is None:
+            entry = await self._get_l2(key, now, decode)
+            if entry is not None:
+                self._l1.put(key, entry)
+                if entry.is_fresh(now):
+                    self.stats.l2_hits += 1
+                    return entry.value
+
+        if entry is not None:
+            self.stats.stale_hits += 1
+            self._schedule_refresh(key, fetcher, ttl, stale_ttl, encode)
+            return entry.value
+
+        self.stats.misses += 1
+        value = await fetcher()
+        if value is not None:
+            await self.put(key, value, ttl, stale_ttl, encode)
+        return value
+
+    async def get(
+        self,
+        key: str,
+        decode: Optional[Callable[[Any], Any]] = None,
+        fresh_only: bool = False,
+    ) -> Optional[Any]:
+        """Return a servable cached value without fetching
+
+        With fresh_only, stale entries are treated as misses so the caller can
+        refetch them itself (used by batch lookups).
+        """
+        now = time.time()
+        entry = self._l1.get(key, now)
+        if entry is None:
+            entry = await self._get_l2(key, now, decode)
+            if entry is not None:
+                self._l1.put(key, entry)
+        if entry is None or (fresh_only and not entry.is_fresh(now)):
+            return None
+        return entry.value
+
+    async def put(
+        self,
+        key: str,
+        value: Any,
+        ttl: int,
+        stale_ttl: int = 0,
+        encode: Optional[Callable[[Any], Any]] = None,
+    ) -> None:
+        """Store a value in both tiers"""
+        now = time.time()
+        entry = CacheEntry(
+            value=value, fresh_until=now + ttl, stale_until=now + ttl + stale_ttl
+        )
+        self._l1.put(key, entry)
+        await self._set_l2(key, entry, ttl + stale_ttl, encode)
+
+    async def invalidate(self, key: str) -> None:
+        """Drop a key from both tiers"""
+        self._l1.delete(key)
+        redis = self._get_redis()
+        if redis is not None:
+            await redis.delete(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats.to_dict()
+        stats["l1_size"] = len(self._l1)
+        stats["refreshing"] = len(self._refreshing)
+        return stats
+
+    # Internals --------------------------------------------------------------
+
+    def _schedule_refresh(
+        self,
+        key: str,
+        fetcher: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int,
+        encode: Optional[Callable[[Any], Any]],
+    ) -> None:
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        task = asyncio.create_task(self._refresh(key, fetcher, ttl, stale_ttl, encode))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _refresh(
+        self,
+        key: str,
+        fetcher: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int,
+        encode: Optional[Callable[[Any], Any]],
+    ) -> None:
+        try:
+            value = await fetcher()
+            if value is not None:
+                await self.put(key, value, ttl, stale_ttl, encode)
+                self.stats.refreshes += 1
+        except Exception as e:
+            self.stats.refresh_errors += 1
+            logger.warning(f"Background refresh failed for {key}: {e}")
+        finally:
+            self._refreshing.discard(key)
+
+    def _get_redis(self) -> Optional[Any]:
+        if not self._use_redis:
+            return None
+        if self._redis is None:
+            from app.services.caching.redis_cache import get_redis_cache
+
+            self._redis = get_redis_cache()
+        if not getattr(self._redis, "enabled", False):
+            return None
+        return self._redis
+
+    async def _get_l2(
+        self, key: str, now: float, decode: Optional[Callable[[Any], Any]] = None
+    ) -> Optional[CacheEntry]:
+        redis = self._get_redis()
+        if redis is None:
+            return None
+        try:
+            payload = await redis.get(key)
+            if not isinstance(payload, dict) or "value" not in payload:
+                return None
+            entry = CacheEntry(
+                value=decode(payload["value"]) if decode else payload["value"],
+                fresh_until=float(payload.get("fresh_until", 0)),
+                stale_until=float(payload.get("stale_until", 0)),
+            )
+            return entry if entry.is_servable(now) else None
+        except Exception as e:
+            logger.debug(f"Market data L2 read failed for {key}: {e}")
+            return None
+
+    async def _set_l2(
+        self,
+        key: str,
+        entry: CacheEntry,
+        ttl: float,
+        encode: Optional[Callable[[Any], Any]] = None,
+    ) -> None:
+        redis = self._get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.set(
+                key,
+                {
+                    "value": encode(entry.value) if encode else entry.value,
+                    "fresh_until": entry.fresh_until,
+                    "stale_until": entry.stale_until,
+                },
+                ttl=max(1, math.ceil(ttl)),
+            )
+        except Exception as e:
+            logger.debug(f"Market data L2 write failed for {key}: {e}")
+
+
+_market_data_cache: Optional[MarketDataCache] = None
+
+
+def get_market_data_cache() -> MarketDataCache:
+    """Get the process-wide market data cache"""
+    global _market_data_cache
+    if _market_data_cache is None:
+        _market_data_cache = MarketDataCache()
+    return _market_data_cache
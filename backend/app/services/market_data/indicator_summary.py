@@ -0,0 +1,178 @@
+"""
+Indicator summaries for the stock analysis agents.
+
+summarize_indicators() reduces a PriceSeries to a small JSON-safe dict that the
+statistics and history agents put in their LLM prompts instead of raw bars, and
+format_indicator_summary() renders that dict as a prompt block.
+"""
+
+import math
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .indicators import (
+    PERIODS_PER_YEAR,
+    RETURN_WINDOWS,
+    annualized_volatility,
+    atr,
+    beta,
+    bollinger_bands,
+    ema,
+    log_returns,
+    macd,
+    max_drawdown,
+    rsi,
+    sharpe_ratio,
+    simple_returns,
+    sma,
+    sortino_ratio,
+)
+from .price_series import PriceSeries
+
+
+def _last(values: np.ndarray) -> Optional[float]:
+    if values.size == 0 or not np.isfinite(values[-1]):
+        return None
+    return round(float(values[-1]), 4)
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    if value is None or not math.isfinite(value):
+        return None
+    return round(float(value), 4)
+
+
+def summarize_indicators(
+    series: PriceSeries,
+    benchmark: Optional[PriceSeries] = None,
+    risk_free_rate: float = 0.0,
+) -> Dict[str, Any]:
+    """Compact, JSON-safe indicator summary of the latest bar of a series"""
+    mask = np.isfinite(series.close) & (series.close > 0)
+    if not mask.all():
+        series = series._take(mask)
+    if series.is_empty:
+        return {}
+
+    close, high, low = series.close, series.high, series.low
+    periods = PERIODS_PER_YEAR.get(series.interval, 252)
+    simple = simple_returns(close)
+    logs = log_returns(close)
+
+    macd_line, macd_signal, macd_hist = macd(close)
+    bb_mid, bb_upper, bb_lower = bollinger_bands(close)
+    atr_values = atr(high, low, close)
+    drawdown, peak_idx, trough_idx = max_drawdown(close)
+    last_close = float(close[-1])
+
+    percent_b = None
+    if _last(bb_upper) is not None and bb_upper[-1] != bb_lower[-1]:
+        percent_b = _round((last_close - bb_lower[-1]) / (bb_upper[-1] - bb_lower[-1]))
+
+    trailing_returns = {
+        label: _round(last_close / close[-bars - 1] - 1.0)
+        for label, bars in RETURN_WINDOWS.items()
+        if series.interval == "1d" and close.size > bars
+    }
+
+    summary = {
+        "bars": len(series),
+        "interval": series.interval,
+        "first_date": series.first_date,
+        "last_date": series.last_date,
+        "last_close": _round(last_close),
+        "period_high": _round(float(high.max())),
+        "period_low": _round(float(low.min())),
+        "total_return": _round(last_close / close[0] - 1.0),
+        "trailing_returns": trailing_returns,
+        "moving_averages": {
+            "sma_20": _last(sma(close, 20)),
+            "sma_50": _last(sma(close, 50)),
+            "sma_200": _last(sma(close, 200)),
+            "ema_12": _last(ema(close, 12)),
+            "ema_26": _last(ema(close, 26)),
+        },
+        "rsi_14": _last(rsi(close)),
+        "macd": {
+            "macd": _last(macd_line),
+            "signal": _last(macd_signal),
+            "histogram": _last(macd_hist),
+        },
+        "bollinger": {
+            "middle": _last(bb_mid),
+            "upper": _last(bb_upper),
+            "lower": _last(bb_lower),
+            "percent_b": percent_b,
+        },
+        "atr_14": _last(atr_values),
+        "atr_percent": (
+            _round(atr_values[-1] / last_close) if _last(atr_values) else None
+        ),
+        "max_drawdown": {
+            "drawdown": _round(drawdown),
+            "peak_date": str(series.dates[peak_idx]) if peak_idx >= 0 else None,
+            "trough_date": str(series.dates[trough_idx]) if trough_idx >= 0 else None,
+        },
+        "volatility": {
+            "log_return_annualized": _round(annualized_volatility(logs, periods)),
+            "daily_log_return_std": (
+                _round(float(logs.std(ddof=1))) if logs.size > 1 else None
+            ),
+        },
+        "sharpe_ratio": _round(sharpe_ratio(simple, periods, risk_free_rate)),
+        "sortino_ratio": _round(sortino_ratio(simple, periods, risk_free_rate)),
+    }
+    if benchmark is not None and not benchmark.is_empty:
+        summary["beta"] = _round(beta(series, benchmark))
+        summary["benchmark"] = benchmark.symbol
+    return summary
+
+
+def format_indicator_summary(summary: Dict[str, Any]) -> str:
+    """Render an indicator summary as a short prompt block"""
+    if not summary:
+        return "Technical Indicators: not available (no price history)."
+
+    def fmt(value: Any, pattern: str = "{:.2f}") -> str:
+        return "N/A" if value is None else pattern.format(value)
+
+    ma = summary.get("moving_averages", {})
+    macd_values = summary.get("macd", {})
+    bands = summary.get("bollinger", {})
+    drawdown = summary.get("max_drawdown", {})
+    volatility = summary.get("volatility", {})
+    trailing = ", ".join(
+        f"{label}: {fmt(value, '{:.2%}')}"
+        for label, value in summary.get("trailing_returns", {}).items()
+    )
+
+    lines = [
+        f"Technical Indicators ({summary.get('bars')} {summary.get('interval')} bars, "
+        f"{summary.get('first_date')} to {summary.get('last_date')}):",
+        f"- Last Close: {fmt(summary.get('last_close'))} "
+        f"(period range {fmt(summary.get('period_low'))} - {fmt(summary.get('period_high'))})",
+        f"- Total Return: {fmt(summary.get('total_return'), '{:.2%}')}"
+        + (f" | Trailing: {trailing}" if trailing else ""),
+        f"- SMA 20/50/200: {fmt(ma.get('sma_20'))} / {fmt(ma.get('sma_50'))} / "
+        f"{fmt(ma.get('sma_200'))} | EMA 12/26: {fmt(ma.get('ema_12'))} / {fmt(ma.get('ema_26'))}",
+        f"- RSI(14): {fmt(summary.get('rsi_14'), '{:.1f}')}",
+        f"- MACD: {fmt(macd_values.get('macd'), '{:.3f}')} "
+        f"(signal {fmt(macd_values.get('signal'), '{:.3f}')}, "
+        f"histogram {fmt(macd_values.get('histogram'), '{:.3f}')})",
+        f"- Bollinger(20,2): {fmt(bands.get('lower'))} - {fmt(bands.get('upper'))}, "
+        f"%B {fmt(bands.get('percent_b'))}",
+        f"- ATR(14): {fmt(summary.get('atr_14'))} "
+        f"({fmt(summary.get('atr_percent'), '{:.2%}')} of price)",
+        f"- Max Drawdown: {fmt(drawdown.get('drawdown'), '{:.2%}')} "
+        f"({drawdown.get('peak_date')} to {drawdown.get('trough_date')})",
+        f"- Annualized Volatility (log returns): "
+        f"{fmt(volatility.get('log_return_annualized'), '{:.2%}')}",
+        f"- Sharpe: {fmt(summary.get('sharpe_ratio'))} | "
+        f"Sortino: {fmt(summary.get('sortino_ratio'))}",
+    ]
+    if "beta" in summary:
+        lines.append(
+            f"- Beta vs {summary.get('benchmark')}: {fmt(summary.get('beta'))}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,365 @@
+"""
+Vectorized technical-indicator engine for PriceSeries data.
+
+All batch indicators operate on whole NumPy arrays (recursive smoothers use
+scipy.signal.lfilter, so there are no per-bar Python loops) and return arrays
+aligned with the input, padded with NaN where the indicator is undefined.
+
+IncrementalIndicators carries the final smoother state forward so a live
+feed can append one bar at a time without recomputing the history.
+
+Prompt summaries built from these live in indicator_summary.
+"""
+
+import math
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+
+from .price_series import PriceSeries
+
+# Bars per year used to annualize volatility and risk-adjusted returns
+PERIODS_PER_YEAR = {
+    "1m": 252 * 390,
+    "2m": 252 * 195,
+    "5m": 252 * 78,
+    "15m": 252 * 26,
+    "30m": 252 * 13,
+    "60m": 252 * 7,
+    "90m": 252 * 5,
+    "1h": 252 * 7,
+    "1d": 252,
+    "5d": 52,
+    "1wk": 52,
+    "1mo": 12,
+    "3mo": 4,
+}
+
+# Trailing-return windows reported in summaries (in daily bars)
+RETURN_WINDOWS = {"1m": 21, "3m": 63, "6m": 126, "1y": 252}
+
+
+# Smoothing primitives ------------------------------------------------------
+
+
+def sma(values: np.ndarray, window: int) -> np.ndarray:
+    """Simple moving average"""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(values.shape, np.nan)
+    if window <= 0 or values.size < window:
+        return out
+    csum = np.cumsum(np.insert(values, 0, 0.0))
+    out[window - 1 :] = (csum[window:] - csum[:-window]) / window
+    return out
+
+
+def _exp_smooth(values: np.ndarray, alpha: float, seed: float) -> np.ndarray:
+    """y[t] = alpha * x[t] + (1 - alpha) * y[t-1], with y[-1] = seed"""
+    y, _ = lfilter([alpha], [1.0, alpha - 1.0], values, zi=[(1.0 - alpha) * seed])
+    return y
+
+
+def ema(values: np.ndarray, span: int) -> np.ndarray:
+    """Exponential moving average seeded with the first value (adjust=False)"""
+    values = np.asarray(values, dtype=np.float64)
+    if values.size == 0:
+        return values.copy()
+    return _exp_smooth(values, 2.0 / (span + 1.0), values[0])
+
+
+def wilder(values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder smoothing seeded with the SMA of the first `period` values"""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(values.shape, np.nan)
+    if values.size < period:
+        return out
+    seed = values[:period].mean()
+    out[period - 1] = seed
+    if values.size > period:
+        out[period:] = _exp_smooth(values[period:], 1.0 / period, seed)
+    return out
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """Population standard deviation over a trailing window"""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(values.shape, np.nan)
+    if values.size < window:
+        return out
+    out[window - 1 :] = sliding_window_view(values, window).std(axis=1)
+    return out
+
+
+# Indicators ----------------------------------------------------------------
+
+
+def rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Relative Strength Index using Wilder smoothing"""
+    close = np.asarray(close, dtype=np.float64)
+    out = np.full(close.shape, np.nan)
+    if close.size <= period:
+        return out
+    delta = np.diff(close)
+    avg_gain = wilder(np.clip(delta, 0, None), period)
+    avg_loss = wilder(np.clip(-delta, 0, None), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain / avg_loss
+        values = 100.0 - 100.0 / (1.0 + rs)
+    values = np.where(avg_loss == 0, 100.0, values)
+    values[np.isnan(avg_gain)] = np.nan
+    out[1:] = values
+    return out
+
+
+def macd(
+    close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """MACD line, signal line and histogram"""
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def bollinger_bands(
+    close: np.ndarray, window: int = 20, num_std: float = 2.0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Middle (SMA), upper and lower Bollinger bands"""
+    middle = sma(close, window)
+    spread = num_std * rolling_std(close, window)
+    return middle, middle + spread, middle - spread
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    prev_close = np.concatenate([[np.nan], close[:-1]])
+    ranges = np.vstack(
+        [high - low, np.abs(high - prev_close), np.abs(low - prev_close)]
+    )
+    return np.nanmax(ranges, axis=0) if close.size else ranges.sum(axis=0)
+
+
+def atr(
+    high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14
+) -> np.ndarray:
+    """Average True Range (Wilder)"""
+    return wilder(true_range(high, low, close), period)
+
+
+def simple_returns(close: np.ndarray) -> np.ndarray:
+    close = np.asarray(close, dtype=np.float64)
+    if close.size < 2:
+        return np.empty(0)
+    return np.diff(close) / close[:-1]
+
+
+def log_returns(close: np.ndarray) -> np.ndarray:
+    close = np.asarray(close, dtype=np.float64)
+    if close.size < 2:
+        return np.empty(0)
+    return np.diff(np.log(close))
+
+
+def max_drawdown(close: np.ndarray) -> Tuple[float, int, int]:
+    """Largest peak-to-trough decline as (fraction, peak_index, trough_index)"""
+    close = np.asarray(close, dtype=np.float64)
+    if close.size == 0:
+        return 0.0, -1, -1
+    peaks = np.maximum.accumulate(close)
+    drawdowns = close / peaks - 1.0
+    trough = int(np.argmin(drawdowns))
+    peak = int(np.argmax(close[: trough + 1]))
+    return float(drawdowns[trough]), peak, trough
+
+
+def annualized_volatility(returns: np.ndarray, periods_per_year: int) -> float:
+    if returns.size < 2:
+        return 0.0
+    return float(returns.std(ddof=1) * math.sqrt(periods_per_year))
+
+
+def sharpe_ratio(
+    returns: np.ndarray, periods_per_year: int, risk_free_rate: float = 0.0
+) -> Optional[float]:
+    if returns.size < 2:
+        return None
+    excess = returns - risk_free_rate / periods_per_year
+    std = excess.std(ddof=1)
+    if std == 0:
+        return None
+    return float(excess.mean() / std * math.sqrt(periods_per_year))
+
+
+def sortino_ratio(
+    returns: np.ndarray, periods_per_year: int, risk_free_rate: float = 0.0
+) -> Optional[float]:
+    if returns.size < 2:
+        return None
+    excess = returns - risk_free_rate / periods_per_year
+    downside = np.minimum(excess, 0.0)
+    downside_dev = math.sqrt(float(np.mean(downside**2)))
+    if downside_dev == 0:
+        return None
+    return float(excess.mean() / downside_dev * math.sqrt(periods_per_year))
+
+
+def beta(series: PriceSeries, benchmark: PriceSeries) -> Optional[float]:
+    """Beta of series against benchmark over their common trading dates"""
+    common, own_idx, bench_idx = np.intersect1d(
+        series.dates, benchmark.dates, return_indices=True
+    )
+    if common.size < 3:
+        return None
+    own = simple_returns(series.close[own_idx])
+    bench = simple_returns(benchmark.close[bench_idx])
+    mask = np.isfinite(own) & np.isfinite(bench)
+    own, bench = own[mask], bench[mask]
+    if bench.size < 2:
+        return None
+    variance = bench.var(ddof=1)
+    if variance == 0:
+        return None
+    return float(np.cov(own, bench, ddof=1)[0, 1] / variance)
+
+
+# Incremental updates -------------------------------------------------------
+
+
+class IncrementalIndicators:
+    """Streaming indicator state that accepts one bar at a time.
+
+    Seed it from history with from_series(), then call update() for each new
+    closed bar. Results match the batch functions for the same input.
+    """
+
+    def __init__(
+        self,
+        sma_window: int = 20,
+        rsi_period: int = 14,
+        atr_period: int = 14,
+        macd_fast: int = 12,
+        macd_slow: int = 26,
+        macd_signal: int = 9,
+        bollinger_std: float = 2.0,
+    ):
+        self.sma_window = sma_window
+        self.rsi_period = rsi_period
+        self.atr_period = atr_period
+        self.macd_fast = macd_fast
+        self.macd_slow = macd_slow
+        self.macd_signal = macd_signal
+        self.bollinger_std = bollinger_std
+
+        self.count = 0
+        self.prev_close: Optional[float] = None
+        self.peak: Optional[float] = None
+        self.max_drawdown = 0.0
+        self.window: Deque[float] = deque(maxlen=sma_window)
+        self.ema_fast: Optional[float] = None
+        self.ema_slow: Optional[float] = None
+        self.macd_signal_value: Optional[float] = None
+        self.avg_gain: Optional[float] = None
+        self.avg_loss: Optional[float] = None
+        self._gain_seed: list = []
+        self._loss_seed: list = []
+        self.atr: Optional[float] = None
+        self._tr_seed: list = []
+
+    @classmethod
+    def from_series(cls, series: PriceSeries, **kwargs: Any) -> "IncrementalIndicators":
+        state = cls(**kwargs)
+        for i in range(len(series)):
+            state.update(series.high[i], series.low[i], series.close[i])
+        return state
+
+    def update(self, high: float, low: float, close: float) -> Dict[str, Any]:
+        """Fold one closed bar into the state and return the latest values"""
+        high, low, close = float(high), float(low), float(close)
+        self.count += 1
+        self.window.append(close)
+
+        # EMA / MACD
+        fast_alpha = 2.0 / (self.macd_fast + 1.0)
+        slow_alpha = 2.0 / (self.macd_slow + 1.0)
+        signal_alpha = 2.0 / (self.macd_signal + 1.0)
+        if self.ema_fast is None:
+            self.ema_fast = self.ema_slow = close
+        else:
+            self.ema_fast += fast_alpha * (close - self.ema_fast)
+            self.ema_slow += slow_alpha * (close - self.ema_slow)
+        macd_line = self.ema_fast - self.ema_slow
+        if self.macd_signal_value is None:
+            self.macd_signal_value = macd_line
+        else:
+            self.macd_signal_value += signal_alpha * (
+                macd_line - self.macd_signal_value
+            )
+
+        # RSI and ATR (Wilder, seeded by the first `period` values)
+        if self.prev_close is not None:
+            change = close - self.prev_close
+            self.avg_gain, self._gain_seed = self._wilder_step(
+                self.avg_gain, self._gain_seed, max(change, 0.0), self.rsi_period
+            )
+            self.avg_loss, self._loss_seed = self._wilder_step(
+                self.avg_loss, self._loss_seed, max(-change, 0.0), self.rsi_period
+            )
+            tr = max(
+                high - low, abs(high - self.prev_close), abs(low - self.prev_close)
+            )
+        else:
+            tr = high - low
+        self.atr, self._tr_seed = self._wilder_step(
+            self.atr, self._tr_seed, tr, self.atr_period
+        )
+
+        # Drawdown
+        self.peak = close if self.peak is None else max(self.peak, close)
+        self.max_drawdown = min(self.max_drawdown, close / self.peak - 1.0)
+        self.prev_close = close
+        return self.snapshot()
+
+    @staticmethod
+    def _wilder_step(
+        current: Optional[float], seed: list, value: float, period: int
+    ) -> Tuple[Optional[float], list]:
+        if current is not None:
+            return current + (value - current) / period, seed
+        seed.append(value)
+        if len(seed) == period:
+            return sum(seed) / period, []
+        return None, seed
+
+    def snapshot(self) -> Dict[str, Any]:
+        full_window = len(self.window) == self.sma_window
+        mean = float(np.mean(self.window)) if full_window else None
+        std = float(np.std(self.window)) if full_window else None
+        if self.avg_gain is None or self.avg_loss is None:
+            rsi_value = None
+        elif self.avg_loss == 0:
+            rsi_value = 100.0
+        else:
+            rsi_value = 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+        macd_line = self.ema_fast - self.ema_slow if self.ema_fast is not None else None
+        return {
+            "bars": self.count,
+            "close": self.prev_close,
+            f"sma_{self.sma_window}": mean,
+            "bollinger_upper": (
+                mean + self.bollinger_std * std if mean is not None else None
+            ),
+            "bollinger_lower": (
+                mean - self.bollinger_std * std if mean is not None else None
+            ),
+            f"ema_{self.macd_fast}": self.ema_fast,
+            f"ema_{self.macd_slow}": self.ema_slow,
+            "macd": macd_line,
+            "macd_signal": self.macd_signal_value,
+            f"rsi_{self.rsi_period}": rsi_value,
+            f"atr_{self.atr_period}": self.atr,
+            "max_drawdown": self.max_drawdown,
+        }
@@ -0,0 +1,397 @@
+"""
+Local persistent OHLCV store with incremental gap-fill.
+
+Daily, weekly and monthly bars are kept in Postgres (migration.stock_price_bars)
+together with a coverage row recording which trading dates are already stored
+for each (symbol, interval). A history request is answered from the store; only
+the missing head (older than anything stored) and tail (since the last stored
+bar) are fetched upstream. The last stored bar is always re-fetched with the
+tail because it may have been a partial, still-trading bar.
+
+Upstream bars are split- and dividend-adjusted, so a corporate action rescales
+every bar before it. Each tail fetch therefore starts one bar earlier, at the
+last completed stored bar, and if upstream now reports a different price for
+that bar the whole covered range is re-fetched and replaces the stored rows.
+
+Intraday intervals are not persisted; they change too quickly to be worth it.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.logging import get_logger
+from app.models.stock_price_history import StockPriceBar, StockPriceCoverage
+
+from .price_series import PriceSeries
+
+logger = get_logger(__name__)
+
+STORED_INTERVALS = ("1d", "1wk", "1mo")
+
+# Rows per INSERT; keeps bind parameters well under the Postgres limit
+UPSERT_CHUNK_SIZE = 2000
+
+# Relative price difference on the anchor bar treated as a new adjustment basis
+ADJUSTMENT_TOLERANCE = 1e-5
+
+# (start, end) -> bars; start inclusive (None = full history), end exclusive
+FetchRange = Callable[
+    [Optional[date], Optional[date]], Awaitable[Optional[PriceSeries]]
+]
+
+
+def period_start(period: str, today: Optional[date] = None) -> Optional[date]:
+    """First trading date covered by a yfinance period (None for 'max')"""
+    today = today or datetime.now(timezone.utc).date()
+    if period == "max":
+        return None
+    if period == "ytd":
+        return date(today.year, 1, 1)
+    if period.endswith("d"):
+        offset = np.busday_offset(today, -int(period[:-1]), roll="backward")
+        return offset.astype(date)
+    if period.endswith("mo"):
+        return today - relativedelta(months=int(period[:-2]))
+    if period.endswith("y"):
+        return today - relativedelta(years=int(period[:-1]))
+    raise ValueError(f"Unsupported period: {period}")
+
+
+class OHLCVStore:
+    """Postgres-backed store of historical bars keyed by symbol and interval"""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Any]] = None,
+        refresh_seconds: Optional[int] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self._session_factory = session_factory or AsyncSessionLocal
+        self.refresh_interval = timedelta(
+            seconds=(
+                refresh_seconds
+                if refresh_seconds is not None
+                else settings.MARKET_DATA_OHLCV_REFRESH_SECONDS
+            )
+        )
+        self.enabled = (
+            enabled if enabled is not None else settings.MARKET_DATA_OHLCV_STORE_ENABLED
+        )
+
+    def supports(self, interval: str) -> bool:
+        return (
+            self.enabled
+            and self._session_factory is not None
+            and interval in STORED_INTERVALS
+        )
+
+    async def get_series(
+        self,
+        symbol: str,
+        period: str,
+        interval: str,
+        fetch_range: FetchRange,
+    ) -> Optional[PriceSeries]:
+        """Serve a period of bars from the store, filling gaps from upstream"""
+        start = period_start(period)
+        coverage = await self.get_coverage(symbol, interval)
+
+        if coverage is None:
+            fetched = await fetch_range(start, None)
+            if fetched is None or fetched.is_empty:
+                return None
+            await self.save(
+                fetched,
+                covered_from=start,
+                starts_at_inception=start is None,
+                refreshed=True,
+            )
+            return fetched
+
+        # Head gap: requested start is older than anything stored. Coverage is
+        # widened to the requested start even when upstream returns nothing,
+        # so a listing younger than the period is not re-fetched every time.
+        if not coverage.starts_at_inception and (
+            start is None or start < coverage.first_trade_date
+        ):
+            head = await fetch_range(start, coverage.first_trade_date)
+            if head is not None:
+                await self.save(
+                    head,
+                    covered_from=start,
+                    starts_at_inception=start is None,
+                )
+
+        # Tail gap: bars since the last stored one (inclusive, it may be partial)
+        if self._refresh_due(coverage):
+            await self._refresh_tail(symbol, interval, coverage, fetch_range)
+
+        series = await self.load(symbol, interval, start)
+        return None if series.is_empty else series
+
+    async def _refresh_tail(
+        self,
+        symbol: str,
+        interval: str,
+        coverage: StockPriceCoverage,
+        fetch_range: FetchRange,
+    ) -> None:
+        """Append new bars, or re-fetch everything if the adjustment changed"""
+        # The older of the last two stored bars is complete, so upstream should
+        # report the same price for it unless the adjustment basis changed
+        anchor = await self.last_bars(symbol, interval, 2)
+        tail_start = (
+            coverage.last_trade_date
+            if anchor.is_empty
+            else anchor.dates[0].astype(date)
+        )
+
+        tail = await fetch_range(tail_start, None)
+        if tail is None or tail.is_empty:
+            return
+        if anchor.is_empty or not self._adjustment_changed(anchor, tail):
+            await self.save(tail, refreshed=True)
+            return
+
+        logger.info(
+            f"Adjusted prices for {symbol} ({interval}) changed since "
+            f"{tail_start}; re-fetching stored history"
+        )
+        history_start = (
+            None if coverage.starts_at_inception else coverage.first_trade_date
+        )
+        history = await fetch_range(history_start, None)
+        if history is None or history.is_empty:
+            # Keep the old basis consistent rather than mixing in the new tail
+            return
+        await self.save(
+            history,
+            covered_from=history_start,
+            starts_at_inception=history_start is None,
+            refreshed=True,
+            replace=True,
+        )
+
+    @staticmethod
+    def _adjustment_changed(anchor: PriceSeries, tail: PriceSeries) -> bool:
+        """Whether upstream now reports a different close for the first anchor bar"""
+        matches = np.flatnonzero(tail.timestamps == anchor.timestamps[0])
+        if matches.size == 0:
+            matches = np.flatnonzero(tail.dates == anchor.dates[0])
+        if matches.size == 0:
+            return False
+        stored, fetched = anchor.close[0], tail.close[matches[0]]
+        if not (np.isfinite(stored) and np.isfinite(fetched)):
+            return False
+        return not np.isclose(fetched, stored, rtol=ADJUSTMENT_TOLERANCE, atol=0.0)
+
+    def _refresh_due(self, coverage: StockPriceCoverage) -> bool:
+        refreshed_at = coverage.last_refreshed_at
+        if refreshed_at is None:
+            return True
+        if refreshed_at.tzinfo is None:
+            refreshed_at = refreshed_at.replace(tzinfo=timezone.utc)
+        return datetime.now(timezone.utc) - refreshed_at >= self.refresh_interval
+
+    # Persistence -------------------------------------------------------------
+
+    async def get_coverage(
+        self, symbol: str, interval: str
+    ) -> Optional[StockPriceCoverage]:
+        async with self._session_factory() as session:
+            result = await session.execute(
+                select(StockPriceCoverage).where(
+                    StockPriceCoverage.symbol == symbol,
+                    StockPriceCoverage.interval == interval,
+                )
+            )
+            return result.scalar_one_or_none()
+
+    async def load(
+        self, symbol: str, interval: str, start: Optional[date] = None
+    ) -> PriceSeries:
+        """Stored bars on or after the given trading date, oldest first"""
+        query = select(
+            StockPriceBar.bar_timestamp,
+            StockPriceBar.trade_date,
+            StockPriceBar.open,
+            StockPriceBar.high,
+            StockPriceBar.low,
+            StockPriceBar.close,
+            StockPriceBar.volume,
+        ).where(StockPriceBar.symbol == symbol, StockPriceBar.interval == interval)
+        if start is not None:
+            query = query.where(StockPriceBar.trade_date >= start)
+        query = query.order_by(StockPriceBar.bar_timestamp)
+
+        async with self._session_factory() as session:
+            rows = (await session.execute(query)).all()
+
+        if not rows:
+            return PriceSeries.empty(symbol, interval)
+
+        timestamps, dates, opens, highs, lows, closes, volumes = zip(*rows)
+
+        def floats(values: tuple) -> np.ndarray:
+            return np.array(
+                [np.nan if v is None else v for v in values], dtype=np.float64
+            )
+
+        return PriceSeries(
+            timestamps=np.array(timestamps, dtype=np.int64),
+            dates=np.array(dates, dtype="datetime64[D]"),
+            open=floats(opens),
+            high=floats(highs),
+            low=floats(lows),
+            close=floats(closes),
+            volume=floats(volumes),
+            symbol=symbol,
+            interval=interval,
+        )
+
+    async def last_bars(self, symbol: str, interval: str, count: int) -> PriceSeries:
+        """The most recent stored bars, oldest first"""
+        query = (
+            select(StockPriceBar.trade_date)
+            .where(StockPriceBar.symbol == symbol, StockPriceBar.interval == interval)
+            .order_by(StockPriceBar.bar_timestamp.desc())
+            .limit(count)
+        )
+        async with self._session_factory() as session:
+            dates = (await session.execute(query)).scalars().all()
+        if not dates:
+            return PriceSeries.empty(symbol, interval)
+        return await self.load(symbol, interval, min(dates))
+
+    async def save(
+        self,
+        series: PriceSeries,
+        covered_from: Optional[date] = None,
+        starts_at_inception: bool = False,
+        refreshed: bool = False,
+        replace: bool = False,
+    ) -> None:
+        """Upsert bars and widen the coverage row to include them.
+
+        Args:
+            series: Bars fetched from upstream (may be empty for a head gap)
+            covered_from: Start date that was requested upstream; coverage is
+                widened to it even if the first bar is later
+            starts_at_inception: The fetch had no start date (period=max)
+            refreshed: The fetch ran up to the present (tail refresh)
+            replace: Drop all stored bars and coverage for the symbol first,
+                in the same transaction (re-fetch after an adjustment change)
+        """
+        if series.is_empty and covered_from is None:
+            return
+
+        first_date = series.dates[0].astype(date) if len(series) else covered_from
+        if covered_from is not None:
+            first_date = min(first_date, covered_from)
+        rows = self._to_rows(series)
+        async with self._session_factory() as session:
+            if replace:
+                for model in (StockPriceBar, StockPriceCoverage):
+                    await session.execute(
+                        delete(model).where(
+                            model.symbol == series.symbol,
+                            model.interval == series.interval,
+                        )
+                    )
+            for offset in range(0, len(rows), UPSERT_CHUNK_SIZE):
+                stmt = insert(StockPriceBar).values(
+                    rows[offset : offset + UPSERT_CHUNK_SIZE]
+                )
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["symbol", "interval", "bar_timestamp"],
+                    set_=dict(
+                        trade_date=stmt.excluded.trade_date,
+                        open=stmt.excluded.open,
+                        high=stmt.excluded.high,
+                        low=stmt.excluded.low,
+                        close=stmt.excluded.close,
+                        volume=stmt.excluded.volume,
+                    ),
+                )
+                await session.execute(stmt)
+
+            coverage = insert(StockPriceCoverage).values(
+                symbol=series.symbol,
+                interval=series.interval,
+                first_trade_date=first_date,
+                last_trade_date=(
+                    series.dates[-1].astype(date) if len(series) else first_date
+                ),
+                starts_at_inception=starts_at_inception,
+            )
+            table = StockPriceCoverage.__table__
+            updates = dict(
+                first_trade_date=func.least(
+                    table.c.first_trade_date, coverage.excluded.first_trade_date
+                ),
+                last_trade_date=func.greatest(
+                    table.c.last_trade_date, coverage.excluded.last_trade_date
+                ),
+                starts_at_inception=(
+                    table.c.starts_at_inception | coverage.excluded.starts_at_inception
+                ),
+            )
+            if refreshed:
+                updates["last_refreshed_at"] = func.now()
+            await session.execute(
+                coverage.on_conflict_do_update(
+                    index_elements=["symbol", "interval"], set_=updates
+                )
+            )
+            await session.commit()
+
+        logger.debug(
+            f"Stored {len(series)} {series.interval} bars for {series.symbol} "
+            f"({series.first_date} to {series.last_date})"
+        )
+
+    @staticmethod
+    def _to_rows(series: PriceSeries) -> List[Dict[str, Any]]:
+        def nullable(values: np.ndarray) -> List[Optional[float]]:
+            return [v if np.isfinite(v) else None for v in values.tolist()]
+
+        return [
+            {
+                "symbol": series.symbol,
+                "interval": series.interval,
+                "bar_timestamp": ts,
+                "trade_date": trade_date,
+                "open": o,
+                "high": h,
+                "low": lo,
+                "close": c,
+                "volume": v,
+            }
+            for ts, trade_date, o, h, lo, c, v in zip(
+                series.timestamps.tolist(),
+                series.dates.astype(date).tolist(),
+                nullable(series.open),
+                nullable(series.high),
+                nullable(series.low),
+                nullable(series.close),
+                nullable(series.volume),
+            )
+        ]
+
+
+_ohlcv_store: Optional[OHLCVStore] = None
+
+
+def get_ohlcv_store() -> OHLCVStore:
+    """Get the process-wide OHLCV store"""
+    global _ohlcv_store
+    if _ohlcv_store is None:
+        _ohlcv_store = OHLCVStore()
+    return _ohlcv_store
@@ -0,0 +1,247 @@
+"""
+Columnar OHLCV price series backed by NumPy arrays.
+
+Historical prices travel from StockDataAPIService through the analysis agents
+as a PriceSeries instead of one dict per bar. Conversion to JSON happens only
+at the route edge, either as the legacy list of bar dicts (to_records) or as
+column arrays (to_columns).
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+@dataclass(frozen=True)
+class PriceSeries:
+    """Immutable OHLCV bars stored column-wise.
+
+    Attributes:
+        timestamps: int64 epoch seconds (UTC) of each bar
+        dates: datetime64[D] exchange-local trading date of each bar
+        open/high/low/close: float64 prices
+        volume: float64 volumes (NaN when the upstream bar had none)
+    """
+
+    timestamps: np.ndarray
+    dates: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    symbol: str = ""
+    interval: str = "1d"
+
+    # Construction -----------------------------------------------------------
+
+    @classmethod
+    def empty(cls, symbol: str = "", interval: str = "1d") -> "PriceSeries":
+        floats = np.empty(0, dtype=np.float64)
+        return cls(
+            timestamps=np.empty(0, dtype=np.int64),
+            dates=np.empty(0, dtype="datetime64[D]"),
+            open=floats,
+            high=floats,
+            low=floats,
+            close=floats,
+            volume=floats,
+            symbol=symbol,
+            interval=interval,
+        )
+
+    @classmethod
+    def from_dataframe(
+        cls, df: Any, symbol: str = "", interval: str = "1d"
+    ) -> "PriceSeries":
+        """Build from a yfinance history DataFrame (DatetimeIndex + OHLCV columns)"""
+        if df is None or len(df) == 0:
+            return cls.empty(symbol, interval)
+
+        index = df.index
+        if getattr(index, "tz", None) is not None:
+            utc = index.tz_convert("UTC").tz_localize(None)
+            local = index.tz_localize(None)
+        else:
+            utc = local = index
+
+        volume = (
+            df["Volume"].to_numpy(dtype=np.float64)
+            if "Volume" in df.columns
+            else np.full(len(df), np.nan)
+        )
+        return cls(
+            timestamps=utc.values.astype("datetime64[s]").astype(np.int64),
+            dates=local.values.astype("datetime64[D]"),
+            open=df["Open"].to_numpy(dtype=np.float64),
+            high=df["High"].to_numpy(dtype=np.float64),
+            low=df["Low"].to_numpy(dtype=np.float64),
+            close=df["Close"].to_numpy(dtype=np.float64),
+            volume=volume,
+            symbol=symbol,
+            interval=interval,
+        )
+
+    @classmethod
+    def from_records(
+        cls, records: Sequence[Dict[str, Any]], symbol: str = "", interval: str = "1d"
+    ) -> "PriceSeries":
+        """Build from the legacy list-of-dicts bar format"""
+        if not records:
+            return cls.empty(symbol, interval)
+
+        def column(name: str) -> np.ndarray:
+            return np.array(
+                [np.nan if r.get(name) is None else r[name] for r in records],
+                dtype=np.float64,
+            )
+
+        return cls(
+            timestamps=np.array([r["timestamp"] for r in records], dtype=np.int64),
+            dates=np.array([r["date"] for r in records], dtype="datetime64[D]"),
+            open=column("open"),
+            high=column("high"),
+            low=column("low"),
+            close=column("close"),
+            volume=column("volume"),
+            symbol=symbol,
+            interval=interval,
+        )
+
+    @classmethod
+    def from_columns(cls, payload: Dict[str, Any]) -> "PriceSeries":
+        """Inverse of to_columns (used for the Redis cache tier)"""
+        return cls(
+            timestamps=np.asarray(payload["timestamp"], dtype=np.int64),
+            dates=np.asarray(payload["date"], dtype="datetime64[D]"),
+            open=np.asarray(payload["open"], dtype=np.float64),
+            high=np.asarray(payload["high"], dtype=np.float64),
+            low=np.asarray(payload["low"], dtype=np.float64),
+            close=np.asarray(payload["close"], dtype=np.float64),
+            volume=np.array(
+                [np.nan if v is None else v for v in payload["volume"]],
+                dtype=np.float64,
+            ),
+            symbol=payload.get("symbol", ""),
+            interval=payload.get("interval", "1d"),
+        )
+
+    # Accessors --------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return int(self.timestamps.shape[0])
+
+    @property
+    def is_empty(self) -> bool:
+        return len(self) == 0
+
+    @property
+    def first_date(self) -> Optional[str]:
+        return str(self.dates[0]) if len(self) else None
+
+    @property
+    def last_date(self) -> Optional[str]:
+        return str(self.dates[-1]) if len(self) else None
+
+    def valid_closes(self) -> np.ndarray:
+        """Close prices with missing and non-positive values removed"""
+        closes = self.close
+        return closes[np.isfinite(closes) & (closes > 0)]
+
+    def valid_volumes(self) -> np.ndarray:
+        """Volumes with missing and zero values removed"""
+        volumes = self.volume
+        return volumes[np.isfinite(volumes) & (volumes > 0)]
+
+    def tail(self, n: int) -> "PriceSeries":
+        return self._take(slice(max(len(self) - n, 0), None))
+
+    def since(self, timestamp: int) -> "PriceSeries":
+        """Bars with timestamp >= the given epoch second"""
+        start = int(np.searchsorted(self.timestamps, timestamp, side="left"))
+        return self._take(slice(start, None))
+
+    def merge(self, other: "PriceSeries") -> "PriceSeries":
+        """Union of two series ordered by timestamp; other wins on duplicates"""
+        if other.is_empty:
+            return self
+        if self.is_empty:
+            return other
+        keep = ~np.isin(self.timestamps, other.timestamps)
+        order_source = np.concatenate([self.timestamps[keep], other.timestamps])
+        order = np.argsort(order_source, kind="stable")
+
+        def combine(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+            return np.concatenate([a[keep], b])[order]
+
+        return PriceSeries(
+            timestamps=order_source[order],
+            dates=combine(self.dates, other.dates),
+            open=combine(self.open, other.open),
+            high=combine(self.high, other.high),
+            low=combine(self.low, other.low),
+            close=combine(self.close, other.close),
+            volume=combine(self.volume, other.volume),
+            symbol=self.symbol or other.symbol,
+            interval=self.interval,
+        )
+
+    def _take(self, index: Any) -> "PriceSeries":
+        return PriceSeries(
+            timestamps=self.timestamps[index],
+            dates=self.dates[index],
+            open=self.open[index],
+            high=self.high[index],
+            low=self.low[index],
+            close=self.close[index],
+            volume=self.volume[index],
+            symbol=self.symbol,
+            interval=self.interval,
+        )
+
+    # Serialization (route edge only) ---------------------------------------
+
+    def to_columns(self) -> Dict[str, Any]:
+        """Column arrays; missing volumes become None"""
+        volume = self.volume.astype(object)
+        volume[~np.isfinite(self.volume)] = None
+        finite = np.isfinite(self.volume)
+        volume[finite] = self.volume[finite].astype(np.int64).tolist()
+        return {
+            "symbol": self.symbol,
+            "interval": self.interval,
+            "timestamp": self.timestamps.tolist(),
+            "date": self.dates.astype(str).tolist(),
+            "open": self.open.tolist(),
+            "high": self.high.tolist(),
+            "low": self.low.tolist(),
+            "close": self.close.tolist(),
+            "volume": volume.tolist(),
+        }
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Legacy list-of-dicts format returned by the /historical endpoint"""
+        columns = self.to_columns()
+        return [
+            {
+                "date": date,
+                "timestamp": ts,
+                "open": o,
+                "high": h,
+                "low": lo,
+                "close": c,
+                "volume": v,
+            }
+            for date, ts, o, h, lo, c, v in zip(
+                columns["date"],
+                columns["timestamp"],
+                columns["open"],
+                columns["high"],
+                columns["low"],
+                columns["close"],
+                columns["volume"],
+            )
+        ]
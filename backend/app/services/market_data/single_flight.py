@@ -0,0 +1,97 @@
+"""
+Request coalescing (single-flight) for market data fetches.
+
+When many requests ask for the same (kind, symbol, params) at once, only the
+first one runs the upstream fetch; the rest await the same in-flight task.
+The fetch runs as its own task so a cancelled caller (e.g. a client that
+disconnected) does not cancel the work other callers are waiting on.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class SingleFlightStats:
+    """Counters describing how much work was coalesced"""
+
+    calls: int = 0
+    executions: int = 0
+    coalesced: int = 0
+    errors: int = 0
+    max_waiters: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "max_waiters": self.max_waiters,
+            "coalesce_rate": (self.coalesced / self.calls * 100 if self.calls else 0.0),
+        }
+
+
+class SingleFlight:
+    """Deduplicates concurrent async calls that share a key"""
+
+    def __init__(self, name: str = "default"):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._waiters: Dict[Hashable, int] = {}
+        self.stats = SingleFlightStats()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn for key, or join the call already in flight for key"""
+        self.stats.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda t, k=key: self._finish(k, t))
+        else:
+            self.stats.coalesced += 1
+
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        self.stats.max_waiters = max(self.stats.max_waiters, self._waiters[key])
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats.to_dict()
+        stats["name"] = self.name
+        stats["in_flight"] = self.in_flight()
+        return stats
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            self._waiters.pop(key, None)
+        if task.cancelled():
+            return
+        # Retrieve the exception so it is not reported as unhandled when every
+        # waiter was cancelled before the fetch finished.
+        error = task.exception()
+        if error is not None:
+            self.stats.errors += 1
+            logger.debug(f"Single-flight call {self.name}:{key} failed: {error}")
+
+
+_market_data_single_flight: Optional[SingleFlight] = None
+
+
+def get_market_data_single_flight() -> SingleFlight:
+    """Get the process-wide single-flight group for upstream market data"""
+    global _market_data_single_flight
+    if _market_data_single_flight is None:
+        _market_data_single_flight = SingleFlight("market_data")
+    return _market_data_single_flight
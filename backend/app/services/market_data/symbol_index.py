@@ -0,0 +1,265 @@
+"""
+In-memory symbol search index for stock typeahead.
+
+The symbol universe (US listings plus NSE and BSE, where an Indian listing
+expands to both its .NS and .BO tickers) is loaded once per process from the
+bundled CSV, or from MARKET_DATA_SYMBOL_UNIVERSE_PATH when a full exchange
+dump is available. Lookups never go upstream:
+
+- symbol prefixes and company-name word prefixes are answered with bisect
+  over sorted key arrays
+- anything else falls back to trigram overlap with the company names
+"""
+
+import csv
+import re
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_UNIVERSE_PATH = Path(__file__).parent / "data" / "symbol_universe.csv"
+
+# Yahoo ticker suffix for each Indian exchange
+EXCHANGE_SUFFIXES = {"NSE": ".NS", "BSE": ".BO"}
+
+# Name words that are not worth a word-prefix entry of their own
+NAME_STOP_WORDS = frozenset(
+    [
+        "THE",
+        "AND",
+        "OF",
+        "INC",
+        "LTD",
+        "LIMITED",
+        "CORP",
+        "CORPORATION",
+        "CO",
+        "COMPANY",
+        "PLC",
+        "GROUP",
+        "HOLDINGS",
+        "CLASS",
+    ]
+)
+
+# Share of the query's trigrams a name must contain to be a fuzzy match
+FUZZY_THRESHOLD = 0.5
+
+# Ranking tiers; higher wins, ties keep universe order (NSE before BSE)
+SCORE_SYMBOL_EXACT = 1000
+SCORE_SYMBOL_PREFIX = 800
+SCORE_NAME_EXACT = 700
+SCORE_NAME_PREFIX = 600
+SCORE_WORD_PREFIX = 500
+SCORE_FUZZY = 400
+
+_NON_NAME_CHARS = re.compile(r"[^A-Z0-9&]+")
+
+
+def normalize_name(text: str) -> str:
+    """Uppercase and collapse punctuation to single spaces"""
+    return _NON_NAME_CHARS.sub(" ", text.upper()).strip()
+
+
+def trigrams(text: str) -> Set[str]:
+    """Three-character substrings (the whole string if shorter)"""
+    if len(text) < 3:
+        return {text} if text else set()
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _prefix_range(keys: Sequence[str], prefix: str) -> range:
+    """Positions in sorted keys that start with prefix"""
+    return range(bisect_left(keys, prefix), bisect_left(keys, prefix + "\uffff"))
+
+
+class TrigramIndex:
+    """Inverted trigram index over a fixed list of strings.
+
+    Any string sharing a substring of three or more characters with the query
+    is a candidate, so substring matching in either direction only needs to
+    look at candidates instead of every key.
+    """
+
+    def __init__(self, keys: Sequence[str]):
+        self.keys = list(keys)
+        self._postings: Dict[str, List[int]] = {}
+        for key_id, key in enumerate(self.keys):
+            for gram in trigrams(key):
+                self._postings.setdefault(gram, []).append(key_id)
+
+    def candidates(self, query: str) -> Counter:
+        """Key ids sharing at least one trigram with query -> shared count"""
+        shared: Counter = Counter()
+        for gram in trigrams(query):
+            shared.update(self._postings.get(gram, ()))
+        return shared
+
+    def similar(
+        self, query: str, threshold: float = FUZZY_THRESHOLD
+    ) -> List[Tuple[int, float]]:
+        """(key id, share of the query's trigrams found in the key), best first
+
+        Like pg_trgm word_similarity, a query that closely matches part of a
+        long name scores high regardless of the rest of the name.
+        """
+        query_size = len(trigrams(query))
+        matches = [
+            (key_id, shared / query_size)
+            for key_id, shared in self.candidates(query).items()
+            if shared / query_size >= threshold
+        ]
+        matches.sort(key=lambda match: -match[1])
+        return matches
+
+
+@dataclass(frozen=True)
+class SymbolEntry:
+    """One tradable ticker in the search universe"""
+
+    symbol: str
+    company_name: str
+    exchange: str
+
+    def to_dict(self) -> Dict[str, str]:
+        return {
+            "symbol": self.symbol,
+            "company_name": self.company_name,
+            "exchange": self.exchange,
+        }
+
+
+def load_symbol_universe(path: Path) -> List[SymbolEntry]:
+    """Read a symbol,name,exchange CSV.
+
+    An exchange column like "NSE|BSE" lists the same company on several
+    Indian exchanges and yields one ticker per exchange.
+    """
+    entries = []
+    with open(path, newline="", encoding="utf-8") as handle:
+        for row in csv.DictReader(handle):
+            symbol = row["symbol"].strip().upper()
+            name = row["name"].strip()
+            for exchange in row["exchange"].strip().upper().split("|"):
+                suffix = EXCHANGE_SUFFIXES.get(exchange, "")
+                ticker = symbol if symbol.startswith("^") else symbol + suffix
+                entries.append(SymbolEntry(ticker, name, exchange))
+    return entries
+
+
+class SymbolIndex:
+    """Ranked prefix and fuzzy search over symbols and company names"""
+
+    def __init__(self, entries: Iterable[SymbolEntry]):
+        seen: Set[str] = set()
+        self.entries: List[SymbolEntry] = []
+        for entry in entries:
+            if entry.symbol not in seen:
+                seen.add(entry.symbol)
+                self.entries.append(entry)
+
+        symbol_keys: List[Tuple[str, int]] = []
+        name_keys: List[Tuple[str, int, bool]] = []
+        names = []
+        for entry_id, entry in enumerate(self.entries):
+            symbol_keys.append((entry.symbol, entry_id))
+            base = entry.symbol.rsplit(".", 1)[0]
+            if base != entry.symbol:
+                symbol_keys.append((base, entry_id))
+
+            name = normalize_name(entry.company_name)
+            names.append(name)
+            name_keys.append((name, entry_id, True))
+            words = name.split(" ")
+            for position in range(1, len(words)):
+                word = words[position]
+                if len(word) > 1 and word not in NAME_STOP_WORDS:
+                    name_keys.append((" ".join(words[position:]), entry_id, False))
+
+        symbol_keys.sort()
+        name_keys.sort()
+        self._symbol_keys = [key for key, _ in symbol_keys]
+        self._symbol_ids = [entry_id for _, entry_id in symbol_keys]
+        self._name_keys = [key for key, _, _ in name_keys]
+        self._name_ids = [(entry_id, is_full) for _, entry_id, is_full in name_keys]
+        self._names = names
+        self._name_trigrams = TrigramIndex(names)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def search(self, query: str, limit: int = 20) -> List[SymbolEntry]:
+        """Best matches for a typed symbol or company name, best first"""
+        return [entry for entry, _ in self.search_scored(query, limit)]
+
+    def search_scored(
+        self, query: str, limit: int = 20
+    ) -> List[Tuple[SymbolEntry, float]]:
+        """(entry, score) for the best matches, best first
+
+        Scores above SCORE_FUZZY are symbol or name prefix hits; anything at
+        or below it only shares trigrams with a company name.
+        """
+        symbol_query = query.upper().strip()
+        name_query = normalize_name(query)
+        if not symbol_query:
+            return []
+
+        scores: Dict[int, float] = {}
+
+        def rank(entry_id: int, score: float) -> None:
+            if score > scores.get(entry_id, 0):
+                scores[entry_id] = score
+
+        for position in _prefix_range(self._symbol_keys, symbol_query):
+            key = self._symbol_keys[position]
+            extra = len(key) - len(symbol_query)
+            rank(
+                self._symbol_ids[position],
+                SCORE_SYMBOL_EXACT if extra == 0 else SCORE_SYMBOL_PREFIX - extra,
+            )
+
+        if name_query:
+            for position in _prefix_range(self._name_keys, name_query):
+                entry_id, is_full = self._name_ids[position]
+                if not is_full:
+                    rank(entry_id, SCORE_WORD_PREFIX)
+                elif self._names[entry_id] == name_query:
+                    rank(entry_id, SCORE_NAME_EXACT)
+                else:
+                    rank(entry_id, SCORE_NAME_PREFIX)
+
+            # Typo fallback once nothing matches by prefix
+            if not scores and len(name_query) >= 3:
+                for entry_id, similarity in self._name_trigrams.similar(name_query):
+                    rank(entry_id, SCORE_FUZZY * similarity)
+
+        ranked = sorted(scores, key=lambda entry_id: (-scores[entry_id], entry_id))
+        return [
+            (self.entries[entry_id], scores[entry_id]) for entry_id in ranked[:limit]
+        ]
+
+
+_symbol_index: Optional[SymbolIndex] = None
+
+
+def get_symbol_index() -> SymbolIndex:
+    """Get the process-wide symbol index, loading the universe on first use"""
+    global _symbol_index
+    if _symbol_index is None:
+        path = Path(settings.MARKET_DATA_SYMBOL_UNIVERSE_PATH or DEFAULT_UNIVERSE_PATH)
+        try:
+            entries = load_symbol_universe(path)
+        except (OSError, KeyError, csv.Error) as e:
+            logger.error(f"Failed to load symbol universe from {path}: {e}")
+            entries = load_symbol_universe(DEFAULT_UNIVERSE_PATH)
+        _symbol_index = SymbolIndex(entries)
+        logger.info(f"Symbol index built with {len(_symbol_index)} tickers")
+    return _symbol_index
@@ -166,10 +166,7 @@ class SharedStateManager:
 
         if self.use_redis and hasattr(self.redis_cache.client, "incrby"):
             try:
-                if self.redis_cache.client_type == "upstash":
-                    return self.redis_cache.client.incrby(cache_key, amount)
-                else:
-                    return await self.redis_cache.client.incrby(cache_key, amount)
+                return await self.redis_cache.client.incrby(cache_key, amount)
             except Exception as e:
                 logger.error(f"Redis increment failed for key {key}: {e}")
                 # Fall back to get/set pattern
@@ -0,0 +1,109 @@
+"""
+Stock Analysis Snapshot - Shared inputs for running several stock agents at once
+
+When /analyze/all runs the financials, statistics, history and news agents
+together, the stock quote, saved stock row and price history are fetched once
+here and handed to every agent instead of each agent refetching and re-saving
+them on the shared database session.
+"""
+
+import asyncio
+import logging
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Any, AsyncContextManager, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.context import RequestContext
+from app.models.stock import Stock
+from app.services.market_data import PriceSeries
+from app.services.stock_data_api import StockDataAPIService
+from app.services.stock_service import StockService
+
+logger = logging.getLogger(__name__)
+
+# History window shared by the statistics and history agents
+SNAPSHOT_PERIOD = "1y"
+SNAPSHOT_INTERVAL = "1d"
+
+# Index used for beta, by listing market
+US_BENCHMARK = "^GSPC"
+INDIA_BENCHMARK = "^NSEI"
+
+
+def benchmark_symbol(stock_symbol: str, stock_data_api: StockDataAPIService) -> str:
+    """Market index a stock is measured against.
+
+    The listing market comes from the same symbol resolution used to fetch
+    quotes, so "RELIANCE" without a suffix is measured against the Nifty.
+    """
+    if stock_data_api.is_indian_market(stock_symbol):
+        return INDIA_BENCHMARK
+    return US_BENCHMARK
+
+
+@dataclass
+class StockAnalysisSnapshot:
+    """Pre-fetched inputs shared by all agents in one analysis run"""
+
+    symbol: str
+    stock_data: Dict[str, Any]
+    stock: Stock
+    price_series: PriceSeries
+    benchmark_series: Optional[PriceSeries] = None
+    period: str = SNAPSHOT_PERIOD
+    interval: str = SNAPSHOT_INTERVAL
+    # Serializes writes on the request's AsyncSession, which does not allow
+    # concurrent operations from the agents running in parallel
+    db_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+def snapshot_db_lock(
+    snapshot: Optional[StockAnalysisSnapshot],
+) -> AsyncContextManager:
+    """Lock to hold around database writes (no-op when running standalone)"""
+    return snapshot.db_lock if snapshot is not None else nullcontext()
+
+
+async def build_stock_analysis_snapshot(
+    db: AsyncSession, context: RequestContext, symbol: str
+) -> Optional[StockAnalysisSnapshot]:
+    """Fetch and save everything the agents need, once.
+
+    Returns None if the stock cannot be found.
+    """
+    stock_service = StockService(db, context)
+    stock_data = await stock_service.get_stock_by_symbol(symbol)
+    if not stock_data:
+        return None
+
+    stock_data_api = stock_service.stock_data_api
+    detailed_data, price_series, benchmark_series = await asyncio.gather(
+        stock_data_api.get_stock_data(symbol),
+        stock_data_api.get_price_series(symbol, SNAPSHOT_PERIOD, SNAPSHOT_INTERVAL),
+        stock_data_api.get_price_series(
+            benchmark_symbol(symbol, stock_data_api), SNAPSHOT_PERIOD, SNAPSHOT_INTERVAL
+        ),
+        return_exceptions=True,
+    )
+    if isinstance(detailed_data, dict):
+        stock_data.update(detailed_data)
+    if not isinstance(price_series, PriceSeries):
+        logger.warning(f"No historical data available for {symbol}")
+        price_series = PriceSeries.empty(interval=SNAPSHOT_INTERVAL)
+    if not isinstance(benchmark_series, PriceSeries):
+        benchmark_series = None
+
+    stock = await stock_service.save_stock(stock_data)
+    logger.info(
+        f"Built analysis snapshot for {symbol}: {len(price_series)} bars, "
+        f"stock ID {stock.id}"
+    )
+    return StockAnalysisSnapshot(
+        symbol=symbol,
+        stock_data=stock_data,
+        stock=stock,
+        price_series=price_series,
+        benchmark_series=benchmark_series,
+    )
@@ -4,9 +4,28 @@ Supports both US stocks and Indian stocks (BSE/NSE)
 """
 
 import logging
-from typing import Any, Dict, List, Optional
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
 import asyncio
 
+from app.services.market_data import (
+    BatchQuoteFetcher,
+    MarketDataCache,
+    OHLCVStore,
+    PriceSeries,
+    SingleFlight,
+    SymbolEntry,
+    SymbolIndex,
+    TrigramIndex,
+    get_market_data_cache,
+    get_market_data_single_flight,
+    get_ohlcv_store,
+    get_symbol_index,
+    parse_quote_prices,
+)
+from app.services.market_data.batch_quotes import Prices
+from app.services.market_data.symbol_index import SCORE_FUZZY
+
 logger = logging.getLogger(__name__)
 
 # Try to import yfinance, fallback to mock if not available
@@ -27,10 +46,25 @@ class StockDataAPIService:
     - Indian BSE stocks (e.g., RELIANCE.BO, TCS.BO)
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        market_cache: Optional[MarketDataCache] = None,
+        single_flight: Optional[SingleFlight] = None,
+        ohlcv_store: Optional[OHLCVStore] = None,
+        symbol_index: Optional[SymbolIndex] = None,
+    ):
         if not YFINANCE_AVAILABLE:
             logger.warning("yfinance not available - using mock data")
 
+        # Shared quote/history cache (process LRU + Redis) across all instances
+        self.market_cache = market_cache or get_market_data_cache()
+        # Coalesces concurrent identical upstream fetches into one executor call
+        self.single_flight = single_flight or get_market_data_single_flight()
+        # Local bar store; only head/tail gaps of daily+ history go upstream
+        self.ohlcv_store = ohlcv_store or get_ohlcv_store()
+        # Typeahead over the bundled symbol universe; no upstream calls
+        self.symbol_index = symbol_index or get_symbol_index()
+
         # Indian company name to ticker mapping (BSE/NSE)
         self.indian_companies = {
             # Major Indian Companies - NSE
@@ -167,6 +201,10 @@ class StockDataAPIService:
             "BANK NIFTY": "^NSEBANK",
         }
 
+        # Partial company-name matches only need to score names sharing a
+        # trigram with the query, not every entry above
+        self._company_name_index = TrigramIndex(list(self.indian_companies))
+
     def _clean_symbol_suffixes(self, symbol: str) -> str:
         """Remove common company suffixes from symbol"""
         cleaned = symbol
@@ -188,6 +226,13 @@ class StockDataAPIService:
         """Check if symbol already has exchange suffix (.NS or .BO)"""
         return symbol.endswith(".NS") or symbol.endswith(".BO")
 
+    def is_indian_market(self, symbol: str) -> bool:
+        """Check if a symbol or company name resolves to an NSE/BSE listing"""
+        resolved = self._normalize_symbol(symbol)
+        return self._has_exchange_suffix(resolved) or (
+            resolved in self.indian_indices.values()
+        )
+
     def _check_indian_indices(self, symbol: str, cleaned: str) -> Optional[str]:
         """Check if symbol matches Indian indices"""
         if symbol in self.indian_indices:
@@ -232,10 +277,12 @@ class StockDataAPIService:
         best_match = None
         best_score = 0
 
-        for company_name, ticker in self.indian_companies.items():
+        keys = self._company_name_index.keys
+        for key_id in sorted(self._company_name_index.candidates(cleaned_symbol)):
+            company_name = keys[key_id]
             score = self._calculate_match_score(cleaned_symbol, company_name)
             if score and score > best_score:
-                best_match = ticker
+                best_match = self.indian_companies[company_name]
                 best_score = score
 
         if best_match:
@@ -275,54 +322,109 @@ class StockDataAPIService:
         """
         Search for stocks by symbol or company name.
         Supports US stocks and Indian stocks (BSE/NSE).
-        Uses Yahoo Finance ticker search.
+
+        Matches come from the local symbol index. Each result keeps the price
+        fields search has always returned (current_price, previous_close,
+        price_change, price_change_percent, currency), filled from the cached
+        quote when there is one and null otherwise, so typing never triggers
+        a price download. Profile fields such as market_cap and sector are
+        likewise only included when the quote is cached. Yahoo Finance is looked up
+        directly (and the answer cached) unless the index matched a symbol or
+        company name by prefix.
         """
+        scored = self.symbol_index.search_scored(query, limit)
+        matches = [entry for entry, _ in scored]
+        # Symbol and name prefix hits are answered locally. A trigram-only hit
+        # may just be the nearest name to a real ticker the index lacks, so
+        # Yahoo is asked as well and its answer goes first.
+        if scored and scored[0][1] > SCORE_FUZZY:
+            return await self._with_cached_quotes(matches)
+
         if not YFINANCE_AVAILABLE:
+            if matches:
+                return await self._with_cached_quotes(matches)
             return await self._mock_search_stocks(query, limit)
 
         try:
-            # Run synchronous yfinance calls in executor
-            loop = asyncio.get_event_loop()
-            stocks = await loop.run_in_executor(
-                None, self._search_stocks_sync, query, limit
-            )
-            return stocks
+            direct = await self._lookup_ticker(query)
         except Exception as e:
             logger.error(f"Error searching stocks: {e}")
-            return await self._mock_search_stocks(query, limit)
+            if not matches:
+                return await self._mock_search_stocks(query, limit)
+            direct = []
+
+        found = {stock.get("symbol") for stock in direct}
+        stocks = direct + await self._with_cached_quotes(
+            [entry for entry in matches if entry.symbol not in found]
+        )
+        return stocks[:limit]
+
+    async def _lookup_ticker(self, query: str) -> List[Dict[str, Any]]:
+        """Direct Yahoo lookup of a typed ticker, cached even when not found"""
+        search_symbol = self._normalize_symbol(query.upper().strip())
+        ttl, stale_ttl = MarketDataCache.quote_ttls()
+
+        async def fetch() -> Dict[str, Any]:
+            stocks = await self._run_coalesced(
+                ("search", search_symbol), self._search_stocks_sync, query, 1
+            )
+            # Wrapped so that an unknown ticker is cached as well
+            return {"stocks": stocks}
+
+        result = await self.market_cache.get_or_fetch(
+            MarketDataCache.search_key(search_symbol), fetch, ttl, stale_ttl
+        )
+        return result["stocks"]
+
+    async def _with_cached_quotes(
+        self, matches: List[SymbolEntry]
+    ) -> List[Dict[str, Any]]:
+        """Index matches as stock dicts, merged with any cached quote"""
+        cached = await asyncio.gather(
+            *(
+                self.market_cache.get(MarketDataCache.quote_key(entry.symbol))
+                for entry in matches
+            ),
+            return_exceptions=True,
+        )
+
+        stocks = []
+        for entry, quote in zip(matches, cached):
+            stock = entry.to_dict()
+            stock.update(self._empty_price_fields(entry.symbol))
+            if isinstance(quote, dict):
+                stock.update(quote)
+            stocks.append(stock)
+        return stocks
+
+    def _empty_price_fields(self, symbol: str) -> Dict[str, Any]:
+        """Price fields of a search result whose quote is not cached"""
+        return {
+            "current_price": None,
+            "previous_close": None,
+            "price_change": None,
+            "price_change_percent": None,
+            "currency": "INR" if self._has_exchange_suffix(symbol) else "USD",
+        }
+
+    async def _run_coalesced(self, key: tuple, func: Any, *args: Any) -> Any:
+        """Run a blocking yfinance fetch in the executor.
+
+        Concurrent callers with the same key share one in-flight executor call,
+        so a burst of requests for a trending ticker uses a single thread.
+        """
 
-    def _get_us_company_to_ticker_map(self) -> Dict[str, str]:
-        """Get mapping of US company names to ticker symbols."""
+        async def run() -> Any:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(None, func, *args)
+
+        return await self.single_flight.do(key, run)
+
+    def get_market_data_stats(self) -> Dict[str, Any]:
+        """Cache and request-coalescing metrics for upstream market data"""
         return {
-            "APPLE": "AAPL",
-            "MICROSOFT": "MSFT",
-            "GOOGLE": "GOOGL",
-            "ALPHABET": "GOOGL",
-            "AMAZON": "AMZN",
-            "TESLA": "TSLA",
-            "META": "META",
-            "FACEBOOK": "META",
-            "NVIDIA": "NVDA",
-            "JPMORGAN": "JPM",
-            "JPMORGAN CHASE": "JPM",
-            "VISA": "V",
-            "JOHNSON & JOHNSON": "JNJ",
-            "JOHNSON AND JOHNSON": "JNJ",
-            "WALMART": "WMT",
-            "PROCTER & GAMBLE": "PG",
-            "MASTERCARD": "MA",
-            "UNITEDHEALTH": "UNH",
-            "HOME DEPOT": "HD",
-            "DISNEY": "DIS",
-            "PAYPAL": "PYPL",
-            "BANK OF AMERICA": "BAC",
-            "VERIZON": "VZ",
-            "ADOBE": "ADBE",
-            "COMCAST": "CMCSA",
-            "NETFLIX": "NFLX",
-            "COCA COLA": "KO",
-            "NIKE": "NKE",
-            "MERCK": "MRK",
+            "cache": self.market_cache.get_stats(),
+            "single_flight": self.single_flight.get_stats(),
         }
 
     def _try_direct_ticker_lookup(self, search_symbol: str) -> Optional[Dict[str, Any]]:
@@ -357,100 +459,130 @@ class StockDataAPIService:
                 logger.debug(f"Direct ticker lookup failed for {search_symbol}: {e}")
         return None
 
-    def _search_common_tickers(
-        self, query_upper: str, limit: int
-    ) -> List[Dict[str, Any]]:
-        """Search through common tickers for matches."""
-        stocks = []
-        common_tickers = [
-            "AAPL",
-            "MSFT",
-            "GOOGL",
-            "AMZN",
-            "TSLA",
-            "META",
-            "NVDA",
-            "JPM",
-            "V",
-            "JNJ",
-            "WMT",
-            "PG",
-            "MA",
-            "UNH",
-            "HD",
-            "DIS",
-            "PYPL",
-            "BAC",
-            "VZ",
-            "ADBE",
-            "CMCSA",
-            "NFLX",
-            "KO",
-            "NKE",
-            "MRK",
-        ]
-
-        for ticker_symbol in common_tickers:
-            if query_upper in ticker_symbol:
-                try:
-                    ticker = yf.Ticker(ticker_symbol)
-                    info = ticker.info
-                    if info and "symbol" in info:
-                        stock_data = self._format_stock_data(info, ticker)
-                        if (
-                            stock_data
-                            and query_upper in stock_data.get("symbol", "").upper()
-                        ):
-                            stocks.append(stock_data)
-                            if len(stocks) >= limit:
-                                break
-                except Exception as e:
-                    logger.debug(f"Error fetching {ticker_symbol}: {e}")
-                    continue
-
-        return stocks
-
     def _search_stocks_sync(self, query: str, limit: int) -> List[Dict[str, Any]]:
-        """Synchronous search implementation"""
-        query_upper = query.upper().strip()
-
+        """Synchronous lookup for tickers missing from the symbol index"""
         # Normalize symbol (handles both US and Indian stocks)
-        search_symbol = self._normalize_symbol(query_upper)
-
-        # If normalization didn't change it, check US companies
-        us_company_to_ticker = self._get_us_company_to_ticker_map()
-        if search_symbol == query_upper and query_upper in us_company_to_ticker:
-            logger.info(
-                f"Mapping US company name '{query_upper}' to ticker '{us_company_to_ticker[query_upper]}'"
-            )
-            search_symbol = us_company_to_ticker[query_upper]
+        search_symbol = self._normalize_symbol(query.upper().strip())
 
-        # Try direct ticker lookup first
         stock_data = self._try_direct_ticker_lookup(search_symbol)
-        if stock_data:
-            return [stock_data][:limit]
+        return [stock_data][:limit] if stock_data else []
 
-        # For broader search, try common tickers
-        stocks = self._search_common_tickers(query_upper, limit)
-        return stocks[:limit]
+    async def get_stock_data(
+        self, symbol: str, force_refresh: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Get detailed stock data by symbol
 
-    async def get_stock_data(self, symbol: str) -> Optional[Dict[str, Any]]:
-        """Get detailed stock data by symbol"""
+        Args:
+            symbol: Stock symbol or company name
+            force_refresh: If True, bypass the market data cache and refetch
+        """
         if not YFINANCE_AVAILABLE:
             return await self._mock_get_stock_data(symbol)
 
         try:
-            loop = asyncio.get_event_loop()
-            stock_data = await loop.run_in_executor(
-                None, self._get_stock_data_sync, symbol
+            symbol_normalized = self._normalize_symbol(symbol)
+            cache_key = MarketDataCache.quote_key(symbol_normalized)
+            ttl, stale_ttl = MarketDataCache.quote_ttls()
+
+            async def fetch() -> Optional[Dict[str, Any]]:
+                return await self._run_coalesced(
+                    ("quote", symbol_normalized), self._get_stock_data_sync, symbol
+                )
+
+            if force_refresh:
+                stock_data = await fetch()
+                if stock_data is not None:
+                    await self.market_cache.put(cache_key, stock_data, ttl, stale_ttl)
+                return stock_data
+
+            return await self.market_cache.get_or_fetch(
+                cache_key, fetch, ttl, stale_ttl
             )
-            return stock_data
         except Exception as e:
             logger.error(f"Error getting stock data for {symbol}: {e}")
             return await self._mock_get_stock_data(symbol)
 
-    def _get_stock_data_sync(self, symbol: str) -> Optional[Dict[str, Any]]:
-        """Synchronous stock data fetch - supports US and Indian stocks"""
+    async def get_stock_data_batch(
+        self, symbols: List[str], force_refresh: bool = False
+    ) -> Dict[str, Any]:
+        """Get stock data for many symbols at once.
+
+        Cached quotes are served directly; the rest share one multi-ticker
+        price download (see market_data.batch_quotes).
+
+        Args:
+            symbols: Stock symbols or company names
+            force_refresh: If True, bypass the market data cache and refetch
+
+        Returns:
+            {"quotes": {symbol: stock_data}, "errors": {symbol: message}},
+            keyed by the symbols as passed in
+        """
+        if not YFINANCE_AVAILABLE:
+            quotes: Dict[str, Dict[str, Any]] = {}
+            errors: Dict[str, str] = {}
+            for symbol in symbols:
+                mock = await self._mock_get_stock_data(symbol)
+                if mock is None:
+                    errors[symbol] = "Stock not found or no data returned"
+                else:
+                    quotes[symbol] = mock
+            return {"quotes": quotes, "errors": errors}
+
+        # Several inputs may resolve to the same ticker (e.g. "TCS" and "TCS.NS")
+        by_ticker: Dict[str, List[str]] = {}
+        for symbol in symbols:
+            by_ticker.setdefault(self._normalize_symbol(symbol), []).append(symbol)
+
+        async def download_prices(tickers: List[str]) -> Dict[str, Prices]:
+            return await self._run_coalesced(
+                ("quote_prices", tuple(sorted(tickers))),
+                self._download_quote_prices_sync,
+                tickers,
+            )
+
+        async def fetch_quote(
+            ticker_symbol: str,
+            info: Optional[Dict[str, Any]],
+            prices: Optional[Prices],
+        ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+            return await self._run_coalesced(
+                ("batch_quote", ticker_symbol, info is None),
+                self._get_batch_quote_sync,
+                ticker_symbol,
+                info,
+                prices,
+            )
+
+        fetcher = BatchQuoteFetcher(self.market_cache, download_prices, fetch_quote)
+        quotes, errors = await fetcher.fetch(by_ticker, force_refresh)
+        return {"quotes": quotes, "errors": errors}
+
+    def _download_quote_prices_sync(self, symbols: List[str]) -> Dict[str, Prices]:
+        """Current and previous close for many tickers in one upstream request"""
+        logger.info(f"Downloading latest prices for {len(symbols)} symbols")
+        data = yf.download(
+            symbols,
+            period="5d",
+            interval="1d",
+            group_by="ticker",
+            threads=True,
+            progress=False,
+        )
+        return parse_quote_prices(data, symbols)
+
+    def _get_stock_data_sync(
+        self,
+        symbol: str,
+        prices: Optional[Prices] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Synchronous stock data fetch - supports US and Indian stocks
+
+        Args:
+            symbol: Stock symbol or company name
+            prices: Optional (current, previous close) already fetched in bulk;
+                skips the per-ticker price history requests
+        """
         try:
             # Normalize symbol (handles both US and Indian stocks)
             symbol_normalized = self._normalize_symbol(symbol)
@@ -458,35 +590,63 @@ class StockDataAPIService:
             logger.info(f"Fetching stock data for '{symbol}' -> '{symbol_normalized}'")
 
             ticker = yf.Ticker(symbol_normalized)
-            info = ticker.info
-
-            # Check if we got valid data
-            if not info:
-                logger.warning(f"No data returned for symbol {symbol_normalized}")
+            info = self._get_stock_info_sync(ticker, symbol, symbol_normalized)
+            if info is None:
                 return None
 
-            # Check for error in response (yfinance sometimes returns error in info)
-            if "error" in info or "symbol" not in info:
-                error_msg = (
-                    info.get("error", {}).get("description", "No symbol in response")
-                    if isinstance(info.get("error"), dict)
-                    else info.get("error", "No symbol in response")
-                )
-                logger.warning(
-                    f"Invalid symbol or error for {symbol_normalized}: {error_msg}"
-                )
-                # Try to suggest alternative if it's a company name search
-                if symbol != symbol_normalized:
-                    logger.info(
-                        f"Original search was '{symbol}', normalized to '{symbol_normalized}' but not found"
-                    )
-                return None
-
-            return self._format_stock_data(info, ticker, symbol_normalized)
+            return self._format_stock_data(info, ticker, symbol_normalized, prices)
         except Exception as e:
             logger.error(f"Error fetching stock data for {symbol}: {e}")
             return None
 
+    def _get_batch_quote_sync(
+        self,
+        ticker_symbol: str,
+        info: Optional[Dict[str, Any]],
+        prices: Optional[Prices],
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Quote for one ticker of a batch; fetches info only when not cached
+
+        Returns:
+            (info, stock_data); info is None when the ticker is invalid
+        """
+        ticker = yf.Ticker(ticker_symbol)
+        if info is None:
+            info = self._get_stock_info_sync(ticker, ticker_symbol, ticker_symbol)
+            if info is None:
+                return None, None
+        return info, self._format_stock_data(info, ticker, ticker_symbol, prices)
+
+    def _get_stock_info_sync(
+        self, ticker: Any, symbol: str, symbol_normalized: str
+    ) -> Optional[Dict[str, Any]]:
+        """Company info for a ticker, or None if upstream does not know it"""
+        info = ticker.info
+
+        # Check if we got valid data
+        if not info:
+            logger.warning(f"No data returned for symbol {symbol_normalized}")
+            return None
+
+        # Check for error in response (yfinance sometimes returns error in info)
+        if "error" in info or "symbol" not in info:
+            error_msg = (
+                info.get("error", {}).get("description", "No symbol in response")
+                if isinstance(info.get("error"), dict)
+                else info.get("error", "No symbol in response")
+            )
+            logger.warning(
+                f"Invalid symbol or error for {symbol_normalized}: {error_msg}"
+            )
+            # Try to suggest alternative if it's a company name search
+            if symbol != symbol_normalized:
+                logger.info(
+                    f"Original search was '{symbol}', normalized to '{symbol_normalized}' but not found"
+                )
+            return None
+
+        return info
+
     def _try_fast_info_price(self, ticker: Any) -> Optional[float]:
         """Try to get price from fast_info."""
         try:
@@ -604,7 +764,11 @@ class StockDataAPIService:
         return None
 
     def _format_stock_data(
-        self, info: Dict, ticker: Any, symbol: Optional[str] = None
+        self,
+        info: Dict,
+        ticker: Any,
+        symbol: Optional[str] = None,
+        prices: Optional[Prices] = None,
     ) -> Optional[Dict[str, Any]]:
         """Format Yahoo Finance data to our stock model format
         Supports both US and Indian stocks
@@ -615,7 +779,11 @@ class StockDataAPIService:
             is_indian = symbol_raw.endswith(".NS") or symbol_raw.endswith(".BO")
 
             # Get current price - prioritize most recent data
-            if is_indian:
+            if prices and prices[0]:
+                current_price, previous_close = prices
+                if previous_close is None:
+                    previous_close = self._get_previous_close(ticker, info)
+            elif is_indian:
                 current_price = self._get_indian_stock_price(ticker, info)
                 previous_close = self._get_previous_close(ticker, info)
             else:
@@ -733,7 +901,19 @@ class StockDataAPIService:
         self, symbol: str, period: str = "1mo", interval: str = "1d"
     ) -> Optional[List[Dict[str, Any]]]:
         """
-        Get historical price data for a stock.
+        Get historical price data for a stock as a list of bar dicts.
+
+        Prefer get_price_series internally; this format is kept for callers
+        that need the legacy JSON shape.
+        """
+        series = await self.get_price_series(symbol, period, interval)
+        return series.to_records() if series is not None else None
+
+    async def get_price_series(
+        self, symbol: str, period: str = "1mo", interval: str = "1d"
+    ) -> Optional[PriceSeries]:
+        """
+        Get historical price data for a stock as a columnar PriceSeries.
 
         Args:
             symbol: Stock symbol
@@ -741,21 +921,59 @@ class StockDataAPIService:
             interval: Valid intervals: 1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo
         """
         if not YFINANCE_AVAILABLE:
-            return await self._mock_historical_prices(symbol, period)
+            return await self._mock_price_series(symbol, period)
 
         try:
-            loop = asyncio.get_event_loop()
-            prices = await loop.run_in_executor(
-                None, self._get_historical_prices_sync, symbol, period, interval
+            symbol_normalized = self._normalize_symbol(symbol)
+            cache_key = MarketDataCache.history_key(symbol_normalized, period, interval)
+            ttl, stale_ttl = MarketDataCache.history_ttls(interval)
+
+            async def fetch_range(
+                start: Optional[date], end: Optional[date]
+            ) -> Optional[PriceSeries]:
+                return await self._run_coalesced(
+                    ("history_range", symbol_normalized, interval, start, end),
+                    self._get_price_range_sync,
+                    symbol_normalized,
+                    interval,
+                    start,
+                    end,
+                )
+
+            async def fetch() -> Optional[PriceSeries]:
+                if self.ohlcv_store.supports(interval):
+                    try:
+                        return await self.ohlcv_store.get_series(
+                            symbol_normalized, period, interval, fetch_range
+                        )
+                    except Exception as e:
+                        logger.warning(
+                            f"OHLCV store unavailable for {symbol_normalized}, "
+                            f"fetching full period upstream: {e}"
+                        )
+                return await self._run_coalesced(
+                    ("history", symbol_normalized, period, interval),
+                    self._get_price_series_sync,
+                    symbol,
+                    period,
+                    interval,
+                )
+
+            return await self.market_cache.get_or_fetch(
+                cache_key,
+                fetch,
+                ttl,
+                stale_ttl,
+                encode=PriceSeries.to_columns,
+                decode=PriceSeries.from_columns,
             )
-            return prices
         except Exception as e:
             logger.error(f"Error getting historical prices for {symbol}: {e}")
-            return await self._mock_historical_prices(symbol, period)
+            return await self._mock_price_series(symbol, period)
 
-    def _get_historical_prices_sync(
+    def _get_price_series_sync(
         self, symbol: str, period: str, interval: str
-    ) -> Optional[List[Dict[str, Any]]]:
+    ) -> Optional[PriceSeries]:
         """Synchronous historical price fetch - supports US and Indian stocks"""
         try:
             # Normalize symbol to handle Indian stocks
@@ -771,25 +989,41 @@ class StockDataAPIService:
                 logger.warning(f"No historical data found for {symbol_normalized}")
                 return None
 
-            prices = []
-            for date, row in hist.iterrows():
-                prices.append(
-                    {
-                        "date": date.strftime("%Y-%m-%d"),
-                        "timestamp": int(date.timestamp()),
-                        "open": float(row["Open"]),
-                        "high": float(row["High"]),
-                        "low": float(row["Low"]),
-                        "close": float(row["Close"]),
-                        "volume": int(row["Volume"]) if "Volume" in row else None,
-                    }
-                )
-
-            return prices
+            return PriceSeries.from_dataframe(hist, symbol_normalized, interval)
         except Exception as e:
             logger.error(f"Error fetching historical prices for {symbol}: {e}")
             return None
 
+    def _get_price_range_sync(
+        self,
+        symbol_normalized: str,
+        interval: str,
+        start: Optional[date],
+        end: Optional[date],
+    ) -> Optional[PriceSeries]:
+        """Synchronous fetch of bars in [start, end) used to fill store gaps.
+
+        A missing start means the full history. Returns an empty series when
+        upstream has no bars in the range and None when the fetch failed.
+        """
+        try:
+            logger.info(
+                f"Fetching {interval} bars for '{symbol_normalized}' "
+                f"from {start or 'inception'} to {end or 'now'}"
+            )
+            # Adjusted bars; the store re-fetches when the adjustment changes
+            ticker = yf.Ticker(symbol_normalized)
+            if start is None:
+                hist = ticker.history(period="max", interval=interval, auto_adjust=True)
+            else:
+                hist = ticker.history(
+                    start=start, end=end, interval=interval, auto_adjust=True
+                )
+            return PriceSeries.from_dataframe(hist, symbol_normalized, interval)
+        except Exception as e:
+            logger.error(f"Error fetching {interval} bars for {symbol_normalized}: {e}")
+            return None
+
     # Mock data methods for fallback
     async def _mock_search_stocks(self, query: str, limit: int) -> List[Dict[str, Any]]:
         """Mock search results"""
@@ -835,9 +1069,7 @@ class StockDataAPIService:
         stocks = await self._mock_search_stocks(symbol, 1)
         return stocks[0] if stocks else None
 
-    async def _mock_historical_prices(
-        self, symbol: str, period: str
-    ) -> Optional[List[Dict[str, Any]]]:
+    async def _mock_price_series(self, symbol: str, period: str) -> PriceSeries:
         """Mock historical prices"""
         import random
         from datetime import datetime, timedelta
@@ -862,7 +1094,7 @@ class StockDataAPIService:
                 }
             )
 
-        return prices
+        return PriceSeries.from_records(prices, symbol=symbol.upper())
 
     async def get_stock_news(
         self,
@@ -14,6 +14,10 @@ from app.services.multi_model_service import (
     TaskComplexity,
     ModelType,
 )
+from app.services.stock_analysis_snapshot import (
+    StockAnalysisSnapshot,
+    snapshot_db_lock,
+)
 from app.services.stock_service import StockService
 from app.services.stock_data_api import StockDataAPIService
 
@@ -30,7 +34,10 @@ class StockFinancialsAgent:
         self.stock_data_api = StockDataAPIService()
 
     async def analyze_financials(
-        self, stock_symbol: str, model: Optional[str] = None
+        self,
+        stock_symbol: str,
+        model: Optional[str] = None,
+        snapshot: Optional[StockAnalysisSnapshot] = None,
     ) -> Dict[str, Any]:
         """
         Generate comprehensive financial analysis using LLM.
@@ -39,59 +46,69 @@ class StockFinancialsAgent:
         Args:
             stock_symbol: Stock symbol to analyze
             model: Optional model name (gemini, llama4_maverick, gemma3_4b, auto)
+            snapshot: Pre-fetched stock data shared with the other agents;
+                skips fetching and saving the stock here
         """
         logger.info(f"💰 [FINANCIALS AGENT] Starting analysis for {stock_symbol}")
         try:
-            # Get stock data (includes financial metrics from Yahoo Finance)
-            logger.info(f"💰 [FINANCIALS AGENT] Fetching stock data for {stock_symbol}")
-            stock_data = await self.stock_service.get_stock_by_symbol(stock_symbol)
-            if not stock_data:
-                logger.error(f"💰 [FINANCIALS AGENT] Stock {stock_symbol} not found")
-                raise ValueError(f"Stock {stock_symbol} not found")
-
-            logger.info(
-                f"💰 [FINANCIALS AGENT] Stock data retrieved: {stock_data.get('company_name', 'N/A')}"
-            )
-
-            # Get detailed financial data
-            logger.info("💰 [FINANCIALS AGENT] Fetching detailed financial data")
-            detailed_data = await self.stock_data_api.get_stock_data(stock_symbol)
-            if detailed_data:
-                # Log what data we received
+            if snapshot is not None:
+                stock_data = dict(snapshot.stock_data)
+                stock = snapshot.stock
+            else:
+                # Get stock data (includes financial metrics from Yahoo Finance)
                 logger.info(
-                    f"💰 [FINANCIALS AGENT] Received detailed data with keys: {list(detailed_data.keys())}"
+                    f"💰 [FINANCIALS AGENT] Fetching stock data for {stock_symbol}"
                 )
-                # Log key financial metrics
-                financial_keys = [
-                    "market_cap",
-                    "trailingPE",
-                    "forwardPE",
-                    "trailingEps",
-                    "totalRevenue",
-                    "profitMargins",
-                    "returnOnEquity",
-                    "debtToEquity",
-                    "currentRatio",
-                    "bookValue",
-                    "priceToBook",
-                ]
-                for key in financial_keys:
-                    if key in detailed_data:
-                        logger.info(
-                            f"💰 [FINANCIALS AGENT] {key}: {detailed_data.get(key)}"
-                        )
-                # Merge financial metrics into stock_data
-                stock_data.update(detailed_data)
-            else:
-                logger.warning(
-                    f"💰 [FINANCIALS AGENT] No detailed financial data returned for {stock_symbol}"
+                stock_data = await self.stock_service.get_stock_by_symbol(stock_symbol)
+                if not stock_data:
+                    logger.error(
+                        f"💰 [FINANCIALS AGENT] Stock {stock_symbol} not found"
+                    )
+                    raise ValueError(f"Stock {stock_symbol} not found")
+
+                logger.info(
+                    f"💰 [FINANCIALS AGENT] Stock data retrieved: {stock_data.get('company_name', 'N/A')}"
                 )
 
-            # Save stock to database if not already saved
-            stock = await self.stock_service.save_stock(stock_data)
-            logger.info(
-                f"💰 [FINANCIALS AGENT] Stock saved to database with ID: {stock.id}"
-            )
+                # Get detailed financial data
+                logger.info("💰 [FINANCIALS AGENT] Fetching detailed financial data")
+                detailed_data = await self.stock_data_api.get_stock_data(stock_symbol)
+                if detailed_data:
+                    # Log what data we received
+                    logger.info(
+                        f"💰 [FINANCIALS AGENT] Received detailed data with keys: {list(detailed_data.keys())}"
+                    )
+                    # Log key financial metrics
+                    financial_keys = [
+                        "market_cap",
+                        "trailingPE",
+                        "forwardPE",
+                        "trailingEps",
+                        "totalRevenue",
+                        "profitMargins",
+                        "returnOnEquity",
+                        "debtToEquity",
+                        "currentRatio",
+                        "bookValue",
+                        "priceToBook",
+                    ]
+                    for key in financial_keys:
+                        if key in detailed_data:
+                            logger.info(
+                                f"💰 [FINANCIALS AGENT] {key}: {detailed_data.get(key)}"
+                            )
+                    # Merge financial metrics into stock_data
+                    stock_data.update(detailed_data)
+                else:
+                    logger.warning(
+                        f"💰 [FINANCIALS AGENT] No detailed financial data returned for {stock_symbol}"
+                    )
+
+                # Save stock to database if not already saved
+                stock = await self.stock_service.save_stock(stock_data)
+                logger.info(
+                    f"💰 [FINANCIALS AGENT] Stock saved to database with ID: {stock.id}"
+                )
 
             # Generate financials analysis prompt
             prompt = self._create_financials_prompt(stock_data)
@@ -154,9 +171,10 @@ class StockFinancialsAgent:
             logger.info("💰 [FINANCIALS AGENT] Analysis data parsed successfully")
 
             # Save analysis to database
-            analysis = await self.stock_service.save_stock_analysis(
-                UUID(str(stock.id)), analysis_data
-            )
+            async with snapshot_db_lock(snapshot):
+                analysis = await self.stock_service.save_stock_analysis(
+                    UUID(str(stock.id)), analysis_data
+                )
             logger.info(
                 f"💰 [FINANCIALS AGENT] Analysis saved to database with ID: {analysis.id}"
             )
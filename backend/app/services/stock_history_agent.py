@@ -3,17 +3,26 @@ Stock History Agent - Specialized AI agent for historical price analysis
 """
 
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.context import RequestContext
+from app.services.market_data import (
+    PriceSeries,
+    format_indicator_summary,
+    summarize_indicators,
+)
 from app.services.multi_model_service import (
     multi_model_service,
     TaskComplexity,
     ModelType,
 )
+from app.services.stock_analysis_snapshot import (
+    StockAnalysisSnapshot,
+    snapshot_db_lock,
+)
 from app.services.stock_service import StockService
 from app.services.stock_data_api import StockDataAPIService
 
@@ -35,6 +44,7 @@ class StockHistoryAgent:
         period: str = "1y",
         interval: str = "1d",
         model: Optional[str] = None,
+        snapshot: Optional[StockAnalysisSnapshot] = None,
     ) -> Dict[str, Any]:
         """
         Generate comprehensive historical price analysis using LLM.
@@ -45,45 +55,55 @@ class StockHistoryAgent:
             period: Time period for historical data
             interval: Data interval
             model: Optional model name (gemini, llama4_maverick, gemma3_4b, auto)
+            snapshot: Pre-fetched stock data and price history shared with the
+                other agents; skips fetching and saving the stock here
         """
         logger.info(f"📈 [HISTORY AGENT] Starting analysis for {stock_symbol}")
         try:
-            # Get stock data
-            logger.info(f"📈 [HISTORY AGENT] Fetching stock data for {stock_symbol}")
-            stock_data = await self.stock_service.get_stock_by_symbol(stock_symbol)
-            if not stock_data:
-                logger.error(f"📈 [HISTORY AGENT] Stock {stock_symbol} not found")
-                raise ValueError(f"Stock {stock_symbol} not found")
-
-            logger.info(
-                f"📈 [HISTORY AGENT] Stock data retrieved: {stock_data.get('company_name', 'N/A')}"
-            )
+            if snapshot is not None:
+                stock_data = dict(snapshot.stock_data)
+                stock = snapshot.stock
+                price_series = snapshot.price_series
+                period = snapshot.period
+            else:
+                # Get stock data
+                logger.info(
+                    f"📈 [HISTORY AGENT] Fetching stock data for {stock_symbol}"
+                )
+                stock_data = await self.stock_service.get_stock_by_symbol(stock_symbol)
+                if not stock_data:
+                    logger.error(f"📈 [HISTORY AGENT] Stock {stock_symbol} not found")
+                    raise ValueError(f"Stock {stock_symbol} not found")
 
-            # Get historical price data
-            logger.info(
-                f"📈 [HISTORY AGENT] Fetching historical prices for period: {period}"
-            )
-            historical_data = await self.stock_data_api.get_historical_prices(
-                stock_symbol, period, interval
-            )
-            if not historical_data:
-                logger.warning(
-                    f"📈 [HISTORY AGENT] No historical data available for {stock_symbol}"
+                logger.info(
+                    f"📈 [HISTORY AGENT] Stock data retrieved: {stock_data.get('company_name', 'N/A')}"
                 )
-                historical_data = []
 
-            logger.info(
-                f"📈 [HISTORY AGENT] Retrieved {len(historical_data)} historical data points"
-            )
+                # Get historical price data
+                logger.info(
+                    f"📈 [HISTORY AGENT] Fetching historical prices for period: {period}"
+                )
+                price_series = await self.stock_data_api.get_price_series(
+                    stock_symbol, period, interval
+                )
+                if price_series is None or price_series.is_empty:
+                    logger.warning(
+                        f"📈 [HISTORY AGENT] No historical data available for {stock_symbol}"
+                    )
+                    price_series = PriceSeries.empty(interval=interval)
+
+                # Save stock to database if not already saved
+                stock = await self.stock_service.save_stock(stock_data)
+                logger.info(
+                    f"📈 [HISTORY AGENT] Stock saved to database with ID: {stock.id}"
+                )
 
-            # Save stock to database if not already saved
-            stock = await self.stock_service.save_stock(stock_data)
             logger.info(
-                f"📈 [HISTORY AGENT] Stock saved to database with ID: {stock.id}"
+                f"📈 [HISTORY AGENT] Retrieved {len(price_series)} historical data points"
             )
 
             # Generate history analysis prompt
-            prompt = self._create_history_prompt(stock_data, historical_data, period)
+            prompt = self._create_history_prompt(stock_data, price_series, period)
             logger.info(
                 f"📈 [HISTORY AGENT] Prompt created, length: {len(prompt)} characters"
             )
@@ -137,14 +157,15 @@ class StockHistoryAgent:
             logger.info("📈 [HISTORY AGENT] Parsing LLM response")
             model_used = response_data.get("model_used", "auto")
             analysis_data = self._parse_llm_response(
-                response_text, stock_data, historical_data, model_used=model_used
+                response_text, stock_data, price_series, model_used=model_used
             )
             logger.info("📈 [HISTORY AGENT] Analysis data parsed successfully")
 
             # Save analysis to database
-            analysis = await self.stock_service.save_stock_analysis(
-                UUID(str(stock.id)), analysis_data
-            )
+            async with snapshot_db_lock(snapshot):
+                analysis = await self.stock_service.save_stock_analysis(
+                    UUID(str(stock.id)), analysis_data
+                )
             logger.info(
                 f"📈 [HISTORY AGENT] Analysis saved to database with ID: {analysis.id}"
             )
@@ -195,42 +216,34 @@ class StockHistoryAgent:
     def _create_history_prompt(
         self,
         stock_data: Dict[str, Any],
-        historical_data: List[Dict[str, Any]],
+        price_series: PriceSeries,
         period: str,
     ) -> str:
         """Create specialized prompt for historical price analysis"""
         # Calculate key statistics from historical data
-        if historical_data:
-            prices = [d.get("close", 0) for d in historical_data if d.get("close")]
-            volumes = [d.get("volume", 0) for d in historical_data if d.get("volume")]
-
-            if prices:
-                min_price = min(prices)
-                max_price = max(prices)
-                avg_price = sum(prices) / len(prices)
-                current_price = (
-                    prices[-1] if prices else stock_data.get("current_price", 0)
-                )
-                price_change = current_price - prices[0] if len(prices) > 1 else 0
-                price_change_pct = (
-                    (price_change / prices[0] * 100) if prices[0] > 0 else 0
-                )
+        prices = price_series.valid_closes()
+        volumes = price_series.valid_volumes()
 
-                avg_volume = sum(volumes) / len(volumes) if volumes else 0
+        # Format historical summary
+        history_summary = ""
+        if not price_series.is_empty:
+            if prices.size:
+                min_price = float(prices.min())
+                max_price = float(prices.max())
+                avg_price = float(prices.mean())
+                current_price = float(prices[-1])
+                price_change = (
+                    current_price - float(prices[0]) if prices.size > 1 else 0
+                )
+                price_change_pct = price_change / float(prices[0]) * 100
+                avg_volume = float(volumes.mean()) if volumes.size else 0
             else:
                 min_price = max_price = avg_price = current_price = price_change = (
                     price_change_pct
                 ) = avg_volume = 0
-        else:
-            min_price = max_price = avg_price = current_price = price_change = (
-                price_change_pct
-            ) = avg_volume = 0
 
-        # Format historical summary
-        history_summary = ""
-        if historical_data:
             history_summary = f"\nHistorical Price Data ({period}):\n"
-            history_summary += f"- Data Points: {len(historical_data)}\n"
+            history_summary += f"- Data Points: {len(price_series)}\n"
             history_summary += f"- Price Range: ${min_price:.2f} - ${max_price:.2f}\n"
             history_summary += f"- Average Price: ${avg_price:.2f}\n"
             history_summary += f"- Current Price: ${current_price:.2f}\n"
@@ -238,13 +251,11 @@ class StockHistoryAgent:
                 f"- Price Change: ${price_change:.2f} ({price_change_pct:.2f}%)\n"
             )
             history_summary += f"- Average Volume: {avg_volume:,.0f}\n"
-            if len(historical_data) > 0:
-                history_summary += (
-                    f"- First Date: {historical_data[0].get('date', 'N/A')}\n"
-                )
-                history_summary += (
-                    f"- Last Date: {historical_data[-1].get('date', 'N/A')}\n"
-                )
+            history_summary += f"- First Date: {price_series.first_date}\n"
+            history_summary += f"- Last Date: {price_series.last_date}\n"
+            history_summary += (
+                f"\n{format_indicator_summary(summarize_indicators(price_series))}\n"
+            )
         else:
             history_summary = "\nNo historical price data available."
 
@@ -311,7 +322,7 @@ Provide only valid JSON, no additional text.
         self,
         response: str,
         stock_data: Dict[str, Any],
-        historical_data: List[Dict[str, Any]],
+        price_series: PriceSeries,
         model_used: str = "auto",
     ) -> Dict[str, Any]:
         """Parse LLM response into structured historical analysis data"""
@@ -370,7 +381,7 @@ Provide only valid JSON, no additional text.
                 "recommendations": analysis_json.get("recommendations", {}),
                 "llm_model": model_used,
                 "llm_prompt": self._create_history_prompt(
-                    stock_data, historical_data, "1y"
+                    stock_data, price_series, "1y"
                 ),
                 "llm_response": analysis_json,
                 "confidence_score": analysis_json.get("recommendations", {}).get(
@@ -424,7 +435,7 @@ Provide only valid JSON, no additional text.
                 },
                 "llm_model": model_used,
                 "llm_prompt": self._create_history_prompt(
-                    stock_data, historical_data, "1y"
+                    stock_data, price_series, "1y"
                 ),
                 "llm_response": {"raw_response": response},
                 "confidence_score": 0.5,
@@ -14,6 +14,10 @@ from app.services.multi_model_service import (
     TaskComplexity,
     ModelType,
 )
+from app.services.stock_analysis_snapshot import (
+    StockAnalysisSnapshot,
+    snapshot_db_lock,
+)
 from app.services.stock_service import StockService
 
 logger = logging.getLogger(__name__)
@@ -32,6 +36,7 @@ class StockNewsAgent:
         stock_symbol: str,
         news_data: List[Dict[str, Any]],
         model: Optional[str] = None,
+        snapshot: Optional[StockAnalysisSnapshot] = None,
     ) -> Dict[str, Any]:
         """
         Generate comprehensive news analysis using LLM.
@@ -41,24 +46,33 @@ class StockNewsAgent:
             stock_symbol: Stock symbol to analyze
             news_data: List of news articles
             model: Optional model name (gemini, llama4_maverick, gemma3_4b, auto)
+            snapshot: Pre-fetched stock data shared with the other agents;
+                skips fetching and saving the stock here
         """
         logger.info(f"📰 [NEWS AGENT] Starting analysis for {stock_symbol}")
         try:
-            # Get stock data
-            logger.info(f"📰 [NEWS AGENT] Fetching stock data for {stock_symbol}")
-            stock_data = await self.stock_service.get_stock_by_symbol(stock_symbol)
-            if not stock_data:
-                logger.error(f"📰 [NEWS AGENT] Stock {stock_symbol} not found")
-                raise ValueError(f"Stock {stock_symbol} not found")
+            if snapshot is not None:
+                stock_data = dict(snapshot.stock_data)
+                stock = snapshot.stock
+            else:
+                # Get stock data
+                logger.info(f"📰 [NEWS AGENT] Fetching stock data for {stock_symbol}")
+                stock_data = await self.stock_service.get_stock_by_symbol(stock_symbol)
+                if not stock_data:
+                    logger.error(f"📰 [NEWS AGENT] Stock {stock_symbol} not found")
+                    raise ValueError(f"Stock {stock_symbol} not found")
 
-            logger.info(
-                f"📰 [NEWS AGENT] Stock data retrieved: {stock_data.get('company_name', 'N/A')}"
-            )
-            logger.info(f"📰 [NEWS AGENT] Processing {len(news_data)} news articles")
+                logger.info(
+                    f"📰 [NEWS AGENT] Stock data retrieved: {stock_data.get('company_name', 'N/A')}"
+                )
 
-            # Save stock to database if not already saved
-            stock = await self.stock_service.save_stock(stock_data)
-            logger.info(f"📰 [NEWS AGENT] Stock saved to database with ID: {stock.id}")
+                # Save stock to database if not already saved
+                stock = await self.stock_service.save_stock(stock_data)
+                logger.info(
+                    f"📰 [NEWS AGENT] Stock saved to database with ID: {stock.id}"
+                )
+
+            logger.info(f"📰 [NEWS AGENT] Processing {len(news_data)} news articles")
 
             # Generate news analysis prompt
             prompt = self._create_news_prompt(stock_data, news_data)
@@ -136,9 +150,10 @@ class StockNewsAgent:
             )
 
             # Save analysis to database
-            analysis = await self.stock_service.save_stock_analysis(
-                UUID(str(stock.id)), analysis_data
-            )
+            async with snapshot_db_lock(snapshot):
+                analysis = await self.stock_service.save_stock_analysis(
+                    UUID(str(stock.id)), analysis_data
+                )
             logger.info(
                 f"📰 [NEWS AGENT] Analysis saved to database with ID: {analysis.id}"
             )
@@ -8,11 +8,12 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, and_, func, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.context import RequestContext
 from app.models.stock import Stock, StockAnalysis
+from app.services.market_data import PriceSeries
 from app.services.stock_data_api import StockDataAPIService
 
 logger = logging.getLogger(__name__)
@@ -73,8 +74,11 @@ class StockService:
                 )
                 return stocks
 
-            # Search in database first
-            search_pattern = f"%{query.upper()}%"
+            # Search in database first. Substring and fuzzy (pg_trgm "%")
+            # matches are served by the trigram indexes on symbol and name;
+            # exact and prefix symbol hits rank ahead of name similarity.
+            query_upper = query.upper().strip()
+            search_pattern = f"%{query_upper}%"
             stmt = (
                 select(Stock)
                 .where(
@@ -82,11 +86,17 @@ class StockService:
                         or_(
                             Stock.symbol.ilike(search_pattern),
                             Stock.company_name.ilike(search_pattern),
+                            Stock.company_name.op("%")(query),
                         ),
                         Stock.client_account_id == self.context.client_account_id,
                         Stock.engagement_id == self.context.engagement_id,
                     )
                 )
+                .order_by(
+                    (Stock.symbol == query_upper).desc(),
+                    Stock.symbol.ilike(f"{query_upper}%").desc(),
+                    func.similarity(Stock.company_name, query).desc(),
+                )
                 .limit(limit)
             )
             result = await self.db.execute(stmt)
@@ -144,11 +154,16 @@ class StockService:
     async def get_historical_prices(
         self, symbol: str, period: str = "1mo", interval: str = "1d"
     ) -> Optional[List[Dict[str, Any]]]:
-        """Get historical price data for a stock"""
+        """Get historical price data for a stock as a list of bar dicts"""
+        series = await self.get_price_series(symbol, period, interval)
+        return series.to_records() if series is not None else None
+
+    async def get_price_series(
+        self, symbol: str, period: str = "1mo", interval: str = "1d"
+    ) -> Optional[PriceSeries]:
+        """Get historical price data for a stock as a columnar PriceSeries"""
         try:
-            return await self.stock_data_api.get_historical_prices(
-                symbol, period, interval
-            )
+            return await self.stock_data_api.get_price_series(symbol, period, interval)
         except Exception as e:
             logger.error(f"Error getting historical prices of a stock: {e}")
             return None
@@ -178,14 +193,62 @@ class StockService:
                 if stock:
                     return stock.to_dict()
 
-            # Fetch fresh data from Yahoo Finance API
-            stock_data = await self.stock_data_api.get_stock_data(symbol)
+            # Fetch data from Yahoo Finance API (served from the shared market
+            # data cache unless a refresh was requested)
+            stock_data = await self.stock_data_api.get_stock_data(
+                symbol, force_refresh=force_refresh
+            )
             return stock_data
 
         except Exception as e:
             logger.error(f"Error getting stock by symbol: {e}")
             return None
 
+    async def get_stocks_by_symbols(
+        self, symbols: List[str], force_refresh: bool = False
+    ) -> Dict[str, Any]:
+        """Get many stocks by symbol with one database query and one batch fetch
+
+        Args:
+            symbols: Stock symbols
+            force_refresh: If True, always fetch fresh data from API, ignoring database cache
+
+        Returns:
+            {"stocks": {symbol: stock_data}, "errors": {symbol: message}}
+        """
+        stocks: Dict[str, Dict[str, Any]] = {}
+        errors: Dict[str, str] = {}
+        upper_symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+
+        if not force_refresh and upper_symbols:
+            try:
+                stmt = select(Stock).where(
+                    and_(
+                        Stock.symbol.in_(upper_symbols),
+                        Stock.client_account_id == self.context.client_account_id,
+                        Stock.engagement_id == self.context.engagement_id,
+                    )
+                )
+                result = await self.db.execute(stmt)
+                for stock in result.scalars().all():
+                    stocks[stock.symbol] = stock.to_dict()
+            except Exception as e:
+                logger.error(f"Error getting stocks by symbols: {e}")
+
+        remaining = [symbol for symbol in upper_symbols if symbol not in stocks]
+        if remaining:
+            try:
+                batch = await self.stock_data_api.get_stock_data_batch(
+                    remaining, force_refresh=force_refresh
+                )
+                stocks.update(batch["quotes"])
+                errors.update(batch["errors"])
+            except Exception as e:
+                logger.error(f"Error fetching stock data batch: {e}")
+                errors.update({symbol: str(e) for symbol in remaining})
+
+        return {"stocks": stocks, "errors": errors}
+
     async def save_stock(self, stock_data: Dict[str, Any]) -> Stock:
         """Save or update stock in database"""
         try:
@@ -6,14 +6,25 @@ import logging
 from typing import Any, Dict, Optional
 from uuid import UUID
 
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.context import RequestContext
+from app.services.market_data import (
+    PriceSeries,
+    format_indicator_summary,
+    summarize_indicators,
+)
 from app.services.multi_model_service import (
     multi_model_service,
     TaskComplexity,
     ModelType,
 )
+from app.services.stock_analysis_snapshot import (
+    StockAnalysisSnapshot,
+    benchmark_symbol,
+    snapshot_db_lock,
+)
 from app.services.stock_service import StockService
 from app.services.stock_data_api import StockDataAPIService
 
@@ -30,7 +41,10 @@ class StockStatisticsAgent:
         self.stock_data_api = StockDataAPIService()
 
     async def analyze_statistics(
-        self, stock_symbol: str, model: Optional[str] = None
+        self,
+        stock_symbol: str,
+        model: Optional[str] = None,
+        snapshot: Optional[StockAnalysisSnapshot] = None,
     ) -> Dict[str, Any]:
         """
         Generate comprehensive statistical analysis using LLM.
@@ -39,35 +53,50 @@ class StockStatisticsAgent:
         Args:
             stock_symbol: Stock symbol to analyze
             model: Optional model name (gemini, llama4_maverick, gemma3_4b, auto)
+            snapshot: Pre-fetched stock data and price history shared with the
+                other agents; skips fetching and saving the stock here
         """
         logger.info(f"📊 [STATISTICS AGENT] Starting analysis for {stock_symbol}")
         try:
-            # Get stock data
-            logger.info(f"📊 [STATISTICS AGENT] Fetching stock data for {stock_symbol}")
-            stock_data = await self.stock_service.get_stock_by_symbol(stock_symbol)
-            if not stock_data:
-                logger.error(f"📊 [STATISTICS AGENT] Stock {stock_symbol} not found")
-                raise ValueError(f"Stock {stock_symbol} not found")
+            if snapshot is not None:
+                stock_data = dict(snapshot.stock_data)
+                stock = snapshot.stock
+                price_series = snapshot.price_series
+                benchmark_series = snapshot.benchmark_series
+            else:
+                # Get stock data
+                logger.info(
+                    f"📊 [STATISTICS AGENT] Fetching stock data for {stock_symbol}"
+                )
+                stock_data = await self.stock_service.get_stock_by_symbol(stock_symbol)
+                if not stock_data:
+                    logger.error(
+                        f"📊 [STATISTICS AGENT] Stock {stock_symbol} not found"
+                    )
+                    raise ValueError(f"Stock {stock_symbol} not found")
 
-            logger.info(
-                f"📊 [STATISTICS AGENT] Stock data retrieved: {stock_data.get('company_name', 'N/A')}"
-            )
+                logger.info(
+                    f"📊 [STATISTICS AGENT] Stock data retrieved: {stock_data.get('company_name', 'N/A')}"
+                )
 
-            # Get historical data for statistical calculations
-            logger.info(
-                "📊 [STATISTICS AGENT] Fetching historical data for statistical analysis"
-            )
-            historical_data = await self.stock_data_api.get_historical_prices(
-                stock_symbol, "1y", "1d"
-            )
+                # Get historical data for statistical calculations
+                logger.info(
+                    "📊 [STATISTICS AGENT] Fetching historical data for statistical analysis"
+                )
+                price_series = await self.stock_data_api.get_price_series(
+                    stock_symbol, "1y", "1d"
+                )
+                benchmark_series = await self._get_benchmark_series(stock_symbol)
 
-            # Calculate statistics
-            statistics = self._calculate_statistics(stock_data, historical_data or [])
+                # Save stock to database if not already saved
+                stock = await self.stock_service.save_stock(stock_data)
+                logger.info(
+                    f"📊 [STATISTICS AGENT] Stock saved to database with ID: {stock.id}"
+                )
 
-            # Save stock to database if not already saved
-            stock = await self.stock_service.save_stock(stock_data)
-            logger.info(
-                f"📊 [STATISTICS AGENT] Stock saved to database with ID: {stock.id}"
+            # Calculate statistics
+            statistics = self._calculate_statistics(
+                stock_data, price_series or PriceSeries.empty(), benchmark_series
             )
 
             # Generate statistics analysis prompt
@@ -131,9 +160,10 @@ class StockStatisticsAgent:
             logger.info("📊 [STATISTICS AGENT] Analysis data parsed successfully")
 
             # Save analysis to database
-            analysis = await self.stock_service.save_stock_analysis(
-                UUID(str(stock.id)), analysis_data
-            )
+            async with snapshot_db_lock(snapshot):
+                analysis = await self.stock_service.save_stock_analysis(
+                    UUID(str(stock.id)), analysis_data
+                )
             logger.info(
                 f"📊 [STATISTICS AGENT] Analysis saved to database with ID: {analysis.id}"
             )
@@ -181,59 +211,76 @@ class StockStatisticsAgent:
             )
             raise
 
+    async def _get_benchmark_series(self, stock_symbol: str) -> Optional[PriceSeries]:
+        """Fetch the market index the stock is measured against for beta"""
+        benchmark = benchmark_symbol(stock_symbol, self.stock_data_api)
+        try:
+            return await self.stock_data_api.get_price_series(benchmark, "1y", "1d")
+        except Exception as e:
+            logger.warning(
+                f"📊 [STATISTICS AGENT] Benchmark {benchmark} unavailable: {e}"
+            )
+            return None
+
     def _calculate_statistics(
-        self, stock_data: Dict[str, Any], historical_data: list
+        self,
+        stock_data: Dict[str, Any],
+        price_series: PriceSeries,
+        benchmark_series: Optional[PriceSeries] = None,
     ) -> Dict[str, Any]:
         """Calculate statistical metrics from stock data"""
+        indicators = summarize_indicators(price_series, benchmark_series)
         stats = {
             "price_statistics": {},
             "volume_statistics": {},
             "volatility_metrics": {},
             "performance_metrics": {},
+            "indicators": indicators,
         }
 
-        if historical_data:
-            prices = [d.get("close", 0) for d in historical_data if d.get("close")]
-            volumes = [d.get("volume", 0) for d in historical_data if d.get("volume")]
+        if indicators:
+            stats["volatility_metrics"] = {
+                "annualized_volatility": indicators["volatility"][
+                    "log_return_annualized"
+                ],
+                "max_drawdown": indicators["max_drawdown"]["drawdown"],
+                "atr_14": indicators["atr_14"],
+                "sharpe_ratio": indicators["sharpe_ratio"],
+                "sortino_ratio": indicators["sortino_ratio"],
+                "beta": indicators.get("beta"),
+            }
 
-            if prices:
-                import statistics
+        prices = price_series.valid_closes()
+        volumes = price_series.valid_volumes()
 
-                stats["price_statistics"] = {
-                    "mean": statistics.mean(prices),
-                    "median": statistics.median(prices),
-                    "min": min(prices),
-                    "max": max(prices),
-                    "std_dev": statistics.stdev(prices) if len(prices) > 1 else 0,
-                }
+        if prices.size:
+            stats["price_statistics"] = {
+                "mean": float(prices.mean()),
+                "median": float(np.median(prices)),
+                "min": float(prices.min()),
+                "max": float(prices.max()),
+                "std_dev": float(prices.std(ddof=1)) if prices.size > 1 else 0,
+            }
 
-                # Calculate returns
-                returns = []
-                for i in range(1, len(prices)):
-                    if prices[i - 1] > 0:
-                        returns.append((prices[i] - prices[i - 1]) / prices[i - 1])
-
-                if returns:
-                    stats["performance_metrics"] = {
-                        "average_return": statistics.mean(returns),
-                        "volatility": (
-                            statistics.stdev(returns) if len(returns) > 1 else 0
-                        ),
-                        "total_return": (
-                            (prices[-1] - prices[0]) / prices[0] if prices[0] > 0 else 0
-                        ),
-                    }
-
-            if volumes:
-                import statistics
-
-                stats["volume_statistics"] = {
-                    "mean": statistics.mean(volumes),
-                    "median": statistics.median(volumes),
-                    "min": min(volumes),
-                    "max": max(volumes),
+            # Calculate returns
+            returns = np.diff(prices) / prices[:-1]
+            if returns.size:
+                stats["performance_metrics"] = {
+                    "average_return": float(returns.mean()),
+                    "volatility": (
+                        float(returns.std(ddof=1)) if returns.size > 1 else 0
+                    ),
+                    "total_return": float((prices[-1] - prices[0]) / prices[0]),
                 }
 
+        if volumes.size:
+            stats["volume_statistics"] = {
+                "mean": float(volumes.mean()),
+                "median": float(np.median(volumes)),
+                "min": float(volumes.min()),
+                "max": float(volumes.max()),
+            }
+
         return stats
 
     def _create_statistics_prompt(
@@ -258,6 +305,8 @@ Performance Metrics:
 Volume Statistics:
 - Mean Volume: {statistics.get('volume_statistics', {}).get('mean', 0):,.0f}
 - Median Volume: {statistics.get('volume_statistics', {}).get('median', 0):,.0f}
+
+{format_indicator_summary(statistics.get('indicators', {}))}
 """
 
         return f"""
@@ -0,0 +1,168 @@
+"""Benchmark Bulk Asset Ingestion
+Compare the COPY-based ingestion path with the ORM batch path on synthetic
+CMDB rows. Every run happens in a transaction that is rolled back, so the
+target engagement is left unchanged.
+
+Usage:
+    DATABASE_URL=postgresql://... python scripts/benchmark_bulk_asset_ingestion.py \
+        [--rows 50000] [--orm-rows 5000] [--duplicate-ratio 0.1]
+
+CLIENT_ACCOUNT_ID / ENGAGEMENT_ID select the engagement to import into;
+by default the first engagement in the database is used.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import uuid
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+from tabulate import tabulate
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.asset_service import AssetService  # noqa: E402
+from app.services.asset_service.deduplication import bulk_ingestion  # noqa: E402
+from app.services.asset_service.deduplication.batch_operations import (  # noqa: E402
+    bulk_create_or_update_assets,
+)
+
+# Database URL from environment - no hardcoded credentials for security
+DATABASE_URL = os.getenv("DATABASE_URL")
+if not DATABASE_URL:
+    raise ValueError(
+        "DATABASE_URL environment variable is required. "
+        "Please set it to your database connection string."
+    )
+ASYNC_DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
+
+ASSET_TYPES = ["server", "application", "database", "network", "storage"]
+ENVIRONMENTS = ["Production", "Staging", "Development", "Test"]
+OPERATING_SYSTEMS = ["RHEL 8", "Windows Server 2019", "Ubuntu 22.04", "AIX 7.2"]
+
+
+def synthetic_rows(count: int, duplicate_ratio: float, seed: int = 7) -> list:
+    """CMDB-style rows; a share of them repeat an earlier row's hostname"""
+    rng = random.Random(seed)
+    run = uuid.uuid4().hex[:8]
+    rows = []
+    for i in range(count):
+        if rows and rng.random() < duplicate_ratio:
+            host = rng.choice(rows)["hostname"]
+        else:
+            host = f"bench-{run}-{i:06d}"
+        rows.append(
+            {
+                "name": host,
+                "hostname": host,
+                "fqdn": f"{host}.bench.local",
+                "ip_address": f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}",
+                "asset_type": rng.choice(ASSET_TYPES),
+                "environment": rng.choice(ENVIRONMENTS),
+                "operating_system": rng.choice(OPERATING_SYSTEMS),
+                "cpu_cores": str(rng.choice([2, 4, 8, 16, 32])),
+                "memory_gb": str(rng.choice([8, 16, 32, 64, 128])),
+                "storage_gb": str(rng.randint(50, 4000)),
+                "business_owner": f"owner{rng.randint(1, 200)}@example.com",
+                "custom_attributes": {"rack": f"R{rng.randint(1, 40)}"},
+            }
+        )
+    return rows
+
+
+async def resolve_context(engine) -> dict:
+    client_account_id = os.getenv("CLIENT_ACCOUNT_ID")
+    engagement_id = os.getenv("ENGAGEMENT_ID")
+    if not (client_account_id and engagement_id):
+        async with engine.connect() as conn:
+            row = (
+                await conn.execute(
+                    text(
+                        "SELECT client_account_id, id FROM migration.engagements "
+                        "ORDER BY created_at LIMIT 1"
+                    )
+                )
+            ).first()
+        if row is None:
+            raise ValueError("No engagement found; set CLIENT_ACCOUNT_ID/ENGAGEMENT_ID")
+        client_account_id, engagement_id = str(row[0]), str(row[1])
+    return {"client_account_id": client_account_id, "engagement_id": engagement_id}
+
+
+async def run_copy_path(engine, context: dict, rows: list) -> dict:
+    async with AsyncSession(engine) as session:
+        service = AssetService(session, context)
+        started = time.perf_counter()
+        report = await bulk_ingestion.bulk_ingest_assets(service, rows)
+        elapsed = time.perf_counter() - started
+        await session.rollback()
+    counts = report.counts()
+    return {
+        "path": "COPY staging",
+        "rows": len(rows),
+        "seconds": round(elapsed, 2),
+        "rows/s": round(len(rows) / elapsed),
+        **counts,
+    }
+
+
+async def run_orm_path(engine, context: dict, rows: list) -> dict:
+    # Keep the batch on the ORM path regardless of its size
+    threshold = bulk_ingestion.BULK_INGEST_THRESHOLD
+    bulk_ingestion.BULK_INGEST_THRESHOLD = len(rows) + 1
+    try:
+        async with AsyncSession(engine) as session:
+            service = AssetService(session, context)
+            started = time.perf_counter()
+            results = await bulk_create_or_update_assets(service, rows)
+            elapsed = time.perf_counter() - started
+            await session.rollback()
+    finally:
+        bulk_ingestion.BULK_INGEST_THRESHOLD = threshold
+    statuses = [status for _, status in results]
+    return {
+        "path": "ORM batch",
+        "rows": len(rows),
+        "seconds": round(elapsed, 2),
+        "rows/s": round(len(rows) / elapsed),
+        "created": statuses.count("created"),
+        "existed": statuses.count("existed"),
+        "updated": statuses.count("updated"),
+        "failed": 0,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--orm-rows", type=int, default=5_000)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.1)
+    args = parser.parse_args()
+
+    engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=NullPool)
+    try:
+        context = await resolve_context(engine)
+        results = [
+            await run_copy_path(
+                engine, context, synthetic_rows(args.rows, args.duplicate_ratio)
+            )
+        ]
+        if args.orm_rows:
+            # No repeated hostnames: the ORM path would hit the unique index
+            results.append(
+                await run_orm_path(engine, context, synthetic_rows(args.orm_rows, 0.0))
+            )
+    finally:
+        await engine.dispose()
+
+    print(tabulate(results, headers="keys", tablefmt="github"))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+"""Benchmark Embedding Similarity
+Compare candidate-by-candidate cosine similarity with the vectorized kernel in
+app.services.embeddings.similarity for one query against 1k, 10k and 100k
+candidates.
+
+Usage:
+    python scripts/benchmark_embedding_similarity.py [--dims 1024] [--k 10] \
+        [--sizes 1000 10000 100000] [--rounds 5]
+
+The loop baselines are slow at 100k candidates, so they are timed on at most
+--loop-sample candidates and scaled up linearly. The kernel is timed both
+including normalization of the candidate matrix and with a matrix normalized
+ahead of time, as a long-lived index would keep it.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from tabulate import tabulate
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.embeddings.similarity import (  # noqa: E402
+    normalize_rows,
+    top_k_similar,
+)
+
+
+def python_loop(query, candidates, k):
+    """The pure-Python scoring EmbeddingService used before"""
+    scores = []
+    magnitude1 = sum(a * a for a in query) ** 0.5
+    for index, candidate in enumerate(candidates):
+        dot_product = sum(a * b for a, b in zip(query, candidate))
+        magnitude2 = sum(b * b for b in candidate) ** 0.5
+        scores.append((index, dot_product / (magnitude1 * magnitude2)))
+    scores.sort(key=lambda x: x[1], reverse=True)
+    return scores[:k]
+
+
+def numpy_loop(query, candidates, k):
+    """Per-candidate NumPy scoring as VectorOperations/agent memory did"""
+    scores = []
+    vec1 = np.array(query)
+    for index, candidate in enumerate(candidates):
+        vec2 = np.array(candidate)
+        similarity = np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2))
+        scores.append((index, float(similarity)))
+    scores.sort(key=lambda x: x[1], reverse=True)
+    return scores[:k]
+
+
+def best_of(rounds, func, *args):
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dims", type=int, default=1024)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+    )
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--loop-sample", type=int, default=2_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    query = rng.standard_normal(args.dims).astype(np.float32)
+    query_list = query.tolist()
+
+    results = []
+    for size in args.sizes:
+        candidates = rng.standard_normal((size, args.dims), dtype=np.float32)
+        sample = min(size, args.loop_sample)
+        sample_lists = candidates[:sample].tolist()
+        scale = size / sample
+
+        python_ms = best_of(1, python_loop, query_list, sample_lists, args.k) * scale
+        numpy_ms = best_of(1, numpy_loop, query_list, sample_lists, args.k) * scale
+        kernel_ms = best_of(args.rounds, top_k_similar, query, candidates, args.k)
+        normalized = normalize_rows(candidates)
+        indexed_ms = best_of(
+            args.rounds,
+            lambda: top_k_similar(
+                normalize_rows(query[None, :]), normalized, args.k, normalized=True
+            ),
+        )
+
+        results.append(
+            {
+                "candidates": size,
+                "python loop ms": round(python_ms * 1e3, 2),
+                "numpy loop ms": round(numpy_ms * 1e3, 2),
+                "kernel ms": round(kernel_ms * 1e3, 2),
+                "kernel, pre-normalized ms": round(indexed_ms * 1e3, 2),
+                "speedup vs numpy loop": f"{numpy_ms / indexed_ms:.0f}x",
+            }
+        )
+
+    print(f"{args.dims} dims, top {args.k}\n")
+    print(tabulate(results, headers="keys", tablefmt="github"))
+
+
+if __name__ == "__main__":
+    main()
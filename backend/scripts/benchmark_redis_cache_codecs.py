@@ -0,0 +1,181 @@
+"""Benchmark Redis Cache Codecs
+Compare encode/decode time and stored size of the RedisCache value codecs on
+flow-state payloads. No Redis server is needed: values go through the same
+CacheSerializer that RedisCache uses.
+
+Usage:
+    DATABASE_URL=postgresql://... python scripts/benchmark_redis_cache_codecs.py \
+        [--limit 200] [--rounds 20] [--compress-threshold 4096]
+
+With DATABASE_URL the payloads are real flow states (CrewAI persistence data
+and discovery flow state). Without it a synthetic discovery flow state with an
+import sample is used.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from tabulate import tabulate
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.caching.redis_cache.codec import (  # noqa: E402
+    MSGPACK_AVAILABLE,
+    CacheSerializer,
+    is_framed,
+)
+from app.services.caching.redis_cache.serializers import (  # noqa: E402
+    datetime_json_deserializer,
+)
+
+CODECS = ["json", "orjson"] + (["msgpack"] if MSGPACK_AVAILABLE else [])
+
+FLOW_STATE_QUERIES = [
+    "SELECT flow_persistence_data FROM migration.crewai_flow_state_extensions "
+    "ORDER BY updated_at DESC LIMIT :limit",
+    "SELECT crewai_state_data FROM migration.discovery_flows "
+    "ORDER BY updated_at DESC LIMIT :limit",
+]
+
+
+def synthetic_flow_state(rows: int = 500, seed: int = 11) -> dict:
+    """Discovery flow state shaped like the cached ones, with typed values"""
+    rng = random.Random(seed)
+    started = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    sample = [
+        {
+            "hostname": f"srv-{i:05d}",
+            "ip_address": f"10.0.{i >> 8}.{i & 255}",
+            "operating_system": rng.choice(["RHEL 8", "Windows 2019", "Ubuntu 22"]),
+            "cpu_cores": rng.choice([2, 4, 8, 16]),
+            "memory_gb": rng.choice([8, 16, 32, 64]),
+            "environment": rng.choice(["Production", "Staging", "Development"]),
+            "owner": f"team-{rng.randint(1, 40)}",
+        }
+        for i in range(rows)
+    ]
+    return {
+        "flow_id": uuid.uuid4(),
+        "client_account_id": uuid.uuid4(),
+        "engagement_id": uuid.uuid4(),
+        "current_phase": "field_mapping",
+        "created_at": started,
+        "updated_at": started + timedelta(minutes=42),
+        "phase_completion": {
+            "data_import": True,
+            "field_mapping": False,
+            "data_cleansing": False,
+        },
+        "raw_data": sample,
+        "field_mappings": {
+            column: {"target": column, "confidence": round(rng.random(), 3)}
+            for column in sample[0]
+        },
+        "agent_insights": [
+            {
+                "agent": "field_mapping",
+                "insight": f"Column {column} maps directly",
+                "timestamp": started + timedelta(seconds=i),
+            }
+            for i, column in enumerate(sample[0])
+        ],
+        "errors": [],
+        "warnings": [],
+    }
+
+
+async def load_flow_states(limit: int) -> list:
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        return []
+    engine = create_async_engine(
+        database_url.replace("postgresql://", "postgresql+asyncpg://"),
+        poolclass=NullPool,
+    )
+    payloads = []
+    try:
+        async with engine.connect() as conn:
+            for query in FLOW_STATE_QUERIES:
+                result = await conn.execute(text(query), {"limit": limit})
+                payloads.extend(row[0] for row in result if row[0])
+    finally:
+        await engine.dispose()
+    return payloads
+
+
+def decode(raw: str):
+    """Read a value the way RedisCache does; unframed entries are legacy JSON"""
+    if is_framed(raw):
+        return CacheSerializer.decode(raw)
+    return datetime_json_deserializer(json.loads(raw))
+
+
+def measure(serializer: CacheSerializer, payloads: list, rounds: int) -> dict:
+    encoded = [serializer.encode(payload) for payload in payloads]
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for payload in payloads:
+            serializer.encode(payload)
+    encode_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for raw in encoded:
+            decode(raw)
+    decode_seconds = time.perf_counter() - started
+
+    operations = rounds * len(payloads)
+    return {
+        "bytes": sum(len(raw) for raw in encoded),
+        "encode us": round(encode_seconds / operations * 1e6, 1),
+        "decode us": round(decode_seconds / operations * 1e6, 1),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--compress-threshold", type=int, default=4096)
+    args = parser.parse_args()
+
+    payloads = await load_flow_states(args.limit)
+    source = "database"
+    if not payloads:
+        payloads = [synthetic_flow_state(rows) for rows in (10, 100, 500, 2000)]
+        source = "synthetic"
+    print(f"{len(payloads)} {source} flow-state payloads, {args.rounds} rounds\n")
+
+    results = []
+    for codec in CODECS:
+        for compression in ("none", "zstd"):
+            serializer = CacheSerializer(codec, compression, args.compress_threshold)
+            results.append(
+                {
+                    "codec": codec,
+                    "compression": compression,
+                    **measure(serializer, payloads, args.rounds),
+                }
+            )
+
+    baseline = results[0]
+    for row in results:
+        row["size vs json"] = f"{row['bytes'] / baseline['bytes']:.0%}"
+        row["decode speedup"] = f"{baseline['decode us'] / row['decode us']:.1f}x"
+    print(tabulate(results, headers="keys", tablefmt="github"))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1 @@
+"""Unit tests for application deduplication services"""
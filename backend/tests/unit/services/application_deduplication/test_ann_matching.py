@@ -0,0 +1,101 @@
+"""
+Unit tests for choosing between the HNSW index and an exact tenant scan.
+
+The database is replaced with a fake that records which match query ran, so
+the tests only cover the scan decision and the exact-scan retry.
+"""
+
+import uuid
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.application_deduplication import ann_matching
+from app.services.application_deduplication.ann_matching import (
+    ANN_EXACT_SCAN_MAX_ROWS,
+    ANN_MATCH_QUERY,
+    EXACT_MATCH_QUERY,
+    query_ann_hits,
+    supports_iterative_scan,
+    use_exact_scan,
+)
+
+APP_ID = uuid.uuid4()
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def one(self):
+        return self.rows[0]
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    def __init__(self, version, tenant_rows, index_hits):
+        self.plan = SimpleNamespace(version=version, tenant_rows=tenant_rows)
+        self.index_hits = index_hits
+        self.queries = []
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        yield
+
+    async def execute(self, query, params=None):
+        if query is ann_matching.ANN_SCAN_PLAN_QUERY:
+            return FakeResult([self.plan])
+        self.queries.append(query)
+        if query is ANN_MATCH_QUERY:
+            positions = self.index_hits
+        elif query is EXACT_MATCH_QUERY:
+            positions = range(1, len(params["embeddings"]) + 1)
+        else:
+            return FakeResult([])
+        return FakeResult(
+            [SimpleNamespace(position=p, id=APP_ID, similarity=0.9) for p in positions]
+        )
+
+
+def test_iterative_scan_needs_pgvector_0_8():
+    assert supports_iterative_scan("0.8.0")
+    assert supports_iterative_scan("1.0")
+    assert not supports_iterative_scan("0.7.4")
+    assert not supports_iterative_scan(None)
+
+
+def test_small_tenants_and_old_pgvector_scan_exactly():
+    assert use_exact_scan("0.8.0", ANN_EXACT_SCAN_MAX_ROWS)
+    assert use_exact_scan("0.7.4", ANN_EXACT_SCAN_MAX_ROWS * 10)
+    assert not use_exact_scan("0.8.0", ANN_EXACT_SCAN_MAX_ROWS + 1)
+
+
+@pytest.mark.asyncio
+async def test_small_tenant_never_uses_the_global_index():
+    db = FakeSession("0.8.0", 5, index_hits=[])
+
+    hits = await query_ann_hits(db, [[1.0], [0.5]], uuid.uuid4(), uuid.uuid4())
+
+    assert set(hits) == {0, 1}
+    assert ANN_MATCH_QUERY not in db.queries
+
+
+@pytest.mark.asyncio
+async def test_vectors_the_index_missed_are_retried_exactly():
+    db = FakeSession("0.8.0", ANN_EXACT_SCAN_MAX_ROWS + 1, index_hits=[1])
+
+    hits = await query_ann_hits(db, [[1.0], [0.5]], uuid.uuid4(), uuid.uuid4())
+
+    assert set(hits) == {0, 1}
+    assert db.queries[-1] is EXACT_MATCH_QUERY
+
+
+@pytest.mark.asyncio
+async def test_tenant_without_embeddings_skips_matching():
+    db = FakeSession("0.8.0", 0, index_hits=[])
+
+    assert await query_ann_hits(db, [[1.0]], uuid.uuid4(), uuid.uuid4()) == {}
+    assert db.queries == []
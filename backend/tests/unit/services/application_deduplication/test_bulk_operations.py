@@ -0,0 +1,118 @@
+"""
+Unit tests for set-wise bulk application deduplication.
+
+Only the in-memory resolution is covered: hits against existing applications
+are passed in directly, as the batched database lookups would return them.
+"""
+
+import uuid
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.models.canonical_applications import CanonicalApplication, MatchMethod
+from app.services.application_deduplication.bulk_matching import (
+    group_application_names,
+    resolve_pending_groups,
+)
+from app.services.application_deduplication.config import DeduplicationConfig
+from app.services.application_deduplication.matching import FuzzyMatcher
+
+
+def _unit(*values):
+    vector = np.zeros(8, dtype=np.float32)
+    vector[: len(values)] = values
+    return vector.tolist()
+
+
+@pytest.fixture
+def service():
+    return SimpleNamespace(
+        config=DeduplicationConfig(enable_vector_search=True),
+        fuzzy_matcher=FuzzyMatcher(),
+    )
+
+
+def _pending(*names, embeddings=None):
+    groups = list(group_application_names(list(names)).values())
+    for group, embedding in zip(groups, embeddings or []):
+        group.embedding = embedding
+    return groups
+
+
+class TestGroupApplicationNames:
+    """Tests for grouping input names by normalized form."""
+
+    def test_names_with_same_normalized_form_share_a_group(self):
+        groups = list(
+            group_application_names(["SAP ERP", "sap  erp", "Oracle", "SAP ERP"])
+        )
+
+        assert len(groups) == 2
+
+    def test_names_without_matchable_text_are_skipped(self):
+        groups = group_application_names(["!!!", "Portal"])
+
+        assert [group.names for group in groups.values()] == [["Portal"]]
+
+
+class TestResolvePendingGroups:
+    """Tests for matching names against existing and earlier new applications."""
+
+    def test_existing_hits_win_and_unmatched_names_become_new(self, service):
+        existing = CanonicalApplication(
+            canonical_name="Customer Portal",
+            client_account_id=uuid.uuid4(),
+            engagement_id=uuid.uuid4(),
+        )
+        pending = _pending("Customer Portl", "Billing")
+
+        resolve_pending_groups(
+            service, pending, [(existing, 0.93), None], [None, None], 100
+        )
+
+        assert pending[0].canonical is existing
+        assert pending[0].match_method == MatchMethod.FUZZY_TEXT
+        assert pending[1].is_new_canonical
+        assert pending[1].new_id is not None
+
+    def test_later_names_fuzzy_match_new_applications_from_the_list(self, service):
+        pending = _pending("Inventory Manager", "Inventory Managr")
+
+        resolve_pending_groups(service, pending, [None, None], [None, None], 100)
+
+        assert pending[0].is_new_canonical
+        assert pending[1].parent is pending[0]
+        assert pending[1].match_method == MatchMethod.FUZZY_TEXT
+        assert pending[1].root is pending[0]
+
+    def test_later_names_vector_match_new_applications_from_the_list(self, service):
+        pending = _pending(
+            "Payroll", "Salary System", embeddings=[_unit(1), _unit(1, 0.1)]
+        )
+
+        resolve_pending_groups(service, pending, [None, None], [None, None], 100)
+
+        assert pending[1].parent is pending[0]
+        assert pending[1].match_method == MatchMethod.VECTOR_SIMILARITY
+        assert pending[1].similarity_score == pytest.approx(0.995, abs=1e-3)
+
+    def test_fuzzy_pool_is_bounded(self, service):
+        pending = _pending("Inventory Manager", "Inventory Managr")
+
+        resolve_pending_groups(service, pending, [None, None], [None, None], 0)
+
+        assert pending[0].is_new_canonical
+        assert pending[1].is_new_canonical
+
+
+class TestFuzzyBestMatch:
+    """Tests for the length-bounded Levenshtein search."""
+
+    def test_best_candidate_above_threshold(self):
+        matcher = FuzzyMatcher()
+        candidates = [("customer portal", "a"), ("customer portals", "b")]
+
+        assert matcher.best_match("customer portal", candidates, 0.85) == ("a", 1.0)
+        assert matcher.best_match("billing", candidates, 0.85) is None
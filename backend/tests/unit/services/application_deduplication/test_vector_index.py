@@ -0,0 +1,133 @@
+"""
+Unit tests for the per-engagement application vector index.
+
+The database is replaced by a fake session returning (id, embedding) rows so
+the tests only cover loading, incremental updates and batch top-k search.
+"""
+
+import uuid
+
+import numpy as np
+import pytest
+
+from app.services.application_deduplication.vector_index import (
+    EngagementVectorIndex,
+    VectorIndexRegistry,
+)
+
+CLIENT = uuid.uuid4()
+ENGAGEMENT = uuid.uuid4()
+
+
+def _unit(*values):
+    vector = np.zeros(8, dtype=np.float32)
+    vector[: len(values)] = values
+    return vector.tolist()
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    async def execute(self, statement):
+        self.queries += 1
+        return FakeResult(self.rows)
+
+
+@pytest.fixture
+def ids():
+    return [uuid.uuid4() for _ in range(3)]
+
+
+@pytest.fixture
+def index(ids):
+    index = EngagementVectorIndex()
+    index.add_many(ids, [_unit(1), _unit(0, 1), _unit(1, 1)])
+    return index
+
+
+class TestEngagementVectorIndex:
+    """Tests for the normalized embedding matrix."""
+
+    def test_batch_search_returns_best_match_per_query(self, index, ids):
+        results = index.search([_unit(2), _unit(0, 3), _unit(1, 0.9)])
+
+        assert [hits[0][0] for hits in results] == [ids[0], ids[1], ids[2]]
+        assert results[0][0][1] == pytest.approx(1.0)
+
+    def test_top_k_is_sorted_and_bounded(self, index, ids):
+        hits = index.search([_unit(1, 0.2)], k=5)[0]
+
+        assert [app_id for app_id, _ in hits] == [ids[0], ids[2], ids[1]]
+        assert [score for _, score in hits] == sorted(
+            (score for _, score in hits), reverse=True
+        )
+
+    def test_unusable_embeddings_are_skipped(self, index):
+        assert index.add(uuid.uuid4(), [1.0, 2.0]) is False
+        assert index.add(uuid.uuid4(), [float("nan")] * 8) is False
+        assert index.search([[1.0, 2.0]]) == [[]]
+        assert len(index) == 3
+
+    def test_add_replace_and_remove(self, index, ids):
+        new_id = uuid.uuid4()
+        index.add(new_id, _unit(0, 0, 1))
+        index.add(ids[0], _unit(0, 0, 0, 1))
+        index.remove(ids[1])
+
+        assert len(index) == 3
+        assert index.search([_unit(0, 0, 1)])[0][0][0] == new_id
+        assert index.search([_unit(0, 0, 0, 1)])[0][0][0] == ids[0]
+        assert index.search([_unit(0, 1)])[0][0][0] != ids[1]
+
+    def test_grows_past_initial_capacity(self):
+        index = EngagementVectorIndex()
+        app_ids = [uuid.uuid4() for _ in range(100)]
+        rng = np.random.default_rng(0)
+        vectors = rng.normal(size=(100, 8))
+        for app_id, vector in zip(app_ids, vectors):
+            index.add(app_id, vector.tolist())
+
+        hits = index.search(vectors.tolist())
+
+        assert [h[0][0] for h in hits] == app_ids
+
+
+class TestVectorIndexRegistry:
+    """Tests for per-engagement loading and updates."""
+
+    @pytest.mark.asyncio
+    async def test_registry_loads_once_and_tracks_new_apps(self, ids):
+        session = FakeSession([(ids[0], _unit(1)), (ids[1], None)])
+        registry = VectorIndexRegistry()
+
+        index = await registry.get(session, CLIENT, ENGAGEMENT, max_age_seconds=60)
+        new_id = uuid.uuid4()
+        registry.add(CLIENT, ENGAGEMENT, new_id, _unit(0, 1))
+        again = await registry.get(session, CLIENT, ENGAGEMENT, max_age_seconds=60)
+
+        assert again is index
+        assert session.queries == 1
+        assert len(index) == 2
+        assert index.search([_unit(0, 1)])[0][0][0] == new_id
+
+    @pytest.mark.asyncio
+    async def test_registry_reloads_expired_and_invalidated(self, ids):
+        session = FakeSession([(ids[0], _unit(1))])
+        registry = VectorIndexRegistry()
+
+        await registry.get(session, CLIENT, ENGAGEMENT, max_age_seconds=0)
+        await registry.get(session, CLIENT, ENGAGEMENT, max_age_seconds=-1)
+        registry.invalidate(CLIENT, ENGAGEMENT)
+        await registry.get(session, CLIENT, ENGAGEMENT, max_age_seconds=60)
+
+        assert session.queries == 3
@@ -0,0 +1,244 @@
+"""
+Unit tests for the COPY-based bulk asset ingestion path.
+
+Covers row validation and typing and the generated merge SQL; the COPY and
+merge statements themselves need PostgreSQL and are exercised by
+scripts/benchmark_bulk_asset_ingestion.py.
+"""
+
+import json
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.asset_service.deduplication import bulk_ingestion
+from app.services.asset_service.deduplication.batch_operations import (
+    _ingest_via_copy,
+)
+from app.services.asset_service.deduplication.bulk_ingestion import (
+    BulkIngestReport,
+    BulkIngestRowsFailed,
+    IngestRowResult,
+    failed_asset_record,
+)
+from app.services.asset_service.deduplication.bulk_ingestion_sql import (
+    insert_assets_sql,
+    merge_existing_sql,
+)
+from app.services.asset_service.deduplication.bulk_ingestion_staging import (
+    staged_columns,
+    staging_record,
+    supports_copy_ingestion,
+)
+
+CLIENT = uuid.uuid4()
+ENGAGEMENT = uuid.uuid4()
+FLOW = str(uuid.uuid4())
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _record(asset_data, ordinal=0):
+    record = staging_record(
+        asset_data, ordinal, CLIENT, ENGAGEMENT, (FLOW, None, FLOW), None, NOW
+    )
+    names = [name for name, _, _ in staged_columns()] + ["ordinal"]
+    return dict(zip(names, record))
+
+
+class TestStagingRecord:
+    """Tests for validating and typing one import row."""
+
+    def test_values_are_typed_for_copy(self):
+        row = _record(
+            {
+                "name": "web-01",
+                "asset_type": "server",
+                "cpu_cores": "8",
+                "memory_gb": "15.5",
+                "pii_flag": "Yes",
+                "rack_location": "R" * 80,
+                "custom_attributes": {"rack": 4},
+                "master_flow_id": FLOW,
+            },
+            ordinal=3,
+        )
+
+        assert row["cpu_cores"] == 8
+        assert row["memory_gb"] == 15.5
+        assert row["pii_flag"] is True
+        assert len(row["rack_location"]) == 50
+        assert row["status"] == "discovered"
+        assert row["master_flow_id"] == uuid.UUID(FLOW)
+        assert json.loads(row["custom_attributes"]) == {"rack": 4}
+        assert "master_flow_id" not in json.loads(row["raw_data"])
+        assert row["ordinal"] == 3
+
+    def test_missing_fields_use_model_defaults_or_insert_defaults(self):
+        row = _record({"name": "db-01"})
+
+        # Filled in by the INSERT, so upserts never merge a default
+        assert row["asset_type"] is None
+        assert row["environment"] is None
+        assert row["assessment_readiness"] == "not_ready"
+        assert json.loads(row["phase_context"]) == {}
+
+    def test_empty_check_constraint_values_become_null(self):
+        assert (
+            _record({"name": "app", "application_type": ""})["application_type"] is None
+        )
+
+    @pytest.mark.parametrize(
+        "asset_data, column",
+        [
+            ({"name": "x", "pii_flag": "sometimes"}, "pii_flag"),
+            ({"name": "x", "imported_by": "not-a-uuid"}, "imported_by"),
+            ({"name": "x", "raw": float("nan")}, "raw_data"),
+        ],
+    )
+    def test_unconvertible_values_fail_the_row(self, asset_data, column):
+        with pytest.raises(ValueError, match=column):
+            _record(asset_data)
+
+
+class TestMergeSql:
+    """Tests for the generated insert and upsert statements."""
+
+    def test_insert_applies_defaults_and_skips_staging_columns(self):
+        sql = insert_assets_sql()
+        insert_columns = sql.split("INSERT INTO migration.assets (", 1)[1].split(")")[0]
+
+        assert "COALESCE(asset_type, :default_asset_type)" in sql
+        assert "ON CONFLICT DO NOTHING" in sql
+        assert "ordinal" not in insert_columns
+        assert "existing_id" not in insert_columns
+
+    def test_enrich_keeps_existing_values_and_overwrite_replaces_them(self):
+        enrich = merge_existing_sql("enrich")
+        overwrite = merge_existing_sql("overwrite")
+
+        assert (
+            "operating_system = COALESCE(a.operating_system, s.operating_system)"
+            in enrich
+        )
+        assert "ORDER BY existing_id, ordinal ASC" in enrich
+        assert (
+            "operating_system = COALESCE(s.operating_system, a.operating_system)"
+            in overwrite
+        )
+        assert "ORDER BY existing_id, ordinal DESC" in overwrite
+
+    def test_identity_fields_are_never_merged(self):
+        for sql in (merge_existing_sql("enrich"), merge_existing_sql("overwrite")):
+            assert "hostname =" not in sql
+            assert " name =" not in sql
+            assert "client_account_id =" not in sql
+
+
+class TestReport:
+    """Tests for the report and path selection."""
+
+    def test_counts_by_status(self):
+        report = BulkIngestReport(
+            rows=[
+                IngestRowResult(0, "created"),
+                IngestRowResult(1, "existed", duplicate_of_row=0),
+                IngestRowResult(2, "failed", error="bad"),
+            ],
+            elapsed_seconds=0.5,
+        )
+
+        assert report.counts() == {
+            "created": 1,
+            "existed": 1,
+            "updated": 0,
+            "failed": 1,
+        }
+        assert report.rows_per_second == 6
+
+    def test_copy_path_needs_asyncpg(self):
+        def session(driver):
+            dialect = SimpleNamespace(driver=driver)
+            return SimpleNamespace(get_bind=lambda: SimpleNamespace(dialect=dialect))
+
+        assert supports_copy_ingestion(session("asyncpg"))
+        assert not supports_copy_ingestion(session("pysqlite"))
+        assert not supports_copy_ingestion(object())
+
+
+class TestFailureReporting:
+    """Tests for reporting rows the COPY path could not ingest."""
+
+    ROWS = [
+        {"name": "web-01", "ip_address": "10.0.0.1"},
+        {"name": "web-02", "ip_address": "10.0.0.2"},
+    ]
+
+    def test_failure_records_match_the_batch_path(self):
+        report = BulkIngestReport(
+            rows=[
+                IngestRowResult(0, "created", asset_id=uuid.uuid4()),
+                IngestRowResult(1, "failed", error="pii_flag: not a boolean"),
+            ]
+        )
+
+        assert report.failure_records(self.ROWS) == [
+            failed_asset_record(self.ROWS[1], "pii_flag: not a boolean")
+        ]
+        assert failed_asset_record(self.ROWS[1], ValueError("bad")) == {
+            "asset_name": "web-02",
+            "error": "bad",
+            "ip_address": "10.0.0.2",
+        }
+
+    @pytest.mark.asyncio
+    async def test_failed_rows_are_raised_with_the_ingested_ones(self, monkeypatch):
+        asset = SimpleNamespace(id=uuid.uuid4(), name="web-01")
+        report = BulkIngestReport(
+            rows=[
+                IngestRowResult(0, "created", asset_id=asset.id),
+                IngestRowResult(1, "failed", error="violates chk_assets_pii_flag"),
+            ]
+        )
+
+        async def fake_ingest(*args, **kwargs):
+            return report
+
+        async def fake_load(db, ingested):
+            return [(asset, "created")]
+
+        monkeypatch.setattr(bulk_ingestion, "bulk_ingest_assets", fake_ingest)
+        monkeypatch.setattr(bulk_ingestion, "load_ingested_assets", fake_load)
+
+        with pytest.raises(BulkIngestRowsFailed) as raised:
+            await _ingest_via_copy(
+                SimpleNamespace(db=None), self.ROWS, FLOW, False, "enrich"
+            )
+
+        assert raised.value.results == [(asset, "created")]
+        assert raised.value.failures == [
+            failed_asset_record(self.ROWS[1], "violates chk_assets_pii_flag")
+        ]
+
+    @pytest.mark.asyncio
+    async def test_clean_ingest_returns_results(self, monkeypatch):
+        asset = SimpleNamespace(id=uuid.uuid4(), name="web-01")
+        report = BulkIngestReport(
+            rows=[IngestRowResult(0, "created", asset_id=asset.id)]
+        )
+
+        async def fake_ingest(*args, **kwargs):
+            return report
+
+        async def fake_load(db, ingested):
+            return [(asset, "created")]
+
+        monkeypatch.setattr(bulk_ingestion, "bulk_ingest_assets", fake_ingest)
+        monkeypatch.setattr(bulk_ingestion, "load_ingested_assets", fake_load)
+
+        results = await _ingest_via_copy(
+            SimpleNamespace(db=None), self.ROWS[:1], FLOW, False, "enrich"
+        )
+
+        assert results == [(asset, "created")]
@@ -0,0 +1,163 @@
+"""
+Shared fixtures for RedisCache tests.
+
+FakeRedis keeps strings, sets and sorted sets in dictionaries and counts
+round trips: one per direct command, one per executed pipeline. The tag index
+scripts are emulated in Python, keyed by script text.
+"""
+
+import fnmatch
+
+import pytest
+
+from app.core.security.cache_encryption import SecureCache
+from app.services.caching.redis_cache import RedisCache
+from app.services.caching.redis_cache.near_cache import LayerStats
+from app.services.caching.redis_cache.tags import (
+    INVALIDATE_TAG_CHUNK_SCRIPT,
+    TAG_KEYS_SCRIPT,
+)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        self.redis.round_trips += 1
+        self.redis.pipeline_commands.extend(self.commands)
+        results = []
+        for name, args, kwargs in self.commands:
+            results.append(getattr(self.redis, f"_{name}")(*args, **kwargs))
+        return results
+
+
+class FakeRedis:
+    def __init__(self):
+        self.strings = {}
+        self.sets = {}
+        # key -> {member: score}
+        self.zsets = {}
+        self.ttls = {}
+        self.published = []
+        self.round_trips = 0
+        self.scans = 0
+        self.invalidation_steps = 0
+        self.pipeline_commands = []
+
+    def __getattr__(self, name):
+        command = getattr(self, f"_{name}")
+
+        async def call(*args, **kwargs):
+            self.round_trips += 1
+            return command(*args, **kwargs)
+
+        return call
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def _get(self, key):
+        return self.strings.get(key)
+
+    def _mget(self, *keys):
+        return [self.strings.get(key) for key in keys]
+
+    def _set(self, key, value, ex=None, nx=False):
+        if nx and key in self.strings:
+            return None
+        self.strings[key] = value
+        if ex:
+            self.ttls[key] = ex
+        return True
+
+    def _setex(self, key, ttl, value):
+        return self._set(key, value, ex=ttl)
+
+    def _delete(self, *keys):
+        deleted = 0
+        for key in keys:
+            found = self.strings.pop(key, None) is not None
+            found = self.sets.pop(key, None) is not None or found
+            found = self.zsets.pop(key, None) is not None or found
+            deleted += found
+        return deleted
+
+    def _exists(self, key):
+        return int(key in self.strings or key in self.sets or key in self.zsets)
+
+    def _expire(self, key, ttl):
+        self.ttls[key] = ttl
+        return True
+
+    def _sadd(self, key, *members):
+        members_set = self.sets.setdefault(key, set())
+        added = len(set(members) - members_set)
+        members_set.update(members)
+        return added
+
+    def _srem(self, key, *members):
+        members_set = self.sets.get(key, set())
+        removed = len(members_set & set(members))
+        members_set.difference_update(members)
+        return removed
+
+    def _smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+    def _publish(self, channel, message):
+        self.published.append((channel, message))
+        return 0
+
+    def _eval(self, script, numkeys, *keys_and_args):
+        keys, args = keys_and_args[:numkeys], keys_and_args[numkeys:]
+        if script == TAG_KEYS_SCRIPT:
+            now, ttl, members = int(args[0]), int(args[1]), args[2:]
+            for tag_set in keys:
+                scores = self.zsets.setdefault(tag_set, {})
+                for member in [m for m, score in scores.items() if score <= now]:
+                    del scores[member]
+                scores.update((member, now + ttl) for member in members)
+                self.ttls[tag_set] = max(self.ttls.get(tag_set, 0), ttl)
+            return len(keys)
+        if script == INVALIDATE_TAG_CHUNK_SCRIPT:
+            self.invalidation_steps += 1
+            scores = self.zsets.get(keys[0], {})
+            members = sorted(scores)[: int(args[0])]
+            deleted = self._delete(*members) if members else 0
+            for member in members:
+                del scores[member]
+            if not scores:
+                self.zsets.pop(keys[0], None)
+            return [deleted, len(scores)] + members
+        raise NotImplementedError(script)
+
+    def _scan(self, cursor=0, match=None, count=None):
+        self.scans += 1
+        keys = sorted(set(self.strings) | set(self.sets) | set(self.zsets))
+        return 0, [key for key in keys if match is None or fnmatch.fnmatch(key, match)]
+
+
+@pytest.fixture
+def fake_redis():
+    return FakeRedis()
+
+
+@pytest.fixture
+def cache(fake_redis):
+    cache = RedisCache.__new__(RedisCache)
+    cache.enabled = True
+    cache.client = fake_redis
+    cache.client_type = "async"
+    cache.default_ttl = 3600
+    cache.redis_stats = LayerStats()
+    cache.secure_cache = SecureCache(cache)
+    return cache
@@ -0,0 +1,206 @@
+"""
+Unit tests for RedisCache batch operations.
+
+The cache runs against the in-memory FakeRedis from conftest, which counts
+round trips so each test can assert how many requests an operation makes.
+"""
+
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.services.caching.redis_cache.near_cache import NearCache
+from app.services.caching.redis_cache.wrappers import AsyncUpstashWrapper
+
+
+class TestBatchApis:
+    """Tests for mget/mset/delete_many on the base cache."""
+
+    @pytest.mark.asyncio
+    async def test_mset_then_mget_round_trip_typed_values(self, cache, fake_redis):
+        flow_id = uuid.uuid4()
+        created = datetime(2025, 1, 1, 12, 30)
+
+        assert await cache.mset({"a": {"id": flow_id}, "b": created, "c": "raw"}, 60)
+        values = await cache.mget(["a", "missing", "b", "c"])
+
+        assert values == [{"id": flow_id}, None, created, "raw"]
+        assert fake_redis.ttls == {"a": 60, "b": 60, "c": 60}
+        assert fake_redis.round_trips == 2
+
+    @pytest.mark.asyncio
+    async def test_delete_many_is_one_command(self, cache, fake_redis):
+        await cache.mset({"a": 1, "b": 2})
+        fake_redis.round_trips = 0
+
+        assert await cache.delete_many(["a", "b", "c"]) == 2
+        assert fake_redis.round_trips == 1
+
+    @pytest.mark.asyncio
+    async def test_empty_batches_skip_redis(self, cache, fake_redis):
+        assert await cache.mget([]) == []
+        assert await cache.mset({}) is True
+        assert await cache.delete_many([]) == 0
+        assert fake_redis.round_trips == 0
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_falls_back(self, cache):
+        cache.enabled = False
+
+        assert await cache.mget(["a"]) == []
+        assert await cache.mset({"a": 1}) is True
+        assert await cache.get_flow_states(["f1"]) == {}
+
+
+class TestFlowMixin:
+    """Tests for flow operations issuing batched round trips."""
+
+    @pytest.mark.asyncio
+    async def test_register_flow_writes_every_key_in_one_pipeline(
+        self, cache, fake_redis
+    ):
+        registered = await cache.register_flow_atomic(
+            "f1", "discovery", {"engagement_id": "e1"}, ttl=120
+        )
+
+        assert registered is True
+        # Existence check plus one pipeline
+        assert fake_redis.round_trips == 2
+        assert fake_redis.sets["flows:active:discovery"] == {"f1"}
+        assert json.loads(fake_redis.strings["flow:metadata:f1"])["engagement_id"] == (
+            "e1"
+        )
+        assert await cache.register_flow_atomic("f1", "discovery", {}) is False
+
+    @pytest.mark.asyncio
+    async def test_register_flow_succeeds_when_nobody_hears_the_publish(
+        self, cache, fake_redis
+    ):
+        cache.near_cache = NearCache({"flow:state": 5})
+        cache.near_cache.set_active(True)
+        fake_redis.sets["flows:active:discovery"] = {"f0"}
+
+        registered = await cache.register_flow_atomic("f1", "discovery", {})
+
+        # PUBLISH reached no subscribers and returned 0
+        assert fake_redis.published
+        assert registered is True
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("client_type", ["async", "upstash"])
+    async def test_unregister_flow_with_the_near_cache_on(
+        self, cache, fake_redis, client_type
+    ):
+        cache.client_type = client_type
+        cache.near_cache = NearCache({"flow:state": 5})
+        cache.near_cache.set_active(True)
+        if client_type == "upstash":
+            fake_redis.strings["flows:active:discovery"] = json.dumps(["f0", "f1"])
+        else:
+            fake_redis.sets["flows:active:discovery"] = {"f0", "f1"}
+
+        unregistered = await cache.unregister_flow_atomic("f1", "discovery")
+
+        assert unregistered is True
+        assert await cache.get_active_flows("discovery") == ["f0"]
+        assert json.loads(fake_redis.published[0][1]) == {"keys": ["flow:state:f1"]}
+
+    @pytest.mark.asyncio
+    async def test_unregister_unknown_flow_ignores_the_publish_reply(
+        self, cache, fake_redis
+    ):
+        cache.near_cache = NearCache({"flow:state": 5})
+        cache.near_cache.set_active(True)
+        # Another worker hears the invalidation; nothing was deleted
+        fake_redis._publish = lambda channel, message: 1
+
+        assert await cache.unregister_flow_atomic("f1", "discovery") is False
+
+    @pytest.mark.asyncio
+    async def test_invalidate_deletes_flow_keys_in_two_round_trips(
+        self, cache, fake_redis
+    ):
+        fake_redis.strings.update(
+            {
+                "flow:state:f1": "{}",
+                "flow:metadata:f1": "{}",
+                "lock:flow:f1": "token",
+                "flow:state:f2": "{}",
+            }
+        )
+
+        assert await cache.invalidate_flow_cache("f1") is True
+        assert set(fake_redis.strings) == {"flow:state:f2"}
+        # One drain step for the empty flow tag set, one DEL for the plain keys
+        assert fake_redis.round_trips == 2
+
+    @pytest.mark.asyncio
+    async def test_get_flow_states_reads_all_flows_with_one_mget(
+        self, cache, fake_redis
+    ):
+        fake_redis.strings["flow:state:f1"] = json.dumps(
+            {"encrypted": False, "data": {"phase": "mapping"}}
+        )
+
+        states = await cache.get_flow_states(["f1", "f2"])
+
+        assert states == {"f1": {"phase": "mapping"}, "f2": None}
+        assert fake_redis.round_trips == 1
+
+
+class TestSseMixin:
+    """Tests for SSE registration and lookup."""
+
+    @pytest.mark.asyncio
+    async def test_register_stores_and_publishes_in_one_round_trip(
+        self, cache, fake_redis
+    ):
+        assert await cache.register_sse_client("c1", "f1") is True
+
+        assert fake_redis.round_trips == 1
+        assert json.loads(fake_redis.published[0][1])["client_id"] == "c1"
+
+    @pytest.mark.asyncio
+    async def test_clients_are_matched_from_one_mget_per_scan_page(
+        self, cache, fake_redis
+    ):
+        for client_id, flow_id in [("c1", "f1"), ("c2", "f2"), ("c3", "f1")]:
+            fake_redis.strings[f"sse:client:{client_id}"] = json.dumps(
+                {"flow_id": flow_id}
+            )
+
+        assert await cache.get_sse_clients("f1") == ["c1", "c3"]
+        assert fake_redis.round_trips == 2
+
+
+class TestUpstashWrapper:
+    """Tests for adapting the Upstash REST pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_pipeline_execute_sends_one_batch(self):
+        class Pipeline:
+            def __init__(self):
+                self.commands = []
+
+            def setex(self, *args):
+                self.commands.append(("setex", args))
+                return self
+
+            async def exec(self):
+                return [True for _ in self.commands]
+
+        class Client:
+            def pipeline(self):
+                return Pipeline()
+
+            async def get(self, key):
+                return key
+
+        client = AsyncUpstashWrapper(Client())
+        pipeline = client.pipeline()
+        pipeline.setex("a", 10, "1").setex("b", 10, "2")
+
+        assert await pipeline.execute() == [True, True]
+        assert await client.get("k") == "k"
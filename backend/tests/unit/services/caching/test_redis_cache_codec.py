@@ -0,0 +1,145 @@
+"""
+Unit tests for the Redis cache value codecs.
+
+Round trips run through CacheSerializer directly; cache-level tests use the
+in-memory FakeRedis from conftest.
+"""
+
+import json
+import uuid
+from datetime import date, datetime, time, timezone
+
+import pytest
+
+from app.core.config import settings
+from app.services.caching.redis_cache.codec import (
+    FLAG_BASE,
+    FLAG_TYPED,
+    FLAG_ZSTD,
+    FORMAT_VERSION,
+    CacheSerializer,
+    is_framed,
+)
+
+FLOW_ID = uuid.uuid4()
+TYPED_STATE = {
+    "flow_id": FLOW_ID,
+    "created_at": datetime(2025, 3, 1, 12, 30, tzinfo=timezone.utc),
+    "due": date(2025, 4, 1),
+    "window": time(9, 15),
+    "checksum": b"\x00\xff",
+    "phases": [{"name": "field_mapping", "progress": 42.5, "done": False}],
+}
+
+
+def _flags(encoded):
+    return ord(encoded[2]) - FLAG_BASE
+
+
+def _framed(serializer, value):
+    encoded = serializer.encode(value)
+    # Plain JSON is written unframed; frame it for the decode under test
+    if not is_framed(encoded):
+        encoded = FORMAT_VERSION + "j" + chr(FLAG_BASE | FLAG_TYPED) + encoded
+    return encoded
+
+
+class TestRoundTrip:
+    """Tests for encoding and decoding values with each codec."""
+
+    @pytest.mark.parametrize("codec", ["json", "msgpack"])
+    @pytest.mark.parametrize("compression", [None, "zstd"])
+    def test_typed_values_survive(self, codec, compression):
+        serializer = CacheSerializer(codec, compression, compress_threshold=0)
+
+        assert serializer.decode(_framed(serializer, TYPED_STATE)) == TYPED_STATE
+
+    def test_orjson_keeps_datetimes_and_returns_uuids_as_strings(self):
+        serializer = CacheSerializer("orjson")
+
+        decoded = serializer.decode(serializer.encode(TYPED_STATE))
+
+        assert decoded["created_at"] == TYPED_STATE["created_at"]
+        assert decoded["checksum"] == b"\x00\xff"
+        assert decoded["flow_id"] == str(FLOW_ID)
+
+    def test_plain_payloads_skip_the_typed_pass(self):
+        encoded = CacheSerializer("orjson").encode({"rows": [1, 2, 3]})
+
+        assert not _flags(encoded) & FLAG_TYPED
+        assert _flags(CacheSerializer("orjson").encode(TYPED_STATE)) & FLAG_TYPED
+
+    def test_unsupported_types_are_rejected(self):
+        with pytest.raises(TypeError):
+            CacheSerializer("msgpack").encode({"value": object()})
+
+
+class TestFraming:
+    """Tests for the header, compression and legacy compatibility."""
+
+    def test_uncompressed_json_stays_legacy_compatible(self):
+        encoded = CacheSerializer("json").encode({"a": 1})
+
+        assert not is_framed(encoded)
+        assert json.loads(encoded) == {"a": 1}
+
+    def test_default_settings_write_entries_older_releases_can_read(self):
+        serializer = CacheSerializer(
+            settings.REDIS_CACHE_CODEC,
+            settings.REDIS_CACHE_COMPRESSION,
+            settings.REDIS_CACHE_COMPRESS_THRESHOLD,
+        )
+        large = {"rows": [{"hostname": f"web-{i:04d}"} for i in range(500)]}
+
+        encoded = serializer.encode(large)
+
+        assert not is_framed(encoded)
+        assert json.loads(encoded) == large
+
+    def test_header_carries_version_codec_and_flags(self):
+        encoded = CacheSerializer("msgpack").encode({"a": 1})
+
+        assert encoded[:2] == FORMAT_VERSION + "m"
+        assert _flags(encoded) == 0
+
+    def test_only_large_bodies_are_compressed(self):
+        serializer = CacheSerializer("msgpack", "zstd", compress_threshold=256)
+        large = {"rows": [{"hostname": f"web-{i:04d}"} for i in range(200)]}
+
+        assert not _flags(serializer.encode({"a": 1})) & FLAG_ZSTD
+        encoded = serializer.encode(large)
+        assert _flags(encoded) & FLAG_ZSTD
+        assert serializer.decode(encoded) == large
+
+    def test_unknown_codec_is_rejected(self):
+        with pytest.raises(ValueError):
+            CacheSerializer.decode(FORMAT_VERSION + "x@{}")
+        with pytest.raises(ValueError):
+            CacheSerializer("pickle")
+
+
+class TestCacheIntegration:
+    """Tests for RedisCache reads and writes across codecs."""
+
+    @pytest.mark.asyncio
+    async def test_values_round_trip_through_the_cache(self, cache, fake_redis):
+        cache.serializer = CacheSerializer("msgpack", "zstd", compress_threshold=0)
+
+        assert await cache.set("flow:state:f1", TYPED_STATE) is True
+
+        assert is_framed(fake_redis.strings["flow:state:f1"])
+        assert await cache.get("flow:state:f1") == TYPED_STATE
+
+    @pytest.mark.asyncio
+    async def test_legacy_json_entries_still_read(self, cache, fake_redis):
+        legacy = CacheSerializer("json").encode(TYPED_STATE)
+        fake_redis.strings["flow:state:old"] = legacy
+        cache.serializer = CacheSerializer("msgpack")
+
+        assert await cache.get("flow:state:old") == TYPED_STATE
+
+    @pytest.mark.asyncio
+    async def test_unreadable_entries_are_a_cache_miss(self, cache, fake_redis):
+        fake_redis.strings["flow:state:bad"] = FORMAT_VERSION + "m@not-base64!"
+
+        assert await cache.get("flow:state:bad") is None
@@ -0,0 +1,216 @@
+"""
+Unit tests for the tag-based invalidation index.
+
+The cache runs against the in-memory FakeRedis from conftest, which emulates
+the tag scripts and counts SCAN calls.
+"""
+
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.caching.auth_cache_service.cache_operations import (
+    CacheOperationsMixin,
+)
+from app.services.caching.invalidation_strategies import (
+    EventDrivenInvalidationStrategy,
+    InvalidationEvent,
+    InvalidationPriority,
+    InvalidationTrigger,
+)
+from app.services.caching.redis_cache import tags
+from app.services.caching.redis_cache.tags import (
+    entity_tags,
+    prefix_tags,
+    split_patterns,
+    tags_for_pattern,
+)
+
+
+class TestTagNames:
+    """Tests for deriving tags from keys and patterns."""
+
+    def test_prefix_tags_cover_every_parent_namespace(self):
+        assert prefix_tags("v1:user:42:context") == [
+            "prefix:v1",
+            "prefix:v1:user",
+            "prefix:v1:user:42",
+        ]
+        assert prefix_tags("plain") == []
+
+    @pytest.mark.parametrize(
+        "pattern, tags",
+        [
+            ("v1:user:42:*", ["prefix:v1:user:42"]),
+            ("flow:phase:*:f1", None),
+            ("v1:user*", None),
+            ("*", None),
+        ],
+    )
+    def test_only_trailing_namespace_wildcards_resolve(self, pattern, tags):
+        assert tags_for_pattern(pattern) == tags
+
+    def test_indexed_patterns_are_scanned_only_with_the_fallback(self):
+        patterns = ["v1:user:42:*", "flow:phase:*:f1"]
+
+        assert split_patterns(patterns) == (
+            ["prefix:v1:user:42"],
+            ["flow:phase:*:f1"],
+        )
+        assert split_patterns(patterns, scan_fallback=True) == (
+            ["prefix:v1:user:42"],
+            patterns,
+        )
+
+    def test_entity_tags_skip_missing_scopes(self):
+        assert entity_tags("f1", None, "c1") == ["flow:f1", "client:c1"]
+
+
+class TestTaggedWrites:
+    """Tests for indexing keys as they are written."""
+
+    @pytest.mark.asyncio
+    async def test_tagged_set_indexes_in_the_same_round_trip(self, cache, fake_redis):
+        assert await cache.set("v1:user:42:context", {"a": 1}, 300, tags=["user:42"])
+
+        assert fake_redis.round_trips == 1
+        assert set(fake_redis.zsets["tagidx:user:42"]) == {"v1:user:42:context"}
+        assert set(fake_redis.zsets["tagidx:prefix:v1:user"]) == {"v1:user:42:context"}
+        assert fake_redis.ttls["tagidx:user:42"] == 300
+
+    @pytest.mark.asyncio
+    async def test_untagged_set_skips_the_index(self, cache, fake_redis):
+        await cache.set("v1:user:42:context", {"a": 1})
+
+        assert fake_redis.zsets == {}
+
+    @pytest.mark.asyncio
+    async def test_expired_members_are_dropped_on_the_next_write(
+        self, cache, fake_redis, monkeypatch
+    ):
+        clock = SimpleNamespace(now=1000)
+        monkeypatch.setattr(tags.time, "time", lambda: clock.now)
+        await cache.set("v1:client:c1:settings", 1, 60, tags=["client:c1"])
+
+        clock.now += 61
+        await cache.set("v1:client:c1:users", 2, 60, tags=["client:c1"])
+
+        assert set(fake_redis.zsets["tagidx:client:c1"]) == {"v1:client:c1:users"}
+        assert set(fake_redis.zsets["tagidx:prefix:v1"]) == {"v1:client:c1:users"}
+
+    @pytest.mark.asyncio
+    async def test_large_batches_are_tagged_in_chunks(
+        self, cache, fake_redis, monkeypatch
+    ):
+        monkeypatch.setattr(tags, "TAG_CHUNK_SIZE", 2)
+        keys = [f"v1:user:{i}:context" for i in range(5)]
+
+        assert await cache.tag_keys(keys, ["batch"], 60)
+
+        scripts = [c for c in fake_redis.pipeline_commands if c[0] == "eval"]
+        assert len(scripts) == 3
+        assert set(fake_redis.zsets["tagidx:batch"]) == set(keys)
+
+
+class TestInvalidation:
+    """Tests for deleting exactly the tagged keys."""
+
+    @pytest.mark.asyncio
+    async def test_flow_invalidation_uses_the_index_not_scan(self, cache, fake_redis):
+        for flow_id in ("f1", "f2"):
+            await cache.cache_flow_result(flow_id, "phase", "mapping", {"ok": True})
+            await cache.cache_flow_result(flow_id, "agent", "validator", {"ok": True})
+        fake_redis.strings["lock:flow:f1"] = "token"
+
+        assert await cache.invalidate_flow_cache("f1") is True
+
+        assert fake_redis.scans == 0
+        assert set(fake_redis.strings) == {
+            "flow:phase:mapping:f2",
+            "flow:agent:validator:f2",
+        }
+        assert "tagidx:flow:f1" not in fake_redis.zsets
+
+    @pytest.mark.asyncio
+    async def test_engagement_tag_spans_flows(self, cache, fake_redis):
+        engagement = str(uuid.uuid4())
+        await cache.cache_flow_result("f1", "phase", "a", 1, engagement_id=engagement)
+        await cache.cache_flow_result("f2", "phase", "a", 2, engagement_id=engagement)
+        await cache.cache_flow_result("f3", "phase", "a", 3)
+
+        assert await cache.invalidate_tags([f"engagement:{engagement}"]) == 2
+        assert set(fake_redis.strings) == {"flow:phase:a:f3"}
+
+    @pytest.mark.asyncio
+    async def test_broad_tags_are_drained_in_chunks(
+        self, cache, fake_redis, monkeypatch
+    ):
+        monkeypatch.setattr(tags, "TAG_CHUNK_SIZE", 2)
+        for i in range(5):
+            await cache.set(f"v1:client:c1:item:{i}", i, tags=["client:c1"])
+
+        assert await cache.invalidate_tags(["client:c1"]) == 5
+
+        assert fake_redis.strings == {}
+        assert fake_redis.invalidation_steps == 3
+        assert "tagidx:client:c1" not in fake_redis.zsets
+
+    @staticmethod
+    def _pattern_event(pattern):
+        return InvalidationEvent(
+            trigger=InvalidationTrigger.MANUAL_INVALIDATION,
+            priority=InvalidationPriority.MEDIUM,
+            entity_type="pattern",
+            entity_id=pattern,
+            client_account_id="c1",
+            metadata={"patterns": [pattern]},
+        )
+
+    @pytest.mark.asyncio
+    async def test_manual_pattern_invalidation_resolves_through_tags(
+        self, cache, fake_redis
+    ):
+        await cache.set("v1:user:42:context", 1, tags=[])
+        await cache.set("v1:user:42:defaults", 2, tags=[])
+        await cache.set("v1:user:7:context", 3, tags=[])
+
+        result = await EventDrivenInvalidationStrategy(cache).invalidate(
+            self._pattern_event("v1:user:42:*")
+        )
+
+        assert result.keys_invalidated == 2
+        assert set(fake_redis.strings) == {"v1:user:7:context"}
+        assert fake_redis.scans == 0
+
+    @pytest.mark.asyncio
+    async def test_scan_fallback_catches_untagged_keys(self, cache, fake_redis):
+        cache.tag_scan_fallback = True
+        await cache.set("v1:user:42:context", 1, tags=[])
+        await cache.set("v1:user:42:defaults", 2)
+
+        result = await EventDrivenInvalidationStrategy(cache).invalidate(
+            self._pattern_event("v1:user:42:*")
+        )
+
+        assert result.keys_invalidated == 2
+        assert fake_redis.strings == {}
+
+    @pytest.mark.asyncio
+    async def test_auth_cache_writes_resolve_through_tags(self, cache, fake_redis):
+        auth_cache = CacheOperationsMixin()
+        auth_cache.redis_cache = cache
+        auth_cache.fallback_cache = SimpleNamespace(set=AsyncMock(return_value=True))
+        auth_cache.stats = SimpleNamespace(average_response_time=0.0)
+        auth_cache._request_times = []
+        await auth_cache._set_to_cache("v1:user:42:session", {"a": 1}, 300)
+        await auth_cache._set_to_cache("v1:user:42:clients", [], 300, False)
+
+        result = await EventDrivenInvalidationStrategy(cache).invalidate(
+            self._pattern_event("v1:user:42:*")
+        )
+
+        assert result.keys_invalidated == 2
+        assert fake_redis.strings == {}
+        assert fake_redis.scans == 0
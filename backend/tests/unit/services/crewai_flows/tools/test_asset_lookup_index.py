@@ -0,0 +1,121 @@
+"""
+Unit tests for the asset lookup index and dependency edge resolution.
+
+Assets are plain dicts in the shape the discovery tools receive.
+"""
+
+from app.services.crewai_flows.tools.asset_lookup_index import (
+    AssetLookupIndex,
+    name_keys,
+    normalize_hostname,
+    subnet_prefix,
+)
+from app.services.crewai_flows.tools.dependency_analysis_tool.graph_builders import (
+    DependencyGraphBuilder,
+)
+
+SERVERS = [
+    {
+        "id": "s1",
+        "name": "CRM-Prod-01",
+        "hostname": "crm01.corp.local",
+        "ip_address": "10.0.1.10",
+        "environment": "prod",
+        "location": "dc1",
+    },
+    {
+        "id": "s2",
+        "name": "orders-db",
+        "ip_address": "10.0.1.20",
+        "environment": "prod",
+        "location": "dc2",
+    },
+    {"id": "s3", "name": "web", "ip_address": "10.0.2.5"},
+]
+
+
+class TestNormalization:
+    """Tests for the key helpers."""
+
+    def test_hostname_from_urls_and_ports(self):
+        assert normalize_hostname("postgres://Orders-DB.corp:5432/orders") == (
+            "orders-db.corp"
+        )
+        assert normalize_hostname("crm01.corp.local.:8080") == "crm01.corp.local"
+
+    def test_subnet_prefix_is_ipv4_only(self):
+        assert subnet_prefix("10.0.1.77") == "10.0.1.0/24"
+        assert subnet_prefix("fe80::1") is None
+        assert subnet_prefix("not-an-ip") is None
+
+    def test_name_keys_are_token_runs(self):
+        assert name_keys("Order API") == ["order", "order-api", "api"]
+
+
+class TestAssetLookupIndex:
+    """Tests for hash lookups over an inventory."""
+
+    def test_attribute_lookups(self):
+        index = AssetLookupIndex(SERVERS)
+
+        assert index.by_name("orders-db")["id"] == "s2"
+        assert index.by_ip("10.0.1.10")["id"] == "s1"
+        assert index.by_hostname("CRM01.corp.local")["id"] == "s1"
+        assert index.by_hostname("crm01")["id"] == "s1"
+        assert index.by_environment_location("prod", "dc2")["id"] == "s2"
+        assert [a["id"] for a in index.in_subnet("10.0.1.99")] == ["s1", "s2"]
+        assert sorted(index.subnets()) == ["10.0.1.0/24", "10.0.2.0/24"]
+
+    def test_overlapping_name_matches_either_direction_in_inventory_order(self):
+        index = AssetLookupIndex(SERVERS)
+
+        assert index.by_overlapping_name("crm")["id"] == "s1"
+        assert index.by_overlapping_name("Orders DB Replica")["id"] == "s2"
+        assert index.by_overlapping_name("ecrm") is None
+
+    def test_resolve_skips_the_referring_asset(self):
+        assets = SERVERS + [{"id": "a1", "name": "crm-app", "ip_address": "10.0.1.10"}]
+        index = AssetLookupIndex(assets)
+
+        assert index.resolve("10.0.1.10", exclude_id="s1")["id"] == "a1"
+        assert index.resolve("jdbc://orders-db:5432/orders")["id"] == "s2"
+        assert index.resolve("") is None
+
+
+class TestDependencyGraphBuilder:
+    """Tests for edges resolved through the index."""
+
+    def test_edges_resolve_by_name_and_connection_string(self):
+        assets = [
+            {"id": "app", "name": "Billing", "asset_type": "application"},
+            {"id": "db", "name": "billing-db", "asset_type": "database"},
+        ]
+        data_deps = [
+            {
+                "asset_id": "app",
+                "data_flows": [
+                    {
+                        "source": "billing-db",
+                        "flow_type": "read_write",
+                        "confidence": 0.7,
+                    }
+                ],
+            }
+        ]
+        config_deps = [
+            {
+                "asset_id": "app",
+                "references": [
+                    {"value": "postgresql://billing-db:5432/billing", "confidence": 0.8}
+                ],
+            }
+        ]
+
+        graph = DependencyGraphBuilder.build_dependency_graph(
+            assets, [], config_deps, data_deps, []
+        )
+
+        assert [(e["source"], e["target"], e["type"]) for e in graph["edges"]] == [
+            ("db", "app", "data_flow"),
+            ("app", "db", "configuration"),
+        ]
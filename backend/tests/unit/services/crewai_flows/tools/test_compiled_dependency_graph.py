@@ -0,0 +1,169 @@
+"""
+Unit tests for the compiled dependency graph and the analyzers built on it.
+
+Graphs are plain node/edge dicts in the shape DependencyGraphBuilder produces;
+an edge points from an asset to an asset it depends on.
+"""
+
+import json
+import random
+import time
+
+from app.services.crewai_flows.tools.dependency_analysis_tool import (
+    MigrationWavePlannerTool,
+)
+from app.services.crewai_flows.tools.dependency_analysis_tool.graph_builders import (
+    CompiledDependencyGraph,
+)
+from app.services.crewai_flows.tools.dependency_analysis_tool.wave_planners import (
+    CriticalPathAnalyzer,
+    MigrationInsightsGenerator,
+)
+
+
+def _graph(node_ids, edges):
+    return {
+        "nodes": [{"id": node_id, "label": node_id.upper()} for node_id in node_ids],
+        "edges": [{"source": source, "target": target} for source, target in edges],
+        "node_count": len(node_ids),
+        "density": 0.2,
+    }
+
+
+class TestCompiledDependencyGraph:
+    """Tests for SCC condensation, wave layering and critical paths."""
+
+    def test_cycles_of_any_length_are_components(self):
+        compiled = CompiledDependencyGraph(
+            ["a", "b", "c", "d", "e", "f"],
+            [("a", "b"), ("b", "c"), ("c", "a"), ("d", "e"), ("e", "d"), ("f", "f")],
+        )
+
+        assert sorted(compiled.cycles()) == [["a", "b", "c"], ["d", "e"], ["f"]]
+
+    def test_edges_to_unknown_nodes_are_dropped(self):
+        compiled = CompiledDependencyGraph(["a", "b"], [("a", "b"), ("a", "zz")])
+
+        assert compiled.edge_count == 1
+        assert compiled.dropped_edges == 1
+        assert compiled.out_degree.tolist() == [1, 0]
+
+    def test_dependencies_come_in_earlier_waves(self):
+        compiled = CompiledDependencyGraph(
+            ["web", "api", "db", "cache", "batch"],
+            [("web", "api"), ("api", "db"), ("api", "cache"), ("db", "cache")],
+        )
+
+        assert compiled.migration_waves() == [
+            [["cache"], ["batch"]],
+            [["db"]],
+            [["api"]],
+            [["web"]],
+        ]
+
+    def test_cycle_members_share_a_wave(self):
+        compiled = CompiledDependencyGraph(
+            ["a", "b", "c"], [("a", "b"), ("b", "a"), ("b", "c")]
+        )
+
+        assert compiled.migration_waves() == [[["c"]], [["a", "b"]]]
+
+    def test_critical_paths_are_longest_first(self):
+        compiled = CompiledDependencyGraph(
+            ["a", "b", "c", "d", "x", "y"],
+            [("a", "b"), ("b", "c"), ("c", "d"), ("a", "d"), ("x", "y")],
+        )
+
+        assert compiled.critical_paths(5) == [["a", "b", "c", "d"], ["x", "y"]]
+        assert compiled.critical_paths(1) == [["a", "b", "c", "d"]]
+
+    def test_large_estate_is_analyzed_quickly_without_recursion(self):
+        rng = random.Random(7)
+        node_count = 20_000
+        node_ids = [f"asset-{i}" for i in range(node_count)]
+        # One long chain (deeper than the recursion limit) plus random edges
+        edges = [(node_ids[i], node_ids[i + 1]) for i in range(node_count - 1)]
+        edges += [
+            (node_ids[rng.randrange(node_count)], node_ids[rng.randrange(node_count)])
+            for _ in range(60_000)
+        ]
+        graph = _graph(node_ids, edges)
+
+        started = time.perf_counter()
+        compiled = CompiledDependencyGraph.from_graph(graph)
+        analysis = CriticalPathAnalyzer.analyze_critical_paths(graph, compiled)
+        MigrationInsightsGenerator.generate_wave_planning_recommendations(
+            graph, analysis, compiled
+        )
+        elapsed = time.perf_counter() - started
+
+        components = compiled.strongly_connected_components()
+        assert sum(len(group) for group in components) == node_count
+        assert elapsed < 1.0
+
+
+class TestCriticalPathAnalyzer:
+    """Tests for the analyzer output built from the compiled graph."""
+
+    def test_reports_longer_cycles_and_keeps_pair_format(self):
+        graph = _graph(
+            ["a", "b", "c", "d", "e"],
+            [("a", "b"), ("b", "c"), ("c", "a"), ("d", "e"), ("e", "d")],
+        )
+
+        cycles = CriticalPathAnalyzer.analyze_critical_paths(graph)[
+            "circular_dependencies"
+        ]
+
+        assert cycles[1]["cycle_id"] == "d-e"
+        assert cycles[1]["type"] == "bidirectional"
+        assert cycles[0]["nodes"] == ["a", "b", "c"]
+        assert cycles[0]["type"] == "cycle"
+
+    def test_critical_path_format(self):
+        paths = CriticalPathAnalyzer.find_critical_paths(
+            _graph(["a", "b", "c"], [])["nodes"],
+            [{"source": "a", "target": "b"}, {"source": "b", "target": "c"}],
+        )
+
+        assert paths == [
+            {
+                "path_id": "path_0",
+                "nodes": ["a", "b", "c"],
+                "length": 3,
+                "end_node": "c",
+            }
+        ]
+
+
+class TestMigrationWavePlanning:
+    """Tests for wave plans derived from dependency layers."""
+
+    def test_recommendations_list_topological_waves(self):
+        graph = _graph(
+            ["a", "b", "c", "d", "e", "f"],
+            [("a", "b"), ("b", "c"), ("c", "b"), ("c", "d")],
+        )
+        analysis = CriticalPathAnalyzer.analyze_critical_paths(graph)
+
+        plan = MigrationInsightsGenerator.generate_wave_planning_recommendations(
+            graph, analysis
+        )
+
+        assert plan["wave_strategy"] == "circular_resolution"
+        assert plan["total_waves"] == 3
+        assert plan["waves"][0]["assets"] == ["d", "e", "f"]
+        assert plan["waves"][1]["migrate_together"] == [["b", "c"]]
+
+    def test_planner_tool_uses_dependency_layers(self):
+        graph = _graph(["a", "b", "c"], [("a", "b"), ("b", "c")])
+        tool = MigrationWavePlannerTool(context_info={})
+
+        plan = json.loads(tool._run(json.dumps({"dependency_graph": graph})))
+
+        assert [wave["assets"] for wave in plan["migration_waves"]] == [
+            ["C"],
+            ["B"],
+            ["A"],
+        ]
+        assert plan["risk_assessment"] == "medium"
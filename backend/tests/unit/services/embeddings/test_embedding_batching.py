@@ -0,0 +1,193 @@
+"""
+Unit tests for embedding micro-batching and the content-addressed cache.
+
+The Redis tier is a dict-backed stand-in for RedisCache's mget/mset, and the
+DeepInfra API is an httpx.MockTransport that records each request's inputs.
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.services.embedding_service import EmbeddingService
+from app.services.embeddings import (
+    EmbeddingBatcher,
+    EmbeddingCache,
+    embedding_cache_key,
+    normalize_text,
+)
+
+
+class _FakeRedisCache:
+    def __init__(self):
+        self.values = {}
+        self.mget_calls = 0
+
+    async def mget(self, keys):
+        self.mget_calls += 1
+        return [self.values.get(key) for key in keys]
+
+    async def mset(self, mapping, ttl=None):
+        self.values.update(mapping)
+        return True
+
+
+def _vector(text):
+    return [float(len(text)), 0.5, -0.25]
+
+
+@pytest.fixture
+def api_calls():
+    return []
+
+
+@pytest.fixture
+def service(monkeypatch, api_calls):
+    def handler(request):
+        inputs = json.loads(request.content)["input"]
+        api_calls.append(inputs)
+        # Reversed to check that results are matched by index
+        data = [
+            {"index": i, "embedding": _vector(text)} for i, text in enumerate(inputs)
+        ]
+        return httpx.Response(200, json={"data": data[::-1]})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(
+        "app.services.embedding_service.get_http_client", lambda: client
+    )
+    service = EmbeddingService()
+    service.ai_available = True
+    service.api_key = "test-key"
+    service.cache = EmbeddingCache(redis=_FakeRedisCache())
+    return service
+
+
+class TestEmbeddingBatcher:
+    """Tests for coalescing concurrent single-text requests."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_submits_share_one_batch(self):
+        batches = []
+
+        async def embed_batch(texts):
+            batches.append(texts)
+            return [[float(i)] for i in range(len(texts))]
+
+        batcher = EmbeddingBatcher(embed_batch)
+
+        results = await asyncio.gather(*(batcher.submit(t) for t in "abc"))
+
+        assert batches == [["a", "b", "c"]]
+        assert results == [[0.0], [1.0], [2.0]]
+
+    @pytest.mark.asyncio
+    async def test_full_batch_is_sent_without_waiting(self):
+        batches = []
+
+        async def embed_batch(texts):
+            batches.append(texts)
+            return [[0.0]] * len(texts)
+
+        batcher = EmbeddingBatcher(embed_batch, max_batch_size=2, max_wait_seconds=60)
+
+        await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit(t) for t in "ab")), timeout=1
+        )
+
+        assert batches == [["a", "b"]]
+
+    @pytest.mark.asyncio
+    async def test_batch_failure_reaches_every_caller(self):
+        async def embed_batch(texts):
+            raise RuntimeError("api down")
+
+        batcher = EmbeddingBatcher(embed_batch)
+
+        results = await asyncio.gather(
+            batcher.submit("a"), batcher.submit("b"), return_exceptions=True
+        )
+
+        assert [str(result) for result in results] == ["api down", "api down"]
+
+
+class TestEmbeddingCache:
+    """Tests for the two cache tiers."""
+
+    def test_key_ignores_whitespace_but_not_case_or_model(self):
+        key = embedding_cache_key("m", "Web  server\n")
+
+        assert key == embedding_cache_key("m", " Web server")
+        assert key != embedding_cache_key("m", "web server")
+        assert key != embedding_cache_key("other", "Web server")
+        assert normalize_text("a \t b") == "a b"
+
+    @pytest.mark.asyncio
+    async def test_redis_hits_fill_the_local_tier(self):
+        redis = _FakeRedisCache()
+        await EmbeddingCache(redis=redis).put_many("m", ["x"], [[0.5, 0.25]])
+        cache = EmbeddingCache(redis=redis)
+
+        assert await cache.get_many("m", ["x", "y"]) == [[0.5, 0.25], None]
+        assert cache.get_local("m", "x") == [0.5, 0.25]
+        assert redis.mget_calls == 1
+
+    @pytest.mark.asyncio
+    async def test_local_tier_is_bounded(self):
+        cache = EmbeddingCache(max_entries=1, redis=_FakeRedisCache())
+
+        await cache.put_many("m", ["x", "y"], [[1.0], [2.0]])
+
+        assert list(cache.entries) == [embedding_cache_key("m", "y")]
+
+    @pytest.mark.asyncio
+    async def test_unavailable_redis_is_a_miss(self):
+        class _DisabledRedis:
+            async def mget(self, keys):
+                return None
+
+        cache = EmbeddingCache(redis=_DisabledRedis())
+
+        assert await cache.get_many("m", ["x"]) == [None]
+
+
+class TestEmbeddingService:
+    """Tests for EmbeddingService on top of the batcher and cache."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_embed_text_calls_make_one_request(
+        self, service, api_calls
+    ):
+        results = await asyncio.gather(
+            *(service.embed_text(text) for text in ["a", "bb", "a"])
+        )
+
+        assert api_calls == [["a", "bb"]]
+        assert results == [_vector("a"), _vector("bb"), _vector("a")]
+
+    @pytest.mark.asyncio
+    async def test_cached_texts_are_not_requested_again(self, service, api_calls):
+        await service.embed_texts(["a", "bb"])
+
+        assert await service.embed_texts(["bb", "ccc", "a "]) == [
+            _vector("bb"),
+            _vector("ccc"),
+            _vector("a"),
+        ]
+        assert api_calls == [["a", "bb"], ["ccc"]]
+        assert await service.embed_text("ccc") == _vector("ccc")
+        assert len(api_calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_fallback_embeddings_are_not_cached(self, service, monkeypatch):
+        async def failing_request(texts):
+            return None
+
+        monkeypatch.setattr(service, "_request_embeddings", failing_request)
+
+        [embedding] = await service.embed_texts(["a"])
+
+        assert embedding == service.local_embedder.embed_text("a")
+        assert service.cache.entries == {}
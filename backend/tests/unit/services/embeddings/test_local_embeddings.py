@@ -0,0 +1,94 @@
+"""
+Unit tests for the offline hashed n-gram embedder.
+
+Everything runs locally; no API key or model is involved.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.services.embedding_service import EmbeddingService
+from app.services.embeddings.local import LocalEmbedder, tokenize
+from app.services.embeddings.similarity import cosine_similarity
+
+
+class TestLocalEmbedder:
+    """Tests for the embedding vectors themselves."""
+
+    def test_tokenizer_splits_identifier_styles(self):
+        assert tokenize("ipAddress host_name OS2019") == [
+            "ip",
+            "address",
+            "host",
+            "name",
+            "os",
+            "2019",
+        ]
+
+    def test_rows_are_unit_float32(self):
+        matrix = LocalEmbedder(dimensions=64).embed(["web server", "database"])
+
+        assert matrix.shape == (2, 64)
+        assert matrix.dtype == np.float32
+        np.testing.assert_allclose(np.linalg.norm(matrix, axis=1), 1.0, rtol=1e-5)
+
+    def test_text_without_words_is_a_zero_vector(self):
+        assert not LocalEmbedder(dimensions=8).embed(["--- !!"]).any()
+
+    def test_similar_names_score_higher_than_unrelated_ones(self):
+        embedder = LocalEmbedder()
+        oracle, oracle_db, tomcat = embedder.embed_texts(
+            ["Oracle DB 19c", "oracle_db_19", "Apache Tomcat"]
+        )
+
+        assert cosine_similarity(oracle, oracle_db) > 0.5
+        assert cosine_similarity(oracle, tomcat) < 0.2
+
+    def test_batch_matches_single_texts(self):
+        embedder = LocalEmbedder()
+        texts = ["hostname", "host name", "HostName"]
+
+        np.testing.assert_allclose(
+            embedder.embed_texts(texts),
+            [embedder.embed_text(text) for text in texts],
+            rtol=1e-6,
+        )
+
+    def test_vectors_are_identical_across_processes(self):
+        # A fresh interpreter gets a different hash() seed
+        code = (
+            "from app.services.embeddings.local import LocalEmbedder;"
+            "print(LocalEmbedder(dimensions=16).embed_text('web server'))"
+        )
+        output = (
+            subprocess.run(
+                [sys.executable, "-c", code],
+                capture_output=True,
+                text=True,
+                check=True,
+                cwd=Path(__file__).resolve().parents[4],
+            )
+            .stdout.strip()
+            .splitlines()[-1]
+        )
+
+        assert output == str(LocalEmbedder(dimensions=16).embed_text("web server"))
+
+
+class TestOfflineEmbeddingService:
+    """Tests for EmbeddingService without an API key."""
+
+    @pytest.mark.asyncio
+    async def test_offline_service_embeds_locally(self):
+        service = EmbeddingService()
+        service.ai_available = False
+
+        [single] = [await service.embed_text("web server")]
+        batch = await service.embed_texts(["web server", "database"])
+
+        assert len(single) == 1024
+        assert batch[0] == single
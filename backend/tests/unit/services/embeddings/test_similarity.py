@@ -0,0 +1,80 @@
+"""
+Unit tests for the vectorized similarity kernel and its call sites.
+
+Vectors are small hand-written lists, so expected scores are exact.
+"""
+
+import numpy as np
+import pytest
+
+from app.services.embedding_service import EmbeddingService
+from app.services.embeddings.similarity import (
+    cosine_similarity,
+    normalize_rows,
+    similarity_matrix,
+    top_k,
+    top_k_similar,
+)
+
+CANDIDATES = [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0], [-1.0, 0.0]]
+
+
+class TestSimilarityKernel:
+    """Tests for the matrix helpers."""
+
+    def test_zero_vectors_score_zero(self):
+        assert cosine_similarity([0.0, 0.0], [1.0, 2.0]) == 0.0
+        assert normalize_rows([[0.0, 0.0]]).tolist() == [[0.0, 0.0]]
+
+    def test_matrix_scores_every_query_against_every_candidate(self):
+        scores = similarity_matrix([[2.0, 0.0], [0.0, 3.0]], CANDIDATES)
+
+        assert scores.dtype == np.float32
+        np.testing.assert_allclose(
+            scores, [[1, 0, 0.70710677, -1], [0, 1, 0.70710677, 0]], atol=1e-6
+        )
+
+    def test_top_k_is_sorted_best_first(self):
+        indices, scores = top_k(np.array([[0.1, 0.9, 0.5, 0.7]]), 3)
+
+        assert indices.tolist() == [[1, 3, 2]]
+        assert scores.tolist() == [[0.9, 0.7, 0.5]]
+
+    def test_top_k_larger_than_candidates_returns_all(self):
+        indices, _ = top_k(np.array([[0.2, 0.1]]), 5)
+
+        assert indices.tolist() == [[0, 1]]
+
+    def test_search_applies_the_threshold(self):
+        [matches] = top_k_similar([[1.0, 0.2]], CANDIDATES, 3, threshold=0.5)
+
+        assert [index for index, _ in matches] == [0, 2]
+
+
+class TestCallSites:
+    """Tests for EmbeddingService on top of the kernel."""
+
+    def test_pairwise_similarity_keeps_dimension_check(self):
+        service = EmbeddingService()
+
+        assert service.calculate_cosine_similarity([1, 0], [1, 1]) == pytest.approx(
+            0.70710677
+        )
+        with pytest.raises(ValueError):
+            service.calculate_cosine_similarity([1, 0], [1, 0, 0])
+
+    @pytest.mark.asyncio
+    async def test_find_similar_assets_ranks_above_threshold(self, monkeypatch):
+        service = EmbeddingService()
+
+        async def embed_text(text):
+            return [1.0, 0.2]
+
+        monkeypatch.setattr(service, "embed_text", embed_text)
+        assets = [(f"asset-{i}", vector) for i, vector in enumerate(CANDIDATES)]
+
+        matches = await service.find_similar_assets(
+            "query", assets, similarity_threshold=0.5, top_k=1
+        )
+
+        assert [asset_id for asset_id, _ in matches] == ["asset-0"]
@@ -0,0 +1,167 @@
+"""
+Unit tests for streaming bulk upload parsing.
+
+Files are built in memory; the service runs without a database session, so
+rows pass through template mapping and validation untransformed.
+"""
+
+import io
+import json
+
+import pytest
+from openpyxl import Workbook
+
+from app.services.manual_collection.bulk_data_models import (
+    BulkDataFormat,
+    ProcessingStatus,
+)
+from app.services.manual_collection.bulk_data_parser import (
+    BulkDataParser,
+    coerce_cell,
+)
+from app.services.manual_collection.bulk_data_service import BulkDataService
+
+
+async def _batches(content, format_type, batch_size=2):
+    parser = BulkDataParser()
+    return [
+        batch
+        async for batch in parser.iter_row_batches(content, format_type, batch_size)
+    ]
+
+
+def _xlsx(rows):
+    workbook = Workbook()
+    sheet = workbook.active
+    for row in rows:
+        sheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+class TestCoerceCell:
+    """Tests for typing delimited-text cells."""
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ("", None),
+            ("  ", None),
+            ("8", 8),
+            ("-3", -3),
+            ("15.5", 15.5),
+            ("1e3", 1000.0),
+            ("0", 0),
+            ("0.5", 0.5),
+            ("007", "007"),
+            ("web-01", "web-01"),
+        ],
+    )
+    def test_values_are_typed(self, value, expected):
+        assert coerce_cell(value) == expected
+
+
+class TestIterRowBatches:
+    """Tests for batching each supported format."""
+
+    @pytest.mark.asyncio
+    async def test_csv_rows_arrive_in_typed_batches(self):
+        content = b"\xef\xbb\xbfname,cpu_cores,memory_gb\na,2,4.5\nb,,8\n\nc,4,16\n"
+
+        batches = await _batches(content, BulkDataFormat.CSV)
+
+        assert [len(batch) for batch in batches] == [2, 1]
+        assert batches[0] == [
+            {"name": "a", "cpu_cores": 2, "memory_gb": 4.5},
+            {"name": "b", "cpu_cores": None, "memory_gb": 8},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_tsv_short_rows_are_padded(self):
+        batches = await _batches(b"name\tenv\nweb\n", BulkDataFormat.TSV)
+
+        assert batches == [[{"name": "web", "env": None}]]
+
+    @pytest.mark.asyncio
+    async def test_excel_is_read_from_the_first_sheet(self):
+        content = _xlsx([["name", "cpu_cores"], ["a", 2], [None, None], ["b", 4]])
+
+        batches = await _batches(content, BulkDataFormat.EXCEL, batch_size=10)
+
+        assert batches == [
+            [{"name": "a", "cpu_cores": 2}, {"name": "b", "cpu_cores": 4}]
+        ]
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            json.dumps([{"n": 1}, {"n": 2}, {"n": 3}]).encode(),
+            b'{"n": 1}\n{"n": 2}\n\n{"n": 3}\n',
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_json_arrays_and_json_lines(self, content):
+        batches = await _batches(content, BulkDataFormat.JSON)
+
+        assert batches == [[{"n": 1}, {"n": 2}], [{"n": 3}]]
+
+    @pytest.mark.asyncio
+    async def test_single_json_object_is_one_row(self):
+        assert await _batches(b'{"n": 1}', BulkDataFormat.JSON) == [[{"n": 1}]]
+
+    @pytest.mark.parametrize(
+        "content, format_type",
+        [
+            (b"a,b\n1,2,3\n", BulkDataFormat.CSV),
+            (b'[{"n": 1} {"n": 2}]', BulkDataFormat.JSON),
+            (b"[1, 2]", BulkDataFormat.JSON),
+            (b'[{"n": 1},]', BulkDataFormat.JSON),
+            (b"not a workbook", BulkDataFormat.EXCEL),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_malformed_files_fail_to_parse(self, content, format_type):
+        with pytest.raises(ValueError, match="Failed to parse file"):
+            await _batches(content, format_type)
+
+    def test_trailing_comma_in_json_array_is_rejected(self):
+        rows = BulkDataParser()._parse_json(b'[{"a": 1},\n ]')
+
+        assert next(rows) == {"a": 1}
+        with pytest.raises(ValueError, match="Invalid JSON format"):
+            next(rows)
+
+    @pytest.mark.asyncio
+    async def test_parse_file_content_returns_all_rows(self):
+        rows = await BulkDataParser().parse_file_content(
+            b"name\na\nb\nc\n", BulkDataFormat.CSV
+        )
+
+        assert rows == [{"name": "a"}, {"name": "b"}, {"name": "c"}]
+
+
+class TestUploadPipeline:
+    """Tests for consuming parsed batches in upload_bulk_data."""
+
+    @pytest.mark.asyncio
+    async def test_issue_rows_are_numbered_across_batches(self):
+        service = BulkDataService()
+        service.BATCH_ROWS = 2
+        content = b"name,port\na,80\nb,443\nc,99999\n"
+
+        result = await service.upload_bulk_data(content, "servers.csv")
+
+        assert result.status == ProcessingStatus.PARTIALLY_COMPLETED
+        assert result.total_rows == 3
+        assert [issue.row_index for issue in result.validation_issues] == [2]
+
+    @pytest.mark.asyncio
+    async def test_row_limit_is_enforced_while_streaming(self):
+        service = BulkDataService()
+        service.MAX_ROWS = 2
+
+        result = await service.upload_bulk_data(b"name\na\nb\nc\n", "assets.csv")
+
+        assert result.status == ProcessingStatus.FAILED
+        assert "maximum row limit of 2" in result.error_message
@@ -0,0 +1,111 @@
+"""
+Unit tests for StockDataAPIService.get_stock_data_batch.
+
+The blocking yfinance helpers are replaced on the instance so the tests only
+cover batching, caching and per-symbol error reporting.
+"""
+
+import pandas as pd
+import pytest
+
+from app.services.market_data import MarketDataCache, SingleFlight, parse_quote_prices
+from app.services.stock_data_api import StockDataAPIService
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr("app.services.stock_data_api.YFINANCE_AVAILABLE", True)
+    api = StockDataAPIService(
+        market_cache=MarketDataCache(max_entries=64, use_redis=False),
+        single_flight=SingleFlight("test"),
+    )
+    api.download_calls = []
+    api.info_calls = []
+
+    def download(symbols):
+        api.download_calls.append(list(symbols))
+        return {s: (100.0, 95.0) for s in symbols if s != "BROKEN"}
+
+    def quote(symbol, info, prices):
+        if info is None:
+            api.info_calls.append((symbol, prices))
+            if symbol == "MISSING":
+                return None, None
+            if symbol == "BROKEN":
+                raise RuntimeError("upstream timeout")
+            info = {"symbol": symbol}
+        return info, {"symbol": symbol, "current_price": prices[0] if prices else None}
+
+    api._download_quote_prices_sync = download
+    api._get_batch_quote_sync = quote
+    return api
+
+
+class TestBatchQuotes:
+    """Tests for multi-symbol quote fetching."""
+
+    @pytest.mark.asyncio
+    async def test_one_download_for_all_symbols(self, service):
+        result = await service.get_stock_data_batch(["AAPL", "MSFT", "NVDA"])
+
+        assert len(service.download_calls) == 1
+        assert sorted(service.download_calls[0]) == ["AAPL", "MSFT", "NVDA"]
+        assert set(result["quotes"]) == {"AAPL", "MSFT", "NVDA"}
+        assert all(prices == (100.0, 95.0) for _, prices in service.info_calls)
+        assert result["errors"] == {}
+
+    @pytest.mark.asyncio
+    async def test_partial_results_with_per_symbol_errors(self, service):
+        result = await service.get_stock_data_batch(["AAPL", "MISSING", "BROKEN"])
+
+        assert set(result["quotes"]) == {"AAPL"}
+        assert "not found" in result["errors"]["MISSING"]
+        assert "upstream timeout" in result["errors"]["BROKEN"]
+
+    @pytest.mark.asyncio
+    async def test_cached_quotes_skip_upstream(self, service):
+        await service.get_stock_data_batch(["AAPL"])
+        result = await service.get_stock_data_batch(["AAPL", "MSFT"])
+
+        assert service.download_calls[-1] == ["MSFT"]
+        assert set(result["quotes"]) == {"AAPL", "MSFT"}
+
+    @pytest.mark.asyncio
+    async def test_force_refresh_refetches_cached_quotes(self, service):
+        await service.get_stock_data_batch(["AAPL"])
+        await service.get_stock_data_batch(["AAPL"], force_refresh=True)
+
+        assert len(service.download_calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_cached_profiles_skip_info_lookups(self, service):
+        await service.get_stock_data_batch(["AAPL", "MSFT"])
+        for symbol in ("AAPL", "MSFT"):
+            await service.market_cache.invalidate(MarketDataCache.quote_key(symbol))
+
+        result = await service.get_stock_data_batch(["AAPL", "MSFT"])
+
+        assert len(service.download_calls) == 2
+        assert len(service.info_calls) == 2
+        assert set(result["quotes"]) == {"AAPL", "MSFT"}
+
+    @pytest.mark.asyncio
+    async def test_mock_fallback_reports_unknown_symbols(self, service, monkeypatch):
+        monkeypatch.setattr("app.services.stock_data_api.YFINANCE_AVAILABLE", False)
+
+        result = await service.get_stock_data_batch(["AAPL", "ZZZZNOPE"])
+
+        assert None not in result["quotes"].values()
+        assert "ZZZZNOPE" in result["errors"]
+
+
+def test_parse_quote_prices_reads_the_last_two_closes():
+    columns = pd.MultiIndex.from_product([["AAPL", "MSFT"], ["Close", "Volume"]])
+    data = pd.DataFrame(
+        [[100.0, 1, None, 1], [101.0, 1, 300.0, 1]],
+        columns=columns,
+    )
+
+    prices = parse_quote_prices(data, ["AAPL", "MSFT", "NVDA"])
+
+    assert prices == {"AAPL": (101.0, 100.0), "MSFT": (300.0, None)}
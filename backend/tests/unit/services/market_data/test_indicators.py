@@ -0,0 +1,135 @@
+"""
+Tests for the vectorized indicator engine.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.market_data import PriceSeries
+from app.services.market_data.indicators import (
+    IncrementalIndicators,
+    atr,
+    beta,
+    bollinger_bands,
+    ema,
+    macd,
+    max_drawdown,
+    rsi,
+    sma,
+)
+from app.services.market_data.indicator_summary import (
+    format_indicator_summary,
+    summarize_indicators,
+)
+
+
+def _series(close, symbol="TEST", start="2024-01-02"):
+    close = np.asarray(close, dtype=np.float64)
+    dates = pd.bdate_range(start, periods=close.size).values.astype("datetime64[D]")
+    return PriceSeries(
+        timestamps=dates.astype("datetime64[s]").astype(np.int64),
+        dates=dates,
+        open=close,
+        high=close * 1.01,
+        low=close * 0.99,
+        close=close,
+        volume=np.full(close.size, 1000.0),
+        symbol=symbol,
+    )
+
+
+@pytest.fixture
+def closes():
+    rng = np.random.default_rng(7)
+    return 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.01, 300)))
+
+
+class TestBatchIndicators:
+    """Tests for the array-at-a-time indicator functions."""
+
+    def test_sma_and_ema_match_pandas(self, closes):
+        reference = pd.Series(closes)
+        np.testing.assert_allclose(
+            sma(closes, 20)[19:], reference.rolling(20).mean().to_numpy()[19:]
+        )
+        assert np.isnan(sma(closes, 20)[:19]).all()
+        np.testing.assert_allclose(
+            ema(closes, 12), reference.ewm(span=12, adjust=False).mean().to_numpy()
+        )
+
+    def test_rsi_bounds_and_monotonic_series(self, closes):
+        values = rsi(closes)
+        assert np.isnan(values[:14]).all()
+        assert ((values[14:] >= 0) & (values[14:] <= 100)).all()
+        assert rsi(np.arange(1.0, 40.0))[-1] == 100.0
+
+    def test_macd_and_bollinger_shapes(self, closes):
+        line, signal, hist = macd(closes)
+        np.testing.assert_allclose(hist, line - signal)
+        middle, upper, lower = bollinger_bands(closes)
+        valid = ~np.isnan(middle)
+        assert (upper[valid] >= middle[valid]).all()
+        assert (lower[valid] <= middle[valid]).all()
+
+    def test_max_drawdown(self):
+        drawdown, peak, trough = max_drawdown(
+            np.array([10.0, 12.0, 9.0, 11.0, 6.0, 8.0])
+        )
+        assert drawdown == pytest.approx(-0.5)
+        assert (peak, trough) == (1, 4)
+
+    def test_beta_of_scaled_returns(self, closes):
+        benchmark = _series(closes, "^GSPC")
+        returns = np.diff(closes) / closes[:-1]
+        levered = 50 * np.cumprod(np.concatenate([[1.0], 1 + 2 * returns]))
+        assert beta(_series(levered), benchmark) == pytest.approx(2.0)
+
+
+class TestIncrementalIndicators:
+    """Tests for bar-by-bar indicator updates."""
+
+    def test_matches_batch_computation(self, closes):
+        series = _series(closes)
+        state = IncrementalIndicators.from_series(series)
+        snapshot = state.snapshot()
+
+        assert snapshot["sma_20"] == pytest.approx(sma(closes, 20)[-1])
+        assert snapshot["ema_12"] == pytest.approx(ema(closes, 12)[-1])
+        assert snapshot["macd_signal"] == pytest.approx(macd(closes)[1][-1])
+        assert snapshot["rsi_14"] == pytest.approx(rsi(closes)[-1])
+        assert snapshot["atr_14"] == pytest.approx(
+            atr(series.high, series.low, closes)[-1]
+        )
+        assert snapshot["max_drawdown"] == pytest.approx(max_drawdown(closes)[0])
+
+    def test_update_appends_one_bar(self, closes):
+        state = IncrementalIndicators.from_series(_series(closes[:-1]))
+        snapshot = state.update(closes[-1] * 1.01, closes[-1] * 0.99, closes[-1])
+        assert snapshot["bars"] == closes.size
+        assert snapshot["ema_26"] == pytest.approx(ema(closes, 26)[-1])
+
+
+class TestSummary:
+    """Tests for the compact prompt summary."""
+
+    def test_summary_is_compact_and_json_safe(self, closes):
+        summary = summarize_indicators(_series(closes), _series(closes, "^GSPC"))
+        assert summary["bars"] == closes.size
+        assert summary["beta"] == pytest.approx(1.0)
+        assert set(summary["trailing_returns"]) == {"1m", "3m", "6m", "1y"}
+        assert 0 <= summary["rsi_14"] <= 100
+
+        text = format_indicator_summary(summary)
+        assert "RSI(14)" in text and "Beta vs ^GSPC" in text
+        assert len(text) < 1500
+
+    def test_short_series_reports_missing_values(self):
+        summary = summarize_indicators(_series([10.0, 11.0, 10.5]))
+        assert summary["moving_averages"]["sma_20"] is None
+        assert summary["rsi_14"] is None
+        assert "N/A" in format_indicator_summary(summary)
+
+    def test_empty_series(self):
+        assert summarize_indicators(PriceSeries.empty()) == {}
+        assert "not available" in format_indicator_summary({})
@@ -0,0 +1,99 @@
+"""
+Unit tests for MarketDataCache.
+
+Tests:
+1. Misses fetch once and later calls are served from the in-process tier
+2. Stale entries are served immediately and revalidated in the background
+3. None results are never cached
+4. LRU eviction honours the size bound
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.market_data.cache import CacheEntry, LRUTTLCache, MarketDataCache
+
+
+def _counting_fetcher(value="quote"):
+    calls = {"count": 0}
+
+    async def fetch():
+        calls["count"] += 1
+        return value
+
+    return fetch, calls
+
+
+class TestMarketDataCache:
+    """Tests for the two-tier market data cache (Redis disabled)."""
+
+    @pytest.mark.asyncio
+    async def test_miss_then_hit(self):
+        cache = MarketDataCache(max_entries=16, use_redis=False)
+        fetch, calls = _counting_fetcher({"symbol": "AAPL"})
+        key = MarketDataCache.quote_key(" aapl ")
+
+        first = await cache.get_or_fetch(key, fetch, ttl=30)
+        second = await cache.get_or_fetch(key, fetch, ttl=30)
+
+        assert first == second == {"symbol": "AAPL"}
+        assert calls["count"] == 1
+        assert cache.stats.misses == 1
+        assert cache.stats.l1_hits == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_while_revalidate(self):
+        cache = MarketDataCache(max_entries=16, use_redis=False)
+        key = MarketDataCache.history_key("TCS.NS", "1Y", "1D")
+        await cache.put(key, "old", ttl=0, stale_ttl=60)
+        fetch, calls = _counting_fetcher("new")
+
+        served = await cache.get_or_fetch(key, fetch, ttl=60, stale_ttl=60)
+        assert served == "old"
+
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert calls["count"] == 1
+        assert await cache.get(key) == "new"
+        assert cache.stats.stale_hits == 1
+
+    @pytest.mark.asyncio
+    async def test_none_is_not_cached(self):
+        cache = MarketDataCache(max_entries=16, use_redis=False)
+        fetch, calls = _counting_fetcher(None)
+        key = MarketDataCache.quote_key("UNKNOWN")
+
+        assert await cache.get_or_fetch(key, fetch, ttl=30) is None
+        assert await cache.get_or_fetch(key, fetch, ttl=30) is None
+        assert calls["count"] == 2
+
+    def test_history_key_normalization(self):
+        assert MarketDataCache.history_key("infy.ns", "1Y", "1D") == (
+            "market:history:INFY.NS:1y:1d"
+        )
+        intraday_ttl, _ = MarketDataCache.history_ttls("1m")
+        daily_ttl, _ = MarketDataCache.history_ttls("1d")
+        assert intraday_ttl < daily_ttl
+
+
+class TestLRUTTLCache:
+    """Tests for the in-process LRU tier."""
+
+    def test_evicts_least_recently_used(self):
+        lru = LRUTTLCache(max_entries=2)
+        entry = CacheEntry(value=1, fresh_until=100.0, stale_until=200.0)
+        lru.put("a", entry)
+        lru.put("b", entry)
+        assert lru.get("a", now=0.0) is entry  # touch "a"
+        lru.put("c", entry)
+
+        assert lru.get("b", now=0.0) is None
+        assert lru.get("a", now=0.0) is entry
+        assert lru.get("c", now=0.0) is entry
+
+    def test_expired_entries_are_dropped(self):
+        lru = LRUTTLCache(max_entries=2)
+        lru.put("a", CacheEntry(value=1, fresh_until=1.0, stale_until=2.0))
+        assert lru.get("a", now=3.0) is None
+        assert len(lru) == 0
@@ -0,0 +1,185 @@
+"""
+Unit tests for the OHLCV store gap-fill logic.
+
+Persistence is replaced by an in-memory subclass so the tests only exercise
+which ranges are requested upstream and what is served back.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.market_data import PriceSeries
+from app.services.market_data.ohlcv_store import OHLCVStore, period_start
+
+TODAY = datetime.now(timezone.utc).date()
+
+
+def _bars(start: date, end: date, factor: float = 1.0) -> PriceSeries:
+    dates = pd.bdate_range(start, end, inclusive="left").values.astype("datetime64[D]")
+    # Price depends only on the date so overlapping fetches agree
+    close = 100.0 + (dates - np.datetime64("2000-01-03")).astype(np.float64) / 100
+    close = close * factor
+    return PriceSeries(
+        timestamps=dates.astype("datetime64[s]").astype(np.int64),
+        dates=dates,
+        open=close,
+        high=close,
+        low=close,
+        close=close,
+        volume=np.full(dates.size, 10.0),
+        symbol="AAPL",
+        interval="1d",
+    )
+
+
+class InMemoryStore(OHLCVStore):
+    def __init__(self, refresh_seconds: int = 900):
+        super().__init__(
+            session_factory=lambda: None, refresh_seconds=refresh_seconds, enabled=True
+        )
+        self.series = PriceSeries.empty("AAPL", "1d")
+        self.coverage = None
+
+    async def get_coverage(self, symbol, interval):
+        return self.coverage
+
+    async def load(self, symbol, interval, start=None):
+        if start is None:
+            return self.series
+        return self.series.since(int(np.datetime64(start, "s").astype(np.int64)))
+
+    async def last_bars(self, symbol, interval, count):
+        if len(self.series) <= count:
+            return self.series
+        return self.series.since(int(self.series.timestamps[-count]))
+
+    async def save(
+        self,
+        series,
+        covered_from=None,
+        starts_at_inception=False,
+        refreshed=False,
+        replace=False,
+    ):
+        if replace:
+            self.series, self.coverage = PriceSeries.empty("AAPL", "1d"), None
+        self.series = self.series.merge(series)
+        first = self.series.dates[0].astype(date)
+        if covered_from is not None:
+            first = min(first, covered_from)
+        if self.coverage is not None:
+            first = min(first, self.coverage.first_trade_date)
+        self.coverage = SimpleNamespace(
+            first_trade_date=first,
+            last_trade_date=self.series.dates[-1].astype(date),
+            starts_at_inception=starts_at_inception
+            or getattr(self.coverage, "starts_at_inception", False),
+            last_refreshed_at=(
+                datetime.now(timezone.utc)
+                if refreshed
+                else getattr(self.coverage, "last_refreshed_at", None)
+            ),
+        )
+
+
+class RecordingUpstream:
+    def __init__(self):
+        self.calls = []
+        # Adjustment applied to every bar, as after a split or dividend
+        self.factor = 1.0
+
+    async def __call__(self, start, end):
+        self.calls.append((start, end))
+        return _bars(
+            start or date(2000, 1, 3), end or TODAY + timedelta(days=1), self.factor
+        )
+
+
+class TestPeriodStart:
+    """Tests for converting yfinance periods to start dates."""
+
+    def test_calendar_periods(self):
+        today = date(2024, 5, 15)
+        assert period_start("max", today) is None
+        assert period_start("ytd", today) == date(2024, 1, 1)
+        assert period_start("3mo", today) == date(2024, 2, 15)
+        assert period_start("10y", today) == date(2014, 5, 15)
+        assert period_start("5d", today) == date(2024, 5, 8)
+
+    def test_unknown_period(self):
+        with pytest.raises(ValueError):
+            period_start("fortnight")
+
+
+class TestGapFill:
+    """Tests for serving history from the store with incremental fetches."""
+
+    @pytest.mark.asyncio
+    async def test_first_request_fetches_full_period(self):
+        store, upstream = InMemoryStore(), RecordingUpstream()
+        series = await store.get_series("AAPL", "1y", "1d", upstream)
+
+        assert upstream.calls == [(period_start("1y"), None)]
+        assert len(series) > 200
+
+    @pytest.mark.asyncio
+    async def test_repeat_request_is_served_locally(self):
+        store, upstream = InMemoryStore(), RecordingUpstream()
+        await store.get_series("AAPL", "1y", "1d", upstream)
+        series = await store.get_series("AAPL", "6mo", "1d", upstream)
+
+        assert len(upstream.calls) == 1
+        assert series.dates[0].astype(date) >= period_start("6mo")
+
+    @pytest.mark.asyncio
+    async def test_longer_period_fetches_only_head_gap(self):
+        store, upstream = InMemoryStore(), RecordingUpstream()
+        await store.get_series("AAPL", "1y", "1d", upstream)
+        first_stored = store.coverage.first_trade_date
+
+        await store.get_series("AAPL", "5y", "1d", upstream)
+
+        assert upstream.calls[1] == (period_start("5y"), first_stored)
+        assert store.coverage.first_trade_date == period_start("5y")
+
+    @pytest.mark.asyncio
+    async def test_stale_coverage_fetches_tail_from_last_complete_bar(self):
+        store, upstream = InMemoryStore(refresh_seconds=0), RecordingUpstream()
+        await store.get_series("AAPL", "1y", "1d", upstream)
+        anchor = store.series.dates[-2].astype(date)
+
+        await store.get_series("AAPL", "1y", "1d", upstream)
+
+        assert upstream.calls[1:] == [(anchor, None)]
+
+    @pytest.mark.asyncio
+    async def test_adjustment_change_refetches_stored_history(self):
+        store, upstream = InMemoryStore(refresh_seconds=0), RecordingUpstream()
+        before = await store.get_series("AAPL", "1y", "1d", upstream)
+        first_stored = store.coverage.first_trade_date
+
+        upstream.factor = 0.5
+        after = await store.get_series("AAPL", "1y", "1d", upstream)
+
+        assert upstream.calls[2] == (first_stored, None)
+        assert store.coverage.first_trade_date == first_stored
+        np.testing.assert_allclose(after.close, before.close * 0.5)
+
+    @pytest.mark.asyncio
+    async def test_max_is_local_after_full_history_is_stored(self):
+        store, upstream = InMemoryStore(), RecordingUpstream()
+        await store.get_series("AAPL", "max", "1d", upstream)
+        await store.get_series("AAPL", "max", "1d", upstream)
+        await store.get_series("AAPL", "10y", "1d", upstream)
+
+        assert upstream.calls == [(None, None)]
+        assert store.coverage.starts_at_inception
+
+    def test_only_daily_and_longer_intervals_are_stored(self):
+        store = InMemoryStore()
+        assert store.supports("1d") and store.supports("1mo")
+        assert not store.supports("5m")
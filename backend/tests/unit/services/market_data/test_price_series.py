@@ -0,0 +1,91 @@
+"""
+Unit tests for the columnar PriceSeries type.
+"""
+
+import numpy as np
+import pandas as pd
+
+from app.services.market_data.price_series import PriceSeries
+
+
+def _history_frame(tz: str = "Asia/Kolkata") -> pd.DataFrame:
+    index = pd.date_range("2024-01-01", periods=4, freq="D", tz=tz)
+    return pd.DataFrame(
+        {
+            "Open": [10.0, 11.0, 12.0, 13.0],
+            "High": [11.0, 12.0, 13.0, 14.0],
+            "Low": [9.0, 10.0, 11.0, 12.0],
+            "Close": [10.5, 11.5, 12.5, 13.5],
+            "Volume": [100, 0, 300, 400],
+        },
+        index=index,
+    )
+
+
+class TestPriceSeries:
+    """Tests for PriceSeries construction and serialization."""
+
+    def test_from_dataframe_keeps_exchange_local_dates(self):
+        series = PriceSeries.from_dataframe(_history_frame(), "TCS.NS", "1d")
+
+        assert len(series) == 4
+        # Midnight IST is the previous day in UTC; the trading date must not shift
+        assert series.first_date == "2024-01-01"
+        assert series.timestamps[0] == int(
+            pd.Timestamp("2024-01-01", tz="Asia/Kolkata").timestamp()
+        )
+        assert series.close.dtype == np.float64
+
+    def test_records_round_trip(self):
+        series = PriceSeries.from_dataframe(_history_frame("UTC"), "AAPL", "1d")
+        records = series.to_records()
+
+        assert records[0] == {
+            "date": "2024-01-01",
+            "timestamp": int(pd.Timestamp("2024-01-01", tz="UTC").timestamp()),
+            "open": 10.0,
+            "high": 11.0,
+            "low": 9.0,
+            "close": 10.5,
+            "volume": 100,
+        }
+        rebuilt = PriceSeries.from_records(records, "AAPL")
+        np.testing.assert_array_equal(rebuilt.close, series.close)
+        np.testing.assert_array_equal(rebuilt.dates, series.dates)
+
+    def test_columns_round_trip(self):
+        series = PriceSeries.from_dataframe(_history_frame(), "TCS.NS", "1d")
+        rebuilt = PriceSeries.from_columns(series.to_columns())
+
+        np.testing.assert_array_equal(rebuilt.timestamps, series.timestamps)
+        np.testing.assert_array_equal(rebuilt.volume, series.volume)
+        assert rebuilt.symbol == "TCS.NS"
+
+    def test_valid_volumes_excludes_zero(self):
+        series = PriceSeries.from_dataframe(_history_frame(), "TCS.NS", "1d")
+        np.testing.assert_array_equal(series.valid_volumes(), [100.0, 300.0, 400.0])
+
+    def test_merge_prefers_newer_bars(self):
+        series = PriceSeries.from_dataframe(_history_frame("UTC"), "AAPL", "1d")
+        head = series._take(slice(0, 3))
+        tail = series.tail(2)
+        updated_tail = PriceSeries(
+            timestamps=tail.timestamps,
+            dates=tail.dates,
+            open=tail.open,
+            high=tail.high,
+            low=tail.low,
+            close=tail.close + 1,
+            volume=tail.volume,
+            symbol="AAPL",
+        )
+
+        merged = head.merge(updated_tail)
+        assert len(merged) == 4
+        np.testing.assert_array_equal(merged.close, [10.5, 11.5, 13.5, 14.5])
+
+    def test_since_and_empty(self):
+        series = PriceSeries.from_dataframe(_history_frame("UTC"), "AAPL", "1d")
+        assert len(series.since(int(series.timestamps[2]))) == 2
+        assert PriceSeries.empty().is_empty
+        assert PriceSeries.empty().to_records() == []
@@ -0,0 +1,86 @@
+"""
+Unit tests for SingleFlight request coalescing.
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.market_data.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Tests for coalescing concurrent calls that share a key."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        group = SingleFlight("test")
+        calls = {"count": 0}
+        release = asyncio.Event()
+
+        async def fetch():
+            calls["count"] += 1
+            await release.wait()
+            return "AAPL"
+
+        waiters = [
+            asyncio.create_task(group.do(("quote", "AAPL"), fetch)) for _ in range(5)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+
+        assert results == ["AAPL"] * 5
+        assert calls["count"] == 1
+        assert group.stats.coalesced == 4
+        assert group.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_independently(self):
+        group = SingleFlight("test")
+
+        async def fetch_a():
+            return "a"
+
+        async def fetch_b():
+            return "b"
+
+        results = await asyncio.gather(
+            group.do(("quote", "A"), fetch_a), group.do(("quote", "B"), fetch_b)
+        )
+        assert results == ["a", "b"]
+        assert group.stats.executions == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_all_waiters(self):
+        group = SingleFlight("test")
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            raise RuntimeError("upstream throttled")
+
+        waiters = [asyncio.create_task(group.do("k", fetch)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert group.stats.errors == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_fetch(self):
+        group = SingleFlight("test")
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return 42
+
+        first = asyncio.create_task(group.do("k", fetch))
+        second = asyncio.create_task(group.do("k", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        assert await second == 42
@@ -0,0 +1,163 @@
+"""
+Unit tests for the typeahead symbol index and its use in StockDataAPIService.
+"""
+
+import pytest
+
+from app.services.market_data import MarketDataCache, SingleFlight
+from app.services.market_data.symbol_index import (
+    DEFAULT_UNIVERSE_PATH,
+    SymbolEntry,
+    SymbolIndex,
+    TrigramIndex,
+    load_symbol_universe,
+)
+from app.services.stock_data_api import StockDataAPIService
+
+ENTRIES = [
+    SymbolEntry("AAPL", "Apple Inc.", "NASDAQ"),
+    SymbolEntry("AMD", "Advanced Micro Devices Inc.", "NASDAQ"),
+    SymbolEntry("TCS.NS", "Tata Consultancy Services Limited", "NSE"),
+    SymbolEntry("TCS.BO", "Tata Consultancy Services Limited", "BSE"),
+    SymbolEntry("TATAMOTORS.NS", "Tata Motors Limited", "NSE"),
+    SymbolEntry("HDFCBANK.NS", "HDFC Bank Limited", "NSE"),
+]
+
+
+@pytest.fixture
+def index():
+    return SymbolIndex(ENTRIES)
+
+
+def _symbols(entries):
+    return [entry.symbol for entry in entries]
+
+
+def test_exact_symbol_ranks_first(index):
+    assert _symbols(index.search("aapl")) == ["AAPL"]
+
+
+def test_base_symbol_matches_every_exchange(index):
+    assert _symbols(index.search("TCS")) == ["TCS.NS", "TCS.BO"]
+
+
+def test_symbol_prefix_ranks_shorter_completion_first(index):
+    assert _symbols(index.search("A"))[:2] == ["AMD", "AAPL"]
+
+
+def test_company_name_and_word_prefix(index):
+    assert _symbols(index.search("tata mo")) == ["TATAMOTORS.NS"]
+    assert _symbols(index.search("bank")) == ["HDFCBANK.NS"]
+
+
+def test_misspelled_name_falls_back_to_trigrams(index):
+    assert _symbols(index.search("consltancy", 1)) == ["TCS.NS"]
+
+
+def test_no_match_and_limit(index):
+    assert index.search("zzzz") == []
+    assert index.search("") == []
+    assert len(index.search("T", 1)) == 1
+
+
+def test_trigram_candidates_cover_substrings_both_ways():
+    trigram_index = TrigramIndex(["APOLLO", "APOLLO MICRO SYSTEMS", "HDFC BANK"])
+
+    assert set(trigram_index.candidates("APOLLO MICRO")) == {0, 1}
+
+
+def test_bundled_universe_expands_indian_listings():
+    symbols = {entry.symbol for entry in load_symbol_universe(DEFAULT_UNIVERSE_PATH)}
+
+    assert {"AAPL", "RELIANCE.NS", "RELIANCE.BO", "^NSEI"} <= symbols
+
+
+@pytest.fixture
+def service():
+    return StockDataAPIService(
+        market_cache=MarketDataCache(max_entries=64, use_redis=False),
+        single_flight=SingleFlight("test"),
+        symbol_index=SymbolIndex(ENTRIES),
+    )
+
+
+@pytest.mark.asyncio
+async def test_search_fills_prices_from_cached_quotes_only(service):
+    await service.market_cache.put(
+        MarketDataCache.quote_key("TCS.NS"), {"current_price": 4000.0}, 60
+    )
+
+    def upstream(*args):
+        raise AssertionError("search went upstream")
+
+    service._search_stocks_sync = upstream
+    service._download_quote_prices_sync = upstream
+
+    stocks = await service.search_stocks("tcs", 5)
+
+    assert [stock["symbol"] for stock in stocks] == ["TCS.NS", "TCS.BO"]
+    assert stocks[0]["current_price"] == 4000.0
+    assert stocks[1]["current_price"] is None
+    assert stocks[1]["price_change"] is None
+    assert stocks[1]["currency"] == "INR"
+
+
+@pytest.mark.asyncio
+async def test_search_keeps_price_fields_without_prices(service, monkeypatch):
+    monkeypatch.setattr("app.services.stock_data_api.YFINANCE_AVAILABLE", False)
+
+    stocks = await service.search_stocks("aapl", 5)
+
+    assert stocks[0]["current_price"] is None
+    assert stocks[0]["price_change_percent"] is None
+    assert stocks[0]["currency"] == "USD"
+
+
+@pytest.fixture
+def lookups(service, monkeypatch):
+    """Direct Yahoo lookups made by search; only TATAX exists upstream"""
+    monkeypatch.setattr("app.services.stock_data_api.YFINANCE_AVAILABLE", True)
+    calls = []
+
+    def lookup(query, limit):
+        calls.append(query)
+        return [{"symbol": "TATAX"}] if query == "TATAX" else []
+
+    service._search_stocks_sync = lookup
+    service._download_quote_prices_sync = lambda symbols: {}
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_ticker_missing_from_index_is_looked_up_first(service, lookups):
+    stocks = await service.search_stocks("TATAX", 5)
+
+    # Only a trigram match in the index, so Yahoo is asked too
+    assert lookups == ["TATAX"]
+    assert stocks[0]["symbol"] == "TATAX"
+    assert "TATAMOTORS.NS" in [stock["symbol"] for stock in stocks[1:]]
+
+
+@pytest.mark.asyncio
+async def test_ticker_lookups_are_cached_including_misses(service, lookups):
+    for _ in range(2):
+        await service.search_stocks("TATAX", 5)
+        unknown = await service.search_stocks("ZZQX", 5)
+
+    assert lookups == ["TATAX", "ZZQX"]
+    assert unknown == []
+
+
+@pytest.mark.asyncio
+async def test_prefix_hits_do_not_look_up_tickers(service, lookups):
+    await service.search_stocks("TCS", 5)
+    await service.search_stocks("hdfc bank", 5)
+
+    assert lookups == []
+
+
+def test_partial_company_match(service):
+    assert service._normalize_symbol("Apollo Micro Systems India") == "APOLLO.NS"
+    assert service._normalize_symbol("TATA CONSULTANCY SERVICES") == "TCS.NS"
+    # One-letter US tickers are not swallowed by longer Indian names
+    assert service._normalize_symbol("V") == "V"
@@ -0,0 +1,241 @@
+"""
+Unit tests for SQL-side agent task history analytics.
+
+The AsyncSession is replaced by a fake that records each statement and
+returns canned aggregate rows, so the tests check both the SQL that is sent
+to Postgres and how its rows are shaped into API responses.
+"""
+
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.agent_task_history_queries import (
+    _fill_daily_trends,
+    get_performance_distribution,
+)
+from app.services.agent_task_history_service import AgentTaskHistoryService
+
+
+class _FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def one(self):
+        return self.rows[0]
+
+    def all(self):
+        return list(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+class _FakeSession:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return _FakeResult(self.results.pop(0))
+
+    def sql(self, index):
+        return str(self.statements[index].compile(dialect=postgresql.dialect()))
+
+
+def _row(**values):
+    return SimpleNamespace(**values)
+
+
+class TestFillDailyTrends:
+    """Every day of the window appears once, oldest first"""
+
+    def test_idle_days_are_zero(self):
+        first_day = date(2025, 3, 1)
+        rows = [
+            _row(
+                day=date(2025, 3, 2),
+                total=4,
+                successful=3,
+                avg_duration=Decimal("12.5"),
+                avg_confidence=Decimal("0.8"),
+            )
+        ]
+        trends = _fill_daily_trends(rows, first_day, 3)
+
+        assert trends["dates"] == ["2025-03-01", "2025-03-02", "2025-03-03"]
+        assert trends["task_counts"] == [0, 4, 0]
+        assert trends["success_rates"] == [0, 75.0, 0]
+        assert trends["avg_durations"] == [0.0, 12.5, 0.0]
+        assert trends["confidence_scores"] == [0.0, 0.8, 0.0]
+
+
+class TestPerformanceSummary:
+    """The summary is built from aggregate rows only"""
+
+    @pytest.mark.asyncio
+    async def test_summary_from_aggregates(self):
+        today = datetime.utcnow().date()
+        session = _FakeSession(
+            [
+                _row(
+                    total_tasks=10,
+                    successful_tasks=8,
+                    avg_duration=Decimal("4.5"),
+                    avg_confidence=Decimal("0.9"),
+                    total_llm_calls=25,
+                    total_thinking_phases=12,
+                )
+            ],
+            [_row(tasks=10, input_tokens=700, output_tokens=300, total_tokens=1000)],
+            [_row(error_type="timeout", count=2)],
+            [
+                _row(
+                    day=today,
+                    total=10,
+                    successful=8,
+                    avg_duration=Decimal("4.5"),
+                    avg_confidence=Decimal("0.9"),
+                )
+            ],
+        )
+        service = AgentTaskHistoryService(session)
+
+        summary = await service.get_agent_performance_summary(
+            "analyst", "client", "engagement", days=7
+        )
+
+        assert summary["summary"]["success_rate"] == 80.0
+        assert summary["summary"]["failed_tasks"] == 2
+        assert summary["token_usage"] == {
+            "total_input_tokens": 700,
+            "total_output_tokens": 300,
+            "total_tokens": 1000,
+            "avg_tokens_per_task": 100.0,
+        }
+        assert summary["error_patterns"] == [{"error_type": "timeout", "count": 2}]
+        assert len(summary["trends"]["dates"]) == 7
+        assert summary["trends"]["dates"][-1] == today.isoformat()
+        assert summary["trends"]["task_counts"][-1] == 10
+
+        assert "token_usage ->> " in session.sql(1)
+        assert "GROUP BY CASE" in session.sql(2)
+        assert "GROUP BY CAST(migration.agent_task_history.started_at AS DATE)" in (
+            session.sql(3)
+        )
+
+    @pytest.mark.asyncio
+    async def test_errors_are_reported_not_raised(self):
+        session = _FakeSession()
+        service = AgentTaskHistoryService(session)
+
+        summary = await service.get_agent_performance_summary(
+            "analyst", "client", "engagement"
+        )
+
+        assert summary["agent_name"] == "analyst"
+        assert "error" in summary
+
+
+class TestAnalytics:
+    """Distribution, resource and complexity analytics are aggregated in SQL"""
+
+    @pytest.mark.asyncio
+    async def test_analytics_from_aggregates(self):
+        session = _FakeSession(
+            # Duration percentiles
+            [
+                _row(
+                    tasks=3,
+                    p25=Decimal("1.111"),
+                    p50=Decimal("2"),
+                    p75=Decimal("3"),
+                    p90=Decimal("3"),
+                    p95=Decimal("3"),
+                    p99=Decimal("3"),
+                )
+            ],
+            [_row(status="completed", count=2), _row(status="failed", count=1)],
+            # Memory and LLM call buckets
+            [_row(avg_memory=Decimal("128.456"), peak_memory=Decimal("256"))],
+            [_row(bucket=0, count=2), _row(bucket=2, count=1)],
+            # Pattern discovery per type
+            [
+                _row(
+                    pattern_type="risk",
+                    patterns=2,
+                    references=5,
+                    high_confidence=1,
+                    confidence_sum=Decimal("1.5"),
+                ),
+                _row(
+                    pattern_type="dependency",
+                    patterns=1,
+                    references=0,
+                    high_confidence=1,
+                    confidence_sum=Decimal("0.9"),
+                ),
+            ],
+            # Complexity buckets
+            [
+                _row(
+                    simple=2,
+                    moderate=1,
+                    complex=0,
+                    very_complex=0,
+                    avg_thinking_phases=Decimal("1.5"),
+                )
+            ],
+        )
+        service = AgentTaskHistoryService(session)
+
+        result = await service.get_agent_analytics(
+            "analyst", "client", "engagement", period_days=30
+        )
+        analytics = result["analytics"]
+
+        distribution = analytics["performance_distribution"]
+        assert distribution["duration_percentiles"]["p25"] == 1.11
+        assert distribution["status_distribution"] == {"completed": 2, "failed": 1}
+        assert analytics["resource_usage"] == {
+            "avg_memory_usage_mb": 128.46,
+            "peak_memory_usage_mb": 256.0,
+            "llm_call_distribution": {"0-5": 2, "10-15": 1},
+        }
+        assert analytics["pattern_discovery"] == {
+            "total_patterns_discovered": 3,
+            "pattern_types": {"risk": 2, "dependency": 1},
+            "total_pattern_references": 5,
+            "high_confidence_patterns": 2,
+            "avg_confidence_score": 0.8,
+        }
+        assert analytics["task_complexity"]["complexity_distribution"]["simple"] == 2
+        assert analytics["task_complexity"]["avg_thinking_phases_per_task"] == 1.5
+
+        assert "percentile_disc" in session.sql(0)
+        assert "WITHIN GROUP" in session.sql(0)
+        assert "GROUP BY migration.agent_task_history.status" in session.sql(1)
+        assert "GROUP BY" in session.sql(3)
+        assert "FILTER (WHERE" in session.sql(5)
+
+    @pytest.mark.asyncio
+    async def test_no_timed_tasks(self):
+        session = _FakeSession(
+            [
+                _row(
+                    tasks=0,
+                    **{f"p{p}": None for p in (25, 50, 75, 90, 95, 99)},
+                )
+            ],
+        )
+        distribution = await get_performance_distribution(
+            session, "analyst", "client", "engagement", date.today() - timedelta(days=7)
+        )
+
+        assert distribution == {"duration_percentiles": {}, "status_distribution": {}}
+        # The status breakdown is skipped entirely
+        assert len(session.statements) == 1
@@ -0,0 +1,253 @@
+"""
+Unit tests for the materialized dependency graph.
+
+Flush contents are transient ORM objects; snapshot writes go to a fake
+connection that records statements, so no database is needed.
+"""
+
+import json
+import uuid
+from types import SimpleNamespace
+
+from app.models.asset import Asset, AssetDependency
+from app.services.dependency_graph_changes import (
+    GRAPH_PENDING_KEY,
+    GraphChange,
+    _after_flush,
+    apply_graph_change,
+    collect_flush_changes,
+)
+from app.services.dependency_graph_store import assemble_graph, graph_dependencies
+
+CLIENT = uuid.uuid4()
+ENGAGEMENT = uuid.uuid4()
+KEY = (CLIENT, ENGAGEMENT)
+
+
+class _Result:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+
+class _Connection:
+    def __init__(self, version):
+        self.version = version
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        self.statements.append((str(statement), params))
+        return _Result(self.version if len(self.statements) == 1 else None)
+
+
+def _dependency(**values):
+    return AssetDependency(
+        id=uuid.uuid4(),
+        client_account_id=CLIENT,
+        engagement_id=ENGAGEMENT,
+        asset_id=uuid.uuid4(),
+        depends_on_asset_id=uuid.uuid4(),
+        dependency_type="api",
+        **values,
+    )
+
+
+class TestAssembleGraph:
+    """Tests for turning the compact snapshot into the graph view payload."""
+
+    def test_nodes_are_edge_endpoints_in_first_seen_order(self):
+        graph = assemble_graph(
+            {"a": "Orders", "b": "Billing", "c": "Unlinked"},
+            {"e1": ["a", "b", "api", None], "e2": ["b", "x", "db", "reads"]},
+        )
+
+        assert graph["nodes"] == [
+            {"id": "a", "label": "Orders"},
+            {"id": "b", "label": "Billing"},
+            {"id": "x", "label": ""},
+        ]
+        assert graph["edges"][0] == {
+            "id": "e1",
+            "source": "a",
+            "target": "b",
+            "type": "api",
+            "description": "",
+        }
+
+    def test_dependency_rows_come_from_the_graph(self):
+        graph = assemble_graph(
+            {"a": "Orders", "b": "Billing"}, {"e1": ["a", "b", "api", "calls"]}
+        )
+
+        assert graph_dependencies(graph) == [
+            {
+                "dependency_id": "e1",
+                "source_app_id": "a",
+                "source_app_name": "Orders",
+                "target_app_info": {"id": "b", "name": "Billing"},
+                "dependency_type": "api",
+                "description": "calls",
+            }
+        ]
+
+
+class TestCollectFlushChanges:
+    """Tests for splitting a flush into graph changes."""
+
+    def test_new_dependencies_wait_for_classification(self):
+        dependency = _dependency()
+
+        changes, upserts = collect_flush_changes([dependency], [], [])
+
+        assert changes == {}
+        assert upserts == {KEY: [dependency]}
+
+    def test_deletes_and_renames_become_changes(self):
+        dependency = _dependency()
+        deleted_asset = Asset(
+            id=uuid.uuid4(), client_account_id=CLIENT, engagement_id=ENGAGEMENT
+        )
+        renamed_asset = Asset(
+            id=uuid.uuid4(),
+            client_account_id=CLIENT,
+            engagement_id=ENGAGEMENT,
+            name="Orders v2",
+        )
+
+        changes, upserts = collect_flush_changes(
+            [], [renamed_asset], [dependency, deleted_asset]
+        )
+
+        change = changes[KEY]
+        assert change.removed_edges == {str(dependency.id)}
+        assert change.removed_nodes == {str(deleted_asset.id)}
+        assert change.renamed == {str(renamed_asset.id): "Orders v2"}
+        assert upserts == {}
+
+    def test_entities_without_tenant_context_are_ignored(self):
+        dependency = AssetDependency(id=uuid.uuid4(), dependency_type="api")
+
+        assert collect_flush_changes([dependency], [], [dependency]) == ({}, {})
+
+
+class TestApplyGraphChange:
+    """Tests for writing a change to the snapshot and change log."""
+
+    def test_updates_snapshot_and_logs_the_change(self):
+        connection = _Connection(version=7)
+        change = GraphChange(
+            edges={"e1": ["a", "b", "api", ""]}, labels={"a": "A", "b": "B"}
+        )
+
+        assert apply_graph_change(connection, KEY, change) == 7
+
+        update_sql, _ = connection.statements[0]
+        assert "CAST(:edges AS jsonb)" in update_sql
+        assert ":removed_nodes" not in update_sql
+        _, insert_params = connection.statements[1]
+        assert insert_params["version"] == 7
+        assert json.loads(insert_params["change"])["labels"] == {"a": "A", "b": "B"}
+
+    def test_missing_snapshot_is_left_for_a_lazy_rebuild(self):
+        connection = _Connection(version=None)
+
+        version = apply_graph_change(connection, KEY, GraphChange(removed_edges={"e1"}))
+
+        assert version is None
+        assert len(connection.statements) == 1
+
+    def test_empty_change_writes_nothing(self):
+        connection = _Connection(version=3)
+
+        assert apply_graph_change(connection, KEY, GraphChange()) is None
+        assert connection.statements == []
+
+
+class _Savepoint:
+    def __init__(self):
+        self.state = None
+
+    def commit(self):
+        self.state = "committed"
+
+    def rollback(self):
+        self.state = "rolled back"
+
+
+class _FlushConnection:
+    """Snapshot exists for KEY; the snapshot UPDATE can be made to fail"""
+
+    def __init__(self, fail_update):
+        self.fail_update = fail_update
+        self.statements = []
+        self.savepoint = None
+
+    def begin_nested(self):
+        self.savepoint = _Savepoint()
+        return self.savepoint
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append((sql, params))
+        if sql.lstrip().startswith("SELECT"):
+            return [SimpleNamespace(client_account_id=CLIENT, engagement_id=ENGAGEMENT)]
+        if "SET edges" in sql:
+            if self.fail_update:
+                raise RuntimeError("snapshot update failed")
+            return _Result(2)
+        return _Result(None)
+
+
+def _flush_session(connection, pending=True, deleted=()):
+    return SimpleNamespace(
+        info={GRAPH_PENDING_KEY: True} if pending else {},
+        new=[],
+        dirty=[],
+        deleted=list(deleted),
+        connection=lambda: connection,
+    )
+
+
+class TestAfterFlush:
+    """Tests for the flush listener around the snapshot update."""
+
+    def test_flushes_without_graph_rows_do_nothing(self):
+        connection = _FlushConnection(fail_update=False)
+
+        _after_flush(_flush_session(connection, pending=False), None)
+
+        assert connection.statements == []
+
+    def test_failed_update_invalidates_the_snapshot(self):
+        connection = _FlushConnection(fail_update=True)
+        session = _flush_session(connection, deleted=[_dependency()])
+
+        _after_flush(session, None)
+
+        assert connection.savepoint.state == "rolled back"
+        invalidate_sql, params = connection.statements[-1]
+        assert "nodes = NULL, edges = NULL, version = version + 1" in invalidate_sql
+        assert params == {"client_account_id": CLIENT, "engagement_id": ENGAGEMENT}
+        assert GRAPH_PENDING_KEY not in session.info
+
+    def test_engagement_is_locked_before_the_snapshot_is_checked(self):
+        connection = _FlushConnection(fail_update=False)
+
+        _after_flush(_flush_session(connection, deleted=[_dependency()]), None)
+
+        lock_sql, params = connection.statements[0]
+        assert "pg_advisory_xact_lock" in lock_sql
+        assert params == {
+            "client_account_id": str(CLIENT),
+            "engagement_id": str(ENGAGEMENT),
+        }
+        assert "dependency_graph_snapshots" in connection.statements[1][0]
+
+    def test_successful_update_commits_the_savepoint(self):
+        connection = _FlushConnection(fail_update=False)
+
+        _after_flush(_flush_session(connection, deleted=[_dependency()]), None)
+
+        assert connection.savepoint.state == "committed"
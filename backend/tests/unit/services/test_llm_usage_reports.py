@@ -0,0 +1,206 @@
+"""
+Unit tests for LLM usage rollup planning and report aggregation.
+
+Only the pure planning and aggregation helpers are exercised; no database is
+involved.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from app.services.llm_usage_reports import (
+    RAW,
+    Segment,
+    aggregate_usage,
+    plan_segments,
+    usage_by_day_query,
+)
+from app.services.llm_usage_rollups import (
+    DAILY,
+    HOUR,
+    HOURLY,
+    ceil_time,
+    floor_time,
+)
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def _usage_row(day, provider="openai", model="gpt-4o", **overrides):
+    row = {
+        "date": day,
+        "llm_provider": provider,
+        "model_name": model,
+        "requests": 10,
+        "successful_requests": 9,
+        "failed_requests": 1,
+        "input_tokens": 100,
+        "output_tokens": 50,
+        "tokens": 150,
+        "cost": Decimal("0.5"),
+        "response_time_ms": 2000,
+        "timed_requests": 10,
+        "first_request": _utc(day.year, day.month, day.day, 1),
+        "last_request": _utc(day.year, day.month, day.day, 23),
+    }
+    row.update(overrides)
+    return row
+
+
+class TestTimeBuckets:
+    """Bucket boundaries are UTC hours and days"""
+
+    def test_floor_and_ceil(self):
+        value = _utc(2025, 3, 4, 10, 30)
+        assert floor_time(value, HOUR) == _utc(2025, 3, 4, 10)
+        assert ceil_time(value, HOUR) == _utc(2025, 3, 4, 11)
+        assert ceil_time(_utc(2025, 3, 4, 10), HOUR) == _utc(2025, 3, 4, 10)
+
+    def test_other_time_zones_are_converted(self):
+        value = datetime(2025, 3, 4, 1, 30, tzinfo=timezone(timedelta(hours=5)))
+        assert floor_time(value, timedelta(days=1)) == _utc(2025, 3, 3)
+
+    def test_naive_values_are_utc(self):
+        assert floor_time(datetime(2025, 3, 4, 10, 30), HOUR) == _utc(2025, 3, 4, 10)
+
+
+class TestPlanSegments:
+    """Report ranges are covered by rollups wherever possible, exactly once"""
+
+    def test_without_rollups_everything_is_raw(self):
+        start, end = _utc(2025, 3, 1), _utc(2025, 3, 10)
+        assert plan_segments(start, end, None, None) == [Segment(RAW, start, end, True)]
+
+    def test_days_then_hours_then_raw_tail(self):
+        segments = plan_segments(
+            _utc(2025, 3, 1, 10, 15),
+            _utc(2025, 3, 10, 12, 30),
+            hourly_until=_utc(2025, 3, 10, 11),
+            daily_until=_utc(2025, 3, 10),
+        )
+        assert segments == [
+            Segment(RAW, _utc(2025, 3, 1, 10, 15), _utc(2025, 3, 1, 11)),
+            Segment(HOURLY, _utc(2025, 3, 1, 11), _utc(2025, 3, 2)),
+            Segment(DAILY, _utc(2025, 3, 2), _utc(2025, 3, 10)),
+            Segment(HOURLY, _utc(2025, 3, 10), _utc(2025, 3, 10, 11)),
+            Segment(RAW, _utc(2025, 3, 10, 11), _utc(2025, 3, 10, 12, 30), True),
+        ]
+
+    def test_unbounded_range(self):
+        segments = plan_segments(
+            None,
+            None,
+            hourly_until=_utc(2025, 3, 10, 11),
+            daily_until=_utc(2025, 3, 10),
+        )
+        assert segments == [
+            Segment(DAILY, None, _utc(2025, 3, 10)),
+            Segment(HOURLY, _utc(2025, 3, 10), _utc(2025, 3, 10, 11)),
+            Segment(RAW, _utc(2025, 3, 10, 11), None, True),
+        ]
+
+    def test_segments_are_contiguous(self):
+        start, end = _utc(2025, 1, 3, 7, 5), _utc(2025, 2, 20, 16, 45)
+        segments = plan_segments(start, end, _utc(2025, 2, 20, 15), _utc(2025, 2, 19))
+        assert segments[0].start == start
+        assert segments[-1].end == end and segments[-1].end_inclusive
+        for previous, current in zip(segments, segments[1:]):
+            assert previous.end == current.start
+            assert not previous.end_inclusive
+
+    def test_range_inside_one_hour_is_raw(self):
+        start, end = _utc(2025, 3, 1, 10, 5), _utc(2025, 3, 1, 10, 50)
+        assert plan_segments(start, end, _utc(2025, 3, 5), _utc(2025, 3, 5)) == [
+            Segment(RAW, start, end, True)
+        ]
+
+    def test_end_on_bucket_boundary_keeps_the_boundary_instant(self):
+        start, end = _utc(2025, 3, 1), _utc(2025, 3, 3)
+        assert plan_segments(start, end, _utc(2025, 3, 5), _utc(2025, 3, 5)) == [
+            Segment(DAILY, start, end),
+            Segment(RAW, end, end, True),
+        ]
+
+    def test_range_entirely_after_rollups_is_raw(self):
+        start, end = _utc(2025, 3, 6), _utc(2025, 3, 7)
+        assert plan_segments(start, end, _utc(2025, 3, 5), _utc(2025, 3, 5)) == [
+            Segment(RAW, start, end, True)
+        ]
+
+
+class TestUsageByDayQuery:
+    """One UNION ALL branch per segment, each with its own time bounds"""
+
+    def test_branches_and_params(self):
+        segments = [
+            Segment(DAILY, None, _utc(2025, 3, 10)),
+            Segment(RAW, _utc(2025, 3, 10), _utc(2025, 3, 10, 5), True),
+        ]
+        sql, params = usage_by_day_query(
+            segments, ["1=1", "model_name = :model"], {"model": "gpt-4o"}
+        )
+
+        assert sql.count("UNION ALL") == 1
+        assert "FROM migration.llm_usage_summary" in sql
+        assert "FROM migration.llm_usage_logs" in sql
+        assert "period_start < :segment_0_end" in sql
+        assert "created_at <= :segment_1_end" in sql
+        assert sql.count("(model_name = :model)") == 2
+        assert params == {
+            "model": "gpt-4o",
+            "segment_0_period": DAILY,
+            "segment_0_end": _utc(2025, 3, 10),
+            "segment_1_start": _utc(2025, 3, 10),
+            "segment_1_end": _utc(2025, 3, 10, 5),
+        }
+
+    def test_unfiltered_raw_segment(self):
+        sql, params = usage_by_day_query([Segment(RAW, None, None, True)], [], {})
+        assert "WHERE (TRUE)" in sql
+        assert params == {}
+
+
+class TestAggregateUsage:
+    """Rows from different sources for the same day and model are merged"""
+
+    def test_merges_rows(self):
+        rows = [
+            _usage_row(date(2025, 3, 1)),
+            _usage_row(date(2025, 3, 2), response_time_ms=500, timed_requests=5),
+            _usage_row(date(2025, 3, 2), model="gpt-4o-mini", cost=Decimal("2")),
+        ]
+        usage = aggregate_usage(rows)
+
+        summary = usage["summary"]
+        assert summary["total_requests"] == 30
+        assert summary["successful_requests"] == 27
+        assert summary["total_tokens"] == 450
+        assert summary["total_cost"] == Decimal("3.0")
+        assert summary["avg_response_time_ms"] == 4500 / 25
+        assert summary["first_request"] == _utc(2025, 3, 1, 1)
+        assert summary["last_request"] == _utc(2025, 3, 2, 23)
+
+        assert [u["model_name"] for u in usage["breakdown_by_model"]] == [
+            "gpt-4o-mini",
+            "gpt-4o",
+        ]
+        assert usage["breakdown_by_model"][1]["requests"] == 20
+        assert [u["date"] for u in usage["daily_usage"]] == [
+            date(2025, 3, 2),
+            date(2025, 3, 1),
+        ]
+        assert usage["daily_usage"][0]["cost"] == Decimal("2.5")
+
+    def test_empty(self):
+        summary = aggregate_usage([])["summary"]
+        assert summary["total_requests"] == 0
+        assert summary["avg_response_time_ms"] == 0.0
+        assert summary["first_request"] is None
+
+    def test_daily_usage_keeps_last_30_days(self):
+        rows = [_usage_row(date(2025, 1, 1) + timedelta(days=i)) for i in range(40)]
+        daily = aggregate_usage(rows)["daily_usage"]
+        assert len(daily) == 30
+        assert daily[0]["date"] == date(2025, 2, 9)
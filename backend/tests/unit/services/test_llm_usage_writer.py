@@ -0,0 +1,161 @@
+"""
+Unit tests for the buffered LLM usage log writer.
+
+AsyncSessionLocal is replaced by a fake session factory that records each
+executed batch instead of talking to Postgres.
+"""
+
+import asyncio
+import threading
+from decimal import Decimal
+
+import pytest
+
+from app.services.llm_usage_tracker import USAGE_ROW_COLUMNS, LLMUsageTracker
+from app.services.llm_usage_writer import LLMUsageLogWriter
+
+
+class _FakeSession:
+    def __init__(self, database):
+        self.database = database
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, statement, rows):
+        if self.database.fail:
+            raise ConnectionError("database unavailable")
+        self.database.batches.append(list(rows))
+
+    async def commit(self):
+        self.database.commits += 1
+
+
+class _FakeDatabase:
+    def __init__(self):
+        self.batches = []
+        self.commits = 0
+        self.fail = False
+
+    def __call__(self):
+        return _FakeSession(self)
+
+
+@pytest.fixture
+def database(monkeypatch):
+    database = _FakeDatabase()
+    monkeypatch.setattr("app.services.llm_usage_writer.AsyncSessionLocal", database)
+    return database
+
+
+def _row(n):
+    return {"id": n, "llm_provider": "deepinfra", "model_name": "m"}
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestLLMUsageLogWriter:
+    """Tests for batching, flushing and drop accounting."""
+
+    @pytest.mark.asyncio
+    async def test_full_batch_is_written_without_waiting(self, database):
+        writer = LLMUsageLogWriter(batch_size=3, flush_interval=60)
+        await writer.start()
+
+        for n in range(3):
+            assert writer.submit(_row(n)) is True
+        await _settle()
+
+        assert [[row["id"] for row in batch] for batch in database.batches] == [
+            [0, 1, 2]
+        ]
+        assert database.commits == 1
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_partial_batch_is_written_after_the_interval(self, database):
+        writer = LLMUsageLogWriter(batch_size=100, flush_interval=0.01)
+        await writer.start()
+
+        writer.submit(_row(0))
+        await asyncio.sleep(0.05)
+
+        assert len(database.batches) == 1
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_rows_from_other_threads_are_flushed_on_stop(self, database):
+        writer = LLMUsageLogWriter(batch_size=100, flush_interval=60)
+        await writer.start()
+
+        threads = [
+            threading.Thread(target=writer.submit, args=(_row(n),)) for n in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        await writer.stop()
+
+        assert sorted(row["id"] for row in database.batches[0]) == [0, 1, 2, 3]
+        assert writer.get_stats()["written"] == 4
+        assert not writer.running
+
+    @pytest.mark.asyncio
+    async def test_rows_beyond_the_queue_bound_are_dropped(self, database):
+        writer = LLMUsageLogWriter(batch_size=100, flush_interval=60, max_queue_size=2)
+        await writer.start()
+
+        results = [writer.submit(_row(n)) for n in range(3)]
+        await writer.stop()
+
+        assert results == [True, True, False]
+        stats = writer.get_stats()
+        assert (stats["enqueued"], stats["dropped"], stats["written"]) == (2, 1, 2)
+
+    @pytest.mark.asyncio
+    async def test_failed_batches_are_counted(self, database):
+        database.fail = True
+        writer = LLMUsageLogWriter(batch_size=2, flush_interval=60)
+        await writer.start()
+
+        writer.submit(_row(0))
+        writer.submit(_row(1))
+        await writer.stop()
+
+        assert writer.get_stats()["failed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_rows_are_written_directly_when_not_running(self, database):
+        writer = LLMUsageLogWriter()
+
+        await writer.write(_row(0))
+
+        assert database.batches == [[_row(0)]]
+
+
+class TestTrackerRows:
+    """Tests for the rows LLMUsageTracker hands to the writer."""
+
+    @pytest.mark.asyncio
+    async def test_logged_usage_is_priced_once_per_batch(self, database):
+        tracker = LLMUsageTracker()
+        tracker.pricing_cache["deepinfra:m"] = {"input": 1.0, "output": 2.0}
+        await tracker.writer.start()
+
+        tracker.record_llm_usage("deepinfra", "m", input_tokens=500, output_tokens=0)
+        log_id = await tracker.log_llm_usage("deepinfra", "m", success=False)
+        await tracker.writer.stop()
+
+        [batch] = database.batches
+        assert [set(row) for row in batch] == [set(USAGE_ROW_COLUMNS)] * 2
+        assert batch[0]["total_cost"] == Decimal("0.5")
+        assert batch[1]["total_cost"] is None
+        assert str(batch[1]["id"]) == log_id
+        assert batch[0]["created_at"] <= batch[1]["created_at"]
@@ -0,0 +1,134 @@
+"""
+Unit tests for the shared stock analysis snapshot used by /analyze/all.
+
+StockService is replaced with a fake so the tests only cover fetching once,
+tolerating missing history and the not-found path.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import stock_analysis_snapshot as snapshot_module
+from app.services.market_data import PriceSeries
+from app.services.stock_analysis_snapshot import (
+    INDIA_BENCHMARK,
+    US_BENCHMARK,
+    benchmark_symbol,
+    build_stock_analysis_snapshot,
+    snapshot_db_lock,
+)
+from app.services.stock_data_api import StockDataAPIService
+
+
+class FakeStockDataAPI:
+    def __init__(self, series):
+        self.series = series
+        self.series_calls = []
+
+    def is_indian_market(self, symbol):
+        return symbol.upper().endswith((".NS", ".BO"))
+
+    async def get_stock_data(self, symbol):
+        return {"market_cap": 1000}
+
+    async def get_price_series(self, symbol, period, interval):
+        self.series_calls.append((symbol, period, interval))
+        if self.series is None:
+            raise RuntimeError("no history")
+        return self.series
+
+
+class FakeStockService:
+    instances = []
+
+    def __init__(self, db, context, stock_data=None, series=None):
+        self.stock_data = stock_data
+        self.stock_data_api = FakeStockDataAPI(series)
+        self.saved = []
+        FakeStockService.instances.append(self)
+
+    async def get_stock_by_symbol(self, symbol):
+        return dict(self.stock_data) if self.stock_data else None
+
+    async def save_stock(self, stock_data):
+        self.saved.append(stock_data)
+        return SimpleNamespace(id="stock-1", symbol=stock_data["symbol"])
+
+
+def _patch_service(monkeypatch, stock_data, series):
+    FakeStockService.instances = []
+    monkeypatch.setattr(
+        snapshot_module,
+        "StockService",
+        lambda db, context: FakeStockService(db, context, stock_data, series),
+    )
+
+
+def test_benchmark_symbol_by_market():
+    api = StockDataAPIService()
+    assert benchmark_symbol("reliance.ns", api) == INDIA_BENCHMARK
+    assert benchmark_symbol("TCS.BO", api) == INDIA_BENCHMARK
+    assert benchmark_symbol("AAPL", api) == US_BENCHMARK
+
+
+def test_benchmark_symbol_resolves_bare_indian_symbols():
+    api = StockDataAPIService()
+    assert benchmark_symbol("RELIANCE", api) == INDIA_BENCHMARK
+    assert benchmark_symbol("hdfc bank", api) == INDIA_BENCHMARK
+    assert benchmark_symbol("NIFTY", api) == INDIA_BENCHMARK
+
+
+@pytest.mark.asyncio
+async def test_snapshot_fetches_and_saves_once(monkeypatch):
+    series = PriceSeries.from_records(
+        [
+            {
+                "timestamp": 1704153600000 + i * 86400000,
+                "date": f"2024-01-0{i + 2}",
+                "open": 1.0,
+                "high": 2.0,
+                "low": 1.0,
+                "close": 2.0,
+                "volume": 100,
+            }
+            for i in range(2)
+        ]
+    )
+    _patch_service(monkeypatch, {"symbol": "AAPL"}, series)
+
+    snapshot = await build_stock_analysis_snapshot(None, None, "AAPL")
+
+    service = FakeStockService.instances[0]
+    assert len(service.saved) == 1
+    assert snapshot.stock.id == "stock-1"
+    assert snapshot.stock_data["market_cap"] == 1000
+    assert len(snapshot.price_series) == 2
+    assert [call[0] for call in service.stock_data_api.series_calls] == [
+        "AAPL",
+        US_BENCHMARK,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_snapshot_tolerates_missing_history(monkeypatch):
+    _patch_service(monkeypatch, {"symbol": "AAPL"}, None)
+
+    snapshot = await build_stock_analysis_snapshot(None, None, "AAPL")
+
+    assert snapshot.price_series.is_empty
+    assert snapshot.benchmark_series is None
+
+
+@pytest.mark.asyncio
+async def test_snapshot_returns_none_when_stock_missing(monkeypatch):
+    _patch_service(monkeypatch, None, None)
+
+    assert await build_stock_analysis_snapshot(None, None, "NOPE") is None
+    assert FakeStockService.instances[0].saved == []
+
+
+@pytest.mark.asyncio
+async def test_db_lock_is_noop_without_snapshot():
+    async with snapshot_db_lock(None):
+        pass